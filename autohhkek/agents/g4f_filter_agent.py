@@ -6,6 +6,7 @@ from typing import Any, Callable
 from autohhkek.agents.openai_filter_agent import FilterPlanningOutput
 from autohhkek.domain.models import Anamnesis, UserPreferences
 from autohhkek.services.g4f_runtime import G4FAppConfig
+from autohhkek.services.llm_usage import LLMCallMeter
 
 
 RunnerFn = Callable[[list[dict[str, str]], G4FAppConfig], Any]
@@ -24,12 +25,16 @@ class G4FHHFilterAgent:
             self.last_error = ""
             return None
         messages = self._build_messages(preferences, anamnesis)
+        meter = LLMCallMeter("filter_planning", backend="g4f", model=self.config.model)
         try:
+            meter.throttle(messages)
             output = self.runner(messages, self.config)
         except Exception as exc:  # noqa: BLE001
+            meter.fail(exc)
             self.last_status = "error"
             self.last_error = str(exc)
             return None
+        meter.succeed(output)
         if not isinstance(output, FilterPlanningOutput):
             output = FilterPlanningOutput.model_validate(output)
         self.last_status = "ok"
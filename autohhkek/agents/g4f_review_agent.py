@@ -6,6 +6,8 @@ from typing import Any, Callable
 from autohhkek.agents.openai_review_agent import VacancyReviewOutput, _coerce_category, _coerce_reason_group, _default_action
 from autohhkek.domain.models import Anamnesis, AssessmentReason, UserPreferences, Vacancy, VacancyAssessment
 from autohhkek.services.g4f_runtime import G4FAppConfig
+from autohhkek.services.llm_usage import LLMCallMeter
+from autohhkek.services.prompt_compaction import CompactVacancy, compact_vacancy
 
 
 RunnerFn = Callable[[list[dict[str, str]], G4FAppConfig], Any]
@@ -28,13 +30,19 @@ class G4FVacancyReviewer:
             self.last_status = "unavailable"
             self.last_error = ""
             return None
-        messages = self._build_messages(vacancy, preferences, anamnesis)
+        compact = compact_vacancy(vacancy)
+        messages = self._build_messages(compact, preferences, anamnesis)
+        meter = LLMCallMeter("vacancy_review", backend="g4f", model=self.config.model, vacancy_id=vacancy.vacancy_id)
+        meter.prompt_compression_ratio = compact.compression_ratio
         try:
+            meter.throttle(messages)
             output = self.runner(messages, self.config)
         except Exception as exc:  # noqa: BLE001
+            meter.fail(exc)
             self.last_status = "error"
             self.last_error = str(exc)
             return None
+        meter.succeed(output)
 
         if not isinstance(output, VacancyReviewOutput):
             output = VacancyReviewOutput.model_validate(output)
@@ -42,7 +50,7 @@ class G4FVacancyReviewer:
         self.last_error = ""
         return self._to_assessment(vacancy, output)
 
-    def _build_messages(self, vacancy: Vacancy, preferences: UserPreferences, anamnesis: Anamnesis) -> list[dict[str, str]]:
+    def _build_messages(self, vacancy: CompactVacancy, preferences: UserPreferences, anamnesis: Anamnesis) -> list[dict[str, str]]:
         return [
             {
                 "role": "system",
@@ -57,7 +65,7 @@ class G4FVacancyReviewer:
                 "role": "user",
                 "content": json.dumps(
                     {
-                        "vacancy": vacancy.to_dict(),
+                        "vacancy": vacancy.payload,
                         "preferences": preferences.to_dict(),
                         "anamnesis": anamnesis.to_dict(),
                     },
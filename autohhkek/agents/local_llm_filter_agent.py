@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from autohhkek.agents.openai_filter_agent import OpenAIHHFilterAgent, RunnerFn
+from autohhkek.services.local_llm_runtime import LocalLLMAppConfig
+
+
+class LocalLLMHHFilterAgent(OpenAIHHFilterAgent):
+    llm_backend = "local"
+    agent_name = "AutoHHKek Local HH Filter Planner"
+
+    def __init__(self, config: LocalLLMAppConfig | None = None, runner: RunnerFn | None = None) -> None:
+        super().__init__(config=config or LocalLLMAppConfig.from_env(), runner=runner)
+
+    def model_name(self) -> str:
+        return self.config.resolved_model()
+
+    def _call_gate(self):
+        return self.config.slot_gate()
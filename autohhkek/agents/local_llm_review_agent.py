@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from autohhkek.agents.openai_review_agent import OpenAIVacancyReviewer, RunnerFn
+from autohhkek.services.local_llm_runtime import LocalLLMAppConfig
+
+
+class LocalLLMVacancyReviewer(OpenAIVacancyReviewer):
+    """Reviews vacancies on a self-hosted OpenAI-compatible server, one request per free slot."""
+
+    llm_backend = "local"
+    backend_label = "на локальной модели"
+    review_strategy = "local_llm_agent"
+
+    def __init__(self, config: LocalLLMAppConfig | None = None, runner: RunnerFn | None = None) -> None:
+        super().__init__(config=config or LocalLLMAppConfig.from_env(), runner=runner)
+
+    def model_name(self) -> str:
+        return self.config.resolved_model()
+
+    def _call_gate(self):
+        return self.config.slot_gate()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+
+from autohhkek.agents.openai_review_agent import _default_action
+from autohhkek.domain.enums import FitCategory, ReasonGroup
+from autohhkek.domain.models import AssessmentReason, Vacancy, VacancyAssessment
+from autohhkek.services.local_classifier import LocalReviewerModel
+
+
+class LocalVacancyReviewer:
+    """Answers from the distilled classifier when it is confident enough, otherwise defers."""
+
+    def __init__(self, model: LocalReviewerModel, threshold: float | None = None) -> None:
+        self.model = model
+        self.threshold = float(threshold if threshold is not None else model.threshold)
+        self.last_status = "idle"
+        self.last_confidence = 0.0
+
+    @classmethod
+    def from_env(cls, model: LocalReviewerModel | None) -> "LocalVacancyReviewer | None":
+        if model is None or os.getenv("AUTOHHKEK_LOCAL_REVIEWER", "1").strip().lower() in {"0", "false", "no", "off"}:
+            return None
+        raw = os.getenv("AUTOHHKEK_LOCAL_REVIEWER_THRESHOLD", "").strip()
+        try:
+            threshold = float(raw) if raw else None
+        except ValueError:
+            threshold = None
+        return cls(model, threshold=threshold)
+
+    def review(self, vacancy: Vacancy) -> VacancyAssessment | None:
+        category, confidence, score = self.model.predict(vacancy)
+        self.last_confidence = confidence
+        if confidence < self.threshold:
+            self.last_status = "deferred"
+            return None
+        self.last_status = "ok"
+        return VacancyAssessment(
+            vacancy_id=vacancy.vacancy_id,
+            category=category,
+            subcategory="local_classifier",
+            score=round(max(0.0, min(100.0, score)), 1),
+            explanation=f"Вакансия оценена локальным классификатором, обученным на прошлых LLM-оценках (уверенность {confidence:.0%}).",
+            reasons=[
+                AssessmentReason(
+                    code="local_classifier",
+                    label="Локальная модель",
+                    group=ReasonGroup.NEUTRAL,
+                    detail=f"Уверенность {confidence:.0%} при пороге {self.threshold:.0%}.",
+                    subcategory="local_classifier",
+                )
+            ],
+            recommended_action=_default_action(category),
+            ready_for_apply=category == FitCategory.FIT,
+            review_strategy="local_classifier",
+            review_notes=f"Локальная модель от {self.model.trained_at or 'unknown'}; LLM не вызывалась.",
+        )
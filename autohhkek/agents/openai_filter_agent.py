@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import json
+from contextlib import nullcontext
 from typing import Any, Callable
 
 from pydantic import BaseModel, Field
 
 from autohhkek.domain.models import Anamnesis, UserPreferences
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+from autohhkek.services.llm_usage import LLMCallMeter
 from autohhkek.services.openai_runtime import OpenAIAppConfig
 
 
@@ -24,6 +27,9 @@ RunnerFn = Callable[[Any, str, Any], Any]
 
 
 class OpenAIHHFilterAgent:
+    llm_backend = "openai"
+    agent_name = "AutoHHKek HH Filter Planner"
+
     def __init__(self, config: OpenAIAppConfig | None = None, runner: RunnerFn | None = None) -> None:
         self.config = config or OpenAIAppConfig.from_env()
         self.runner = runner or self._run_sync
@@ -36,16 +42,22 @@ class OpenAIHHFilterAgent:
             self.last_error = ""
             return None
 
+        meter = LLMCallMeter("filter_planning", backend=self.llm_backend, model=self.model_name())
         try:
-            result = self.runner(
-                self._build_agent(),
-                self._build_prompt(preferences, anamnesis),
-                run_config=self.config.build_run_config(workflow_name="AutoHHKek filter planning"),
-            )
+            prompt = self._build_prompt(preferences, anamnesis)
+            meter.throttle(prompt)
+            with self._call_gate():
+                result = self.runner(
+                    self._build_agent(),
+                    prompt,
+                    run_config=self.config.build_run_config(workflow_name="AutoHHKek filter planning"),
+                )
         except Exception as exc:  # noqa: BLE001
+            meter.fail(exc)
             self.last_status = "error"
             self.last_error = str(exc)
             return None
+        meter.succeed(result)
 
         output = getattr(result, "final_output", None)
         if output is None:
@@ -63,12 +75,21 @@ class OpenAIHHFilterAgent:
         self.last_error = ""
         return output
 
+    def model_name(self) -> str:
+        return self.config.model
+
+    def _call_gate(self):
+        return nullcontext()
+
     def _build_agent(self):
+        return LLM_CLIENT_POOL.agent((self.agent_name, self.model_name(), FilterPlanningOutput), self._create_agent)
+
+    def _create_agent(self):
         from agents import Agent
 
         return Agent(
-            name="AutoHHKek HH Filter Planner",
-            model=self.config.model,
+            name=self.agent_name,
+            model=self.model_name(),
             instructions=(
                 "You convert the user's hiring preferences into hh.ru search intent. "
                 "Prefer deterministic, reusable filters. Only propose area_code values when you are confident "
@@ -92,6 +113,4 @@ class OpenAIHHFilterAgent:
         )
 
     def _run_sync(self, agent, prompt: str, run_config=None):
-        from agents import Runner
-
-        return Runner.run_sync(agent, prompt, run_config=run_config)
+        return LLM_CLIENT_POOL.run_agent(agent, prompt, run_config=run_config)
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import json
+from contextlib import nullcontext
+from dataclasses import replace
 from typing import Any, Callable
 
 from pydantic import BaseModel, Field
 
 from autohhkek.domain.enums import FitCategory, ReasonGroup
 from autohhkek.domain.models import Anamnesis, AssessmentReason, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+from autohhkek.services.llm_usage import LLMCallMeter
 from autohhkek.services.openai_runtime import OpenAIAppConfig
+from autohhkek.services.prompt_compaction import CompactVacancy, compact_vacancy
 
 
 class VacancyReasonOutput(BaseModel):
@@ -23,6 +28,7 @@ class VacancyReviewOutput(BaseModel):
     category: str
     subcategory: str = ""
     score: float = 50.0
+    confidence: float = 0.5
     explanation: str = ""
     recommended_action: str = ""
     review_notes: str = ""
@@ -30,14 +36,34 @@ class VacancyReviewOutput(BaseModel):
 
 
 RunnerFn = Callable[[Any, str, Any], Any]
+REVIEW_INSTRUCTIONS = (
+    "Ты оцениваешь вакансии hh.ru для одного кандидата. "
+    "Возвращай только структурированный ответ. "
+    "Пиши только на русском языке. "
+    "Классифицируй вакансии в fit, doubt или no_fit. "
+    "Объясняй решение кратко и по делу, оценки держи в диапазоне от 0 до 100, причины делай короткими и машиночитаемыми. "
+    "В поле confidence укажи уверенность в выбранной категории от 0 до 1."
+)
 
 
 class OpenAIVacancyReviewer:
+    llm_backend = "openai"
+    backend_label = "OpenAI"
+    review_strategy = "openai_agent"
+
     def __init__(self, config: OpenAIAppConfig | None = None, runner: RunnerFn | None = None) -> None:
         self.config = config or OpenAIAppConfig.from_env()
         self.runner = runner or self._run_sync
+        self._native_runner = runner is None
+        self.tier = ""
         self.last_status = "idle"
         self.last_error = ""
+        self.last_confidence = 0.0
+
+    def with_model(self, model: str, *, tier: str) -> "OpenAIVacancyReviewer":
+        reviewer = type(self)(replace(self.config, model=model), runner=None if self._native_runner else self.runner)
+        reviewer.tier = tier
+        return reviewer
 
     def review(
         self,
@@ -50,16 +76,24 @@ class OpenAIVacancyReviewer:
             self.last_error = ""
             return None
 
+        meter = LLMCallMeter("vacancy_review", backend=self.llm_backend, model=self.model_name(), vacancy_id=vacancy.vacancy_id, tier=self.tier)
         try:
-            result = self.runner(
-                self._build_agent(),
-                self._build_prompt(vacancy, preferences, anamnesis),
-                run_config=self.config.build_run_config(workflow_name="AutoHHKek vacancy review"),
-            )
+            compact = compact_vacancy(vacancy)
+            meter.prompt_compression_ratio = compact.compression_ratio
+            prompt = self._build_prompt(compact, preferences, anamnesis)
+            meter.throttle(prompt)
+            with self._call_gate():
+                result = self.runner(
+                    self._build_agent(),
+                    prompt,
+                    run_config=self.config.build_run_config(workflow_name="AutoHHKek vacancy review"),
+                )
         except Exception as exc:  # noqa: BLE001
+            meter.fail(exc)
             self.last_status = "error"
             self.last_error = str(exc)
             return None
+        meter.succeed(result)
 
         output = getattr(result, "final_output", None)
         if output is None:
@@ -75,32 +109,36 @@ class OpenAIVacancyReviewer:
                 return None
         self.last_status = "ok"
         self.last_error = ""
+        self.last_confidence = confidence_of(output)
         return self._to_assessment(vacancy, output)
 
+    def model_name(self) -> str:
+        return self.config.model
+
+    def _call_gate(self):
+        return nullcontext()
+
     def _build_agent(self):
+        return LLM_CLIENT_POOL.agent(("AutoHHKek Vacancy Reviewer", self.model_name(), VacancyReviewOutput), self._create_agent)
+
+    def _create_agent(self):
         from agents import Agent
 
         return Agent(
             name="AutoHHKek Vacancy Reviewer",
-            model=self.config.model,
-            instructions=(
-                "Ты оцениваешь вакансии hh.ru для одного кандидата. "
-                "Возвращай только структурированный ответ. "
-                "Пиши только на русском языке. "
-                "Классифицируй вакансии в fit, doubt или no_fit. "
-                "Объясняй решение кратко и по делу, оценки держи в диапазоне от 0 до 100, причины делай короткими и машиночитаемыми."
-            ),
+            model=self.model_name(),
+            instructions=REVIEW_INSTRUCTIONS,
             output_type=VacancyReviewOutput,
         )
 
     def _build_prompt(
         self,
-        vacancy: Vacancy,
+        vacancy: CompactVacancy,
         preferences: UserPreferences,
         anamnesis: Anamnesis,
     ) -> str:
         payload = {
-            "vacancy": vacancy.to_dict(),
+            "vacancy": vacancy.payload,
             "preferences": preferences.to_dict(),
             "anamnesis": anamnesis.to_dict(),
         }
@@ -112,9 +150,7 @@ class OpenAIVacancyReviewer:
         )
 
     def _run_sync(self, agent, prompt: str, run_config=None):
-        from agents import Runner
-
-        return Runner.run_sync(agent, prompt, run_config=run_config)
+        return LLM_CLIENT_POOL.run_agent(agent, prompt, run_config=run_config)
 
     def _to_assessment(self, vacancy: Vacancy, output: VacancyReviewOutput) -> VacancyAssessment:
         category = _coerce_category(output.category)
@@ -135,15 +171,19 @@ class OpenAIVacancyReviewer:
             category=category,
             subcategory=output.subcategory or "llm_review",
             score=max(0.0, min(100.0, output.score)),
-            explanation=output.explanation or "Вакансия оценена агентом OpenAI.",
+            explanation=output.explanation or f"Вакансия оценена агентом {self.backend_label}.",
             reasons=reasons,
             recommended_action=recommended_action,
             ready_for_apply=category == FitCategory.FIT,
-            review_strategy="openai_agent",
-            review_notes=output.review_notes or f"Проверено моделью {self.config.model}.",
+            review_strategy=self.review_strategy,
+            review_notes=output.review_notes or f"Проверено моделью {self.model_name()}.",
         )
 
 
+def confidence_of(output: VacancyReviewOutput) -> float:
+    return max(0.0, min(1.0, float(output.confidence)))
+
+
 def _coerce_category(value: str) -> FitCategory:
     normalized = (value or "").strip().lower()
     if normalized == FitCategory.FIT.value:
@@ -6,6 +6,8 @@ from typing import Any, Callable
 from pydantic import BaseModel, Field
 
 from autohhkek.domain.models import Anamnesis, UserPreferences
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+from autohhkek.services.llm_usage import LLMCallMeter
 from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
 
 
@@ -45,25 +47,30 @@ class OpenRouterResumeIntakeAgent:
             self.last_error = ""
             return None
 
+        meter = LLMCallMeter("resume_intake", backend="openrouter", model=self.config.model)
         try:
+            prompt = self._build_prompt(
+                preferences=preferences,
+                anamnesis=anamnesis,
+                resume_title=resume_title,
+                resume_summary=resume_summary,
+                extracted=extracted or {},
+            )
+            meter.throttle(prompt)
             result = self.runner(
                 self._build_agent(),
-                self._build_prompt(
-                    preferences=preferences,
-                    anamnesis=anamnesis,
-                    resume_title=resume_title,
-                    resume_summary=resume_summary,
-                    extracted=extracted or {},
-                ),
+                prompt,
                 run_config=self.config.build_run_config(
                     workflow_name="AutoHHKek resume intake analysis",
                     model=self.config.model,
                 ),
             )
         except Exception as exc:  # noqa: BLE001
+            meter.fail(exc)
             self.last_status = "error"
             self.last_error = str(exc)
             return None
+        meter.succeed(result)
 
         output = getattr(result, "final_output", None)
         if output is None:
@@ -82,6 +89,12 @@ class OpenRouterResumeIntakeAgent:
         return output
 
     def _build_agent(self):
+        return LLM_CLIENT_POOL.agent(
+            ("AutoHHKek OpenRouter Resume Intake Analyst", self.config.model, ResumeIntakeAnalysisOutput),
+            self._create_agent,
+        )
+
+    def _create_agent(self):
         from agents import Agent
 
         return Agent(
@@ -131,6 +144,4 @@ class OpenRouterResumeIntakeAgent:
         )
 
     def _run_sync(self, agent, prompt: str, run_config=None):
-        from agents import Runner
-
-        return Runner.run_sync(agent, prompt, run_config=run_config)
+        return LLM_CLIENT_POOL.run_agent(agent, prompt, run_config=run_config)
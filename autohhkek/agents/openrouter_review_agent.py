@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import asyncio
 import json
+import statistics
+import time
+from dataclasses import replace
 from typing import Any, Callable
 
 from autohhkek.agents.openai_review_agent import (
@@ -9,23 +12,41 @@ from autohhkek.agents.openai_review_agent import (
     _coerce_category,
     _coerce_reason_group,
     _default_action,
+    confidence_of,
 )
 from autohhkek.domain.enums import FitCategory
 from autohhkek.domain.models import Anamnesis, AssessmentReason, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL, LLMCallCancelled
+from autohhkek.services.llm_router import LLM_ROUTER
+from autohhkek.services.llm_usage import LLM_USAGE, LLMCallMeter, percentile
 from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
+from autohhkek.services.prompt_compaction import CompactVacancy, compact_vacancy
+from autohhkek.services.review_escalation import ESCALATION_TIER
 
 
 RunnerFn = Callable[[Any, str, Any], Any]
+HEDGE_MIN_SAMPLES = 10
+HEDGE_HISTORY_SIZE = 100
+HEDGE_MIN_DELAY_SEC = 1.0
 
 
 class OpenRouterVacancyReviewer:
     def __init__(self, config: OpenRouterAppConfig | None = None, runner: RunnerFn | None = None) -> None:
         self.config = config or OpenRouterAppConfig.from_env()
         self.runner = runner or self._run_sync
+        self._native_runner = runner is None
+        self.tier = ""
         self.last_status = "idle"
         self.last_error = ""
         self.last_model = self.config.model
+        self.last_confidence = 0.0
         self.review_timeout_sec = max(5.0, float(getattr(self.config, "timeout_sec", 25.0) or 25.0) + 5.0)
+        self.hedge_stats = {"reviews": 0, "hedged": 0, "hedge_wins": 0, "budget_skips": 0}
+
+    def with_model(self, model: str, *, tier: str) -> "OpenRouterVacancyReviewer":
+        reviewer = OpenRouterVacancyReviewer(replace(self.config, model=model), runner=None if self._native_runner else self.runner)
+        reviewer.tier = tier
+        return reviewer
 
     def review(
         self,
@@ -38,29 +59,24 @@ class OpenRouterVacancyReviewer:
             self.last_error = ""
             return None
 
-        result = None
-        prompt = self._build_prompt(vacancy, preferences, anamnesis)
+        compact = compact_vacancy(vacancy)
+        prompt = self._build_prompt(compact, preferences, anamnesis)
         errors: list[str] = []
-        for model in self._candidate_models():
-            self.last_model = model
-            try:
-                result = self.runner(
-                    self._build_agent(model),
-                    prompt,
-                    run_config=self.config.build_run_config(
-                        workflow_name="AutoHHKek OpenRouter vacancy review",
-                        model=model,
-                    ),
-                )
-                break
-            except Exception as exc:  # noqa: BLE001
-                errors.append(f"{model}: {exc}")
-                continue
+        meter = LLMCallMeter("vacancy_review", backend="openrouter", model=self.config.model, vacancy_id=vacancy.vacancy_id, tier=self.tier)
+        meter.prompt_compression_ratio = compact.compression_ratio
+        candidates = self._candidate_models()
+        if self.config.hedge_enabled:
+            self.hedge_stats["reviews"] += 1
+            result, last_exc = self._review_hedged(prompt, candidates, meter, errors)
+        else:
+            result, last_exc = self._review_sequential(prompt, candidates, meter, errors)
 
         if result is None:
+            meter.fail(last_exc)
             self.last_status = "error"
             self.last_error = " | ".join(errors)
             return None
+        meter.succeed(result)
 
         output = getattr(result, "final_output", None)
         if output is None:
@@ -76,18 +92,163 @@ class OpenRouterVacancyReviewer:
                 return None
         self.last_status = "ok"
         self.last_error = ""
+        self.last_confidence = confidence_of(output)
         return self._to_assessment(vacancy, output)
 
+    def _review_sequential(self, prompt: str, candidates: list[str], meter: LLMCallMeter, errors: list[str]):
+        last_exc: Exception | None = None
+        for attempt, model in enumerate(candidates):
+            self.last_model = model
+            if attempt:
+                meter.retry(model)
+            try:
+                meter.throttle(prompt)
+                result = self.runner(
+                    self._build_agent(model),
+                    prompt,
+                    run_config=self.config.build_run_config(
+                        workflow_name="AutoHHKek OpenRouter vacancy review",
+                        model=model,
+                    ),
+                )
+                return result, None
+            except LLMCallCancelled as exc:
+                errors.append(f"{model}: {exc}")
+                return None, exc
+            except Exception as exc:  # noqa: BLE001
+                last_exc = exc
+                errors.append(f"{model}: {exc}")
+                if attempt + 1 < len(candidates):
+                    # The meter only reports the final model, so earlier fallbacks feed the router here.
+                    LLM_ROUTER.record_failure("openrouter", model, error_class=type(exc).__name__)
+        return None, last_exc
+
+    def _review_hedged(self, prompt: str, candidates: list[str], meter: LLMCallMeter, errors: list[str]):
+        history = self._observed_latencies_ms()
+        if len(history) >= HEDGE_MIN_SAMPLES:
+            delay_sec = max(HEDGE_MIN_DELAY_SEC, percentile(history, 0.90) / 1000)
+        else:
+            delay_sec = max(HEDGE_MIN_DELAY_SEC, float(self.config.timeout_sec) / 2)
+        meter.throttle(prompt)
+        try:
+            result = LLM_CLIENT_POOL.run_coroutine(
+                lambda: self._hedged_attempts(prompt, candidates, meter, errors, delay_sec),
+                timeout=self.review_timeout_sec,
+            )
+        except (TimeoutError, LLMCallCancelled) as exc:
+            errors.append(f"{self.last_model}: {exc}")
+            return None, exc
+        if result[0] is not None and meter.hedge_won:
+            # The cancelled primary's real latency is unknown; estimate it from the observed tail beyond the hedge delay.
+            tail = [value for value in history if value > delay_sec * 1000]
+            estimate = statistics.median(tail) if tail else self.review_timeout_sec * 1000
+            meter.unhedged_latency_ms = round(max(estimate, (time.perf_counter() - meter.started) * 1000), 1)
+        return result
+
+    async def _hedged_attempts(self, prompt: str, candidates: list[str], meter: LLMCallMeter, errors: list[str], delay_sec: float):
+        """Try ``candidates`` in order like ``_review_sequential``; once, the next one may start early as a hedge.
+
+        A hedge always goes to a different model: with a single candidate nothing is hedged.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        fallbacks = list(candidates[1:])
+        tasks: dict[asyncio.Future, str] = {}
+
+        def _launch(model: str) -> asyncio.Future:
+            task = asyncio.ensure_future(self._attempt_async(model, prompt))
+            tasks[task] = model
+            return task
+
+        pending: set[asyncio.Future] = {_launch(candidates[0])}
+        hedge_task: asyncio.Future | None = None
+        timer_active = bool(fallbacks)
+        last_exc: Exception | None = None
+        empty_result = None
+        try:
+            while pending:
+                timeout = max(0.0, delay_sec - (loop.time() - started)) if timer_active else None
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    model = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as exc:  # noqa: BLE001
+                        last_exc = exc
+                        errors.append(f"{model}: {exc}")
+                        if pending or fallbacks:
+                            # The meter only reports the final model, so earlier failures feed the router here.
+                            LLM_ROUTER.record_failure("openrouter", model, error_class=type(exc).__name__)
+                        continue
+                    if getattr(result, "final_output", None) is None:
+                        errors.append(f"{model}: missing final_output")
+                        empty_result = result
+                        continue
+                    self.last_model = meter.model = model
+                    if task is hedge_task:
+                        meter.hedge_won = True
+                        self.hedge_stats["hedge_wins"] += 1
+                    return result, None
+                if not pending and fallbacks:
+                    # Everything in flight failed: plain sequential fallback to the next model.
+                    timer_active = False
+                    model = fallbacks.pop(0)
+                    await asyncio.to_thread(meter.throttle, prompt)
+                    meter.retry(model)
+                    self.last_model = model
+                    pending.add(_launch(model))
+                elif pending and not done and timer_active:
+                    timer_active = False
+                    if self.hedge_stats["hedged"] + 1 > self.config.hedge_budget * self.hedge_stats["reviews"]:
+                        self.hedge_stats["budget_skips"] += 1
+                        continue
+                    await asyncio.to_thread(meter.throttle, prompt, exclude_from_latency=False)
+                    meter.hedged = True
+                    self.hedge_stats["hedged"] += 1
+                    hedge_task = _launch(fallbacks.pop(0))
+                    pending.add(hedge_task)
+            return empty_result, last_exc
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _attempt_async(self, model: str, prompt: str):
+        agent = self._build_agent(model)
+        run_config = self.config.build_run_config(workflow_name="AutoHHKek OpenRouter vacancy review", model=model)
+        if self._native_runner:
+            from agents import Runner
+
+            return await Runner.run(agent, prompt, run_config=run_config)
+        return await asyncio.to_thread(self.runner, agent, prompt, run_config=run_config)
+
+    def _observed_latencies_ms(self) -> list[float]:
+        records = [
+            item
+            for item in LLM_USAGE.records(component="vacancy_review")
+            if item.backend == "openrouter" and item.model == self.config.model and item.status == "ok" and not item.hedge_won
+        ]
+        return [item.latency_ms for item in records[-HEDGE_HISTORY_SIZE:]]
+
     def _candidate_models(self) -> list[str]:
+        if self.tier == ESCALATION_TIER:
+            # Falling back to a weaker model would defeat the escalation; the triage verdict stands instead.
+            return [self.config.model]
         candidates = [self.config.model, "openai/gpt-4o-mini"]
         unique: list[str] = []
         for model in candidates:
             value = str(model or "").strip()
             if value and value not in unique:
                 unique.append(value)
-        return unique
+        return unique[:1] + [model for model in unique[1:] if LLM_ROUTER.is_available("openrouter", model)]
 
     def _build_agent(self, model: str):
+        return LLM_CLIENT_POOL.agent(
+            ("AutoHHKek OpenRouter Vacancy Reviewer", model, VacancyReviewOutput),
+            lambda: self._create_agent(model),
+        )
+
+    def _create_agent(self, model: str):
         from agents import Agent
 
         return Agent(
@@ -98,20 +259,20 @@ class OpenRouterVacancyReviewer:
                 "Возвращай только структурированный ответ. "
                 "Пиши только на русском языке. "
                 "Классифицируй вакансии в fit, doubt или no_fit. "
-                "Объясняй решение кратко и по делу, оценки держи в диапазоне от 0 до 100, причины делай короткими и машиночитаемыми."
+                "Объясняй решение кратко и по делу, оценки держи в диапазоне от 0 до 100, причины делай короткими и машиночитаемыми. "
+                "В поле confidence укажи уверенность в выбранной категории от 0 до 1."
             ),
             output_type=VacancyReviewOutput,
         )
 
     def _build_prompt(
         self,
-        vacancy: Vacancy,
+        vacancy: CompactVacancy,
         preferences: UserPreferences,
         anamnesis: Anamnesis,
     ) -> str:
         payload = {
-            "vacancy": vacancy.to_dict(),
-            "vacancy_searchable_text": vacancy.searchable_text(),
+            "vacancy": vacancy.payload,
             "preferences": preferences.to_dict(),
             "anamnesis": anamnesis.to_dict(),
         }
@@ -123,14 +284,10 @@ class OpenRouterVacancyReviewer:
         )
 
     def _run_sync(self, agent, prompt: str, run_config=None):
-        from agents import Runner
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(Runner.run_sync, agent, prompt, run_config=run_config)
-            try:
-                return future.result(timeout=self.review_timeout_sec)
-            except FutureTimeoutError as exc:
-                future.cancel()
-                raise TimeoutError(f"OpenRouter review timed out after {self.review_timeout_sec:.0f}s") from exc
+        try:
+            return LLM_CLIENT_POOL.run_agent(agent, prompt, run_config=run_config, timeout=self.review_timeout_sec)
+        except TimeoutError as exc:
+            raise TimeoutError(f"OpenRouter review timed out after {self.review_timeout_sec:.0f}s") from exc
 
     def _to_assessment(self, vacancy: Vacancy, output: VacancyReviewOutput) -> VacancyAssessment:
         category = _coerce_category(output.category)
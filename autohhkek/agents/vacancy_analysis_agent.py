@@ -1,28 +1,159 @@
 from __future__ import annotations
 
+import asyncio
 from collections import Counter
+from collections.abc import Callable
 import hashlib
+import threading
 
 from autohhkek.domain.enums import FitCategory
 from autohhkek.domain.models import RunSummary, Vacancy, VacancyAssessment
 from autohhkek.services.filter_planner import HHFilterPlanner
 from autohhkek.services.hh_refresh import HHVacancyRefresher
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+from autohhkek.services.llm_rate_limit import LLM_RATE_LIMITER
+from autohhkek.services.llm_router import LLM_ROUTER
 from autohhkek.services.llm_runtime import LLMRuntime
+from autohhkek.services.llm_usage import LLM_USAGE, format_llm_usage_note, record_cache_hit, summarize_llm_calls
+from autohhkek.services.local_classifier import LocalReviewerModel
 from autohhkek.services.profile_rules import compose_rules_markdown
+from autohhkek.services.refresh_pipeline import PipelineConfig, PipelineStage
+from autohhkek.services.review_ensemble import format_ensemble_stats_note
+from autohhkek.services.review_escalation import format_escalation_note, summarize_escalations
 from autohhkek.services.seed import import_legacy_vacancies
 from autohhkek.services.storage import WorkspaceStore, _vacancy_signature, build_vacancy_snapshot_hash
+from autohhkek.services.vacancy_clusters import VacancyClusterIndex, annotate_vacancy_clusters, propagate_verdict
 
+from .local_review_agent import LocalVacancyReviewer
 from .vacancy_review_agent import VacancyReviewAgent
 
 
+class _ReviewPass:
+    """Verdict source for one analysis run: the previous assessment, a cluster verdict or a fresh review.
+
+    ``assess`` may be called from several worker threads: each call checks out a
+    ``VacancyReviewAgent`` of its own (they keep per-call state such as the triage tier and
+    last status), and the counters and the cluster index sit behind one lock.
+    """
+
+    def __init__(
+        self,
+        reviewer_factory: Callable[[], VacancyReviewAgent],
+        cluster_index: VacancyClusterIndex,
+        *,
+        rules_hash: str,
+        backend: str,
+        previous_vacancies: dict[str, Vacancy],
+        previous_assessments: dict[str, VacancyAssessment],
+    ) -> None:
+        self.reviewer_factory = reviewer_factory
+        self.cluster_index = cluster_index
+        self.rules_hash = rules_hash
+        self.backend = backend
+        self.previous_vacancies = previous_vacancies
+        self.previous_assessments = previous_assessments
+        self.reused = 0
+        self.propagated = 0
+        self.reviewers: list[VacancyReviewAgent] = []
+        self._idle: list[VacancyReviewAgent] = []
+        self._lock = threading.Lock()
+
+    @property
+    def reviewer(self) -> VacancyReviewAgent:
+        """The first reviewer, for settings shared by all of them (rule weights)."""
+        with self._lock:
+            if not self.reviewers:
+                self.reviewers.append(self.reviewer_factory())
+                self._idle.append(self.reviewers[0])
+            return self.reviewers[0]
+
+    @property
+    def escalations(self) -> list[dict[str, object]]:
+        return [item for reviewer in self.reviewers for item in getattr(reviewer, "escalations", [])]
+
+    @property
+    def ensemble_stats(self) -> dict[str, int]:
+        total: Counter[str] = Counter()
+        for reviewer in self.reviewers:
+            total.update(getattr(reviewer, "ensemble_stats", {}))
+        return dict(total)
+
+    def assign(self, vacancies: list[Vacancy]) -> dict[str, str]:
+        with self._lock:
+            return self.cluster_index.assign(vacancies)
+
+    def assess(self, vacancy: Vacancy, representative: str) -> VacancyAssessment:
+        previous_vacancy = self.previous_vacancies.get(vacancy.vacancy_id)
+        previous_assessment = self.previous_assessments.get(vacancy.vacancy_id)
+        with self._lock:
+            cluster_verdict = None
+            if representative != vacancy.vacancy_id:
+                cluster_verdict = self.cluster_index.verdict_for(representative, rules_hash=self.rules_hash)
+        reviewed = False
+        if previous_vacancy and previous_assessment and _vacancy_signature(previous_vacancy) == _vacancy_signature(vacancy):
+            assessment = previous_assessment
+            with self._lock:
+                self.reused += 1
+            record_cache_hit("vacancy_review", backend=self.backend, vacancy_id=vacancy.vacancy_id)
+        elif cluster_verdict is not None:
+            assessment = propagate_verdict(cluster_verdict, vacancy.vacancy_id, representative)
+            with self._lock:
+                self.propagated += 1
+            record_cache_hit("vacancy_review", backend=self.backend, vacancy_id=vacancy.vacancy_id)
+        else:
+            reviewer = self._checkout()
+            try:
+                if vacancy.meta.get("prescore_blocked"):
+                    # Hard-blocked on the SERP card already: the rules decide, no LLM call is spent.
+                    assessment = reviewer.rule_engine.assess(vacancy)
+                    assessment.review_strategy = "rule_hard_block"
+                else:
+                    assessment = reviewer.review(vacancy)
+                    reviewed = True
+            finally:
+                with self._lock:
+                    self._idle.append(reviewer)
+        # A fresh review of the representative replaces its verdict; anything else only fills a gap.
+        with self._lock:
+            if assessment.review_strategy not in {"rule_based_fallback", "rule_hard_block"} and (
+                (reviewed and representative == vacancy.vacancy_id)
+                or self.cluster_index.verdict_for(representative, rules_hash=self.rules_hash) is None
+            ):
+                self.cluster_index.remember_verdict(representative, assessment, rules_hash=self.rules_hash)
+        return assessment
+
+    def _checkout(self) -> VacancyReviewAgent:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        reviewer = self.reviewer_factory()
+        with self._lock:
+            self.reviewers.append(reviewer)
+        return reviewer
+
+
 class VacancyAnalysisAgent:
-    def __init__(self, store: WorkspaceStore, vacancy_refresher: HHVacancyRefresher | None = None) -> None:
+    def __init__(
+        self,
+        store: WorkspaceStore,
+        vacancy_refresher: HHVacancyRefresher | None = None,
+        pipeline_config: PipelineConfig | None = None,
+    ) -> None:
         self.store = store
         self.vacancy_refresher = vacancy_refresher or HHVacancyRefresher(store)
+        self.pipeline_config = pipeline_config or PipelineConfig.from_env()
 
-    def ensure_vacancies(self, limit: int = 150, *, refresh: bool = True) -> tuple[list[Vacancy], dict[str, object]]:
+    def ensure_vacancies(
+        self,
+        limit: int = 150,
+        *,
+        refresh: bool = True,
+        downstream: list[PipelineStage] | None = None,
+    ) -> tuple[list[Vacancy], dict[str, object]]:
         refresh_result = {"status": "skipped", "reason": "refresh_disabled", "message": "Live refresh disabled."}
-        if refresh:
+        if refresh and downstream is not None:
+            refresh_result = self.vacancy_refresher.refresh(limit=limit, downstream=downstream)
+        elif refresh:
             refresh_result = self.vacancy_refresher.refresh(limit=limit)
         vacancies = self.store.load_vacancies()
         if vacancies or refresh_result.get("status") in {"updated", "empty"}:
@@ -47,56 +178,106 @@ class VacancyAnalysisAgent:
 
         rules_markdown = compose_rules_markdown(self.store, preferences, anamnesis)
         self.store.save_selection_rules(rules_markdown)
+        rules_hash = hashlib.sha1(rules_markdown.encode("utf-8")).hexdigest()
 
+        run_id = self.store.build_run_id("analyze")
+        LLM_ROUTER.restore(self.store.load_llm_router_state())
         llm_runtime = LLMRuntime(runtime_settings)
         effective_backend = llm_runtime.effective_backend()
         previous_vacancies = {item.vacancy_id: item for item in self.store.load_vacancies()}
         previous_assessments = {item.vacancy_id: item for item in self.store.load_assessments()}
-        vacancies, refresh_result = self.ensure_vacancies(limit=0, refresh=True)
-        vacancies = vacancies[:limit]
-
-        reviewer = VacancyReviewAgent(preferences, anamnesis, llm_backend=effective_backend)
-        assessments: list[VacancyAssessment] = []
-        reused_assessments = 0
-        total_to_review = len(vacancies)
-        if progress_callback:
-            progress_callback(done=0, total=total_to_review, title="", strategy="starting")
-        for index, vacancy in enumerate(vacancies, start=1):
-            previous_vacancy = previous_vacancies.get(vacancy.vacancy_id)
-            previous_assessment = previous_assessments.get(vacancy.vacancy_id)
-            if previous_vacancy and previous_assessment and _vacancy_signature(previous_vacancy) == _vacancy_signature(vacancy):
-                assessments.append(previous_assessment)
-                reused_assessments += 1
-            else:
-                assessments.append(reviewer.review(vacancy))
-            if index == total_to_review or index % 5 == 0:
-                self.store.save_assessments(assessments)
-            if progress_callback:
-                progress_callback(
-                    done=index,
-                    total=total_to_review,
-                    title=vacancy.title,
-                    strategy=getattr(assessments[-1], "review_strategy", ""),
-                )
-        self.store.save_assessments(assessments)
-
-        filter_plan = HHFilterPlanner(
-            preferences,
-            anamnesis,
-            selected_resume_id=self.store.load_selected_resume_id(),
-            llm_backend=effective_backend,
-        ).build()
+        local_model = LocalReviewerModel.load(self.store.paths.local_reviewer_model_path)
+        rule_weights = self.store.load_rule_weights()
+
+        def _new_reviewer() -> VacancyReviewAgent:
+            return VacancyReviewAgent(
+                preferences,
+                anamnesis,
+                llm_backend=effective_backend,
+                llm_runtime=llm_runtime,
+                local_reviewer=LocalVacancyReviewer.from_env(local_model),
+                rule_weights=rule_weights,
+            )
+
+        cluster_index = VacancyClusterIndex.load(self.store.paths.vacancy_clusters_path) or VacancyClusterIndex()
+        review_pass = _ReviewPass(
+            _new_reviewer,
+            cluster_index,
+            rules_hash=rules_hash,
+            backend=effective_backend,
+            previous_vacancies=previous_vacancies,
+            previous_assessments=previous_assessments,
+        )
+        streamed: dict[str, VacancyAssessment] = {}
+        streaming = self.pipeline_config.enabled and bool(getattr(self.vacancy_refresher, "can_stream", False))
+        with LLM_USAGE.scope(run_id):
+            downstream = self._review_stages(review_pass, streamed, limit, progress_callback) if streaming else None
+            vacancies, refresh_result = self.ensure_vacancies(limit=0, refresh=True, downstream=downstream)
+            clusters = cluster_index.assign(vacancies)
+            cluster_meta_before = [dict(item.meta) for item in vacancies]
+            near_duplicate_count = annotate_vacancy_clusters(vacancies, clusters)
+            if any(before != item.meta for before, item in zip(cluster_meta_before, vacancies)):
+                self.store.save_vacancies(vacancies)
+            if streamed:
+                # The streamed admission set is the slice; vacancies it did not reach fill the remainder.
+                vacancies = [item for item in vacancies if item.vacancy_id in streamed] + [
+                    item for item in vacancies if item.vacancy_id not in streamed
+                ]
+            vacancies = vacancies[:limit]
+
+            assessments: list[VacancyAssessment] = []
+            total_to_review = len(vacancies)
+            if progress_callback and not streamed:
+                progress_callback(done=0, total=total_to_review, title="", strategy="starting")
+            # A streaming run has reviewed what it saw; this pass covers vacancies carried over from earlier runs.
+            for index, vacancy in enumerate(vacancies, start=1):
+                assessment = streamed.get(vacancy.vacancy_id)
+                if assessment is None:
+                    assessment = review_pass.assess(vacancy, clusters.get(vacancy.vacancy_id, vacancy.vacancy_id))
+                assessments.append(assessment)
+                if index == total_to_review or index % 5 == 0:
+                    # Keep the streamed verdicts on disk while the pass is still short of them.
+                    self.store.save_assessments(list({**streamed, **{item.vacancy_id: item for item in assessments}}.values()))
+                if progress_callback:
+                    progress_callback(
+                        done=index,
+                        total=total_to_review,
+                        title=vacancy.title,
+                        strategy=getattr(assessments[-1], "review_strategy", ""),
+                    )
+            self.store.save_assessments(list({**streamed, **{item.vacancy_id: item for item in assessments}}.values()))
+            cluster_index.save(self.store.paths.vacancy_clusters_path)
+
+            filter_plan = HHFilterPlanner(
+                preferences,
+                anamnesis,
+                selected_resume_id=self.store.load_selected_resume_id(),
+                llm_backend=effective_backend,
+            ).build()
         self.store.save_filter_plan(filter_plan)
         vacancy_hash = build_vacancy_snapshot_hash(vacancies)
         review_strategy_counts = Counter(item.review_strategy for item in assessments)
         llm_reviewed_count = sum(
-            count for strategy, count in review_strategy_counts.items() if strategy and strategy != "rule_based_fallback"
+            count
+            for strategy, count in review_strategy_counts.items()
+            if strategy and strategy not in {"rule_based_fallback", "rule_hard_block", "local_classifier"}
         )
+        llm_calls = LLM_USAGE.records(scope=run_id)
+        llm_usage = summarize_llm_calls(llm_calls, vacancy_count=len(vacancies), dropped=LLM_USAGE.dropped(run_id))
+        escalations = review_pass.escalations
+        for item in escalations:
+            self.store.append_review_escalation({**item, "run_id": run_id})
+        escalation_summary = summarize_escalations(escalations, reviewed_count=llm_reviewed_count)
+        reused_assessments = review_pass.reused
+        cluster_propagated = review_pass.propagated
+        ensemble_stats = review_pass.ensemble_stats
+        router_state = LLM_ROUTER.to_dict()
+        self.store.save_llm_router_state(router_state)
         analysis_state = {
             "run_id": "",
             "assessed_at": "",
             "rules_rebuilt_at": "",
-            "rules_hash": hashlib.sha1(rules_markdown.encode("utf-8")).hexdigest(),
+            "rules_hash": rules_hash,
             "rules_preview": rules_markdown[:1500],
             "vacancy_snapshot_hash": vacancy_hash,
             "vacancy_count": len(vacancies),
@@ -111,7 +292,19 @@ class VacancyAnalysisAgent:
             "review_strategy_counts": dict(review_strategy_counts),
             "llm_reviewed_count": llm_reviewed_count,
             "rule_fallback_count": review_strategy_counts.get("rule_based_fallback", 0),
+            "local_reviewed_count": review_strategy_counts.get("local_classifier", 0),
+            "rule_weights_version": review_pass.reviewer.rule_engine.weights.version,
             "reused_assessment_count": reused_assessments,
+            "near_duplicate_count": near_duplicate_count,
+            "cluster_propagated_count": cluster_propagated,
+            "streamed_assessment_count": len(streamed),
+            "pipeline": refresh_result.get("pipeline") or [],
+            "escalation": escalation_summary,
+            "ensemble": ensemble_stats,
+            "llm_usage": llm_usage,
+            "backend_health": router_state["items"],
+            "llm_client_pool": LLM_CLIENT_POOL.stats(),
+            "llm_rate_limits": LLM_RATE_LIMITER.stats(),
             "stale": False,
             "stale_reason": "",
         }
@@ -122,7 +315,7 @@ class VacancyAnalysisAgent:
             FitCategory.NO_FIT.value: sum(1 for item in assessments if item.category == FitCategory.NO_FIT),
         }
         run = RunSummary(
-            run_id=self.store.build_run_id("analyze"),
+            run_id=run_id,
             mode="analyze",
             status="completed",
             processed=len(assessments),
@@ -133,10 +326,15 @@ class VacancyAnalysisAgent:
                 f"Источник вакансий: {refresh_result.get('message') or refresh_result.get('reason') or 'unknown'}",
                 f"LLM backend: requested {runtime_settings.llm_backend}, effective {effective_backend}.",
                 "Для каждой вакансии сохранены категория и причины.",
+                f"Почти-дубликатов в очереди: {near_duplicate_count}, оценок перенесено внутри кластеров: {cluster_propagated}.",
+                *filter(None, [format_escalation_note(escalation_summary), format_ensemble_stats_note(ensemble_stats)]),
+                format_llm_usage_note(llm_usage),
             ],
+            metrics={"llm_usage": llm_usage},
         )
         run.finished_at = run.started_at
         self.store.save_run(run)
+        self.store.save_run_llm_calls(run.run_id, [item.to_dict() for item in llm_calls])
         analysis_state["run_id"] = run.run_id
         analysis_state["assessed_at"] = run.finished_at
         analysis_state["rules_rebuilt_at"] = run.finished_at
@@ -145,8 +343,62 @@ class VacancyAnalysisAgent:
         self.store.record_event(
             "analysis",
             f"Проанализировано {len(assessments)} вакансий.",
-            details={**counts, "refresh": refresh_result, "effective_backend": effective_backend},
+            details={**counts, "refresh": refresh_result, "effective_backend": effective_backend, "llm_usage": llm_usage},
             run_id=run.run_id,
         )
         self.store.record_event("filters", "Построен script-first план фильтров hh.ru.", details=filter_plan, run_id=run.run_id)
         return run, assessments
+
+    def _review_stages(
+        self,
+        review_pass: _ReviewPass,
+        streamed: dict[str, VacancyAssessment],
+        limit: int,
+        progress_callback=None,
+    ) -> list[PipelineStage]:
+        """``review`` and ``persist`` stages appended to the live refresh pipeline.
+
+        Reviews run in worker threads so the browser loop keeps fetching details meanwhile. The
+        refresh streams cards in global prescore order, so admitting the first ``limit``
+        arrivals keeps the best-first budget; hard-blocked cards pass through without taking a
+        slot and later get a rule verdict. Partial queues and assessments are saved as they
+        come so the dashboard fills up during the run.
+        """
+        usage_scope = LLM_USAGE.current_scope()
+        stored = self.store.load_vacancies()
+        stored_assessments = {item.vacancy_id: item for item in self.store.load_assessments()}
+        arrived: list[Vacancy] = []
+        admitted: set[str] = set()
+
+        async def _review(vacancy: Vacancy):
+            if len(admitted) >= limit or vacancy.vacancy_id in admitted or vacancy.meta.get("prescore_blocked"):
+                return [(vacancy, None)]
+            admitted.add(vacancy.vacancy_id)
+            representative = review_pass.assign([vacancy])[vacancy.vacancy_id]
+
+            def _call() -> VacancyAssessment:
+                with LLM_USAGE.scope(usage_scope):
+                    return review_pass.assess(vacancy, representative)
+
+            return [(vacancy, await asyncio.to_thread(_call))]
+
+        async def _persist(reviewed: tuple[Vacancy, VacancyAssessment | None]):
+            vacancy, assessment = reviewed
+            arrived.append(vacancy)
+            if assessment is None:
+                return None
+            streamed[vacancy.vacancy_id] = assessment
+            done = len(streamed)
+            if done == 1 or done % 5 == 0:
+                arrived_ids = {item.vacancy_id for item in arrived}
+                self.store.save_vacancies(arrived + [item for item in stored if item.vacancy_id not in arrived_ids])
+                # Verdicts from earlier runs stay on disk until this run replaces them.
+                self.store.save_assessments(list({**stored_assessments, **streamed}.values()))
+            if progress_callback:
+                progress_callback(done=done, total=len(admitted), title=vacancy.title, strategy=assessment.review_strategy)
+            return None
+
+        return [
+            PipelineStage("review", _review, workers=self.pipeline_config.review_workers),
+            PipelineStage("persist", _persist),
+        ]
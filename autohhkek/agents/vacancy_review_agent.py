@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import time
+from collections import Counter
+from typing import Any
+
+from autohhkek.domain.enums import FitCategory
 from autohhkek.domain.models import Anamnesis, RuntimeSettings, Vacancy, VacancyAssessment
-from autohhkek.services.analysis import VacancyRuleEngine
+from autohhkek.services.analysis import RuleWeights, VacancyRuleEngine
+from autohhkek.services.llm_router import LLM_ROUTER, LLMBackendRouter
+from autohhkek.services.llm_runtime import LLMRuntime
+from autohhkek.services.review_ensemble import format_ensemble_note, run_ensemble
+from autohhkek.services.review_escalation import ESCALATION_TIER, TRIAGE_TIER, EscalationPolicy, escalation_record
+from autohhkek.services.runtime_settings import ENSEMBLE_RULES_MEMBER, normalize_review_ensemble
 
 from .g4f_review_agent import G4FVacancyReviewer
-from .openai_review_agent import OpenAIVacancyReviewer
+from .local_llm_review_agent import LocalLLMVacancyReviewer
+from .local_review_agent import LocalVacancyReviewer
+from .openai_review_agent import OpenAIVacancyReviewer, _default_action
 from .openrouter_review_agent import OpenRouterVacancyReviewer
 
 
@@ -18,38 +30,188 @@ class VacancyReviewAgent:
         openai_reviewer: OpenAIVacancyReviewer | None = None,
         openrouter_reviewer: OpenRouterVacancyReviewer | None = None,
         g4f_reviewer: G4FVacancyReviewer | None = None,
+        llm_runtime: LLMRuntime | None = None,
+        router: LLMBackendRouter | None = None,
+        local_reviewer: LocalVacancyReviewer | None = None,
+        local_llm_reviewer: LocalLLMVacancyReviewer | None = None,
+        rule_weights: RuleWeights | None = None,
     ) -> None:
         self.preferences = preferences
         self.anamnesis = anamnesis
         self.runtime_settings = runtime_settings or RuntimeSettings(llm_backend=llm_backend or "openrouter")
-        self.rule_engine = VacancyRuleEngine(preferences, anamnesis)
+        self.rule_engine = VacancyRuleEngine(preferences, anamnesis, rule_weights)
         self.openai_reviewer = openai_reviewer or OpenAIVacancyReviewer()
         self.openrouter_reviewer = openrouter_reviewer or OpenRouterVacancyReviewer()
         self.g4f_reviewer = g4f_reviewer or G4FVacancyReviewer()
+        self.local_llm_reviewer = local_llm_reviewer or LocalLLMVacancyReviewer(getattr(llm_runtime, "local", None))
+        self.llm_runtime = llm_runtime
+        self.router = router or LLM_ROUTER
+        self.local_reviewer = local_reviewer
+        settings = getattr(llm_runtime, "settings", None) or self.runtime_settings.to_dict()
+        self.escalation_policy = EscalationPolicy.from_settings(settings, self.rule_engine.weights)
+        self.escalations: list[dict[str, Any]] = []
+        self._escalation_reviewers: dict[tuple[str, str], Any] = {}
+        self.ensemble_members = normalize_review_ensemble(settings.get("review_ensemble"))
+        self.ensemble_stats: Counter[str] = Counter()
+        self._ensemble_reviewers: dict[str, Any] = {}
 
-    def review(self, vacancy: Vacancy) -> VacancyAssessment:
-        backend = self.runtime_settings.llm_backend
+    def _reviewer_for(self, backend: str):
+        if backend == "local":
+            return self.local_llm_reviewer
         if backend == "g4f":
-            reviewer = self.g4f_reviewer
-        elif backend == "openrouter":
-            reviewer = self.openrouter_reviewer
-        else:
-            reviewer = self.openai_reviewer
+            return self.g4f_reviewer
+        if backend == "openrouter":
+            return self.openrouter_reviewer
+        return self.openai_reviewer
+
+    def _backend_candidates(self) -> list[str]:
+        # With a runtime the whole ready fallback chain is routable, so traffic can move
+        # to the next healthy backend mid-run; without one only the requested backend is.
+        primary = self.runtime_settings.llm_backend
+        if self.llm_runtime is None:
+            return [primary]
+        ready = self.llm_runtime.backend_order()
+        return [primary, *[item for item in ready if item != primary]]
+
+    def review(self, vacancy: Vacancy) -> VacancyAssessment:
+        if self.local_reviewer is not None:
+            assessment = self.local_reviewer.review(vacancy)
+            if assessment is not None:
+                return assessment
+        if self.ensemble_members:
+            return self._review_ensemble(vacancy)
+
+        candidates = [
+            (backend, _reviewer_model(self._reviewer_for(backend)))
+            for backend in self._backend_candidates()
+        ]
+        route = self.router.choose(candidates)
+        if route is None:
+            assessment = self.rule_engine.assess(vacancy)
+            assessment.review_strategy = "rule_based_fallback"
+            assessment.review_notes = (
+                f"LLM-бэкенды ({', '.join(backend for backend, _ in candidates)}) временно отключены после серии ошибок. "
+                "Использованы детерминированные правила."
+            )
+            return assessment
+
+        backend = route[0]
+        reviewer = self._reviewer_for(backend)
+        triage_model = _reviewer_model(reviewer)
+        escalation_model = self.escalation_policy.model_for(backend, triage_model)
+        if escalation_model:
+            reviewer.tier = TRIAGE_TIER
         assessment = reviewer.review(vacancy, self.preferences, self.anamnesis)
         if assessment is not None:
+            if escalation_model:
+                return self._escalate(vacancy, backend, reviewer, assessment, triage_model, escalation_model)
             return assessment
 
+        return self._rule_fallback(vacancy, backend, reviewer)
+
+    def _rule_fallback(self, vacancy: Vacancy, backend: str, reviewer: Any) -> VacancyAssessment:
         assessment = self.rule_engine.assess(vacancy)
         assessment.review_strategy = "rule_based_fallback"
         last_status = getattr(reviewer, "last_status", "unknown")
         last_error = getattr(reviewer, "last_error", "")
         if last_status == "unavailable":
-            assessment.review_notes = f"LLM-проверка через {self.runtime_settings.llm_backend} недоступна. Использованы детерминированные правила."
+            assessment.review_notes = f"LLM-проверка через {backend} недоступна. Использованы детерминированные правила."
         elif last_status == "error":
             assessment.review_notes = (
-                f"LLM-проверка через {self.runtime_settings.llm_backend} завершилась ошибкой, поэтому использованы детерминированные правила. "
+                f"LLM-проверка через {backend} завершилась ошибкой, поэтому использованы детерминированные правила. "
                 f"Последняя ошибка: {last_error}"
             )
         else:
             assessment.review_notes = "Использованы детерминированные правила как стабильный fallback."
         return assessment
+
+    def _ensemble_member(self, spec: str):
+        backend, _, model = spec.partition(":")
+        if backend == ENSEMBLE_RULES_MEMBER:
+            return self.rule_engine.assess
+        reviewer = self._reviewer_for(backend)
+        if model and model != _reviewer_model(reviewer) and hasattr(reviewer, "with_model"):
+            if spec not in self._ensemble_reviewers:
+                self._ensemble_reviewers[spec] = reviewer.with_model(model, tier="")
+            reviewer = self._ensemble_reviewers[spec]
+        if not self.router.is_available(backend, _reviewer_model(reviewer)):
+            return None
+        return lambda vacancy: reviewer.review(vacancy, self.preferences, self.anamnesis)
+
+    def _review_ensemble(self, vacancy: Vacancy) -> VacancyAssessment:
+        started = time.perf_counter()
+        votes, category = run_ensemble(vacancy, [(spec, self._ensemble_member(spec)) for spec in self.ensemble_members])
+        note = format_ensemble_note(votes, category, (time.perf_counter() - started) * 1000)
+        self.ensemble_stats["reviews"] += 1
+        self.ensemble_stats["cancelled_calls"] += sum(1 for vote in votes if vote.status == "cancelled")
+        # Prefer an LLM verdict as the carrier: its explanation and reasons are richer than the rule engine's.
+        answered = sorted((vote for vote in votes if vote.assessment is not None), key=lambda vote: vote.member == ENSEMBLE_RULES_MEMBER)
+        if category:
+            self.ensemble_stats["agreements"] += 1
+            self.ensemble_stats["early_exits"] += int(any(vote.status == "cancelled" for vote in votes))
+            source = next(vote.assessment for vote in answered if vote.assessment.category.value == category)
+            assessment = VacancyAssessment.from_dict(source.to_dict())
+        elif not any(vote.member != ENSEMBLE_RULES_MEMBER for vote in answered):
+            self.ensemble_stats["fallbacks"] += 1
+            backend = next(spec for spec in self.ensemble_members if spec != ENSEMBLE_RULES_MEMBER).partition(":")[0]
+            assessment = self._rule_fallback(vacancy, backend, self._reviewer_for(backend))
+            assessment.review_notes = f"{note} {assessment.review_notes}"
+            return assessment
+        else:
+            self.ensemble_stats["disagreements"] += 1
+            assessment = VacancyAssessment.from_dict(answered[0].assessment.to_dict())
+            assessment.category = FitCategory.DOUBT
+            assessment.subcategory = "ensemble_disagreement"
+            assessment.score = round(sum(vote.assessment.score for vote in answered) / len(answered), 1)
+            assessment.ready_for_apply = False
+            assessment.recommended_action = _default_action(FitCategory.DOUBT)
+            note = f"{note} Вакансия оставлена на ручную проверку."
+        assessment.review_strategy = "ensemble"
+        assessment.review_notes = f"{note} {assessment.review_notes}".strip()
+        return assessment
+
+    def _escalate(
+        self,
+        vacancy: Vacancy,
+        backend: str,
+        reviewer: Any,
+        triage: VacancyAssessment,
+        triage_model: str,
+        escalation_model: str,
+    ) -> VacancyAssessment:
+        triage_confidence = float(getattr(reviewer, "last_confidence", 1.0))
+        reason = self.escalation_policy.reason(triage, triage_confidence)
+        if not reason:
+            return triage
+        key = (backend, escalation_model)
+        if key not in self._escalation_reviewers:
+            self._escalation_reviewers[key] = reviewer.with_model(escalation_model, tier=ESCALATION_TIER)
+        strong = self._escalation_reviewers[key]
+        final = strong.review(vacancy, self.preferences, self.anamnesis)
+        self.escalations.append(
+            escalation_record(
+                vacancy.vacancy_id,
+                backend=backend,
+                reason=reason,
+                triage_model=triage_model,
+                triage=triage,
+                triage_confidence=triage_confidence,
+                escalation_model=escalation_model,
+                final=final,
+                final_confidence=getattr(strong, "last_confidence", None) if final is not None else None,
+            )
+        )
+        if final is None:
+            triage.review_notes = f"{triage.review_notes} Эскалация на {escalation_model} не удалась, оставлена оценка триажа.".strip()
+            return triage
+        final.review_notes = (
+            f"Перепроверено моделью {escalation_model} после триажа {triage_model} "
+            f"({triage.category.value}, {triage.score:.0f}, уверенность {triage_confidence:.0%}). {final.review_notes}"
+        ).strip()
+        return final
+
+
+def _reviewer_model(reviewer: Any) -> str:
+    if hasattr(reviewer, "model_name"):
+        return str(reviewer.model_name() or "")
+    return str(getattr(getattr(reviewer, "config", None), "model", "") or "")
@@ -14,8 +14,20 @@ from autohhkek.agents.vacancy_analysis_agent import VacancyAnalysisAgent
 from autohhkek.dashboard.server import start_dashboard_server
 from autohhkek.domain.enums import FitCategory
 from autohhkek.integrations.hh.runtime import HHAutomationRuntime
+from autohhkek.services.batch_review import (
+    FAILED_BATCH_STATUSES,
+    LocalBatchSubmitter,
+    OpenAIBatchSubmitter,
+    rule_engine_responder,
+    run_deferred_review,
+)
 from autohhkek.services.filter_planner import HHFilterPlanner
+from autohhkek.services.llm_runtime import LLMRuntime
+from autohhkek.services.llm_usage import format_llm_usage_note
+from autohhkek.services.local_classifier import train_local_reviewer
+from autohhkek.services.rule_calibration import calibrate_rule_weights
 from autohhkek.services.rule_loader import apply_rule_bundles, load_rule_bundle
+from autohhkek.services.rule_sweep import build_weight_grid, run_rule_sweep
 from autohhkek.services.rules import build_selection_rules_markdown
 from autohhkek.services.storage import WorkspaceStore
 
@@ -41,9 +53,28 @@ def build_parser() -> argparse.ArgumentParser:
     import_rules.add_argument("paths", nargs="+", help="Paths to markdown files.")
 
     analyze = subparsers.add_parser("analyze", help="Review vacancies without applying.")
-    analyze.add_argument("--limit", type=int, default=120)
+    analyze.add_argument("--limit", type=int, default=None, help="Vacancies to review (default 120; --deferred defaults to the whole cache).")
     analyze.add_argument("--no-interactive", action="store_true")
     analyze.add_argument("--rules-md", nargs="*", default=[], help="Extra markdown rule files to import before analysis.")
+    analyze.add_argument("--deferred", action="store_true", help="Submit or resume a batch review job instead of reviewing interactively.")
+    analyze.add_argument("--submitter", choices=["openai", "local"], default="openai", help="Batch backend for --deferred.")
+    analyze.add_argument("--wait", type=float, default=0.0, help="Seconds to keep polling a --deferred job before exiting.")
+    analyze.add_argument("--poll-interval", type=float, default=30.0)
+
+    train_local = subparsers.add_parser("train-local-reviewer", help="Train the local vacancy classifier from stored LLM assessments.")
+    train_local.add_argument("--account", default="", help="Account key to train for (defaults to the active account).")
+    train_local.add_argument("--threshold", type=float, default=None, help="Confidence needed to skip the LLM (default: calibrated).")
+    train_local.add_argument("--target-accuracy", type=float, default=0.9, help="Held-out accuracy the calibrated threshold must reach.")
+
+    calibrate = subparsers.add_parser("calibrate-rules", help="Fit rule weights and thresholds to manual fit/doubt/no_fit decisions.")
+    calibrate.add_argument("--account", default="", help="Account key to calibrate (defaults to the active account).")
+
+    sweep = subparsers.add_parser("sweep-rules", help="Show how weight/threshold settings would re-sort the cached vacancies.")
+    sweep.add_argument("--account", default="", help="Account key to sweep (defaults to the active account).")
+    sweep.add_argument("--fit-thresholds", default="", help="Comma-separated fit thresholds, for example 65,72,80.")
+    sweep.add_argument("--doubt-thresholds", default="", help="Comma-separated doubt thresholds, for example 40,45.")
+    sweep.add_argument("--weight", action="append", default=[], help="Feature values to try, for example salary_unknown=-4,-8,-12.")
+    sweep.add_argument("--as-json", action="store_true")
 
     filter_plan = subparsers.add_parser("plan-filters", help="Build hh.ru filter plan from current rules.")
     filter_plan.add_argument("--as-json", action="store_true")
@@ -145,6 +176,129 @@ def _print_analysis_summary(store: WorkspaceStore) -> None:
             print(f" - {title} | score={item.score:.1f} | {item.subcategory}")
             print(f"   {item.explanation}")
             print(f"   review_strategy={item.review_strategy}")
+    llm_usage = dict(store.load_analysis_state().get("llm_usage") or {})
+    if llm_usage:
+        print(f"\n{format_llm_usage_note(llm_usage)}")
+        for backend, stats in sorted(dict(llm_usage.get("by_backend") or {}).items()):
+            print(
+                f" - {backend}: calls={stats['calls']} p50={stats['latency_p50_ms']:.0f}ms "
+                f"p95={stats['latency_p95_ms']:.0f}ms tokens={stats['total_tokens']} cost_usd={stats['estimated_cost_usd']:.4f}"
+            )
+
+
+def _run_deferred_review(store: WorkspaceStore, *, submitter: str, limit: int, wait_sec: float, poll_interval_sec: float) -> None:
+    runtime = LLMRuntime(store.load_runtime_settings())
+    if submitter == "local":
+        preferences, anamnesis = store.load_preferences(), store.load_anamnesis()
+        batch_submitter = LocalBatchSubmitter(
+            store.paths.batch_reviews_dir / "local",
+            rule_engine_responder(preferences, anamnesis, store.load_vacancies()),
+        )
+    else:
+        if not runtime.openai.is_available():
+            raise RuntimeError("Deferred review needs OPENAI_API_KEY for the OpenAI Batch API.")
+        batch_submitter = OpenAIBatchSubmitter(runtime.openai)
+    job = run_deferred_review(
+        store,
+        batch_submitter,
+        model=runtime.openai.model,
+        limit=limit,
+        wait_sec=wait_sec,
+        poll_interval_sec=poll_interval_sec,
+    )
+    print(f"batch_job: {job['job_id']}")
+    print(f"batch_id: {job.get('batch_id', '')}")
+    print(f"status: {job['status']}")
+    print(f"requests: {job['request_count']}")
+    if job["status"] == "ingested":
+        print(f"ingested: {job['ingested_count']}")
+        print(f"errors: {len(job.get('errors') or {})}")
+        _print_analysis_summary(store)
+    elif job["status"] not in FAILED_BATCH_STATUSES:
+        print("Batch is still running; run `analyze --deferred` again to resume.")
+
+
+def _train_local_reviewer(store: WorkspaceStore, *, threshold: float | None, target_accuracy: float) -> None:
+    model = train_local_reviewer(
+        store.load_vacancies(),
+        store.load_assessments(),
+        threshold=threshold,
+        target_accuracy=target_accuracy,
+    )
+    model.save(store.paths.local_reviewer_model_path)
+    report = {**model.report, "trained_at": model.trained_at}
+    store.save_local_reviewer_report(report)
+    store.record_event("local_reviewer", "Trained local vacancy classifier.", details=report)
+    print("Local reviewer trained.")
+    print(f"model_path: {store.paths.local_reviewer_model_path}")
+    print(f"train_samples: {report['train_samples']}, holdout_samples: {report['holdout_samples']}")
+    print(f"class_counts: {report['class_counts']}")
+    print(f"holdout_accuracy: {report['holdout_accuracy']}")
+    print(f"expected_calibration_error: {report['expected_calibration_error']}")
+    print(f"threshold: {report['threshold']} (recommended: {report['recommended_threshold']})")
+    print("coverage:")
+    for item in report["coverage"]:
+        print(f" - confidence>={item['threshold']}: coverage={item['coverage']} accuracy={item['accuracy']}")
+
+
+def _calibrate_rules(store: WorkspaceStore) -> None:
+    preferences = store.load_preferences()
+    anamnesis = store.load_anamnesis()
+    if not preferences or not anamnesis:
+        raise RuntimeError("Rule calibration requires intake first.")
+    profile = calibrate_rule_weights(
+        preferences,
+        anamnesis,
+        store.load_vacancies(),
+        store.load_vacancy_feedback(),
+        current=store.load_rule_weights(),
+    )
+    profile = store.save_rule_weight_profile(profile)
+    store.record_event("rules", f"Calibrated rule weights v{profile['version']}.", details=profile)
+    print(f"rule_weights_version: {profile['version']} ({'active' if profile['activated'] else 'kept inactive'})")
+    print(f"samples: {profile['samples']} {profile['class_counts']}")
+    print(f"cv_accuracy: {profile['cv_accuracy']} vs current {profile['baseline_cv_accuracy']} ({profile['folds']} folds)")
+    print(f"thresholds: fit>={profile['fit_threshold']} doubt>={profile['doubt_threshold']}")
+    print("weights:")
+    for name, value in profile["weights"].items():
+        print(f" - {name}: {value:+.2f}")
+    print(f"profile_path: {store.paths.rule_weights_path}")
+
+
+def _parse_float_list(raw: str) -> list[float]:
+    return [float(item) for item in raw.split(",") if item.strip()]
+
+
+def _sweep_rules(store: WorkspaceStore, *, fit_thresholds: str, doubt_thresholds: str, weights: list[str], as_json: bool) -> None:
+    preferences = store.load_preferences()
+    anamnesis = store.load_anamnesis()
+    if not preferences or not anamnesis:
+        raise RuntimeError("Rule sweep requires intake first.")
+    weight_axes: dict[str, list[float]] = {}
+    for item in weights:
+        name, _, values = item.partition("=")
+        weight_axes[name.strip()] = _parse_float_list(values)
+    current = store.load_rule_weights()
+    grid = build_weight_grid(
+        current,
+        fit_thresholds=_parse_float_list(fit_thresholds),
+        doubt_thresholds=_parse_float_list(doubt_thresholds),
+        weights=weight_axes,
+    )
+    vacancies = store.load_vacancies()
+    results = run_rule_sweep(preferences, anamnesis, vacancies, store.load_assessments(), store.load_vacancy_feedback(), grid)
+    if as_json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    print(f"vacancies: {len(vacancies)}, settings: {len(results)}, current rule_weights_version: {current.version}")
+    for result in results:
+        changed = {name: value for name, value in result["weights"].items() if value != current.weight(name)}
+        agreement = result["feedback_agreement"]
+        print(
+            f" - fit>={result['fit_threshold']:g} doubt>={result['doubt_threshold']:g}"
+            f"{' ' + str(changed) if changed else ''}: {result['counts']} churn={result['churn']}"
+            f" feedback={'n/a' if agreement is None else agreement} ({result['feedback_samples']})"
+        )
 
 
 def _parse_payload_json(raw: str) -> dict:
@@ -200,11 +354,33 @@ def main(argv: list[str] | None = None) -> int:
         intake_agent.ensure(interactive=not args.no_interactive)
         if args.rules_md:
             _import_rule_paths(store, args.rules_md)
-        analysis_agent.analyze(limit=args.limit)
+        if args.deferred:
+            _run_deferred_review(store, submitter=args.submitter, limit=args.limit or 0, wait_sec=args.wait, poll_interval_sec=args.poll_interval)
+            return 0
+        analysis_agent.analyze(limit=120 if args.limit is None else args.limit)
         _print_analysis_summary(store)
         print(f"\nDashboard data: {store.paths.runtime_root}")
         return 0
 
+    if command == "train-local-reviewer":
+        target_store = WorkspaceStore(project_root(), account_key=args.account) if args.account else store
+        _train_local_reviewer(target_store, threshold=args.threshold, target_accuracy=args.target_accuracy)
+        return 0
+
+    if command == "calibrate-rules":
+        _calibrate_rules(WorkspaceStore(project_root(), account_key=args.account) if args.account else store)
+        return 0
+
+    if command == "sweep-rules":
+        _sweep_rules(
+            WorkspaceStore(project_root(), account_key=args.account) if args.account else store,
+            fit_thresholds=args.fit_thresholds,
+            doubt_thresholds=args.doubt_thresholds,
+            weights=args.weight,
+            as_json=args.as_json,
+        )
+        return 0
+
     if command == "plan-filters":
         intake_agent.ensure(interactive=False)
         preferences = store.load_preferences()
@@ -1520,13 +1520,12 @@ def update_vacancy_feedback(store: WorkspaceStore, *, vacancy_id: str, decision:
     }[decision_key]
     target.explanation = target.review_notes
     store.save_assessments(assessments)
-    store.save_vacancy_feedback_item(
-        vacancy_key,
-        {
-            "decision": decision_key,
-            "decided_at": utc_now_iso(),
-        },
-    )
+    feedback_item = {"decision": decision_key, "decided_at": utc_now_iso()}
+    vacancy = next((item for item in store.load_vacancies() if item.vacancy_id == vacancy_key), None)
+    if vacancy is not None:
+        # Kept with the decision so rule calibration still sees it after the snapshot rotates.
+        feedback_item["vacancy"] = vacancy.to_dict()
+    store.save_vacancy_feedback_item(vacancy_key, feedback_item)
     store.record_event("vacancy-feedback", "Пользователь изменил статус вакансии.", details={"vacancy_id": vacancy_key, "decision": decision_key})
     cover_letter_generated = False
     apply_plan_error = ""
@@ -992,7 +992,7 @@ function buildPipeline(snapshot) {
             ? `Оценено ${assessedCount} вакансий: ${snapshot.counts?.fit || 0} / ${snapshot.counts?.doubt || 0} / ${snapshot.counts?.no_fit || 0}.`
             : "После анализа вакансии появятся в трёх колонках.",
       detail: assessedCount > 0
-        ? "Можно перейти к карточкам, ручной корректировке решений и запуску отклика по приоритетным вакансиям."
+        ? ["Можно перейти к карточкам, ручной корректировке решений и запуску отклика по приоритетным вакансиям.", llmUsageLine(snapshot)].filter(Boolean).join(" ")
         : "Подходит = можно откликаться, Сомневаюсь = нужен ручной разбор, Не подходит = отбрасываем.",
       action: assessedCount > 0 ? { id: "open-vacancies", label: "Открыть вакансии" } : vacanciesLoaded ? { id: "analyze", label: "Запустить оценку" } : null,
     },
@@ -1147,7 +1147,11 @@ function announceSnapshotChanges(snapshot, previousSnapshot) {
     appendAssistantMessage(`Зафиксировал резюме для поиска: ${snapshot.selected_resume_title || snapshot.selected_resume_id}.`, `resume:${snapshot.selected_resume_id}`);
   }
   if (!previousSnapshot.pending_rule_edit?.markdown && snapshot.pending_rule_edit?.markdown) {
-    appendAssistantMessage("Подготовил черновик правки правил. Проверьте diff и подтвердите изменение в чате.", `rules-draft:${snapshot.pending_rule_edit.filename || "draft"}`);
+    const impactNote = String(snapshot.pending_rule_edit.impact?.note || "").trim();
+    appendAssistantMessage(
+      `Подготовил черновик правки правил. Проверьте diff и подтвердите изменение в чате.${impactNote ? `\n${impactNote}` : ""}`,
+      `rules-draft:${snapshot.pending_rule_edit.filename || "draft"}`,
+    );
   }
 }
 
@@ -1175,6 +1179,26 @@ function renderHero(snapshot) {
   document.getElementById("generated-at").textContent = `Обновлено: ${formatDate(snapshot.generated_at)}`;
 }
 
+function llmUsageLine(snapshot) {
+  const usage = snapshot.analysis_state?.llm_usage || {};
+  if (!usage.calls) return "";
+  const p50 = (Number(usage.latency_p50_ms || 0) / 1000).toFixed(1);
+  const p95 = (Number(usage.latency_p95_ms || 0) / 1000).toFixed(1);
+  const cost = Number(usage.estimated_cost_usd || 0);
+  const openCircuits = (snapshot.analysis_state?.backend_health || [])
+    .filter((item) => item.state && item.state !== "closed")
+    .map((item) => `${item.backend}${item.model ? `/${item.model}` : ""}`);
+  const circuitNote = openCircuits.length ? ` Временно отключены: ${openCircuits.join(", ")}.` : "";
+  const tiers = Object.entries(usage.by_tier || {})
+    .map(([tier, item]) => {
+      const tierCost = Number(item.estimated_cost_usd || 0);
+      return `${tier === "escalation" ? "эскалация" : "триаж"} ${item.calls} (p50 ${(Number(item.latency_p50_ms || 0) / 1000).toFixed(1)}s${tierCost ? `, ~$${tierCost.toFixed(4)}` : ""})`;
+    });
+  const escalation = snapshot.analysis_state?.escalation || {};
+  const tierNote = tiers.length ? ` По уровням: ${tiers.join(", ")}; расхождений с триажем ${escalation.disagreements || 0}.` : "";
+  return `LLM: ${usage.calls} вызовов, p50 ${p50}s, p95 ${p95}s, токенов ${usage.total_tokens || 0}${cost ? `, ~$${cost.toFixed(4)}` : ""}, ошибок ${usage.errors || 0}.${tierNote}${circuitNote}`;
+}
+
 function renderStatusStrip(snapshot) {
   const step = currentPipelineStep(snapshot);
   const cards = [
@@ -2124,7 +2148,9 @@ function renderVacancies(snapshot) {
                         <div class="vacancy-card-top">
                           <div>
                             <strong>${escapeHtml(card.title)}</strong>
-                            <div class="vacancy-meta">${escapeHtml(card.company || "компания не указана")} • ${escapeHtml(card.location || "локация не указана")}</div>
+                            <div class="vacancy-meta">${escapeHtml(card.company || "компания не указана")} • ${escapeHtml(card.location || "локация не указана")}${
+                              card.cluster_members?.length ? ` • ${escapeHtml(`+${card.cluster_members.length} похожих`)}` : ""
+                            }</div>
                           </div>
                           <span class="score score--corner" aria-label="Оценка">${escapeHtml(card.score)}</span>
                         </div>
@@ -2183,6 +2209,9 @@ function detailMetaRows(card, snapshot) {
     ["Категория", card.category_label || card.category || "не указана"],
     ["Счёт", String(card.score)],
   ];
+  if (card.cluster_members?.length) {
+    rows.push(["Почти-дубликаты", card.cluster_members.join(", ")]);
+  }
   return rows.map(([label, value]) => `<div class="meta-row"><span>${escapeHtml(label)}</span><strong>${escapeHtml(value)}</strong></div>`).join("");
 }
 
@@ -42,7 +42,12 @@ from autohhkek.app.commands import (
 )
 from autohhkek.services.hh_login import run_hh_login
 from autohhkek.services.hh_resume_catalog import HHResumeCatalog
+from autohhkek.services.browser_service import BROWSER_SERVICE
 from autohhkek.services.chat_rule_parser import parse_rule_request, patch_to_markdown
+from autohhkek.services.rule_impact import preview_rule_edit
+from autohhkek.services.llm_router import LLM_ROUTER
+from autohhkek.services.llm_usage import LLMCallMeter
+from autohhkek.services.local_llm_runtime import LocalLLMAppConfig
 from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
 from autohhkek.services.storage import WorkspaceStore
 
@@ -62,6 +67,7 @@ class DashboardHandle:
         self.server.shutdown()
         self.server.server_close()
         self.thread.join(timeout=5)
+        BROWSER_SERVICE.shutdown()
 
 
 def _asset_response(path: Path) -> tuple[bytes, str]:
@@ -147,18 +153,9 @@ def _openrouter_chat_reply(store: WorkspaceStore, *, text: str, selected_vacancy
         return None
     settings = store.load_runtime_settings()
     config.model = str(getattr(settings, "openrouter_model", "") or config.model)
+    meter = LLMCallMeter("chat", backend="openrouter", model=config.model)
     try:
-        from openai import OpenAI
-
-        client = OpenAI(
-            api_key=config.api_key,
-            base_url=config.base_url,
-            default_headers={
-                **({"HTTP-Referer": config.site_url} if config.site_url else {}),
-                **({"X-OpenRouter-Title": config.app_name} if config.app_name else {}),
-            } or None,
-            timeout=config.timeout_sec,
-        )
+        client = config.build_client()
         selected_resume_id = store.load_selected_resume_id()
         resume_items = list(store.load_hh_resumes())
         selected_resume = next((item for item in resume_items if str(item.get("resume_id") or "") == selected_resume_id), None)
@@ -173,16 +170,26 @@ def _openrouter_chat_reply(store: WorkspaceStore, *, text: str, selected_vacancy
             f"Текущий selected_vacancy_id: {selected_vacancy_id or 'не выбрана'}.\n\n"
             f"Сообщение пользователя: {text.strip()}"
         )
+        meter.throttle(prompt)
         response = client.responses.create(model=config.model, input=prompt)
+        meter.succeed(response)
         message = str(getattr(response, "output_text", "") or "").strip()
         if not message:
             return None
         return {"message": message, "backend": "openrouter", "model": config.model}
     except Exception as exc:  # noqa: BLE001
+        if meter.record is None:
+            meter.fail(exc)
         return {"message": "", "backend": "openrouter", "model": config.model, "error": str(exc)}
 
 
-def _build_rules_proposal(*, current_rules: str, markdown: str, filename: str = "chat_rules.md") -> dict[str, object]:
+def _build_rules_proposal(
+    *,
+    current_rules: str,
+    markdown: str,
+    filename: str = "chat_rules.md",
+    impact: dict[str, object] | None = None,
+) -> dict[str, object]:
     current_lines = (current_rules or "").splitlines()
     proposal_block = f"\n# Proposed chat rule edit\n\nSource: {filename}\n\n{markdown.strip()}\n"
     proposed_rules = (current_rules.rstrip() + proposal_block) if current_rules.strip() else proposal_block.lstrip()
@@ -201,6 +208,7 @@ def _build_rules_proposal(*, current_rules: str, markdown: str, filename: str =
         "current_rules_preview": current_rules[:3000],
         "proposed_rules_preview": proposed_rules[:3000],
         "diff": "\n".join(diff_lines[:200]),
+        "impact": dict(impact or {}),
     }
 
 
@@ -468,6 +476,23 @@ def _handle_chat_command(
     if "backend openai" in normalized or "выбери openai" in normalized:
         result = update_runtime_settings(store, {"llm_backend": "openai", "mode_selected": True})
         return _chat_response(f"Backend переключён на OpenAI. Модель: {result.get('openai_model')}.", action="runtime-settings", details=result)
+    if "backend local" in normalized or "выбери локальн" in normalized:
+        result = update_runtime_settings(store, {"llm_backend": "local", "mode_selected": True})
+        local = LocalLLMAppConfig.from_env()
+        local.model = str(result.get("local_model") or local.model)
+        if not local.is_available():
+            return _chat_response(
+                f"Backend переключён на локальную модель, но сервер {local.base_url} не отвечает. "
+                "Запустите llama-server/Ollama или задайте AUTOHHKEK_LOCAL_LLM_BASE_URL; пока работает fallback.",
+                action="runtime-settings",
+                details=result,
+            )
+        return _chat_response(
+            f"Backend переключён на локальную модель {local.resolved_model()} ({local.base_url}, слотов: {local.resolved_slots()}). "
+            "Оценка вакансий идёт без оплаты токенов.",
+            action="runtime-settings",
+            details=result,
+        )
     if "backend g4f" in normalized or "выбери g4f" in normalized:
         result = update_runtime_settings(store, {"llm_backend": "g4f", "mode_selected": True})
         return _chat_response(
@@ -487,6 +512,37 @@ def _handle_chat_command(
         result = update_runtime_settings(store, {"openrouter_model": model})
         return _chat_response(f"Модель OpenRouter обновлена: {result.get('openrouter_model')}.", action="runtime-settings", details=result)
 
+    ensemble_match = re.match(r"^(?:ансамбль|ensemble)\s+(.+)$", normalized)
+    if ensemble_match:
+        members = [] if ensemble_match.group(1).strip() in {"off", "выкл", "нет"} else text.split(None, 1)[-1]
+        result = update_runtime_settings(store, {"review_ensemble": members})
+        if not result.get("review_ensemble"):
+            return _chat_response(
+                "Ансамблевая проверка выключена. Для включения нужно минимум два участника, например: ансамбль openrouter, openai, rules.",
+                action="runtime-settings",
+                details=result,
+            )
+        return _chat_response(
+            f"Ансамблевая проверка: {', '.join(result['review_ensemble'])}. Вердикт принимается, как только двое согласны.",
+            action="runtime-settings",
+            details=result,
+        )
+
+    escalation_match = re.match(r"^(?:эскалация|escalation)\s+(openrouter|openai)\s+(\S+)$", normalized)
+    if escalation_match:
+        backend = escalation_match.group(1)
+        model = text.split()[-1].strip()
+        result = update_runtime_settings(store, {f"{backend}_escalation_model": model})
+        value = result.get(f"{backend}_escalation_model")
+        if value == "off":
+            return _chat_response(f"Эскалация {backend} выключена: все вакансии оценивает одна модель.", action="runtime-settings", details=result)
+        return _chat_response(
+            f"Эскалация {backend}: неуверенные и пограничные оценки перепроверит {value} "
+            f"(уверенность ниже {result.get('escalation_min_confidence'):.0%} или ±{result.get('escalation_score_margin'):.0f} от порогов).",
+            action="runtime-settings",
+            details=result,
+        )
+
     if "пересобери правила" in normalized or "сгенерируй правила" in normalized:
         result = build_rules_from_profile(store)
         pending_rule_edit.clear()
@@ -539,11 +595,18 @@ def _handle_chat_command(
             markdown = patch_to_markdown(patch)
             if not markdown:
                 markdown = f"notes: {raw_request}"
-        proposal = _build_rules_proposal(current_rules=store.load_selection_rules(), markdown=markdown, filename="chat_rules.md")
+        proposal = _build_rules_proposal(
+            current_rules=store.load_selection_rules(),
+            markdown=markdown,
+            filename="chat_rules.md",
+            impact=preview_rule_edit(store, markdown, filename="chat_rules.md"),
+        )
         pending_rule_edit.clear()
         pending_rule_edit.update(proposal)
+        impact_note = str(dict(proposal.get("impact") or {}).get("note") or "")
         return _chat_response(
-            "Подготовил изменение правил. Посмотри diff и напиши «подтверди правила» или «отмени правила».",
+            "Подготовил изменение правил. Посмотри diff и напиши «подтверди правила» или «отмени правила»."
+            + (f"\n{impact_note}" if impact_note else ""),
             action="propose-rules",
             details=proposal,
         )
@@ -654,6 +717,12 @@ def _handler_factory(project_root: Path):
         "openrouter_model",
         "g4f_model",
         "g4f_provider",
+        "local_model",
+        "openai_escalation_model",
+        "openrouter_escalation_model",
+        "escalation_min_confidence",
+        "escalation_score_margin",
+        "review_ensemble",
     )
 
     class DashboardHandler(BaseHTTPRequestHandler):
@@ -1171,6 +1240,7 @@ def _handler_factory(project_root: Path):
 
 
 def start_dashboard_server(project_root: Path, host: str = "127.0.0.1", port: int = 8766) -> DashboardHandle:
+    LLM_ROUTER.restore(WorkspaceStore(project_root.resolve()).load_llm_router_state())
     handler = _handler_factory(project_root.resolve())
     server = ThreadingHTTPServer((host, port), handler)
     actual_host, actual_port = server.server_address[:2]
@@ -48,6 +48,7 @@ BACKEND_LABELS = {
     "openai": "OpenAI",
     "openrouter": "OpenRouter",
     "g4f": "g4f",
+    "local": "Локальная модель",
 }
 
 RUN_STATUS_LABELS = {
@@ -396,6 +397,8 @@ def _vacancy_card(vacancy, assessment) -> dict[str, Any]:
         "summary": _clean_text(vacancy.summary, "Краткое описание вакансии недоступно."),
         "description": _clean_text(vacancy.description[:5000], "Полный текст вакансии пока не сохранён."),
         "skills": vacancy.skills,
+        "cluster_id": str(vacancy.meta.get("cluster_id") or ""),
+        "cluster_size": int(vacancy.meta.get("cluster_size") or 1),
     }
 
 
@@ -485,6 +488,7 @@ def _build_last_run_summary(runs: list[dict[str, Any]]) -> dict[str, Any]:
         "processed": processed,
         "counts": counts,
         "notes": latest.get("notes") or [],
+        "metrics": latest.get("metrics") or {},
         "label": latest.get("run_id") or "Последний запуск",
         "detail": detail,
         "summary": detail,
@@ -582,6 +586,8 @@ def _build_operator_summary(
         attention_items.append("OpenAI API не настроен. Где возможно, будет использован fallback.")
     if selected_backend == "openrouter" and not runtime_capabilities.get("openrouter_ready"):
         attention_items.append("OpenRouter API не настроен. Где возможно, будет использован fallback.")
+    if selected_backend == "local" and not backend_capabilities.get("ready"):
+        attention_items.append("Локальный LLM-сервер не отвечает (AUTOHHKEK_LOCAL_LLM_BASE_URL). Где возможно, будет использован fallback.")
     if selected_backend == "g4f" and not backend_capabilities.get("ready"):
         attention_items.append("g4f сейчас недоступен или выбран неподходящий provider/model.")
     if pending_repairs and selected_backend in {"openai", "openrouter"} and not runtime_capabilities.get("playwright_mcp_ready"):
@@ -752,6 +758,11 @@ def build_dashboard_snapshot(project_root: Path, limit: int = 120) -> dict[str,
         FitCategory.FIT.value: [],
     }
     reason_counter: Counter[str] = Counter()
+    cluster_members: dict[str, list[str]] = {}
+    for vacancy in vacancies.values():
+        cluster_id = str(vacancy.meta.get("cluster_id") or "")
+        if cluster_id:
+            cluster_members.setdefault(cluster_id, []).append(vacancy.vacancy_id)
     for assessment in display_assessments:
         vacancy = vacancies.get(assessment.vacancy_id)
         if not vacancy:
@@ -759,6 +770,7 @@ def build_dashboard_snapshot(project_root: Path, limit: int = 120) -> dict[str,
         card = _vacancy_card(vacancy, assessment)
         card["user_feedback"] = dict(vacancy_feedback.get(card["id"], {}) or {})
         card["cover_letter_draft"] = str(cover_letter_drafts.get(card["id"], "") or "")
+        card["cluster_members"] = [item for item in cluster_members.get(card["cluster_id"], []) if item != card["id"]]
         columns[assessment.category.value].append(card)
         reason_counter.update(reason["subcategory"] or reason["code"] for reason in card["reasons"])
 
@@ -1054,6 +1066,7 @@ def build_dashboard_snapshot(project_root: Path, limit: int = 120) -> dict[str,
             "started_at": last_run_summary.get("started_at", ""),
             "finished_at": last_run_summary.get("finished_at", ""),
             "notes": last_run_summary.get("notes", []),
+            "metrics": last_run_summary.get("metrics", {}),
             "summary": last_run_summary.get("summary", "No runs recorded yet."),
         },
     }
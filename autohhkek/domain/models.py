@@ -229,6 +229,7 @@ class RunSummary:
     processed: int = 0
     counts: dict[str, int] = field(default_factory=dict)
     notes: list[str] = field(default_factory=list)
+    metrics: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         return serialize(self)
@@ -259,7 +260,13 @@ class RuntimeSettings:
     openrouter_model: str = "openai/gpt-5-nano"
     g4f_model: str = "gpt-4o-mini"
     g4f_provider: str = ""
+    local_model: str = ""
     selected_resume_id: str = ""
+    openai_escalation_model: str = ""
+    openrouter_escalation_model: str = ""
+    escalation_min_confidence: float = 0.7
+    escalation_score_margin: float = 5.0
+    review_ensemble: list[str] = field(default_factory=list)
 
     def to_dict(self) -> dict[str, Any]:
         payload = serialize(self)
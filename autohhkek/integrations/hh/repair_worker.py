@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 from contextlib import AsyncExitStack
 import json
 from pathlib import Path
@@ -11,6 +10,8 @@ from pydantic import BaseModel, Field
 from autohhkek.domain.models import RuntimeSettings
 from autohhkek.integrations.hh.playwright_mcp import PlaywrightMCPBridge, PlaywrightMCPConfig
 from autohhkek.services.g4f_runtime import G4FAppConfig
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+from autohhkek.services.llm_usage import LLMCallMeter
 from autohhkek.services.openai_runtime import OpenAIAppConfig
 from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
 from autohhkek.services.paths import WorkspacePaths
@@ -92,20 +93,28 @@ class PlaywrightRepairWorker:
             task["worker_error"] = "No available g4f backend for repair."
             return task
 
+        config = {"g4f": self.g4f_config, "openrouter": self.openrouter_config}.get(backend, self.openai_config)
+        meter = LLMCallMeter("repair_worker", backend=backend, model=config.model)
         try:
             if backend == "g4f":
-                result = self.g4f_runner(self._build_g4f_messages(task), self.g4f_config.model, PlaywrightRepairOutput)
+                messages = self._build_g4f_messages(task)
+                meter.throttle(messages)
+                result = self.g4f_runner(messages, self.g4f_config.model, PlaywrightRepairOutput)
             else:
-                config = self.openrouter_config if backend == "openrouter" else self.openai_config
+                prompt = self._build_prompt(task)
+                meter.throttle(prompt)
                 result = self.runner(
                     self._build_agent(config),
-                    self._build_prompt(task),
+                    prompt,
                     run_config=config.build_run_config(workflow_name="AutoHHKek MCP repair worker"),
                 )
         except Exception as exc:  # noqa: BLE001
+            meter.fail(exc)
             task["status"] = "error"
             task["worker_error"] = str(exc)
+            task["llm_call"] = meter.record.to_dict()
             return task
+        task["llm_call"] = meter.succeed(result).to_dict()
 
         if backend == "g4f":
             output = result if isinstance(result, PlaywrightRepairOutput) else PlaywrightRepairOutput.model_validate(result)
@@ -128,12 +137,14 @@ class PlaywrightRepairWorker:
 
     def _resolve_backend(self, task: dict[str, Any]) -> str:
         requested = self.runtime_settings.llm_backend
-        if requested != "g4f" and not bool(task.get("mcp_ready")):
+        if requested not in {"g4f", "local"} and not bool(task.get("mcp_ready")):
             return requested
         priorities = {
             "openai": ["openai", "openrouter", "g4f"],
             "openrouter": ["openrouter", "openai", "g4f"],
             "g4f": ["g4f", "openrouter", "openai"],
+            # Small local models are not trusted with live MCP browser repair.
+            "local": ["openrouter", "openai", "g4f"],
         }
         ready = {
             "openai": bool(task.get("openai_ready")),
@@ -188,7 +199,7 @@ class PlaywrightRepairWorker:
                     await stack.enter_async_context(server)
                 return await Runner.run(agent, prompt, run_config=run_config)
 
-        return asyncio.run(_run())
+        return LLM_CLIENT_POOL.run_coroutine(_run)
 
     def _run_g4f(self, messages: list[dict[str, str]], model: str, response_schema=None) -> PlaywrightRepairOutput:
         from g4f.client import Client
@@ -68,6 +68,8 @@ class HHAutomationRuntime:
             supports.extend(["openrouter-vacancy-review", "openrouter-filter-planning"])
         if g4f_capabilities.get("ready"):
             supports.extend(["g4f-vacancy-review", "g4f-filter-planning"])
+        if llm_capabilities["backends"]["local"].get("ready"):
+            supports.extend(["local-vacancy-review", "local-filter-planning"])
         if mcp_ready:
             supports.append("playwright-mcp-repair")
         return {
@@ -86,6 +88,9 @@ class HHAutomationRuntime:
             "effective_backend_ready": llm_capabilities["effective_backend_ready"],
             "fallback_applied": llm_capabilities["fallback_applied"],
             "llm_backends": llm_capabilities["backends"],
+            "llm_backend_health": llm_capabilities["backend_health"],
+            "llm_client_pool": llm_capabilities["client_pool"],
+            "llm_rate_limits": llm_capabilities["rate_limits"],
             "playwright_mcp_ready": mcp_ready,
             "playwright_mcp_command": self.playwright_mcp.config.command,
             "playwright_mcp_source": "auto" if self.playwright_mcp.config.command and not self.store.project_root.joinpath(".env").exists() else "configured",
@@ -115,6 +120,10 @@ class HHAutomationRuntime:
             if g4f_ready:
                 return "Script-first DOM automation with g4f review/planning and без доступного Playwright MCP."
             return "Script-first DOM automation with g4f selected, but g4f is unavailable."
+        if self.llm_runtime.selected_backend == "local":
+            if self.llm_runtime.local.is_available():
+                return "Script-first DOM automation with local LLM review/planning; repair tasks use the cloud backends."
+            return "Script-first DOM automation with local LLM selected, but the local server is unreachable."
         if self.llm_runtime.selected_backend == "openrouter":
             if openrouter_ready and mcp_ready:
                 return "Script-first DOM automation with OpenRouter review/planning and Playwright MCP repair fallback."
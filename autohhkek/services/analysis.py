@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
 
 from autohhkek.domain.enums import FitCategory, ReasonGroup
 from autohhkek.domain.models import Anamnesis, AssessmentReason, UserPreferences, Vacancy, VacancyAssessment
@@ -32,223 +34,310 @@ def infer_salary_from_text(text: str) -> tuple[int | None, int | None]:
     return min(numbers), max(numbers)
 
 
+# Score points per unit of each engine feature. Capped counts are expressed in units of
+# the per-item weight, so "6 per required skill, at most 20" is a feature capped at 20/6.
+DEFAULT_RULE_WEIGHTS: dict[str, float] = {
+    "title_match": 18.0,
+    "title_gap": -8.0,
+    "required_skills_present": 6.0,
+    "required_skills_missing": -8.0,
+    "skill_overlap": 2.0,
+    "remote_match": 8.0,
+    "remote_required": -20.0,
+    "location_fit": 6.0,
+    "location_gap": -12.0,
+    "salary_unknown": -4.0,
+    "salary_fit": 8.0,
+    "salary_low": -18.0,
+    "screening_required": -3.0,
+}
+RULE_FEATURES = tuple(DEFAULT_RULE_WEIGHTS)
+BASE_SCORE = 50.0
+DEFAULT_FIT_THRESHOLD = 72.0
+DEFAULT_DOUBT_THRESHOLD = 45.0
+# Engine features grouped by the preference/anamnesis inputs they read. "hard_block" has no
+# weighted feature and "markers" reads only the vacancy text.
+RULE_FEATURE_GROUPS: dict[str, tuple[str, ...]] = {
+    "hard_block": (),
+    "title": ("title_match", "title_gap"),
+    "skills": ("required_skills_present", "required_skills_missing", "skill_overlap"),
+    "format": ("remote_match", "remote_required", "location_fit", "location_gap"),
+    "salary": ("salary_unknown", "salary_fit", "salary_low"),
+    "markers": ("screening_required",),
+}
+RULE_GROUP_INPUTS: dict[str, tuple[str, ...]] = {
+    "hard_block": ("excluded_companies", "excluded_keywords", "forbidden_keywords"),
+    "title": ("target_titles",),
+    "skills": ("required_skills", "preferred_skills", "primary_skills", "secondary_skills"),
+    "format": ("remote_only", "preferred_locations", "allow_relocation"),
+    "salary": ("salary_min",),
+    "markers": (),
+}
+RULE_SIGNAL_GROUPS = frozenset(RULE_FEATURE_GROUPS)
+
+
+@dataclass(slots=True)
+class RuleWeights:
+    weights: dict[str, float] = field(default_factory=lambda: dict(DEFAULT_RULE_WEIGHTS))
+    fit_threshold: float = DEFAULT_FIT_THRESHOLD
+    doubt_threshold: float = DEFAULT_DOUBT_THRESHOLD
+    version: int = 0
+
+    def weight(self, feature: str) -> float:
+        return float(self.weights.get(feature, DEFAULT_RULE_WEIGHTS[feature]))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "weights": dict(self.weights),
+            "fit_threshold": self.fit_threshold,
+            "doubt_threshold": self.doubt_threshold,
+            "version": self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any] | None) -> "RuleWeights":
+        data = dict(payload or {})
+        if not data:
+            return cls()
+        return cls(
+            weights={**DEFAULT_RULE_WEIGHTS, **{key: float(value) for key, value in dict(data.get("weights") or {}).items() if key in DEFAULT_RULE_WEIGHTS}},
+            fit_threshold=float(data.get("fit_threshold", DEFAULT_FIT_THRESHOLD)),
+            doubt_threshold=float(data.get("doubt_threshold", DEFAULT_DOUBT_THRESHOLD)),
+            version=int(data.get("version") or 0),
+        )
+
+
 class VacancyRuleEngine:
-    def __init__(self, preferences: UserPreferences, anamnesis: Anamnesis) -> None:
+    def __init__(self, preferences: UserPreferences, anamnesis: Anamnesis, weights: RuleWeights | None = None) -> None:
         self.preferences = preferences
         self.anamnesis = anamnesis
+        self.weights = weights or RuleWeights()
         skill_pool = preferences.required_skills + preferences.preferred_skills + anamnesis.primary_skills + anamnesis.secondary_skills
         self.skill_pool = [normalize_text(item) for item in unique_preserve_order(skill_pool)]
 
-    def assess(self, vacancy: Vacancy) -> VacancyAssessment:
-        text = normalize_text(vacancy.searchable_text())
-        reasons: list[AssessmentReason] = []
-        score = 50.0
+    def _signals(
+        self,
+        vacancy: Vacancy,
+        *,
+        text: str | None = None,
+        groups: frozenset[str] = RULE_SIGNAL_GROUPS,
+    ) -> tuple[list[tuple[str, float, AssessmentReason]], AssessmentReason | None]:
+        """Triggered engine features as (feature, value, reason) plus the hard-block reason, if any.
+
+        Reason weights are left at zero here; ``assess`` fills them from the active weight profile.
+        Only the signal ``groups`` asked for are evaluated, so callers that know which preference
+        inputs changed can skip the rest.
+        """
+        text = normalize_text(vacancy.searchable_text()) if text is None else text
+        signals: list[tuple[str, float, AssessmentReason]] = []
         hard_block: AssessmentReason | None = None
 
-        excluded_terms = self.preferences.excluded_companies + self.preferences.excluded_keywords + self.preferences.forbidden_keywords
-        for term in excluded_terms:
-            normalized = normalize_text(term)
-            if normalized and normalized in text:
-                hard_block = AssessmentReason(
-                    code="hard_block",
-                    label="Жёсткое исключение",
-                    group=ReasonGroup.NEGATIVE,
-                    detail=f"Найдён запрещённый маркер: {term}",
-                    weight=-100,
-                    subcategory="blacklisted_employer",
-                )
-                break
-
-        target_hits = [title for title in self.preferences.target_titles if normalize_text(title) in text]
-        if target_hits:
-            score += 18
-            reasons.append(
-                AssessmentReason(
-                    code="title_match",
-                    label="Совпадение по роли",
-                    group=ReasonGroup.POSITIVE,
-                    detail=f"Вакансия пересекается с целевой ролью: {', '.join(target_hits[:2])}",
-                    weight=18,
-                    subcategory="role_fit",
+        def _signal(feature: str, value: float, label: str, group: ReasonGroup, detail: str, subcategory: str) -> None:
+            reason = AssessmentReason(code=feature, label=label, group=group, detail=detail, weight=0, subcategory=subcategory)
+            signals.append((feature, value, reason))
+
+        if "hard_block" in groups:
+            excluded_terms = self.preferences.excluded_companies + self.preferences.excluded_keywords + self.preferences.forbidden_keywords
+            for term in excluded_terms:
+                normalized = normalize_text(term)
+                if normalized and normalized in text:
+                    hard_block = AssessmentReason(
+                        code="hard_block",
+                        label="Жёсткое исключение",
+                        group=ReasonGroup.NEGATIVE,
+                        detail=f"Найдён запрещённый маркер: {term}",
+                        weight=-100,
+                        subcategory="blacklisted_employer",
+                    )
+                    break
+
+        if "title" in groups:
+            target_hits = [title for title in self.preferences.target_titles if normalize_text(title) in text]
+            if target_hits:
+                _signal(
+                    "title_match",
+                    1.0,
+                    "Совпадение по роли",
+                    ReasonGroup.POSITIVE,
+                    f"Вакансия пересекается с целевой ролью: {', '.join(target_hits[:2])}",
+                    "role_fit",
                 )
-            )
-        elif self.preferences.target_titles:
-            score -= 8
-            reasons.append(
-                AssessmentReason(
-                    code="title_gap",
-                    label="Слабое совпадение по роли",
-                    group=ReasonGroup.NEUTRAL,
-                    detail="В названии вакансии нет явного совпадения с целевыми ролями.",
-                    weight=-8,
-                    subcategory="title_gap",
+            elif self.preferences.target_titles:
+                _signal(
+                    "title_gap",
+                    1.0,
+                    "Слабое совпадение по роли",
+                    ReasonGroup.NEUTRAL,
+                    "В названии вакансии нет явного совпадения с целевыми ролями.",
+                    "title_gap",
                 )
-            )
-
-        required_hits = [skill for skill in self.preferences.required_skills if normalize_text(skill) in text]
-        required_missing = [skill for skill in self.preferences.required_skills if normalize_text(skill) not in text]
-        if required_hits:
-            bonus = min(20, len(required_hits) * 6)
-            score += bonus
-            reasons.append(
-                AssessmentReason(
-                    code="required_skills_present",
-                    label="Обязательные навыки совпадают",
-                    group=ReasonGroup.POSITIVE,
-                    detail=f"Найдены обязательные навыки: {', '.join(required_hits[:4])}",
-                    weight=bonus,
-                    subcategory="must_have_hit",
+
+        if "skills" in groups:
+            required_hits = [skill for skill in self.preferences.required_skills if normalize_text(skill) in text]
+            required_missing = [skill for skill in self.preferences.required_skills if normalize_text(skill) not in text]
+            if required_hits:
+                _signal(
+                    "required_skills_present",
+                    min(20 / 6, float(len(required_hits))),
+                    "Обязательные навыки совпадают",
+                    ReasonGroup.POSITIVE,
+                    f"Найдены обязательные навыки: {', '.join(required_hits[:4])}",
+                    "must_have_hit",
                 )
-            )
-        if required_missing:
-            penalty = min(24, len(required_missing) * 8)
-            score -= penalty
-            reasons.append(
-                AssessmentReason(
-                    code="required_skills_missing",
-                    label="Часть must-have не найдена",
-                    group=ReasonGroup.NEUTRAL if len(required_missing) == 1 else ReasonGroup.NEGATIVE,
-                    detail=f"Не найдены навыки: {', '.join(required_missing[:4])}",
-                    weight=-penalty,
-                    subcategory="skill_gap",
+            if required_missing:
+                _signal(
+                    "required_skills_missing",
+                    min(3.0, float(len(required_missing))),
+                    "Часть must-have не найдена",
+                    ReasonGroup.NEUTRAL if len(required_missing) == 1 else ReasonGroup.NEGATIVE,
+                    f"Не найдены навыки: {', '.join(required_missing[:4])}",
+                    "skill_gap",
                 )
-            )
-
-        preferred_hits = [skill for skill in self.skill_pool if skill and skill in text]
-        if preferred_hits:
-            bonus = min(16, len(set(preferred_hits)) * 2)
-            score += bonus
-            reasons.append(
-                AssessmentReason(
-                    code="skill_overlap",
-                    label="Есть стековое пересечение",
-                    group=ReasonGroup.POSITIVE,
-                    detail=f"Совпали ключевые слова стека: {', '.join(sorted(set(preferred_hits))[:6])}",
-                    weight=bonus,
-                    subcategory="skill_overlap",
+
+            preferred_hits = [skill for skill in self.skill_pool if skill and skill in text]
+            if preferred_hits:
+                _signal(
+                    "skill_overlap",
+                    min(8.0, float(len(set(preferred_hits)))),
+                    "Есть стековое пересечение",
+                    ReasonGroup.POSITIVE,
+                    f"Совпали ключевые слова стека: {', '.join(sorted(set(preferred_hits))[:6])}",
+                    "skill_overlap",
                 )
-            )
-
-        remote_terms = ("удален", "remote", "гибрид", "hybrid")
-        is_remote = vacancy.is_remote or any(term in text for term in remote_terms)
-        if self.preferences.remote_only:
-            if is_remote:
-                score += 8
-                reasons.append(
-                    AssessmentReason(
-                        code="remote_match",
-                        label="Подходит по формату работы",
-                        group=ReasonGroup.POSITIVE,
-                        detail="Вакансия выглядит удалённой или гибридной.",
-                        weight=8,
-                        subcategory="remote_fit",
+
+        if "format" in groups:
+            remote_terms = ("удален", "remote", "гибрид", "hybrid")
+            is_remote = vacancy.is_remote or any(term in text for term in remote_terms)
+            if self.preferences.remote_only:
+                if is_remote:
+                    _signal(
+                        "remote_match",
+                        1.0,
+                        "Подходит по формату работы",
+                        ReasonGroup.POSITIVE,
+                        "Вакансия выглядит удалённой или гибридной.",
+                        "remote_fit",
                     )
-                )
-            else:
-                score -= 20
-                reasons.append(
-                    AssessmentReason(
-                        code="remote_required",
-                        label="Нет удалённого формата",
-                        group=ReasonGroup.NEGATIVE,
-                        detail="Пользователь ищет только remote-вакансии.",
-                        weight=-20,
-                        subcategory="format_mismatch",
+                else:
+                    _signal(
+                        "remote_required",
+                        1.0,
+                        "Нет удалённого формата",
+                        ReasonGroup.NEGATIVE,
+                        "Пользователь ищет только remote-вакансии.",
+                        "format_mismatch",
                     )
-                )
-        elif self.preferences.preferred_locations:
-            location_hit = any(normalize_text(location) in text for location in self.preferences.preferred_locations)
-            if location_hit or is_remote:
-                score += 6
-                reasons.append(
-                    AssessmentReason(
-                        code="location_fit",
-                        label="Подходит по географии",
-                        group=ReasonGroup.POSITIVE,
-                        detail="Локация или remote-формат совпадают с ожиданиями.",
-                        weight=6,
-                        subcategory="location_fit",
+            elif self.preferences.preferred_locations:
+                location_hit = any(normalize_text(location) in text for location in self.preferences.preferred_locations)
+                if location_hit or is_remote:
+                    _signal(
+                        "location_fit",
+                        1.0,
+                        "Подходит по географии",
+                        ReasonGroup.POSITIVE,
+                        "Локация или remote-формат совпадают с ожиданиями.",
+                        "location_fit",
                     )
-                )
-            elif not self.preferences.allow_relocation:
-                score -= 12
-                reasons.append(
-                    AssessmentReason(
-                        code="location_gap",
-                        label="Сомнение по локации",
-                        group=ReasonGroup.NEGATIVE,
-                        detail="Локация не совпадает, а релокация отключена.",
-                        weight=-12,
-                        subcategory="location_mismatch",
+                elif not self.preferences.allow_relocation:
+                    _signal(
+                        "location_gap",
+                        1.0,
+                        "Сомнение по локации",
+                        ReasonGroup.NEGATIVE,
+                        "Локация не совпадает, а релокация отключена.",
+                        "location_mismatch",
                     )
-                )
 
-        salary_from, salary_to = vacancy.salary_from, vacancy.salary_to
-        if salary_from is None and salary_to is None:
-            salary_from, salary_to = infer_salary_from_text(f"{vacancy.salary_text}\n{vacancy.description}\n{vacancy.summary}")
-        if self.preferences.salary_min:
-            visible_salary = salary_to or salary_from
-            if visible_salary is None:
-                score -= 4
-                reasons.append(
-                    AssessmentReason(
-                        code="salary_unknown",
-                        label="Зарплата не указана",
-                        group=ReasonGroup.NEUTRAL,
-                        detail="Без диапазона зарплаты вакансия требует ручной проверки.",
-                        weight=-4,
-                        subcategory="missing_salary",
+        if "salary" in groups:
+            salary_from, salary_to = vacancy.salary_from, vacancy.salary_to
+            if salary_from is None and salary_to is None:
+                salary_from, salary_to = infer_salary_from_text(f"{vacancy.salary_text}\n{vacancy.description}\n{vacancy.summary}")
+            if self.preferences.salary_min:
+                visible_salary = salary_to or salary_from
+                if visible_salary is None:
+                    _signal(
+                        "salary_unknown",
+                        1.0,
+                        "Зарплата не указана",
+                        ReasonGroup.NEUTRAL,
+                        "Без диапазона зарплаты вакансия требует ручной проверки.",
+                        "missing_salary",
                     )
-                )
-            elif visible_salary >= self.preferences.salary_min:
-                score += 8
-                reasons.append(
-                    AssessmentReason(
-                        code="salary_fit",
-                        label="Зарплата в диапазоне",
-                        group=ReasonGroup.POSITIVE,
-                        detail=f"Видимая зарплата не ниже {self.preferences.salary_min:,} RUB".replace(",", " "),
-                        weight=8,
-                        subcategory="salary_fit",
+                elif visible_salary >= self.preferences.salary_min:
+                    _signal(
+                        "salary_fit",
+                        1.0,
+                        "Зарплата в диапазоне",
+                        ReasonGroup.POSITIVE,
+                        f"Видимая зарплата не ниже {self.preferences.salary_min:,} RUB".replace(",", " "),
+                        "salary_fit",
                     )
-                )
-            else:
-                score -= 18
-                reasons.append(
-                    AssessmentReason(
-                        code="salary_low",
-                        label="Зарплата ниже порога",
-                        group=ReasonGroup.NEGATIVE,
-                        detail=f"Видимая зарплата ниже желаемого минимума {self.preferences.salary_min:,} RUB".replace(",", " "),
-                        weight=-18,
-                        subcategory="salary_low",
+                else:
+                    _signal(
+                        "salary_low",
+                        1.0,
+                        "Зарплата ниже порога",
+                        ReasonGroup.NEGATIVE,
+                        f"Видимая зарплата ниже желаемого минимума {self.preferences.salary_min:,} RUB".replace(",", " "),
+                        "salary_low",
                     )
-                )
 
-        if any(marker in text for marker in ("тест", "опрос", "анкета", "скрининг")):
-            score -= 3
-            reasons.append(
-                AssessmentReason(
-                    code="screening_required",
-                    label="Потребуется опрос или тест",
-                    group=ReasonGroup.NEUTRAL,
-                    detail="В тексте вакансии упоминаются анкеты, тесты или скрининг.",
-                    weight=-3,
-                    subcategory="screening_or_test_required",
+        if "markers" in groups:
+            if any(marker in text for marker in ("тест", "опрос", "анкета", "скрининг")):
+                _signal(
+                    "screening_required",
+                    1.0,
+                    "Потребуется опрос или тест",
+                    ReasonGroup.NEUTRAL,
+                    "В тексте вакансии упоминаются анкеты, тесты или скрининг.",
+                    "screening_or_test_required",
                 )
-            )
-
-        if "сопровод" in text:
-            reasons.append(
-                AssessmentReason(
-                    code="cover_letter_requested",
-                    label="Может потребоваться сопроводительное",
-                    group=ReasonGroup.NEUTRAL,
-                    detail="Есть признаки запроса на сопроводительное письмо.",
-                    weight=0,
-                    subcategory="cover_letter_requested",
+
+            if "сопровод" in text:
+                signals.append(
+                    (
+                        "",
+                        0.0,
+                        AssessmentReason(
+                            code="cover_letter_requested",
+                            label="Может потребоваться сопроводительное",
+                            group=ReasonGroup.NEUTRAL,
+                            detail="Есть признаки запроса на сопроводительное письмо.",
+                            weight=0,
+                            subcategory="cover_letter_requested",
+                        ),
+                    )
                 )
-            )
+        return signals, hard_block
+
+    def feature_vector(
+        self,
+        vacancy: Vacancy,
+        *,
+        text: str | None = None,
+        groups: frozenset[str] = RULE_SIGNAL_GROUPS,
+    ) -> tuple[list[float], bool]:
+        """Values for ``RULE_FEATURES`` in order, and whether a hard block overrides the score.
+
+        Features outside ``groups`` come back as zero and the hard block as ``False`` unless
+        ``"hard_block"`` is requested.
+        """
+        signals, hard_block = self._signals(vacancy, text=text, groups=groups)
+        values = dict.fromkeys(RULE_FEATURES, 0.0)
+        for feature, value, _ in signals:
+            if feature:
+                values[feature] = value
+        return [values[feature] for feature in RULE_FEATURES], hard_block is not None
+
+    def assess(self, vacancy: Vacancy) -> VacancyAssessment:
+        signals, hard_block = self._signals(vacancy)
+        reasons: list[AssessmentReason] = []
+        score = BASE_SCORE
+        for feature, value, reason in signals:
+            if feature:
+                reason.weight = round(self.weights.weight(feature) * value, 1)
+                score += reason.weight
+            reasons.append(reason)
 
         if hard_block:
             reasons.append(hard_block)
@@ -256,9 +345,9 @@ class VacancyRuleEngine:
             category = FitCategory.NO_FIT
             subcategory = hard_block.subcategory or "blacklisted_employer"
         else:
-            if score >= 72:
+            if score >= self.weights.fit_threshold:
                 category = FitCategory.FIT
-            elif score >= 45:
+            elif score >= self.weights.doubt_threshold:
                 category = FitCategory.DOUBT
             else:
                 category = FitCategory.NO_FIT
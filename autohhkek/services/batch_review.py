@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+from pydantic import ValidationError
+
+from autohhkek.agents.openai_review_agent import REVIEW_INSTRUCTIONS, OpenAIVacancyReviewer, VacancyReviewOutput, confidence_of
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy, VacancyAssessment, utc_now_iso
+from autohhkek.services.analysis import VacancyRuleEngine
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+from autohhkek.services.llm_usage import LLM_USAGE, LLMCallRecord, estimate_cost_usd
+from autohhkek.services.openai_runtime import OpenAIAppConfig
+from autohhkek.services.profile_rules import compose_rules_markdown
+from autohhkek.services.prompt_compaction import compact_vacancy
+from autohhkek.services.storage import WorkspaceStore
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+# The Batch API bills half the synchronous price.
+BATCH_PRICE_FACTOR = 0.5
+ACTIVE_BATCH_STATUSES = {"prepared", "submitted", "validating", "in_progress", "finalizing", "cancelling"}
+FAILED_BATCH_STATUSES = {"failed", "expired", "cancelled"}
+BATCH_REVIEW_STRATEGY = "openai_batch"
+
+
+class BatchSubmitter(Protocol):
+    name: str
+
+    def submit(self, input_path: Path, *, metadata: dict[str, str]) -> str: ...
+
+    def status(self, batch_id: str) -> dict[str, Any]: ...
+
+    def download(self, batch_id: str, target: Path) -> bool: ...
+
+
+class OpenAIBatchSubmitter:
+    """Uploads the request file and runs it through the OpenAI Batch API."""
+
+    name = "openai"
+
+    def __init__(self, config: OpenAIAppConfig | None = None) -> None:
+        self.config = config or OpenAIAppConfig.from_env()
+
+    def _client(self):
+        return LLM_CLIENT_POOL.sync_client("openai", api_key=self.config.api_key, base_url=self.config.base_url, timeout=self.config.timeout_sec)
+
+    def submit(self, input_path: Path, *, metadata: dict[str, str]) -> str:
+        client = self._client()
+        with input_path.open("rb") as handle:
+            uploaded = client.files.create(file=handle, purpose="batch")
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+            metadata=metadata,
+        )
+        return str(batch.id)
+
+    def status(self, batch_id: str) -> dict[str, Any]:
+        batch = self._client().batches.retrieve(batch_id)
+        counts = getattr(batch, "request_counts", None)
+        return {
+            "status": str(batch.status),
+            "output_file_id": str(batch.output_file_id or ""),
+            "error_file_id": str(batch.error_file_id or ""),
+            "request_counts": {
+                "total": int(getattr(counts, "total", 0) or 0),
+                "completed": int(getattr(counts, "completed", 0) or 0),
+                "failed": int(getattr(counts, "failed", 0) or 0),
+            },
+        }
+
+    def download(self, batch_id: str, target: Path) -> bool:
+        client = self._client()
+        output_file_id = self.status(batch_id)["output_file_id"]
+        if not output_file_id:
+            return False
+        target.write_text(client.files.content(output_file_id).text, encoding="utf-8")
+        return True
+
+
+ResponderFn = Callable[[str, dict[str, Any]], dict[str, Any]]
+
+
+class LocalBatchSubmitter:
+    """Offline stand-in for the Batch API: answers every request with ``responder`` once polled.
+
+    ``polls_until_done`` keeps the batch ``in_progress`` for that many status checks so
+    callers exercise the same poll/resume path as with the real API.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path, responder: ResponderFn, *, polls_until_done: int = 0) -> None:
+        self.root = root
+        self.responder = responder
+        self.polls_until_done = polls_until_done
+
+    def _state_path(self, batch_id: str) -> Path:
+        return self.root / f"{batch_id}.json"
+
+    def submit(self, input_path: Path, *, metadata: dict[str, str]) -> str:
+        batch_id = f"local-batch-{hashlib.sha1(f'{input_path}:{time.time_ns()}'.encode('utf-8')).hexdigest()[:10]}"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._state_path(batch_id).write_text(json.dumps({"input_path": str(input_path), "polls": 0, "metadata": metadata}), encoding="utf-8")
+        return batch_id
+
+    def status(self, batch_id: str) -> dict[str, Any]:
+        path = self._state_path(batch_id)
+        if not path.exists():
+            return {"status": "failed", "output_file_id": "", "error_file_id": ""}
+        state = json.loads(path.read_text(encoding="utf-8"))
+        state["polls"] += 1
+        path.write_text(json.dumps(state), encoding="utf-8")
+        done = state["polls"] > self.polls_until_done
+        return {"status": "completed" if done else "in_progress", "output_file_id": batch_id if done else "", "error_file_id": ""}
+
+    def download(self, batch_id: str, target: Path) -> bool:
+        state = json.loads(self._state_path(batch_id).read_text(encoding="utf-8"))
+        lines = []
+        for raw in Path(state["input_path"]).read_text(encoding="utf-8").splitlines():
+            request = json.loads(raw)
+            content = json.dumps(self.responder(request["custom_id"], request["body"]), ensure_ascii=False)
+            lines.append(
+                {
+                    "id": f"{batch_id}-{request['custom_id']}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "model": request["body"]["model"],
+                            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                            "usage": {"prompt_tokens": 0, "completion_tokens": 0},
+                        },
+                    },
+                    "error": None,
+                }
+            )
+        target.write_text("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines), encoding="utf-8")
+        return True
+
+
+def rule_engine_responder(preferences: UserPreferences, anamnesis: Anamnesis, vacancies: list[Vacancy]) -> ResponderFn:
+    """Responder for ``LocalBatchSubmitter`` that answers with the deterministic rule engine."""
+    engine = VacancyRuleEngine(preferences, anamnesis)
+    by_id = {item.vacancy_id: item for item in vacancies}
+
+    def _respond(custom_id: str, body: dict[str, Any]) -> dict[str, Any]:
+        assessment = engine.assess(by_id[custom_id])
+        return {
+            "category": assessment.category.value,
+            "subcategory": assessment.subcategory,
+            "score": assessment.score,
+            "confidence": 1.0,
+            "explanation": assessment.explanation,
+            "recommended_action": assessment.recommended_action,
+        }
+
+    return _respond
+
+
+def _response_format() -> dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": "VacancyReviewOutput", "schema": VacancyReviewOutput.model_json_schema()}}
+
+
+def build_batch_requests(
+    vacancies: list[Vacancy],
+    preferences: UserPreferences,
+    anamnesis: Anamnesis,
+    *,
+    model: str,
+) -> list[dict[str, Any]]:
+    """One OpenAI Batch request line per vacancy, with the same prompt the interactive reviewer sends."""
+    reviewer = OpenAIVacancyReviewer(OpenAIAppConfig(model=model))
+    response_format = _response_format()
+    return [
+        {
+            "custom_id": vacancy.vacancy_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": REVIEW_INSTRUCTIONS},
+                    {"role": "user", "content": reviewer._build_prompt(compact_vacancy(vacancy), preferences, anamnesis)},
+                ],
+                "response_format": response_format,
+            },
+        }
+        for vacancy in vacancies
+    ]
+
+
+def parse_batch_output_line(line: dict[str, Any]) -> tuple[VacancyReviewOutput | None, dict[str, Any], str]:
+    """The validated review, token usage and error (``""`` when ok) of one Batch output line."""
+    response = dict(line.get("response") or {})
+    body = dict(response.get("body") or {})
+    usage = dict(body.get("usage") or {})
+    if line.get("error"):
+        return None, usage, str(dict(line["error"]).get("message") or line["error"])
+    if int(response.get("status_code") or 0) != 200:
+        return None, usage, f"HTTP {response.get('status_code')}: {dict(body.get('error') or {}).get('message', '')}".strip()
+    try:
+        content = body["choices"][0]["message"]["content"]
+        return VacancyReviewOutput.model_validate_json(content), usage, ""
+    except (KeyError, IndexError, TypeError) as exc:
+        return None, usage, f"malformed response: {exc}"
+    except ValidationError as exc:
+        return None, usage, f"invalid review: {exc.error_count()} validation error(s)"
+
+
+def _job_dir(store: WorkspaceStore, job: dict[str, Any]) -> Path:
+    return store.paths.batch_review_dir(str(job["job_id"]))
+
+
+def active_batch_job(store: WorkspaceStore) -> dict[str, Any] | None:
+    return next((job for job in store.load_batch_review_jobs() if job.get("status") in ACTIVE_BATCH_STATUSES | {"completed"}), None)
+
+
+def prepare_batch_job(store: WorkspaceStore, *, model: str, limit: int = 0) -> dict[str, Any]:
+    preferences = store.load_preferences()
+    anamnesis = store.load_anamnesis()
+    if not preferences or not anamnesis:
+        raise RuntimeError("Нельзя анализировать вакансии без intake.")
+    vacancies = store.load_vacancies()
+    if limit:
+        vacancies = vacancies[:limit]
+    rules_markdown = compose_rules_markdown(store, preferences, anamnesis)
+    job = {
+        "job_id": store.build_run_id("batch-review"),
+        "status": "prepared",
+        "model": model,
+        "rules_hash": hashlib.sha1(rules_markdown.encode("utf-8")).hexdigest(),
+        "vacancy_ids": [item.vacancy_id for item in vacancies],
+        "request_count": len(vacancies),
+        "created_at": utc_now_iso(),
+    }
+    target = _job_dir(store, job)
+    target.mkdir(parents=True, exist_ok=True)
+    lines = build_batch_requests(vacancies, preferences, anamnesis, model=model)
+    (target / "input.jsonl").write_text("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines), encoding="utf-8")
+    store.save_batch_review_job(job)
+    return job
+
+
+def ingest_batch_output(store: WorkspaceStore, job: dict[str, Any], output_path: Path) -> dict[str, Any]:
+    """Merge the batch verdicts into the stored assessments, replacing older verdicts per vacancy."""
+    vacancies = {item.vacancy_id: item for item in store.load_vacancies()}
+    assessments = {item.vacancy_id: item for item in store.load_assessments()}
+    reviewer = OpenAIVacancyReviewer(OpenAIAppConfig(model=str(job["model"])))
+    errors: dict[str, str] = {}
+    ingested = 0
+    for raw in output_path.read_text(encoding="utf-8").splitlines():
+        if not raw.strip():
+            continue
+        line = json.loads(raw)
+        vacancy_id = str(line.get("custom_id") or "")
+        output, usage, error = parse_batch_output_line(line)
+        model = str(dict(dict(line.get("response") or {}).get("body") or {}).get("model") or job["model"])
+        prompt_tokens, completion_tokens = usage.get("prompt_tokens"), usage.get("completion_tokens")
+        cost = estimate_cost_usd("openai", model, prompt_tokens, completion_tokens)
+        LLM_USAGE.add(
+            LLMCallRecord(
+                component="vacancy_review",
+                backend="openai",
+                model=model,
+                status="ok" if output is not None else "error",
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                error_class="" if output is not None else "BatchItemError",
+                vacancy_id=vacancy_id,
+                estimated_cost_usd=cost * BATCH_PRICE_FACTOR if cost is not None else None,
+                tier="batch",
+            )
+        )
+        if vacancy_id not in vacancies:
+            errors[vacancy_id] = "vacancy no longer cached"
+            continue
+        if output is None:
+            errors[vacancy_id] = error
+            continue
+        assessment = reviewer._to_assessment(vacancies[vacancy_id], output)
+        assessment.review_strategy = BATCH_REVIEW_STRATEGY
+        assessment.review_notes = (
+            f"{assessment.review_notes} Отложенная проверка пакетом {job['job_id']} (уверенность {confidence_of(output):.0%})."
+        ).strip()
+        assessments[vacancy_id] = assessment
+        ingested += 1
+    ordered: list[VacancyAssessment] = [assessments[key] for key in vacancies if key in assessments]
+    ordered.extend(item for key, item in assessments.items() if key not in vacancies)
+    store.save_assessments(ordered)
+    return {"ingested": ingested, "errors": errors}
+
+
+def run_deferred_review(
+    store: WorkspaceStore,
+    submitter: BatchSubmitter,
+    *,
+    model: str,
+    limit: int = 0,
+    wait_sec: float = 0.0,
+    poll_interval_sec: float = 30.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> dict[str, Any]:
+    """Prepare, submit, poll and ingest one batch review job, resuming an unfinished job first.
+
+    Every step is saved to ``job.json`` before the next begins, so a restarted process picks
+    the job up where it stopped. With ``wait_sec=0`` the status is checked once and the call
+    returns; run it again later to continue. A submitted job is only resumed through the
+    submitter that accepted it: its batch id means nothing to another one.
+    """
+    job = active_batch_job(store) or prepare_batch_job(store, model=model, limit=limit)
+    if job.get("submitter") and job["submitter"] != submitter.name:
+        raise RuntimeError(
+            f"Пакет {job['job_id']} отправлен через {job['submitter']}, а не {submitter.name}; продолжите его тем же способом."
+        )
+    job_dir = _job_dir(store, job)
+    if job["status"] == "prepared":
+        job["batch_id"] = submitter.submit(job_dir / "input.jsonl", metadata={"job_id": str(job["job_id"])})
+        job["submitter"] = submitter.name
+        job["status"] = "submitted"
+        job["submitted_at"] = utc_now_iso()
+        store.save_batch_review_job(job)
+        store.record_event("batch-review", f"Отправлен пакет из {job['request_count']} вакансий на отложенную проверку.", details={"job_id": job["job_id"]})
+
+    deadline = time.monotonic() + max(0.0, wait_sec)
+    while job["status"] in ACTIVE_BATCH_STATUSES:
+        state = submitter.status(str(job["batch_id"]))
+        job["status"] = state["status"]
+        job["request_counts"] = state.get("request_counts") or job.get("request_counts") or {}
+        job["polled_at"] = utc_now_iso()
+        store.save_batch_review_job(job)
+        if job["status"] in ACTIVE_BATCH_STATUSES and time.monotonic() + poll_interval_sec <= deadline:
+            sleep(poll_interval_sec)
+            continue
+        break
+
+    if job["status"] == "completed":
+        output_path = job_dir / "output.jsonl"
+        if output_path.exists() or submitter.download(str(job["batch_id"]), output_path):
+            result = ingest_batch_output(store, job, output_path)
+            job.update(status="ingested", ingested_count=result["ingested"], errors=result["errors"], completed_at=utc_now_iso())
+            store.save_batch_review_job(job)
+            analysis_state = store.load_analysis_state()
+            analysis_state["deferred_review"] = {key: job.get(key) for key in ("job_id", "model", "request_count", "ingested_count", "completed_at")}
+            analysis_state["assessment_count"] = len(store.load_assessments())
+            store.save_analysis_state(analysis_state)
+            store.record_event(
+                "batch-review",
+                f"Загружены результаты пакета: {result['ingested']} оценок, ошибок {len(result['errors'])}.",
+                details={"job_id": job["job_id"]},
+            )
+    elif job["status"] in FAILED_BATCH_STATUSES:
+        store.record_event("batch-review", f"Пакет {job['job_id']} завершился со статусом {job['status']}.", details={"job_id": job["job_id"]})
+    return job
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import asynccontextmanager
+from typing import Any
+
+from autohhkek.services.playwright_browser import launch_chromium_resilient
+
+DEFAULT_SHUTDOWN_TIMEOUT_SEC = 15.0
+# Launch errors that mean the driver process itself is gone rather than the browser missing.
+DEAD_DRIVER_MARKERS = ("connection closed", "pipe closed", "driver", "has been closed")
+BrowserKey = tuple[str, bool]
+
+
+async def _start_playwright():
+    from playwright.async_api import async_playwright
+
+    return await async_playwright().start()
+
+
+class BrowserService:
+    """Per-process Playwright driver with one warm Chromium per (account, headless) pair.
+
+    Playwright objects are bound to the event loop that created them, so everything runs on
+    one long-lived loop thread owned by the service; synchronous callers (CLI, dashboard
+    worker threads) submit coroutines through ``run``. A browser that crashed or was closed
+    is relaunched on the next request, and a dead driver is restarted once before giving up.
+    """
+
+    def __init__(
+        self,
+        *,
+        start_playwright: Callable[[], Awaitable[Any]] = _start_playwright,
+        launch: Callable[..., Awaitable[Any]] = launch_chromium_resilient,
+    ) -> None:
+        self._start_playwright = start_playwright
+        self._launch = launch
+        self._playwright = None
+        self._browsers: dict[BrowserKey, Any] = {}
+        self._launch_locks: dict[BrowserKey, asyncio.Lock] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _serve() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                loop.close()
+
+            thread = threading.Thread(target=_serve, name="autohhkek-browser-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._thread = thread
+            return loop
+
+    def run(self, factory: Callable[[], Coroutine[Any, Any, Any]], *, timeout: float | None = None) -> Any:
+        """Run ``factory()`` on the browser loop and wait for its result from a synchronous caller."""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BrowserService.run must not be called from the browser loop; await the coroutine instead.")
+        future = asyncio.run_coroutine_threadsafe(factory(), loop)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            raise TimeoutError(f"Browser task timed out after {timeout:.0f}s") from exc
+
+    async def _ensure_playwright(self):
+        if self._playwright is None:
+            self._playwright = await self._start_playwright()
+            self._count("driver_starts")
+        return self._playwright
+
+    async def _restart_playwright(self) -> None:
+        playwright, self._playwright = self._playwright, None
+        browsers, self._browsers = list(self._browsers.values()), {}
+        for browser in browsers:
+            await _quietly(browser.close())
+        if playwright is not None:
+            await _quietly(playwright.stop())
+        self._count("driver_restarts")
+
+    async def browser(self, account_key: str = "default", *, headless: bool = True):
+        """A connected browser for ``account_key``, launched or relaunched when needed."""
+        key = (str(account_key or "default"), bool(headless))
+        lock = self._launch_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            current = self._browsers.get(key)
+            if current is not None and _is_connected(current):
+                self._count("browser_reuses")
+                return current
+            if current is not None:
+                self._browsers.pop(key, None)
+                self._count("relaunches")
+            try:
+                browser = await self._launch(await self._ensure_playwright(), headless=headless)
+            except Exception as exc:  # noqa: BLE001
+                if self._playwright is None or not any(marker in str(exc).lower() for marker in DEAD_DRIVER_MARKERS):
+                    raise
+                await self._restart_playwright()
+                browser = await self._launch(await self._ensure_playwright(), headless=headless)
+            self._browsers[key] = browser
+            self._count("launches")
+            return browser
+
+    @asynccontextmanager
+    async def context(self, account_key: str = "default", *, headless: bool = True, **context_kwargs) -> AsyncIterator[Any]:
+        """A fresh browser context on the warm browser, closed on exit; the browser stays up."""
+        browser = await self.browser(account_key, headless=headless)
+        context = await browser.new_context(**context_kwargs)
+        self._count("contexts")
+        try:
+            yield context
+        finally:
+            await _quietly(context.close())
+
+    async def probe(self) -> None:
+        """Check that a browser can be launched, keeping it warm for the default account."""
+        if not any(_is_connected(browser) for browser in self._browsers.values()):
+            await self.browser()
+
+    async def _close_all(self) -> None:
+        browsers, self._browsers = list(self._browsers.values()), {}
+        for browser in browsers:
+            await _quietly(browser.close())
+        playwright, self._playwright = self._playwright, None
+        if playwright is not None:
+            await _quietly(playwright.stop())
+        self._launch_locks.clear()
+
+    def shutdown(self, *, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT_SEC) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        future = asyncio.run_coroutine_threadsafe(self._close_all(), loop)
+        try:
+            future.result(timeout=timeout)
+        except Exception:  # noqa: BLE001
+            future.cancel()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "browsers": sorted(f"{account}:{'headless' if headless else 'headed'}" for account, headless in self._browsers),
+            "driver_running": self._playwright is not None,
+            "loop_alive": bool(self._thread and self._thread.is_alive()),
+            **dict(sorted(self._counters.items())),
+        }
+
+
+def _is_connected(browser) -> bool:
+    try:
+        return bool(browser.is_connected())
+    except Exception:  # noqa: BLE001
+        return False
+
+
+async def _quietly(awaitable) -> None:
+    try:
+        await awaitable
+    except Exception:  # noqa: BLE001
+        pass
+
+
+BROWSER_SERVICE = BrowserService()
+atexit.register(BROWSER_SERVICE.shutdown)
@@ -38,3 +38,25 @@ def load_dotenv(project_root: Path | None = None, *, override: bool = False) ->
 
 def load_project_dotenv(project_root: Path | None = None, *, override: bool = False) -> dict[str, str]:
     return load_dotenv(project_root, override=override)
+
+
+def env_float(name: str, default: float) -> float:
+    """``float`` from the environment; unset, empty or malformed values give ``default``."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    """``int`` from the environment; unset, empty or malformed values give ``default``."""
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
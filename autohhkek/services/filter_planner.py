@@ -3,6 +3,7 @@ from __future__ import annotations
 import re
 from urllib.parse import urlencode
 from autohhkek.agents.g4f_filter_agent import G4FHHFilterAgent
+from autohhkek.agents.local_llm_filter_agent import LocalLLMHHFilterAgent
 from autohhkek.agents.openai_filter_agent import OpenAIHHFilterAgent
 from autohhkek.agents.openrouter_filter_agent import OpenRouterHHFilterAgent
 from autohhkek.domain.models import Anamnesis, UserPreferences
@@ -67,10 +68,12 @@ class HHFilterPlanner:
             planner_backend = {
                 "g4f": "g4f_agent",
                 "openrouter": "openrouter_agent",
+                "local": "local_llm_agent",
             }.get(self.llm_backend, "openai_agent")
             strategy = {
                 "g4f": "script_first_with_g4f_planning",
                 "openrouter": "script_first_with_openrouter_planning",
+                "local": "script_first_with_local_llm_planning",
             }.get(self.llm_backend, "script_first_with_openai_planning")
             if not resume_first_search and llm_plan.search_text.strip():
                 search_text = llm_plan.search_text.strip()
@@ -222,6 +225,8 @@ class HHFilterPlanner:
             return G4FHHFilterAgent()
         if llm_backend == "openrouter":
             return OpenRouterHHFilterAgent()
+        if llm_backend == "local":
+            return LocalLLMHHFilterAgent()
         return OpenAIHHFilterAgent()
 
     def _heuristic_follow_up_texts(self) -> list[str]:
@@ -277,7 +282,7 @@ class HHFilterPlanner:
                     "id": f"followup_kw_{i + 1}",
                     "query_params": qp,
                     "initial_max_pages": 6,
-                    "persist_serp_cache": False,
+                    "persist_serp_cache": True,
                     "max_pages_cap": 6,
                 }
             )
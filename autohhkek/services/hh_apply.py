@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 import json
 from pathlib import Path
 from typing import Any
 
 from autohhkek.domain.models import utc_now_iso
-from autohhkek.services.playwright_browser import launch_chromium_resilient
+from autohhkek.services.browser_service import BROWSER_SERVICE
 from autohhkek.services.storage import WorkspaceStore
 
 APPLY_SELECTORS = [
@@ -104,19 +103,16 @@ def _has_any_token(text: str, tokens: tuple[str, ...]) -> bool:
     return any(token in normalized for token in tokens)
 
 
-async def _launch_apply_browser(playwright):
-    return await launch_chromium_resilient(playwright, headless=False)
-
-
 async def _run_apply_flow(
     *,
     state_path: Path,
     vacancy_url: str,
     resume_id: str,
     cover_letter: str,
+    account_key: str = "default",
 ) -> dict[str, Any]:
     try:
-        from playwright.async_api import async_playwright
+        import playwright.async_api  # noqa: F401
     except ImportError as exc:  # pragma: no cover
         return {
             "status": "failed",
@@ -131,9 +127,7 @@ async def _run_apply_flow(
             "message": "hh_state.json is missing. Login to hh.ru first.",
         }
 
-    async with async_playwright() as playwright:
-        browser = await _launch_apply_browser(playwright)
-        context = await browser.new_context(storage_state=storage_state, locale="ru-RU")
+    async with BROWSER_SERVICE.context(account_key, headless=False, storage_state=storage_state, locale="ru-RU") as context:
         page = await context.new_page()
         try:
             await page.goto(vacancy_url, wait_until="domcontentloaded", timeout=60000)
@@ -264,8 +258,6 @@ async def _run_apply_flow(
         finally:
             state_payload = await context.storage_state()
             state_path.write_text(json.dumps(state_payload, ensure_ascii=False, indent=2), encoding="utf-8")
-            await context.close()
-            await browser.close()
 
 
 def run_hh_apply(
@@ -280,14 +272,15 @@ def run_hh_apply(
             "status": "failed",
             "message": "Не передан URL вакансии.",
         }
-    state_path = WorkspaceStore(Path(project_root).resolve()).hh_state_path
+    store = WorkspaceStore(Path(project_root).resolve())
     try:
-        return asyncio.run(
-            _run_apply_flow(
-                state_path=state_path,
+        return BROWSER_SERVICE.run(
+            lambda: _run_apply_flow(
+                state_path=store.hh_state_path,
                 vacancy_url=vacancy_url.strip(),
                 resume_id=resume_id.strip(),
                 cover_letter=cover_letter,
+                account_key=store.paths.account_key,
             )
         )
     except PermissionError as exc:
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+from autohhkek.services.env_loader import env_float, env_int
+
+DEFAULT_DETAIL_PAGES = 4
+MAX_DETAIL_PAGES = 16
+DEFAULT_HOST_DELAY_SEC = 0.3
+DEFAULT_DETAIL_ATTEMPTS = 2
+DEFAULT_DETAIL_TIMEOUT_MS = 60000
+RETRY_BACKOFF_SEC = 1.0
+
+ExtractFn = Callable[[Any], Awaitable[dict[str, object]]]
+
+
+@dataclass(slots=True)
+class DetailFetchConfig:
+    pages: int = DEFAULT_DETAIL_PAGES
+    host_delay_sec: float = DEFAULT_HOST_DELAY_SEC
+    attempts: int = DEFAULT_DETAIL_ATTEMPTS
+    timeout_ms: int = DEFAULT_DETAIL_TIMEOUT_MS
+
+    @classmethod
+    def from_env(cls) -> "DetailFetchConfig":
+        return cls(
+            pages=min(MAX_DETAIL_PAGES, max(1, env_int("AUTOHHKEK_HH_DETAIL_PAGES", DEFAULT_DETAIL_PAGES))),
+            host_delay_sec=max(0.0, env_float("AUTOHHKEK_HH_HOST_DELAY_SEC", DEFAULT_HOST_DELAY_SEC)),
+            attempts=max(1, env_int("AUTOHHKEK_HH_DETAIL_ATTEMPTS", DEFAULT_DETAIL_ATTEMPTS)),
+        )
+
+
+@dataclass(slots=True)
+class DetailFetchStats:
+    requested: int = 0
+    fetched: int = 0
+    failed: int = 0
+    retries: int = 0
+    pages: int = 0
+    elapsed_sec: float = 0.0
+    busy_sec: float = 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Summed per-page load time over wall time: how much faster than one page in a row."""
+        return self.busy_sec / self.elapsed_sec if self.elapsed_sec > 0 else 1.0
+
+    def merge(self, other: "DetailFetchStats") -> None:
+        """Add the counters of a later batch; ``pages`` keeps the widest pool."""
+        self.requested += other.requested
+        self.fetched += other.fetched
+        self.failed += other.failed
+        self.retries += other.retries
+        self.pages = max(self.pages, other.pages)
+        self.elapsed_sec += other.elapsed_sec
+        self.busy_sec += other.busy_sec
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "requested": self.requested,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "retries": self.retries,
+            "pages": self.pages,
+            "elapsed_sec": round(self.elapsed_sec, 2),
+            "sequential_estimate_sec": round(self.busy_sec, 2),
+            "speedup": round(self.speedup, 2),
+        }
+
+    def summary_line(self) -> str:
+        return (
+            f"Описания загружены: {self.fetched}/{self.requested} за {self.elapsed_sec:.1f}s в {self.pages} вкладках "
+            f"(последовательно ~{self.busy_sec:.1f}s, ускорение x{self.speedup:.1f}; повторов {self.retries}, ошибок {self.failed})."
+        )
+
+
+class HostPoliteness:
+    """Spaces request starts to the same host by ``delay_sec``, across every worker of the pool."""
+
+    def __init__(self, delay_sec: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.delay_sec = max(0.0, float(delay_sec))
+        self.clock = clock
+        self._next_start: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, url: str) -> None:
+        if self.delay_sec <= 0:
+            return
+        host = urlsplit(url).netloc.lower()
+        async with self._lock:
+            now = self.clock()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.delay_sec
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def fetch_vacancy_details(
+    context,
+    items: list[dict[str, Any]],
+    extract: ExtractFn,
+    *,
+    config: DetailFetchConfig | None = None,
+    log: Callable[[str], None] | None = None,
+) -> DetailFetchStats:
+    """Load detail pages for ``items`` on a pool of pages of one browser context and merge them in place.
+
+    Pages of the same context share its cookies, so every worker browses as the logged-in user.
+    Items keep their order because results are written back into the dicts they came from.
+    """
+    config = config or DetailFetchConfig()
+    queue: asyncio.Queue[tuple[int, dict[str, Any]]] = asyncio.Queue()
+    for index, item in enumerate(items):
+        if str(item.get("url") or "").strip():
+            queue.put_nowait((index, item))
+    stats = DetailFetchStats(requested=queue.qsize(), pages=min(max(1, config.pages), max(1, queue.qsize())))
+    if not stats.requested:
+        return stats
+    politeness = HostPoliteness(config.host_delay_sec)
+    done = 0
+
+    async def _fetch(page, url: str) -> dict[str, object] | None:
+        for attempt in range(1, config.attempts + 1):
+            await politeness.wait(url)
+            started = time.perf_counter()
+            try:
+                await page.goto(url, wait_until="domcontentloaded", timeout=config.timeout_ms)
+                detail = await extract(page)
+            except Exception:  # noqa: BLE001
+                stats.busy_sec += time.perf_counter() - started
+                if attempt >= config.attempts:
+                    return None
+                stats.retries += 1
+                await asyncio.sleep(RETRY_BACKOFF_SEC * attempt)
+                continue
+            stats.busy_sec += time.perf_counter() - started
+            return detail
+        return None
+
+    async def _worker() -> None:
+        nonlocal done
+        page = await context.new_page()
+        try:
+            while True:
+                try:
+                    index, item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                url = str(item.get("url") or "").strip()
+                detail = await _fetch(page, url)
+                if detail is None:
+                    stats.failed += 1
+                else:
+                    stats.fetched += 1
+                    merge_detail(item, detail)
+                    item["detail_source"] = "browser"
+                done += 1
+                if log and (done % 8 == 0 or done == stats.requested):
+                    log(f"Страницы вакансий: {done}/{stats.requested} (последняя: {str(item.get('title') or url)[:72]})")
+        finally:
+            await page.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(stats.pages)))
+    stats.elapsed_sec = time.perf_counter() - started
+    return stats
+
+
+def merge_detail(item: dict[str, Any], detail: dict[str, object]) -> None:
+    description = str(detail.get("description") or "").strip()
+    if description:
+        item["description"] = description
+    skills = [str(skill).strip() for skill in list(detail.get("skills") or []) if str(skill).strip()]
+    if skills:
+        item["skills"] = skills
+    for key in ("experience", "schedule", "published_at"):
+        value = str(detail.get(key) or "").strip()
+        if value:
+            item[key] = value
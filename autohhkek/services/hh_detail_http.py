@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any
+
+from autohhkek.services.env_loader import env_float, env_int
+from autohhkek.services.hh_detail_fetch import HostPoliteness, merge_detail
+
+DEFAULT_HTTP_CONCURRENCY = 16
+DEFAULT_HTTP_HOST_DELAY_SEC = 0.05
+DEFAULT_HTTP_TIMEOUT_SEC = 20.0
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+CAPTCHA_MARKERS = ("captcha", "подтвердите, что вы не робот", "вы не робот")
+LOGIN_URL_MARKERS = ("/account/login", "/login", "/oauth/authorize")
+# data-qa markers of the vacancy page; each field lists current and older layouts.
+DETAIL_FIELDS = {
+    "title": ("vacancy-title",),
+    "description": ("vacancy-description",),
+    "skills": ("skills-element", "bloko-tag__text"),
+    "experience": ("vacancy-experience",),
+    "schedule": (
+        "vacancy-view-employment-mode",
+        "common-employment-text",
+        "work-schedule-by-days-text",
+        "working-hours-text",
+        "work-formats-text",
+    ),
+    "published": ("vacancy-creation-time-redesigned", "vacancy-creation-time"),
+}
+BLOCK_TAGS = {"p", "div", "li", "br", "ul", "ol", "h1", "h2", "h3", "h4", "section", "tr"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+PUBLISHED_PATTERN = re.compile(r"Вакансия опубликована\s+(.+?)(?:\s+в\s+[А-ЯЁA-Z][^\d]*)?$")
+
+
+@dataclass(slots=True)
+class HttpDetailConfig:
+    enabled: bool = True
+    concurrency: int = DEFAULT_HTTP_CONCURRENCY
+    host_delay_sec: float = DEFAULT_HTTP_HOST_DELAY_SEC
+    timeout_sec: float = DEFAULT_HTTP_TIMEOUT_SEC
+
+    @classmethod
+    def from_env(cls) -> "HttpDetailConfig":
+        return cls(
+            enabled=os.getenv("AUTOHHKEK_HH_HTTP_DETAILS", "1").strip().lower() not in {"0", "false", "no", "off"},
+            concurrency=max(1, env_int("AUTOHHKEK_HH_HTTP_CONCURRENCY", DEFAULT_HTTP_CONCURRENCY)),
+            host_delay_sec=max(0.0, env_float("AUTOHHKEK_HH_HTTP_HOST_DELAY_SEC", DEFAULT_HTTP_HOST_DELAY_SEC)),
+        )
+
+
+@dataclass(slots=True)
+class HttpDetailStats:
+    requested: int = 0
+    fetched: int = 0
+    fallbacks: dict[str, int] = field(default_factory=dict)
+    elapsed_sec: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.fetched / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+    def merge(self, other: "HttpDetailStats") -> None:
+        self.requested += other.requested
+        self.fetched += other.fetched
+        for reason, count in other.fallbacks.items():
+            self.fallbacks[reason] = self.fallbacks.get(reason, 0) + count
+        self.elapsed_sec += other.elapsed_sec
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "requested": self.requested,
+            "fetched": self.fetched,
+            "fallbacks": dict(sorted(self.fallbacks.items())),
+            "elapsed_sec": round(self.elapsed_sec, 2),
+            "per_second": round(self.per_second, 1),
+        }
+
+    def summary_line(self) -> str:
+        fallback = sum(self.fallbacks.values())
+        reasons = ", ".join(f"{reason} {count}" for reason, count in sorted(self.fallbacks.items()))
+        return (
+            f"HTTP-описания: {self.fetched}/{self.requested} за {self.elapsed_sec:.1f}s ({self.per_second:.1f}/с); "
+            f"в браузер уходит {fallback}{f' ({reasons})' if reasons else ''}."
+        )
+
+
+class _VacancyDetailParser(HTMLParser):
+    """Collects the text of elements whose ``data-qa`` matches one of ``DETAIL_FIELDS``."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.values: dict[str, list[str]] = {}
+        self._open: list[tuple[str, int, list[str]]] = []
+        self._depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in BLOCK_TAGS:
+            for _, _, chunks in self._open:
+                chunks.append("\n")
+        if tag in VOID_TAGS:
+            return
+        self._depth += 1
+        data_qa = str(dict(attrs).get("data-qa") or "")
+        if not data_qa:
+            return
+        tokens = data_qa.split()
+        for name, markers in DETAIL_FIELDS.items():
+            if any(marker in tokens for marker in markers):
+                self._open.append((name, self._depth, []))
+                return
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in VOID_TAGS:
+            return
+        while self._open and self._open[-1][1] >= self._depth:
+            name, _, chunks = self._open.pop()
+            text = _normalize_text("".join(chunks))
+            if text:
+                self.values.setdefault(name, []).append(text)
+                for _, _, parent in self._open:
+                    parent.append(" ")
+        self._depth = max(0, self._depth - 1)
+
+    def handle_data(self, data: str) -> None:
+        for _, _, chunks in self._open:
+            chunks.append(data)
+
+    def close(self) -> None:
+        super().close()
+        # Unclosed tags inside a captured block leave it open at EOF; keep what was read.
+        while self._open:
+            name, _, chunks = self._open.pop()
+            text = _normalize_text("".join(chunks))
+            if text:
+                self.values.setdefault(name, []).append(text)
+
+
+def _normalize_text(value: str) -> str:
+    lines = [re.sub(r"[ \t  ]+", " ", line).strip() for line in value.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def parse_vacancy_detail_html(html: str) -> dict[str, object]:
+    parser = _VacancyDetailParser()
+    parser.feed(html)
+    parser.close()
+    values = parser.values
+    published = " ".join(values.get("published", [])[:1])
+    match = PUBLISHED_PATTERN.search(published)
+    return {
+        "title": " ".join(values.get("title", [])[:1]),
+        "description": "\n".join(values.get("description", [])[:1]),
+        "skills": list(dict.fromkeys(values.get("skills", []))),
+        "experience": " ".join(values.get("experience", [])[:1]),
+        "schedule": "; ".join(dict.fromkeys(values.get("schedule", []))),
+        "published_at": match.group(1).strip() if match else published,
+    }
+
+
+def fallback_reason(status_code: int, final_url: str, html: str, detail: dict[str, object]) -> str:
+    """Why a response cannot be used without a browser, ``""`` when the parsed detail is good."""
+    lowered_url = final_url.lower()
+    if any(marker in lowered_url for marker in LOGIN_URL_MARKERS):
+        return "login_redirect"
+    head = html[:20000].lower()
+    if "/captcha" in lowered_url or status_code in {403, 429} or any(marker in head for marker in CAPTCHA_MARKERS):
+        return "captcha"
+    if status_code != 200:
+        return f"http_{status_code}"
+    if not detail.get("description"):
+        return "js_shell"
+    return ""
+
+
+def cookies_from_state(state_payload: dict[str, Any]):
+    import httpx
+
+    jar = httpx.Cookies()
+    for cookie in list(state_payload.get("cookies") or []):
+        name = str(cookie.get("name") or "")
+        if name:
+            jar.set(name, str(cookie.get("value") or ""), domain=str(cookie.get("domain") or ""), path=str(cookie.get("path") or "/"))
+    return jar
+
+
+def build_http_client(state_payload: dict[str, Any], config: HttpDetailConfig):
+    """An ``httpx.AsyncClient`` carrying the saved hh.ru cookies, sized for ``config.concurrency``."""
+    import httpx
+
+    return httpx.AsyncClient(
+        cookies=cookies_from_state(state_payload),
+        headers={"User-Agent": HTTP_USER_AGENT, "Accept-Language": "ru-RU,ru;q=0.9"},
+        follow_redirects=True,
+        timeout=config.timeout_sec,
+        limits=httpx.Limits(max_connections=config.concurrency, max_keepalive_connections=config.concurrency),
+    )
+
+
+async def fetch_vacancy_details_http(
+    items: list[dict[str, Any]],
+    state_payload: dict[str, Any],
+    *,
+    config: HttpDetailConfig | None = None,
+    client=None,
+    log: Callable[[str], None] | None = None,
+) -> tuple[HttpDetailStats, list[dict[str, Any]]]:
+    """Fetch ``/vacancy/<id>`` HTML with the saved hh.ru cookies and merge parsed details in place.
+
+    Returns the stats and the items that still need the browser (captcha, login redirect,
+    JS-only shell, network errors).
+    """
+    import httpx
+
+    config = config or HttpDetailConfig()
+    targets = [item for item in items if str(item.get("url") or "").strip()]
+    stats = HttpDetailStats(requested=len(targets))
+    if not targets:
+        return stats, []
+    politeness = HostPoliteness(config.host_delay_sec)
+    semaphore = asyncio.Semaphore(config.concurrency)
+    fallback: list[dict[str, Any]] = []
+    owns_client = client is None
+    if owns_client:
+        client = build_http_client(state_payload, config)
+
+    async def _one(item: dict[str, Any]) -> None:
+        url = str(item.get("url") or "").strip()
+        async with semaphore:
+            await politeness.wait(url)
+            try:
+                response = await client.get(url)
+                html = response.text
+                detail = parse_vacancy_detail_html(html)
+                reason = fallback_reason(response.status_code, str(response.url), html, detail)
+            except (httpx.HTTPError, ValueError) as exc:
+                reason, detail = f"network_{exc.__class__.__name__}", {}
+        if reason:
+            stats.fallbacks[reason] = stats.fallbacks.get(reason, 0) + 1
+            fallback.append(item)
+            return
+        merge_detail(item, detail)
+        item["detail_source"] = "http"
+        stats.fetched += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(_one(item) for item in targets))
+    finally:
+        if owns_client:
+            await client.aclose()
+    stats.elapsed_sec = time.perf_counter() - started
+    if log:
+        log(stats.summary_line())
+    order = {id(item): index for index, item in enumerate(items)}
+    return stats, sorted(fallback, key=lambda item: order[id(item)])
@@ -1,17 +1,86 @@
 from __future__ import annotations
 
-import asyncio
 import hashlib
 import json
 import os
 import re
-from pathlib import Path
+import time
 from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
 
 from autohhkek.domain.models import Vacancy
-from autohhkek.services.playwright_browser import launch_chromium_resilient
+from autohhkek.services.analysis import VacancyRuleEngine
+from autohhkek.services.browser_service import BROWSER_SERVICE
+from autohhkek.services.env_loader import env_float, env_int
+from autohhkek.services.hh_detail_fetch import DetailFetchConfig, DetailFetchStats, fetch_vacancy_details
+from autohhkek.services.hh_detail_http import HttpDetailConfig, HttpDetailStats, build_http_client, fetch_vacancy_details_http
+from autohhkek.services.lean_scraping import LeanScrapingConfig, apply_scraping_profile, update_profile_timings
+from autohhkek.services.refresh_pipeline import PipelineConfig, PipelineStage, StreamingPipeline
+from autohhkek.services.serp_cache import DEFAULT_SERP_CACHE_SAMPLE_PAGES, DEFAULT_SERP_CACHE_TTL_SEC, SerpPageCache, serp_query_key
+from autohhkek.services.serp_prescore import SerpPrescore, prescore_serp_cards
+from autohhkek.services.vacancy_clusters import VacancyClusterIndex, annotate_vacancy_clusters
 from autohhkek.services.vacancy_dedupe import dedupe_remote_same_posting_different_region, merge_serp_by_url
 
+DEFAULT_SERP_INTERVAL_SEC = 1.0
+MAX_SERP_TABS = 8
+DEFAULT_KNOWN_PAGE_STREAK = 2
+DEFAULT_FULL_SWEEP_HOURS = 24.0
+# Cards per pipeline item in streaming mode: one SERP page.
+STREAM_CHUNK_SIZE = 20
+DETAIL_FIELDS = ("description", "skills", "experience", "schedule", "published_at", "detail_source")
+# Card text that changes while the posting itself does not.
+VOLATILE_SNIPPET_PATTERNS = (
+    re.compile(r"сейчас смотр\w*\s+\d+\s+\w+", re.IGNORECASE),
+    re.compile(r"\d+\s+отклик\w*", re.IGNORECASE),
+    re.compile(r"(?:был[аи]?\s+)?онлайн\s+\S+(?:\s+назад)?", re.IGNORECASE),
+)
+
+
+@dataclass(slots=True)
+class SerpPaginationConfig:
+    """``tabs`` above 1 switches SERP pagination to the concurrent mode; starts stay ``interval_sec`` apart.
+
+    ``cache_ttl_sec`` is how long a walked SERP may be reused while its first page is unchanged;
+    ``cache_sample_pages`` middle pages are re-checked along with the last one before reuse.
+    """
+
+    tabs: int = 1
+    interval_sec: float = DEFAULT_SERP_INTERVAL_SEC
+    cache_ttl_sec: float = DEFAULT_SERP_CACHE_TTL_SEC
+    cache_sample_pages: int = DEFAULT_SERP_CACHE_SAMPLE_PAGES
+
+    @classmethod
+    def from_env(cls) -> "SerpPaginationConfig":
+        return cls(
+            tabs=min(MAX_SERP_TABS, max(1, env_int("AUTOHHKEK_HH_SERP_TABS", 1))),
+            interval_sec=max(0.0, env_float("AUTOHHKEK_HH_SERP_INTERVAL_SEC", DEFAULT_SERP_INTERVAL_SEC)),
+            cache_ttl_sec=max(0.0, env_float("AUTOHHKEK_HH_SERP_CACHE_TTL_SEC", DEFAULT_SERP_CACHE_TTL_SEC)),
+            cache_sample_pages=max(0, env_int("AUTOHHKEK_HH_SERP_CACHE_SAMPLE_PAGES", DEFAULT_SERP_CACHE_SAMPLE_PAGES)),
+        )
+
+
+@dataclass(slots=True)
+class IncrementalRefreshConfig:
+    """Stop SERP pagination after ``known_pages`` fully known pages; walk everything every ``full_sweep_hours``."""
+
+    enabled: bool = True
+    known_pages: int = DEFAULT_KNOWN_PAGE_STREAK
+    full_sweep_hours: float = DEFAULT_FULL_SWEEP_HOURS
+
+    @classmethod
+    def from_env(cls) -> "IncrementalRefreshConfig":
+        return cls(
+            enabled=os.getenv("AUTOHHKEK_HH_INCREMENTAL", "1").strip().lower() not in {"0", "false", "no", "off"},
+            known_pages=max(1, env_int("AUTOHHKEK_HH_INCREMENTAL_KNOWN_PAGES", DEFAULT_KNOWN_PAGE_STREAK)),
+            full_sweep_hours=max(0.0, env_float("AUTOHHKEK_HH_FULL_SWEEP_HOURS", DEFAULT_FULL_SWEEP_HOURS)),
+        )
+
+    def full_sweep_due(self, last_full_sweep_at: float, *, now: float | None = None) -> bool:
+        if not self.enabled or last_full_sweep_at <= 0:
+            return True
+        return (time.time() if now is None else now) - last_full_sweep_at >= self.full_sweep_hours * 3600
+
 
 class HHVacancyRefresher:
     def __init__(
@@ -21,14 +90,46 @@ class HHVacancyRefresher:
         resume_id: str = "",
         state_path: Path | None = None,
         search_runner: Callable[..., object] | None = None,
+        detail_config: DetailFetchConfig | None = None,
+        scraping_config: LeanScrapingConfig | None = None,
+        http_detail_config: HttpDetailConfig | None = None,
+        serp_config: SerpPaginationConfig | None = None,
+        incremental_config: IncrementalRefreshConfig | None = None,
+        pipeline_config: PipelineConfig | None = None,
     ) -> None:
         self.store = store
         selected_resume_id = self.store.load_selected_resume_id() if hasattr(self.store, "load_selected_resume_id") else ""
         self.resume_id = (resume_id or selected_resume_id or os.getenv("AUTOHHKEK_HH_RESUME_ID", "")).strip()
         self.state_path = Path(state_path) if state_path else self.store.hh_state_path
         self.search_runner = search_runner or self._run_live_refresh
+        self.detail_config = detail_config or DetailFetchConfig.from_env()
+        self.scraping_config = scraping_config or LeanScrapingConfig.from_env()
+        self.http_detail_config = http_detail_config or HttpDetailConfig.from_env()
+        self.serp_config = serp_config or SerpPaginationConfig.from_env()
+        self.incremental_config = incremental_config or IncrementalRefreshConfig.from_env()
+        self.pipeline_config = pipeline_config or PipelineConfig.from_env()
+
+    @property
+    def can_stream(self) -> bool:
+        """Whether ``refresh`` can feed ``downstream`` pipeline stages: only the live hh.ru search streams."""
+        return self.search_runner == self._run_live_refresh
 
-    def refresh(self, *, limit: int = 0, log_line: Callable[[str], None] | None = None) -> dict[str, object]:
+    def refresh(
+        self,
+        *,
+        limit: int = 0,
+        full_sweep: bool = False,
+        downstream: list[PipelineStage] | None = None,
+        log_line: Callable[[str], None] | None = None,
+    ) -> dict[str, object]:
+        """Search hh.ru and store the vacancy queue.
+
+        With ``downstream`` stages the detail stage of the live search runs as a
+        ``StreamingPipeline``: every extracted ``Vacancy`` is handed to them while details of
+        later cards are still loading. The SERP itself is walked, deduplicated and prescored
+        in full first, so the global best-first order holds at the cost of the first verdict
+        waiting for the SERP walk.
+        """
         def _log(msg: str) -> None:
             if log_line:
                 log_line(str(msg or "").strip())
@@ -47,9 +148,20 @@ class HHVacancyRefresher:
                 "reason": "login_required",
                 "message": "Нет сохраненной сессии hh.ru. Сначала выполните вход.",
             }
+        # Read before the search: a streaming run persists partial queues while it goes.
+        stored_vacancies = self.store.load_vacancies()
         try:
-            if self.search_runner is self._run_live_refresh:
-                runner_result = self._run_live_refresh(self.resume_id, limit, log_line=log_line)
+            if self.search_runner == self._run_live_refresh:
+                last_sweep = float(self.store.load_dashboard_state().get("last_full_serp_sweep_at") or 0.0)
+                incremental = not full_sweep and not self.incremental_config.full_sweep_due(last_sweep)
+                _log("Инкрементальное обновление выдачи." if incremental else "Полный проход выдачи.")
+                runner_result = self._run_live_refresh(
+                    self.resume_id,
+                    limit,
+                    incremental=incremental,
+                    downstream=downstream,
+                    log_line=log_line,
+                )
             else:
                 runner_result = self.search_runner(self.resume_id, limit)
         except Exception as exc:  # noqa: BLE001
@@ -68,7 +180,7 @@ class HHVacancyRefresher:
         vacancies = list(vacancies or [])
         metadata = dict(metadata or {})
 
-        known_ids = {item.vacancy_id for item in self.store.load_vacancies()}
+        known_ids = {item.vacancy_id for item in stored_vacancies}
         unique_vacancies: list[Vacancy] = []
         seen_ids: set[str] = set()
         for vacancy in vacancies:
@@ -77,8 +189,21 @@ class HHVacancyRefresher:
             seen_ids.add(vacancy.vacancy_id)
             unique_vacancies.append(vacancy)
         new_ids = [item.vacancy_id for item in unique_vacancies if item.vacancy_id not in known_ids]
+        sweep = str(metadata.get("sweep") or "")
+        if sweep == "incremental":
+            # Pages past the stop point were not walked; keep what the last sweeps found there.
+            carried = [item for item in stored_vacancies if item.vacancy_id not in seen_ids]
+            unique_vacancies.extend(carried)
+            _log(f"Инкрементально: с hh.ru {len(seen_ids)} карточек, из прошлой очереди сохранено {len(carried)}.")
+        elif sweep == "full":
+            self.store.update_dashboard_state({"last_full_serp_sweep_at": time.time()})
 
-        if vacancies:
+        if unique_vacancies:
+            cluster_index = VacancyClusterIndex.load(self.store.paths.vacancy_clusters_path) or VacancyClusterIndex()
+            near_duplicates = annotate_vacancy_clusters(unique_vacancies, cluster_index.assign(unique_vacancies))
+            cluster_index.save(self.store.paths.vacancy_clusters_path)
+            if near_duplicates:
+                _log(f"Найдено почти-дубликатов вакансий (перепосты, копии по городам): {near_duplicates}.")
             _log(f"Сохраняю {len(unique_vacancies)} карточек (новых id: {len(new_ids)}).")
             total_available = int(metadata.get("total_available") or 0)
             pages_parsed = int(metadata.get("pages_parsed") or 0)
@@ -101,9 +226,14 @@ class HHVacancyRefresher:
                     "resume_id": self.resume_id,
                     "count": len(unique_vacancies),
                     "new_count": len(new_ids),
+                    "near_duplicate_count": near_duplicates,
                     "total_available": total_available,
                     "pages_parsed": pages_parsed,
                     "search_url": search_url,
+                    "detail_fetch": metadata.get("detail_fetch") or {},
+                    "scraping": metadata.get("scraping") or {},
+                    "prescore": metadata.get("prescore") or {},
+                    "sweep": sweep,
                 },
             )
             total_suffix = f" На hh.ru найдено {total_available}." if total_available else ""
@@ -117,9 +247,13 @@ class HHVacancyRefresher:
                 ),
                 "count": len(unique_vacancies),
                 "new_count": len(new_ids),
+                "near_duplicate_count": near_duplicates,
                 "total_available": total_available,
                 "pages_parsed": pages_parsed,
                 "search_url": search_url,
+                "detail_fetch": metadata.get("detail_fetch") or {},
+                "scraping": metadata.get("scraping") or {},
+                "pipeline": metadata.get("pipeline") or [],
             }
 
         _log("Выдача пуста — сохраняю пустую локальную очередь.")
@@ -152,17 +286,17 @@ class HHVacancyRefresher:
         resume_id: str,
         limit: int,
         *,
+        incremental: bool = False,
+        downstream: list[PipelineStage] | None = None,
         log_line: Callable[[str], None] | None = None,
     ) -> tuple[list[Vacancy], dict[str, object]]:
         async def _inner() -> tuple[list[Vacancy], dict[str, object]]:
             def _log(msg: str) -> None:
                 if log_line:
                     log_line(str(msg or "").strip())
-            from playwright.async_api import async_playwright
-
             from logic.vacancy_parser import extract_vacancy_detail, search_vacancies
 
-            _log("Запускаю Chromium и подставляю cookies hh.ru.")
+            _log("Открываю контекст в общем браузере и подставляю cookies hh.ru.")
             state_payload = json.loads(self.state_path.read_text(encoding="utf-8"))
             cookies = list(state_payload.get("cookies") or [])
             filter_plan = self.store.load_filter_plan() or {}
@@ -177,14 +311,21 @@ class HHVacancyRefresher:
                         "max_pages_cap": None,
                     }
                 ]
-            async with async_playwright() as playwright:
-                browser = await launch_chromium_resilient(playwright, headless=True)
-                context = await browser.new_context(
-                    viewport={"width": 1440, "height": 1100},
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                )
+            known_page = None
+            if incremental:
+                known_cards = {item.vacancy_id: str(item.meta.get("card_hash") or "") for item in self.store.load_vacancies()}
+
+                def known_page(items: list[dict[str, object]]) -> bool:
+                    return bool(items) and all(known_cards.get(_vacancy_id_for(item)) == serp_card_hash(item) for item in items)
+
+            async with BROWSER_SERVICE.context(
+                self.store.paths.account_key,
+                viewport={"width": 1440, "height": 1100},
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            ) as context:
                 if cookies:
                     await context.add_cookies(cookies)
+                scraping_stats = await apply_scraping_profile(context, self.scraping_config)
                 page = await context.new_page()
                 merged_raw: list[dict[str, str]] = []
                 total_available_max = 0
@@ -195,6 +336,12 @@ class HHVacancyRefresher:
                 for spec in rounds_cfg:
                     query_params = dict(spec.get("query_params") or {})
                     cap = spec.get("max_pages_cap")
+                    round_started = time.perf_counter()
+                    serp_cache = SerpPageCache.load(
+                        self.store.paths.serp_cache_path(serp_query_key(self.store.paths.account_key, resume_id, query_params)),
+                        ttl_sec=self.serp_config.cache_ttl_sec,
+                        sample_pages=self.serp_config.cache_sample_pages,
+                    )
                     raw_batch, total_count, parser_meta = await search_vacancies(
                         page,
                         resume_id,
@@ -202,7 +349,14 @@ class HHVacancyRefresher:
                         query_params=query_params,
                         persist_serp_cache=bool(spec.get("persist_serp_cache", True)),
                         max_pages_cap=int(cap) if cap is not None else None,
+                        serp_cache=serp_cache,
+                        serp_tabs=self.serp_config.tabs,
+                        serp_interval_sec=self.serp_config.interval_sec,
+                        known_page=known_page,
+                        known_page_streak=self.incremental_config.known_pages,
                     )
+                    round_elapsed = time.perf_counter() - round_started
+                    scraping_stats.time_pages("serp", round_elapsed, int(parser_meta.get("pages_parsed") or 0))
                     total_available_max = max(total_available_max, int(total_count or 0))
                     pages_parsed_sum += int(parser_meta.get("pages_parsed") or 0)
                     if not primary_search_url:
@@ -211,70 +365,191 @@ class HHVacancyRefresher:
                     rid = str(spec.get("id") or "round")
                     _log(
                         f"Выдача «{rid}»: карточек {len(raw_batch or [])}, "
-                        f"всего на hh.ru ~{int(total_count or 0)}, страниц пройдено {int(parser_meta.get('pages_parsed') or 0)}."
+                        f"всего на hh.ru ~{int(total_count or 0)}, страниц пройдено {int(parser_meta.get('pages_parsed') or 0)} "
+                        f"за {round_elapsed:.1f}s (вкладок: {self.serp_config.tabs}, из кэша выдачи: {int(parser_meta.get('pages_reused') or 0)})."
                     )
+                    if parser_meta.get("stopped_on_known_pages"):
+                        _log(f"Выдача «{rid}»: {self.incremental_config.known_pages} стр. подряд без новых карточек — дальше не иду.")
                     round_summaries.append(
                         {
                             "id": spec.get("id"),
                             "serp_count": len(raw_batch or []),
                             "total_available": int(total_count or 0),
                             "pages_parsed": int(parser_meta.get("pages_parsed") or 0),
+                            "elapsed_sec": round(round_elapsed, 2),
+                            "serp_tabs": self.serp_config.tabs,
+                            "serp_cache": parser_meta.get("serp_cache") or {},
+                            "stopped_on_known_pages": bool(parser_meta.get("stopped_on_known_pages")),
                         }
                     )
                 merged_raw = merge_serp_by_url(merged_raw)
                 _log(f"После склейки URL по выдачам: {len(merged_raw)} уникальных ссылок.")
-                merged_raw, remote_dup_removed = dedupe_remote_same_posting_different_region(merged_raw)
-                if remote_dup_removed:
-                    _log(f"Сняты дубликаты одной вакансии в разных регионах: {remote_dup_removed}.")
-                raw_vacancies = merged_raw
+                raw_vacancies, remote_dup_removed = dedupe_remote_same_posting_different_region(merged_raw)
                 total_count = total_available_max
-                parser_meta = {
-                    "search_url": primary_search_url or str(filter_plan.get("search_url") or ""),
-                    "pages_parsed": pages_parsed_sum,
-                    "search_rounds": round_summaries,
-                    "remote_duplicate_cards_removed": remote_dup_removed,
-                }
                 detail_limit = min(len(raw_vacancies), limit if limit and limit > 0 else 120)
-                _log(f"Подгружаю полные описания для {detail_limit} из {len(raw_vacancies)} карточек (лимит детализации).")
-                for idx, item in enumerate(raw_vacancies[:detail_limit]):
-                    vacancy_url = str(item.get("url") or "").strip()
-                    if not vacancy_url:
-                        continue
-                    title_preview = str(item.get("title") or "")[:72]
-                    if idx % 8 == 0 or idx == detail_limit - 1:
-                        _log(f"Страница вакансии {idx + 1}/{detail_limit}: {title_preview or vacancy_url[:64]}")
-                    try:
-                        await page.goto(vacancy_url, wait_until="domcontentloaded", timeout=60000)
-                        detail = await extract_vacancy_detail(page)
-                    except Exception:
-                        continue
-                    description = str(detail.get("description") or "").strip()
-                    if description:
-                        item["description"] = description
-                    skills = [str(skill).strip() for skill in list(detail.get("skills") or []) if str(skill).strip()]
-                    if skills:
-                        item["skills"] = skills
-                await context.close()
-                await browser.close()
+                prescore = self._prescore(raw_vacancies, resume_id)
+                if prescore is not None:
+                    raw_vacancies = prescore.ordered
+                pending, detail_cache = self._reuse_cached_details(raw_vacancies)
+                pending = [item for item in pending if not item.get("prescore_blocked")]
+                _log(
+                    f"Описания из кэша (карточка не изменилась): {detail_cache['reused']}; "
+                    f"новых или изменённых карточек: {len(pending)}, изменилось: {detail_cache['changed']}."
+                )
+                browser_items = pending[:detail_limit]
+                detail_cache["fetched"] = len(browser_items)
+                if prescore is not None:
+                    _log(prescore.summary_line(len(browser_items)))
+                _log(
+                    f"Подгружаю полные описания для {len(browser_items)} из {len(pending)} карточек без кэша "
+                    f"(лимит детализации {detail_limit}, вкладок: {self.detail_config.pages})."
+                )
+                pipeline_stats: list[dict[str, object]] = []
+                if downstream is not None:
+                    detail_stats, http_stats, pipeline_stats = await self._stream_details(
+                        context,
+                        state_payload,
+                        resume_id,
+                        raw_vacancies,
+                        browser_items,
+                        downstream,
+                        log=_log,
+                    )
+                else:
+                    http_stats = None
+                    if self.http_detail_config.enabled:
+                        http_stats, browser_items = await fetch_vacancy_details_http(
+                            browser_items,
+                            state_payload,
+                            config=self.http_detail_config,
+                            log=_log,
+                        )
+                    detail_stats = await fetch_vacancy_details(
+                        context,
+                        browser_items,
+                        extract_vacancy_detail,
+                        config=self.detail_config,
+                        log=_log,
+                    )
+                if remote_dup_removed:
+                    _log(f"Сняты дубликаты одной вакансии в разных регионах: {remote_dup_removed}.")
+                if detail_stats.requested:
+                    _log(detail_stats.summary_line())
+                scraping_stats.time_pages("detail", detail_stats.busy_sec, detail_stats.fetched + detail_stats.failed + detail_stats.retries)
+            profile_history, speedups = update_profile_timings(self.store.load_scrape_profile_stats(), scraping_stats)
+            self.store.save_scrape_profile_stats(profile_history)
+            _log(scraping_stats.summary_line(speedups))
             result = [self._to_vacancy(item, resume_id) for item in raw_vacancies]
             return (
                 result[:limit] if limit and limit > 0 else result,
                 {
                     "total_available": total_count,
-                    "pages_parsed": int(parser_meta.get("pages_parsed") or 0),
-                    "search_url": str(parser_meta.get("search_url") or filter_plan.get("search_url") or ""),
-                    "search_rounds": parser_meta.get("search_rounds") or [],
-                    "remote_duplicate_cards_removed": int(parser_meta.get("remote_duplicate_cards_removed") or 0),
+                    "pages_parsed": pages_parsed_sum,
+                    "search_url": primary_search_url or str(filter_plan.get("search_url") or ""),
+                    "search_rounds": round_summaries,
+                    "remote_duplicate_cards_removed": remote_dup_removed,
+                    "detail_fetch": {**detail_stats.to_dict(), "http": http_stats.to_dict() if http_stats else {}, "cache": detail_cache},
+                    "scraping": {**scraping_stats.to_dict(), "speedup_vs_full": speedups},
+                    "prescore": prescore.to_dict(detail_cache["fetched"]) if prescore is not None else {},
+                    "sweep": "incremental" if incremental else "full",
+                    "pipeline": pipeline_stats,
                 },
             )
 
-        return asyncio.run(_inner())
+        return BROWSER_SERVICE.run(_inner)
+
+    async def _stream_details(
+        self,
+        context,
+        state_payload: dict[str, object],
+        resume_id: str,
+        raw_vacancies: list[dict[str, object]],
+        browser_items: list[dict[str, object]],
+        downstream: list[PipelineStage],
+        *,
+        log: Callable[[str], None],
+    ) -> tuple[DetailFetchStats, HttpDetailStats | None, list[dict[str, object]]]:
+        """Cards in chunks -> details -> extract -> ``downstream``, connected by bounded queues.
+
+        The SERP is walked, deduplicated and prescored as a whole first, so chunks leave in the
+        global prescore order and only ``browser_items`` (the detail budget) are fetched; the
+        downstream review sees the best expected fits first while later chunks still load.
+        """
+        from logic.vacancy_parser import extract_vacancy_detail
+
+        to_fetch = {id(item) for item in browser_items}
+        detail_stats = DetailFetchStats()
+        http_stats = HttpDetailStats() if self.http_detail_config.enabled else None
+        client = build_http_client(state_payload, self.http_detail_config) if http_stats is not None else None
+
+        async def _produce(emit) -> None:
+            for start in range(0, len(raw_vacancies), STREAM_CHUNK_SIZE):
+                await emit(raw_vacancies[start : start + STREAM_CHUNK_SIZE])
+
+        async def _details(items: list[dict[str, object]]):
+            pending = [item for item in items if id(item) in to_fetch]
+            if pending and http_stats is not None:
+                part, pending = await fetch_vacancy_details_http(pending, state_payload, config=self.http_detail_config, client=client)
+                http_stats.merge(part)
+            if pending:
+                detail_stats.merge(await fetch_vacancy_details(context, pending, extract_vacancy_detail, config=self.detail_config))
+            return [items]
+
+        async def _extract(items: list[dict[str, object]]):
+            log(pipeline.depth_line())
+            return [self._to_vacancy(item, resume_id) for item in items]
+
+        pipeline = StreamingPipeline(
+            [PipelineStage("details", _details), PipelineStage("extract", _extract), *downstream],
+            queue_size=self.pipeline_config.queue_size,
+        )
+        log(f"Потоковый режим: этапы {', '.join(stage.name for stage in pipeline.stages)}; очередь между этапами {pipeline.queue_size}.")
+        try:
+            await pipeline.run(_produce)
+        finally:
+            if client is not None:
+                await client.aclose()
+        if http_stats is not None and http_stats.requested:
+            log(http_stats.summary_line())
+        log(pipeline.summary_line())
+        return detail_stats, http_stats, pipeline.to_dict()
+
+    def _prescore(self, raw_vacancies: list[dict[str, object]], resume_id: str) -> SerpPrescore | None:
+        """Rank SERP cards by the rule engine before the detail stage; ``None`` until intake is done."""
+        preferences = self.store.load_preferences()
+        anamnesis = self.store.load_anamnesis()
+        if not preferences or not anamnesis:
+            return None
+        engine = VacancyRuleEngine(preferences, anamnesis, self.store.load_rule_weights())
+        return prescore_serp_cards(raw_vacancies, engine, lambda item: self._to_vacancy(item, resume_id))
+
+    def _reuse_cached_details(self, raw_vacancies: list[dict[str, object]]) -> tuple[list[dict[str, object]], dict[str, int]]:
+        """Copy stored details onto cards whose SERP snippet is unchanged; return the cards still to fetch."""
+        cached = {item.vacancy_id: item for item in self.store.load_vacancies() if item.meta.get("detail_source")}
+        pending: list[dict[str, object]] = []
+        counts = {"reused": 0, "changed": 0}
+        for item in raw_vacancies:
+            item["card_hash"] = serp_card_hash(item)
+            previous = cached.get(_vacancy_id_for(item))
+            if previous is None:
+                pending.append(item)
+                continue
+            if previous.meta.get("card_hash") != item["card_hash"]:
+                counts["changed"] += 1
+                pending.append(item)
+                continue
+            item["description"] = previous.description
+            item["skills"] = list(previous.skills)
+            for key in DETAIL_FIELDS[2:]:
+                if previous.meta.get(key):
+                    item[key] = previous.meta[key]
+            counts["reused"] += 1
+        return pending, counts
 
     def _to_vacancy(self, payload: dict[str, str], resume_id: str) -> Vacancy:
         url = str(payload.get("url") or "").strip()
         title = str(payload.get("title") or "Без названия").strip() or "Без названия"
-        match = re.search(r"/vacancy/(\d+)", url)
-        vacancy_id = match.group(1) if match else hashlib.sha1(f"{title}:{url}".encode("utf-8")).hexdigest()[:16]
+        vacancy_id = _vacancy_id_for(payload)
         salary_text = str(payload.get("salary_text") or "").strip()
         salary_numbers = [int(item.replace(" ", "")) for item in re.findall(r"(\d[\d ]{3,})", salary_text)]
         salary_from = salary_numbers[0] if len(salary_numbers) >= 1 else None
@@ -292,5 +567,28 @@ class HHVacancyRefresher:
             url=url,
             summary=str(payload.get("summary") or title).strip(),
             description=str(payload.get("description") or payload.get("all_text") or payload.get("summary") or title).strip(),
-            meta={"source": "hh_live_search", "resume_id": resume_id},
+            skills=[str(skill) for skill in list(payload.get("skills") or [])],
+            meta={
+                "source": "hh_live_search",
+                "resume_id": resume_id,
+                **{key: str(payload[key]) for key in (*DETAIL_FIELDS[2:], "card_hash") if payload.get(key)},
+                **{key: payload[key] for key in ("prescore", "prescore_blocked") if key in payload},
+            },
         )
+
+
+def _vacancy_id_for(payload: dict[str, object]) -> str:
+    url = str(payload.get("url") or "").strip()
+    title = str(payload.get("title") or "Без названия").strip() or "Без названия"
+    match = re.search(r"/vacancy/(\d+)", url)
+    return match.group(1) if match else hashlib.sha1(f"{title}:{url}".encode("utf-8")).hexdigest()[:16]
+
+
+def serp_card_hash(payload: dict[str, object]) -> str:
+    """Hash of the SERP card fields an employer edit would change: title, company, salary and snippet."""
+    snippet = str(payload.get("summary") or "")
+    for pattern in VOLATILE_SNIPPET_PATTERNS:
+        snippet = pattern.sub(" ", snippet)
+    parts = [str(payload.get(key) or "") for key in ("title", "company", "salary_text")] + [snippet]
+    normalized = "\x1f".join(" ".join(part.lower().split()) for part in parts)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import html as html_lib
 import json
 import re
@@ -8,7 +7,9 @@ import traceback
 from pathlib import Path
 
 from autohhkek.services.account_profiles import derive_account_profile
-from autohhkek.services.playwright_browser import ensure_async_subprocess_available, launch_chromium_resilient
+from autohhkek.services.browser_service import BROWSER_SERVICE
+from autohhkek.services.lean_scraping import apply_scraping_profile
+from autohhkek.services.playwright_browser import ensure_async_subprocess_available
 
 
 def _normalize_resume_url(url: str) -> str:
@@ -142,7 +143,7 @@ class HHResumeCatalog:
         except Exception as exc:  # noqa: BLE001
             return {"status": "failed", "message": f"Playwright runtime is unavailable for hh.ru resume refresh: {exc}", "items": []}
         try:
-            fetch_result = asyncio.run(self._fetch())
+            fetch_result = BROWSER_SERVICE.run(self._fetch)
         except Exception as exc:  # noqa: BLE001
             debug_path = self.store.save_debug_artifact(
                 "hh-resumes-exception",
@@ -218,19 +219,17 @@ class HHResumeCatalog:
         )
 
     async def _fetch(self) -> dict[str, object]:
-        from playwright.async_api import async_playwright
-
         state_payload = json.loads(self.state_path.read_text(encoding="utf-8"))
         last_page_url = ""
         last_page_title = ""
         last_html = ""
-        async with async_playwright() as playwright:
-            browser = await launch_chromium_resilient(playwright, headless=True)
-            context = await browser.new_context(
-                viewport={"width": 1440, "height": 1000},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                storage_state=state_payload or None,
-            )
+        async with BROWSER_SERVICE.context(
+            self.store.paths.account_key,
+            viewport={"width": 1440, "height": 1000},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            storage_state=state_payload or None,
+        ) as context:
+            await apply_scraping_profile(context)
             page = await context.new_page()
             for url in (
                 "https://hh.ru/applicant/resumes",
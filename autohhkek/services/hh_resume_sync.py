@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import html
 import json
 import re
@@ -8,8 +7,9 @@ from pathlib import Path
 from typing import Any
 
 from autohhkek.domain.models import Anamnesis, UserPreferences, utc_now_iso
+from autohhkek.services.browser_service import BROWSER_SERVICE
 from autohhkek.services.hh_login import run_hh_login
-from autohhkek.services.playwright_browser import launch_chromium_resilient
+from autohhkek.services.lean_scraping import apply_scraping_profile
 
 
 KNOWN_SKILLS = [
@@ -334,7 +334,7 @@ class HHResumeProfileSync:
         payload: dict[str, Any]
         relogin_attempted = False
         try:
-            payload = asyncio.run(self._fetch_selected_resume(selected_resume_id))
+            payload = BROWSER_SERVICE.run(lambda: self._fetch_selected_resume(selected_resume_id))
         except RuntimeError as exc:
             if "login_required" not in str(exc):
                 raise
@@ -349,7 +349,7 @@ class HHResumeProfileSync:
                 }
             self.state_path = self.store.hh_state_path
             try:
-                payload = asyncio.run(self._fetch_selected_resume(selected_resume_id))
+                payload = BROWSER_SERVICE.run(lambda: self._fetch_selected_resume(selected_resume_id))
             except Exception as exc:  # noqa: BLE001
                 debug_artifact = self.store.save_debug_artifact(
                     "hh-resume-sync-error",
@@ -421,17 +421,15 @@ class HHResumeProfileSync:
         }
 
     async def _fetch_selected_resume(self, resume_id: str) -> dict[str, Any]:
-        from playwright.async_api import async_playwright
-
         state_payload = json.loads(self.state_path.read_text(encoding="utf-8"))
         resume_url = self._resume_url_for(resume_id)
-        async with async_playwright() as playwright:
-            browser = await launch_chromium_resilient(playwright, headless=True)
-            context = await browser.new_context(
-                viewport={"width": 1440, "height": 1100},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                storage_state=state_payload or None,
-            )
+        async with BROWSER_SERVICE.context(
+            self.store.paths.account_key,
+            viewport={"width": 1440, "height": 1100},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            storage_state=state_payload or None,
+        ) as context:
+            await apply_scraping_profile(context)
             page = await context.new_page()
             await page.goto(resume_url, wait_until="domcontentloaded", timeout=60000)
             await page.wait_for_timeout(2000)
@@ -445,8 +443,6 @@ class HHResumeProfileSync:
                 "text": await page.inner_text("body"),
                 "html": await page.content(),
             }
-            await context.close()
-            await browser.close()
             return payload
 
     async def _expand_resume_sections(self, page) -> None:
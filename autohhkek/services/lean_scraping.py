@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "ping"})
+TRACKER_HOST_MARKERS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "mc.yandex.ru",
+    "an.yandex.ru",
+    "yandex.ru/ads",
+    "adfox.ru",
+    "top-fwz1.mail.ru",
+    "ad.mail.ru",
+    "vk.com/rtrg",
+    "facebook.net",
+    "criteo.",
+    "hotjar.",
+    "tns-counter.ru",
+)
+# Typical hh.ru transfer sizes, used for a blocked type until this run has loaded one of it.
+TYPICAL_RESOURCE_BYTES = {
+    "image": 25_000,
+    "media": 250_000,
+    "font": 45_000,
+    "stylesheet": 60_000,
+    "script": 40_000,
+    "ping": 500,
+    "tracker": 30_000,
+}
+PROFILE_TIMING_ALPHA = 0.3
+
+
+@dataclass(slots=True)
+class LeanScrapingConfig:
+    """Which requests a scraping context aborts.
+
+    Stylesheets stay on by default: ``innerText`` honours CSS visibility, so without CSS
+    the resume sync would read collapsed and hidden blocks too.
+    """
+
+    enabled: bool = True
+    block_css: bool = False
+
+    @classmethod
+    def from_env(cls) -> "LeanScrapingConfig":
+        return cls(
+            enabled=os.getenv("AUTOHHKEK_HH_LEAN_SCRAPING", "1").strip().lower() not in {"0", "false", "no", "off"},
+            block_css=os.getenv("AUTOHHKEK_HH_LEAN_BLOCK_CSS", "").strip().lower() in {"1", "true", "yes", "on"},
+        )
+
+    @property
+    def profile(self) -> str:
+        if not self.enabled:
+            return "full"
+        return "lean_no_css" if self.block_css else "lean"
+
+
+def block_reason(resource_type: str, url: str, config: LeanScrapingConfig) -> str:
+    """``"tracker"`` or the blocked resource type, ``""`` when the request must go through."""
+    if not config.enabled:
+        return ""
+    parts = urlsplit(url)
+    target = f"{parts.netloc.lower()}{parts.path}"
+    if any(marker in target for marker in TRACKER_HOST_MARKERS):
+        return "tracker"
+    if resource_type in BLOCKED_RESOURCE_TYPES or (config.block_css and resource_type == "stylesheet"):
+        return resource_type
+    return ""
+
+
+@dataclass(slots=True)
+class LeanScrapingStats:
+    profile: str = "full"
+    requests: dict[str, int] = field(default_factory=dict)
+    blocked: dict[str, int] = field(default_factory=dict)
+    bytes_loaded: dict[str, int] = field(default_factory=dict)
+    loaded: dict[str, int] = field(default_factory=dict)
+    page_timings: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def record_request(self, resource_type: str, reason: str) -> None:
+        self.requests[resource_type] = self.requests.get(resource_type, 0) + 1
+        if reason:
+            self.blocked[reason] = self.blocked.get(reason, 0) + 1
+
+    def record_loaded(self, resource_type: str, size: int) -> None:
+        self.loaded[resource_type] = self.loaded.get(resource_type, 0) + 1
+        self.bytes_loaded[resource_type] = self.bytes_loaded.get(resource_type, 0) + max(0, int(size))
+
+    def time_pages(self, kind: str, seconds: float, pages: int) -> None:
+        if pages <= 0:
+            return
+        timing = self.page_timings.setdefault(kind, {"pages": 0, "seconds": 0.0})
+        timing["pages"] += pages
+        timing["seconds"] += max(0.0, seconds)
+
+    def bytes_saved(self) -> dict[str, int]:
+        saved = {}
+        for reason, count in self.blocked.items():
+            seen = self.loaded.get(reason, 0)
+            average = self.bytes_loaded.get(reason, 0) / seen if seen else TYPICAL_RESOURCE_BYTES.get(reason, 0)
+            saved[reason] = int(count * average)
+        return saved
+
+    def ms_per_page(self) -> dict[str, float]:
+        return {kind: round(item["seconds"] * 1000 / item["pages"], 1) for kind, item in self.page_timings.items() if item["pages"]}
+
+    def to_dict(self) -> dict[str, Any]:
+        saved = self.bytes_saved()
+        return {
+            "profile": self.profile,
+            "requests": dict(sorted(self.requests.items())),
+            "blocked": dict(sorted(self.blocked.items())),
+            "bytes_loaded": sum(self.bytes_loaded.values()),
+            "bytes_saved_estimate": sum(saved.values()),
+            "bytes_saved_by_type": dict(sorted(saved.items())),
+            "ms_per_page": self.ms_per_page(),
+        }
+
+    def summary_line(self, speedups: dict[str, float] | None = None) -> str:
+        blocked = sum(self.blocked.values())
+        details = ", ".join(f"{reason} {count}" for reason, count in sorted(self.blocked.items(), key=lambda item: -item[1]))
+        timings = ", ".join(f"{kind} {ms / 1000:.1f}s/стр" for kind, ms in self.ms_per_page().items())
+        gains = ", ".join(f"{kind} x{value:.1f}" for kind, value in sorted((speedups or {}).items()))
+        line = (
+            f"Профиль браузера {self.profile}: запросов {sum(self.requests.values())}, заблокировано {blocked}"
+            f"{f' ({details})' if details else ''}, сэкономлено ~{sum(self.bytes_saved().values()) / 1_000_000:.1f} MB"
+        )
+        if timings:
+            line += f"; {timings}"
+        if gains:
+            line += f"; быстрее полного профиля: {gains}"
+        return line + "."
+
+
+async def apply_scraping_profile(context, config: LeanScrapingConfig | None = None, stats: LeanScrapingStats | None = None) -> LeanScrapingStats:
+    """Install request blocking on ``context`` and count requests and transferred bytes per resource type."""
+    config = config or LeanScrapingConfig.from_env()
+    stats = stats or LeanScrapingStats()
+    stats.profile = config.profile
+
+    async def _route(route) -> None:
+        request = route.request
+        reason = block_reason(request.resource_type, request.url, config)
+        stats.record_request(request.resource_type, reason)
+        if reason:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _finished(request) -> None:
+        try:
+            sizes = await request.sizes()
+        except Exception:  # noqa: BLE001
+            return
+        stats.record_loaded(request.resource_type, int(sizes.get("responseBodySize") or 0) + int(sizes.get("responseHeadersSize") or 0))
+
+    if config.enabled:
+        await context.route("**/*", _route)
+    else:
+        context.on("request", lambda request: stats.record_request(request.resource_type, ""))
+    context.on("requestfinished", _finished)
+    return stats
+
+
+def update_profile_timings(history: dict[str, Any], stats: LeanScrapingStats) -> tuple[dict[str, Any], dict[str, float]]:
+    """Fold this run's per-page times into the per-profile history; return it with the speed-up over ``full``."""
+    updated = {profile: dict(kinds) for profile, kinds in dict(history or {}).items() if isinstance(kinds, dict)}
+    current = updated.setdefault(stats.profile, {})
+    for kind, ms in stats.ms_per_page().items():
+        previous = float(current.get(kind) or 0.0)
+        current[kind] = round(ms if previous <= 0 else previous + PROFILE_TIMING_ALPHA * (ms - previous), 1)
+    speedups: dict[str, float] = {}
+    baseline = updated.get("full", {})
+    if stats.profile != "full":
+        for kind, ms in current.items():
+            if ms > 0 and float(baseline.get(kind) or 0) > 0:
+                speedups[kind] = round(float(baseline[kind]) / ms, 2)
+    return updated, speedups
+
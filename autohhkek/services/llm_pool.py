@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import threading
+from concurrent.futures import CancelledError as FutureCancelledError
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Any, Callable, Coroutine, Hashable, Iterator
+
+
+DEFAULT_MAX_CONNECTIONS = 32
+DEFAULT_KEEPALIVE_EXPIRY_SEC = 90.0
+
+
+def _api_key_hash(api_key: str) -> str:
+    return hashlib.sha256(str(api_key or "").encode("utf-8")).hexdigest()[:12]
+
+
+def _headers_hash(headers: dict[str, str] | None) -> str:
+    payload = "\n".join(f"{key.lower()}:{value}" for key, value in sorted(dict(headers or {}).items()))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12] if payload else ""
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class LLMCallCancelled(Exception):
+    """An agent run abandoned through its ``LLMCancelScope`` because the caller no longer needs it."""
+
+
+class LLMCancelScope:
+    """Cancels the agent runs a group of threads has in flight, e.g. ensemble members that lost the race."""
+
+    def __init__(self) -> None:
+        self.cancelled = False
+        self._futures: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def track(self, future: Future) -> None:
+        with self._lock:
+            if not self.cancelled:
+                self._futures.add(future)
+                return
+        future.cancel()
+
+    def forget(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def cancel(self) -> int:
+        with self._lock:
+            self.cancelled = True
+            futures, self._futures = list(self._futures), set()
+        return sum(1 for future in futures if future.cancel())
+
+
+class LLMClientPool:
+    """Per-process cache of OpenAI-compatible clients, agents-SDK providers and built agents.
+
+    Async clients keep their keep-alive connections bound to the event loop they were
+    first used on, so every agent run is executed on one long-lived loop thread owned by
+    the pool instead of a fresh loop per call.
+    """
+
+    def __init__(self, *, max_connections: int = DEFAULT_MAX_CONNECTIONS, keepalive_expiry_sec: float = DEFAULT_KEEPALIVE_EXPIRY_SEC) -> None:
+        self.max_connections = max(1, int(max_connections))
+        self.keepalive_expiry_sec = float(keepalive_expiry_sec)
+        self._lock = threading.RLock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._async_clients: dict[tuple, Any] = {}
+        self._sync_clients: dict[tuple, Any] = {}
+        self._providers: dict[tuple, Any] = {}
+        self._agents: dict[Hashable, Any] = {}
+        self._counters: dict[str, int] = {}
+        self._local = threading.local()
+
+    @staticmethod
+    def client_key(
+        backend: str,
+        base_url: str,
+        api_key: str,
+        *,
+        timeout: float | None = None,
+        headers: dict[str, str] | None = None,
+        organization: str = "",
+        project: str = "",
+    ) -> tuple:
+        """Everything a pooled client is built with: callers that differ in any of it get their own client."""
+        return (
+            str(backend or ""),
+            str(base_url or ""),
+            _api_key_hash(api_key),
+            float(timeout) if timeout is not None else None,
+            _headers_hash(headers),
+            str(organization or ""),
+            str(project or ""),
+        )
+
+    def _count(self, name: str) -> None:
+        self._counters[name] = self._counters.get(name, 0) + 1
+
+    def _http_limits(self):
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive_expiry_sec,
+        )
+
+    def async_client(
+        self,
+        backend: str,
+        *,
+        api_key: str,
+        base_url: str = "",
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        organization: str = "",
+        project: str = "",
+    ):
+        key = self.client_key(
+            backend,
+            base_url,
+            api_key,
+            timeout=timeout,
+            headers=headers,
+            organization=organization,
+            project=project,
+        )
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is not None:
+                self._count("async_client_hits")
+                return client
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+            client = AsyncOpenAI(
+                api_key=api_key or None,
+                base_url=base_url or None,
+                organization=organization or None,
+                project=project or None,
+                default_headers=headers or None,
+                timeout=timeout,
+                http_client=DefaultAsyncHttpxClient(http2=_http2_available(), limits=self._http_limits()),
+            )
+            self._async_clients[key] = client
+            self._count("async_clients_created")
+            return client
+
+    def sync_client(
+        self,
+        backend: str,
+        *,
+        api_key: str,
+        base_url: str = "",
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ):
+        key = self.client_key(backend, base_url, api_key, timeout=timeout, headers=headers)
+        with self._lock:
+            client = self._sync_clients.get(key)
+            if client is not None:
+                self._count("sync_client_hits")
+                return client
+            from openai import DefaultHttpxClient, OpenAI
+
+            client = OpenAI(
+                api_key=api_key or None,
+                base_url=base_url or None,
+                default_headers=headers or None,
+                timeout=timeout,
+                http_client=DefaultHttpxClient(http2=_http2_available(), limits=self._http_limits()),
+            )
+            self._sync_clients[key] = client
+            self._count("sync_clients_created")
+            return client
+
+    def provider(self, backend: str, *, use_responses: bool = True, **client_kwargs: Any):
+        # Self-hosted OpenAI-compatible servers only speak Chat Completions, not the Responses API.
+        key = (
+            *self.client_key(
+                backend,
+                client_kwargs.get("base_url", ""),
+                client_kwargs.get("api_key", ""),
+                timeout=client_kwargs.get("timeout"),
+                headers=client_kwargs.get("headers"),
+                organization=client_kwargs.get("organization", ""),
+                project=client_kwargs.get("project", ""),
+            ),
+            use_responses,
+        )
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is not None:
+                self._count("provider_hits")
+                return provider
+            from agents import OpenAIProvider
+
+            provider = OpenAIProvider(openai_client=self.async_client(backend, **client_kwargs), use_responses=use_responses)
+            self._providers[key] = provider
+            self._count("providers_created")
+            return provider
+
+    def agent(self, key: Hashable, factory: Callable[[], Any]):
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is not None:
+                self._count("agent_hits")
+                return agent
+            agent = factory()
+            self._agents[key] = agent
+            self._count("agents_created")
+            return agent
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _serve() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=_serve, name="autohhkek-llm-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop = loop
+            self._thread = thread
+            return loop
+
+    @contextmanager
+    def cancel_scope(self, scope: LLMCancelScope) -> Iterator[LLMCancelScope]:
+        """Runs started by this thread inside the block are cancelled together with ``scope``."""
+        previous = getattr(self._local, "cancel_scope", None)
+        self._local.cancel_scope = scope
+        try:
+            yield scope
+        finally:
+            self._local.cancel_scope = previous
+
+    def run_coroutine(self, factory: Callable[[], Coroutine[Any, Any, Any]], *, timeout: float | None = None) -> Any:
+        scope: LLMCancelScope | None = getattr(self._local, "cancel_scope", None)
+        if scope is not None and scope.cancelled:
+            raise LLMCallCancelled("LLM run cancelled before start")
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(factory(), loop)
+        with self._lock:
+            self._count("runs")
+        if scope is not None:
+            scope.track(future)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as exc:
+            future.cancel()
+            with self._lock:
+                self._count("run_timeouts")
+            raise TimeoutError(f"LLM run timed out after {timeout:.0f}s") from exc
+        except FutureCancelledError as exc:
+            with self._lock:
+                self._count("run_cancellations")
+            raise LLMCallCancelled("LLM run cancelled") from exc
+        finally:
+            if scope is not None:
+                scope.forget(future)
+
+    def run_agent(self, agent, prompt: str, *, run_config=None, timeout: float | None = None) -> Any:
+        from agents import Runner
+
+        return self.run_coroutine(lambda: Runner.run(agent, prompt, run_config=run_config), timeout=timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "async_clients": len(self._async_clients),
+                "sync_clients": len(self._sync_clients),
+                "providers": len(self._providers),
+                "agents": len(self._agents),
+                "http2": _http2_available(),
+                "loop_alive": bool(self._thread and self._thread.is_alive()),
+                **dict(sorted(self._counters.items())),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._async_clients.clear()
+            self._sync_clients.clear()
+            self._providers.clear()
+            self._agents.clear()
+            self._counters.clear()
+
+
+LLM_CLIENT_POOL = LLMClientPool()
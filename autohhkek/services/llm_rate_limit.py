@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import contextlib
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from autohhkek.services.env_loader import env_float
+
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ANALYZE = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_ANALYZE: "analyze",
+    PRIORITY_BACKGROUND: "background",
+}
+COMPONENT_PRIORITIES = {
+    "chat": PRIORITY_INTERACTIVE,
+    "resume_intake": PRIORITY_INTERACTIVE,
+    "vacancy_review": PRIORITY_ANALYZE,
+    "filter_planning": PRIORITY_BACKGROUND,
+    "repair_worker": PRIORITY_BACKGROUND,
+}
+DEFAULT_REQUESTS_PER_MINUTE = {"openai": 500, "openrouter": 120, "g4f": 20}
+DEFAULT_MAX_WAIT_SEC = 60.0
+DEFAULT_COMPLETION_TOKENS = 600
+LOCK_STALE_SEC = 10.0
+FILE_LOCK_RETRY_SEC = 0.01
+
+
+def priority_for(component: str) -> int:
+    return COMPONENT_PRIORITIES.get(component, PRIORITY_ANALYZE)
+
+
+def estimate_prompt_tokens(prompt: Any) -> int:
+    text = prompt if isinstance(prompt, str) else json.dumps(prompt, ensure_ascii=False, default=str)
+    # ~4 characters per token is close enough for budgeting; usage reports settle the difference.
+    return len(text or "") // 4 + DEFAULT_COMPLETION_TOKENS
+
+
+@dataclass(slots=True)
+class RateLimit:
+    requests_per_minute: float = 0.0
+    tokens_per_minute: float = 0.0
+
+    @classmethod
+    def from_env(cls, backend: str) -> "RateLimit":
+        prefix = f"AUTOHHKEK_{backend.upper()}"
+        return cls(
+            requests_per_minute=env_float(f"{prefix}_RPM", float(DEFAULT_REQUESTS_PER_MINUTE.get(backend, 0))),
+            tokens_per_minute=env_float(f"{prefix}_TPM", 0.0),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self.requests_per_minute > 0 or self.tokens_per_minute > 0
+
+
+@dataclass(slots=True)
+class _Bucket:
+    per_minute: float
+    level: float
+    updated_at: float
+
+    def refill(self, now: float) -> None:
+        if self.per_minute <= 0:
+            return
+        elapsed = max(0.0, now - self.updated_at)
+        self.level = min(self.per_minute, self.level + elapsed * self.per_minute / 60.0)
+        self.updated_at = now
+
+    def seconds_until(self, amount: float) -> float:
+        if self.per_minute <= 0 or self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.per_minute
+
+
+class _FileLock:
+    """Minimal cross-process mutex built on exclusive file creation."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def try_acquire(self) -> bool:
+        """One attempt to take the lock; a lock file older than ``LOCK_STALE_SEC`` is broken first."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - self.path.stat().st_mtime <= LOCK_STALE_SEC:
+                        return False
+                    self.path.unlink()
+                except OSError:
+                    return False
+        return False
+
+    def release(self) -> None:
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> "_FileLock":
+        while not self.try_acquire():
+            time.sleep(FILE_LOCK_RETRY_SEC)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class LLMRateLimiter:
+    """Token-bucket limiter per backend for requests/min and tokens/min.
+
+    Waiters for the same backend are served strictly by priority class, then FIFO.
+    With ``lock_path`` set, bucket levels are shared between processes through a JSON
+    file guarded by a lock file; priority ordering stays process-local. The lock file is
+    never waited on while ``_cond`` is held: the head waiter only tries it and otherwise
+    waits on ``_cond`` (releasing it), and ``settle``/``penalize`` take it before ``_cond``.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: Callable[[str], RateLimit] | None = None,
+        lock_path: str | Path | None = None,
+        max_wait_sec: float | None = None,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self._limits = limits or RateLimit.from_env
+        self._lock_path = Path(lock_path) if lock_path else None
+        self._max_wait_sec = max_wait_sec
+        self.clock = clock or time.time
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiters: dict[str, list[tuple[int, int]]] = {}
+        self._buckets: dict[str, tuple[_Bucket, _Bucket]] = {}
+        self._stats: dict[str, dict[str, Any]] = {}
+
+    @property
+    def lock_path(self) -> Path | None:
+        if self._lock_path is not None:
+            return self._lock_path
+        raw = os.getenv("AUTOHHKEK_LLM_RATE_LOCK_FILE", "").strip()
+        return Path(raw) if raw else None
+
+    @property
+    def max_wait_sec(self) -> float:
+        if self._max_wait_sec is not None:
+            return self._max_wait_sec
+        return env_float("AUTOHHKEK_LLM_RATE_MAX_WAIT_SEC", DEFAULT_MAX_WAIT_SEC)
+
+    def _local_buckets(self, backend: str, limit: RateLimit, now: float) -> tuple[_Bucket, _Bucket]:
+        buckets = self._buckets.get(backend)
+        if buckets is None:
+            buckets = (
+                _Bucket(limit.requests_per_minute, limit.requests_per_minute, now),
+                _Bucket(limit.tokens_per_minute, limit.tokens_per_minute, now),
+            )
+            self._buckets[backend] = buckets
+        requests, tokens = buckets
+        requests.per_minute = limit.requests_per_minute
+        tokens.per_minute = limit.tokens_per_minute
+        return buckets
+
+    def _file_lock(self) -> _FileLock | contextlib.nullcontext:
+        lock_path = self.lock_path
+        return _FileLock(lock_path) if lock_path is not None else contextlib.nullcontext()
+
+    def _with_buckets(self, backend: str, limit: RateLimit, update: Callable[[_Bucket, _Bucket, float], Any]) -> Any:
+        """Apply ``update`` to the backend buckets; the caller holds ``_cond`` and, if set, the lock file."""
+        now = self.clock()
+        requests, tokens = self._local_buckets(backend, limit, now)
+        lock_path = self.lock_path
+        if lock_path is None:
+            requests.refill(now)
+            tokens.refill(now)
+            return update(requests, tokens, now)
+        state_path = lock_path.with_suffix(lock_path.suffix + ".json")
+        try:
+            shared = json.loads(state_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            shared = {}
+        item = dict(shared.get(backend) or {})
+        if item:
+            requests.level = float(item.get("requests", requests.level))
+            tokens.level = float(item.get("tokens", tokens.level))
+            requests.updated_at = tokens.updated_at = float(item.get("updated_at", now))
+        requests.refill(now)
+        tokens.refill(now)
+        result = update(requests, tokens, now)
+        shared[backend] = {"requests": requests.level, "tokens": tokens.level, "updated_at": now}
+        state_path.write_text(json.dumps(shared), encoding="utf-8")
+        return result
+
+    def _try_take(self, backend: str, limit: RateLimit, cost: float) -> float:
+        def _take(requests: _Bucket, tokens: _Bucket, now: float) -> float:
+            token_cost = min(cost, tokens.per_minute) if tokens.per_minute > 0 else 0.0
+            delay = max(requests.seconds_until(1.0), tokens.seconds_until(token_cost))
+            if delay > 0:
+                return delay
+            if requests.per_minute > 0:
+                requests.level -= 1.0
+            tokens.level -= token_cost
+            return 0.0
+
+        lock_path = self.lock_path
+        if lock_path is None:
+            return self._with_buckets(backend, limit, _take)
+        file_lock = _FileLock(lock_path)
+        if not file_lock.try_acquire():
+            # Another process holds the buckets: retry shortly, with ``_cond`` released meanwhile.
+            return FILE_LOCK_RETRY_SEC
+        try:
+            return self._with_buckets(backend, limit, _take)
+        finally:
+            file_lock.release()
+
+    def _stat(self, backend: str) -> dict[str, Any]:
+        return self._stats.setdefault(
+            backend,
+            {"acquired": 0, "waited": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "overruns": 0, "penalties": 0, "wait_ms_by_priority": {}},
+        )
+
+    def acquire(self, backend: str, *, priority: int = PRIORITY_ANALYZE, tokens: int = 0) -> float:
+        """Block until a request slot is free; returns the time waited in milliseconds."""
+        limit = self._limits(backend)
+        if not limit.active:
+            return 0.0
+        started = time.monotonic()
+        deadline = started + max(0.0, self.max_wait_sec)
+        overrun = False
+        with self._cond:
+            ticket = (int(priority), next(self._seq))
+            queue = self._waiters.setdefault(backend, [])
+            heapq.heappush(queue, ticket)
+            try:
+                while True:
+                    delay = self._try_take(backend, limit, float(tokens)) if queue[0] == ticket else 0.25
+                    if delay <= 0:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        # Past the cap the call goes out anyway; the provider's own 429 handling takes over.
+                        overrun = True
+                        break
+                    self._cond.wait(timeout=min(delay, remaining))
+            finally:
+                queue.remove(ticket)
+                heapq.heapify(queue)
+                self._cond.notify_all()
+            waited_ms = round((time.monotonic() - started) * 1000, 1)
+            stat = self._stat(backend)
+            stat["acquired"] += 1
+            stat["overruns"] += int(overrun)
+            if waited_ms >= 1.0:
+                name = PRIORITY_NAMES.get(int(priority), str(priority))
+                stat["waited"] += 1
+                stat["wait_ms_total"] = round(stat["wait_ms_total"] + waited_ms, 1)
+                stat["wait_ms_max"] = max(stat["wait_ms_max"], waited_ms)
+                stat["wait_ms_by_priority"][name] = round(stat["wait_ms_by_priority"].get(name, 0.0) + waited_ms, 1)
+        return waited_ms
+
+    def settle(self, backend: str, *, estimated_tokens: int, actual_tokens: int | None) -> None:
+        """Return or charge the difference between the up-front token estimate and reported usage."""
+        limit = self._limits(backend)
+        if actual_tokens is None or limit.tokens_per_minute <= 0:
+            return
+
+        def _adjust(requests: _Bucket, tokens: _Bucket, now: float) -> None:
+            tokens.level = min(tokens.per_minute, tokens.level + min(estimated_tokens, tokens.per_minute) - actual_tokens)
+
+        with self._file_lock(), self._cond:
+            self._with_buckets(backend, limit, _adjust)
+            self._cond.notify_all()
+
+    def penalize(self, backend: str) -> None:
+        """Drain the request bucket after a provider 429 so every caller backs off together."""
+        limit = self._limits(backend)
+        if not limit.active:
+            return
+
+        def _drain(requests: _Bucket, tokens: _Bucket, now: float) -> None:
+            requests.level = min(requests.level, 0.0)
+
+        with self._file_lock(), self._cond:
+            self._with_buckets(backend, limit, _drain)
+            self._stat(backend)["penalties"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                backend: {**stat, "waiting": len(self._waiters.get(backend) or [])}
+                for backend, stat in sorted(self._stats.items())
+            }
+
+    def reset(self) -> None:
+        with self._cond:
+            self._buckets.clear()
+            self._stats.clear()
+
+
+LLM_RATE_LIMITER = LLMRateLimiter()
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from autohhkek.services.llm_usage import LLM_USAGE, LLMCallRecord
+
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+FAILURE_STATUSES = {"error", "timeout"}
+
+
+@dataclass(slots=True)
+class BackendHealth:
+    backend: str
+    model: str = ""
+    state: str = CIRCUIT_CLOSED
+    outcomes: deque[int] = field(default_factory=lambda: deque(maxlen=20))
+    ewma_latency_ms: float = 0.0
+    consecutive_failures: int = 0
+    open_count: int = 0
+    opened_at: float = 0.0
+    cooldown_sec: float = 0.0
+    probe_started_at: float = 0.0
+    last_error_class: str = ""
+
+    @property
+    def success_rate(self) -> float:
+        if not self.outcomes:
+            return 1.0
+        return sum(self.outcomes) / len(self.outcomes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "model": self.model,
+            "state": self.state,
+            "outcomes": list(self.outcomes),
+            "success_rate": round(self.success_rate, 3),
+            "ewma_latency_ms": round(self.ewma_latency_ms, 1),
+            "consecutive_failures": self.consecutive_failures,
+            "open_count": self.open_count,
+            "opened_at": self.opened_at,
+            "cooldown_sec": self.cooldown_sec,
+            "last_error_class": self.last_error_class,
+        }
+
+
+class LLMBackendRouter:
+    """Tracks health per (backend, model) and gates calls through a circuit breaker.
+
+    A circuit opens after ``failure_threshold`` consecutive failures, stays open for a
+    cooldown that doubles on every re-open, then lets a single probe through
+    (half-open). A successful probe closes the circuit, a failed one re-opens it.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 3,
+        cooldown_sec: float = 60.0,
+        max_cooldown_sec: float = 900.0,
+        window: int = 20,
+        ewma_alpha: float = 0.3,
+        degraded_score: float = 0.5,
+        min_samples: int = 5,
+        slow_latency_ms: float = 20000.0,
+        clock: Callable[[], float] | None = None,
+    ) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_sec = float(cooldown_sec)
+        self.max_cooldown_sec = float(max_cooldown_sec)
+        self.window = max(1, int(window))
+        self.ewma_alpha = float(ewma_alpha)
+        self.degraded_score = float(degraded_score)
+        self.min_samples = max(1, int(min_samples))
+        self.slow_latency_ms = float(slow_latency_ms)
+        self.clock = clock or time.time
+        self._health: dict[tuple[str, str], BackendHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, backend: str, model: str) -> BackendHealth:
+        key = (str(backend or ""), str(model or ""))
+        health = self._health.get(key)
+        if health is None:
+            health = BackendHealth(backend=key[0], model=key[1], outcomes=deque(maxlen=self.window))
+            self._health[key] = health
+        return health
+
+    def _refresh_state(self, health: BackendHealth, now: float) -> str:
+        if health.state == CIRCUIT_OPEN and now - health.opened_at >= health.cooldown_sec:
+            health.state = CIRCUIT_HALF_OPEN
+            health.probe_started_at = 0.0
+        return health.state
+
+    def _probe_busy(self, health: BackendHealth, now: float) -> bool:
+        # A probe whose outcome never arrived (e.g. the reviewer bailed out early) must
+        # not block the circuit forever, so the lease expires after one cooldown.
+        return bool(health.probe_started_at) and now - health.probe_started_at < max(health.cooldown_sec, self.cooldown_sec)
+
+    def _admits(self, health: BackendHealth, now: float) -> bool:
+        state = self._refresh_state(health, now)
+        if state == CIRCUIT_OPEN:
+            return False
+        return not (state == CIRCUIT_HALF_OPEN and self._probe_busy(health, now))
+
+    def _score(self, health: BackendHealth) -> float:
+        # A couple of early errors say little about a backend; the breaker covers hard outages.
+        score = health.success_rate if len(health.outcomes) >= self.min_samples else 1.0
+        if health.ewma_latency_ms > self.slow_latency_ms:
+            score *= self.slow_latency_ms / health.ewma_latency_ms
+        return score
+
+    def _update_latency(self, health: BackendHealth, latency_ms: float) -> None:
+        if not latency_ms:
+            return
+        if health.ewma_latency_ms:
+            health.ewma_latency_ms += self.ewma_alpha * (latency_ms - health.ewma_latency_ms)
+        else:
+            health.ewma_latency_ms = float(latency_ms)
+
+    def _open(self, health: BackendHealth, now: float, cooldown_sec: float) -> None:
+        health.state = CIRCUIT_OPEN
+        health.opened_at = now
+        health.cooldown_sec = cooldown_sec
+        health.open_count += 1
+
+    def is_available(self, backend: str, model: str = "") -> bool:
+        with self._lock:
+            health = self._health.get((str(backend or ""), str(model or "")))
+            return health is None or self._admits(health, self.clock())
+
+    def choose(self, candidates: list[tuple[str, str]]) -> tuple[str, str] | None:
+        """Pick the first healthy candidate in preference order, reserving a probe slot if half-open."""
+        with self._lock:
+            now = self.clock()
+            allowed: list[tuple[tuple[str, str], BackendHealth | None]] = []
+            for backend, model in candidates:
+                key = (str(backend or ""), str(model or ""))
+                health = self._health.get(key)
+                if health is None or self._admits(health, now):
+                    allowed.append((key, health))
+            if not allowed:
+                return None
+
+            def score(item: tuple[tuple[str, str], BackendHealth | None]) -> float:
+                return 1.0 if item[1] is None else self._score(item[1])
+
+            key, health = next((item for item in allowed if score(item) >= self.degraded_score), None) or max(allowed, key=score)
+            if health is not None and health.state == CIRCUIT_HALF_OPEN:
+                health.probe_started_at = now
+            return key
+
+    def record_success(self, backend: str, model: str = "", *, latency_ms: float = 0.0) -> None:
+        with self._lock:
+            health = self._get(backend, model)
+            health.outcomes.append(1)
+            self._update_latency(health, latency_ms)
+            health.consecutive_failures = 0
+            health.state = CIRCUIT_CLOSED
+            health.cooldown_sec = 0.0
+            health.probe_started_at = 0.0
+
+    def record_failure(self, backend: str, model: str = "", *, latency_ms: float = 0.0, error_class: str = "") -> None:
+        with self._lock:
+            now = self.clock()
+            health = self._get(backend, model)
+            health.outcomes.append(0)
+            self._update_latency(health, latency_ms)
+            health.consecutive_failures += 1
+            health.last_error_class = error_class
+            health.probe_started_at = 0.0
+            if health.state == CIRCUIT_HALF_OPEN:
+                self._open(health, now, min(self.max_cooldown_sec, max(health.cooldown_sec, self.cooldown_sec) * 2))
+            elif health.state == CIRCUIT_CLOSED and health.consecutive_failures >= self.failure_threshold:
+                self._open(health, now, self.cooldown_sec)
+
+    def observe(self, record: LLMCallRecord) -> None:
+        if record.cache_hit or not record.backend or record.status == "cancelled":
+            return
+        if record.status in FAILURE_STATUSES:
+            self.record_failure(record.backend, record.model, latency_ms=record.latency_ms, error_class=record.error_class)
+        else:
+            self.record_success(record.backend, record.model, latency_ms=record.latency_ms)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            now = self.clock()
+            items = []
+            for health in self._health.values():
+                self._refresh_state(health, now)
+                items.append({**health.to_dict(), "score": round(self._score(health), 3)})
+        return sorted(items, key=lambda item: (item["backend"], item["model"]))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"saved_at": self.clock(), "items": self.snapshot()}
+
+    def restore(self, payload: dict[str, Any] | None) -> int:
+        """Load persisted health; keys already observed in this process keep their live state."""
+        restored = 0
+        with self._lock:
+            for item in list(dict(payload or {}).get("items") or []):
+                backend = str(item.get("backend") or "")
+                model = str(item.get("model") or "")
+                if not backend or (backend, model) in self._health:
+                    continue
+                health = self._get(backend, model)
+                health.outcomes.extend(1 if value else 0 for value in list(item.get("outcomes") or []))
+                health.state = str(item.get("state") or CIRCUIT_CLOSED)
+                if health.state not in {CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN}:
+                    health.state = CIRCUIT_CLOSED
+                health.ewma_latency_ms = float(item.get("ewma_latency_ms") or 0.0)
+                health.consecutive_failures = int(item.get("consecutive_failures") or 0)
+                health.open_count = int(item.get("open_count") or 0)
+                health.opened_at = float(item.get("opened_at") or 0.0)
+                health.cooldown_sec = float(item.get("cooldown_sec") or 0.0)
+                health.last_error_class = str(item.get("last_error_class") or "")
+                restored += 1
+        return restored
+
+    def reset(self) -> None:
+        with self._lock:
+            self._health.clear()
+
+
+LLM_ROUTER = LLMBackendRouter()
+LLM_USAGE.subscribe(LLM_ROUTER.observe)
@@ -3,40 +3,66 @@ from __future__ import annotations
 from typing import Any
 
 from autohhkek.services.g4f_runtime import G4FAppConfig
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+from autohhkek.services.llm_rate_limit import LLM_RATE_LIMITER
+from autohhkek.services.local_llm_runtime import LocalLLMAppConfig
+from autohhkek.services.llm_router import LLM_ROUTER, LLMBackendRouter
 from autohhkek.services.openai_runtime import OpenAIAppConfig
 from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
 from autohhkek.services.runtime_settings import normalize_runtime_settings
 
 
+FALLBACK_ORDERS = {
+    "openai": ["openai", "openrouter", "g4f"],
+    "openrouter": ["openrouter", "openai", "g4f"],
+    "g4f": ["g4f", "openrouter", "openai"],
+    "local": ["local", "openrouter", "openai", "g4f"],
+}
+
+
 class LLMRuntime:
-    def __init__(self, settings: dict[str, Any] | None = None) -> None:
+    def __init__(self, settings: dict[str, Any] | None = None, router: LLMBackendRouter | None = None) -> None:
         source = settings.to_dict() if hasattr(settings, "to_dict") else settings
         self.settings = normalize_runtime_settings(source)
+        self.router = router or LLM_ROUTER
         self.openai = OpenAIAppConfig.from_env()
         self.openrouter = OpenRouterAppConfig.from_env()
         self.g4f = G4FAppConfig.from_env()
+        self.local = LocalLLMAppConfig.from_env()
         self.openai.model = self.settings["openai_model"]
         self.openrouter.model = self.settings["openrouter_model"]
         self.g4f.model = self.settings["g4f_model"]
         self.g4f.provider = self.settings["g4f_provider"]
+        self.local.model = self.settings["local_model"]
 
     @property
     def selected_backend(self) -> str:
         return self.settings["llm_backend"]
 
-    def effective_backend(self) -> str:
+    def backend_order(self) -> list[str]:
         requested = self.selected_backend
-        fallback_orders = {
-            "openai": ["openai", "openrouter", "g4f"],
-            "openrouter": ["openrouter", "openai", "g4f"],
-            "g4f": ["g4f", "openrouter", "openai"],
-        }
-        for backend in fallback_orders.get(requested, [requested, "openrouter", "g4f", "openai"]):
-            if self.backend_ready(backend):
+        order = FALLBACK_ORDERS.get(requested, [requested, "openrouter", "g4f", "openai"])
+        return [backend for backend in order if self.backend_ready(backend)]
+
+    def backend_model(self, backend: str) -> str:
+        if backend == "local":
+            return self.local.resolved_model()
+        if backend == "g4f":
+            return self.g4f.model
+        if backend == "openrouter":
+            return self.openrouter.model
+        return self.openai.model
+
+    def effective_backend(self) -> str:
+        ready = self.backend_order()
+        for backend in ready:
+            if self.router.is_available(backend, self.backend_model(backend)):
                 return backend
-        return requested
+        return ready[0] if ready else self.selected_backend
 
     def backend_ready(self, backend: str) -> bool:
+        if backend == "local":
+            return self.local.is_available()
         if backend == "g4f":
             return self.g4f.is_available()
         if backend == "openrouter":
@@ -58,6 +84,9 @@ class LLMRuntime:
             "effective_backend": effective_backend,
             "effective_backend_ready": self.backend_ready(effective_backend),
             "fallback_applied": effective_backend != self.selected_backend,
+            "backend_health": self.router.snapshot(),
+            "client_pool": LLM_CLIENT_POOL.stats(),
+            "rate_limits": LLM_RATE_LIMITER.stats(),
             "backends": {
                 "openai": {
                     "ready": self.openai.is_available(),
@@ -71,5 +100,10 @@ class LLMRuntime:
                     "supports_mcp_repair": True,
                 },
                 "g4f": g4f_runtime,
+                "local": {
+                    **self.local.to_safe_dict(),
+                    "ready": self.local.is_available(),
+                    "supports_mcp_repair": False,
+                },
             },
         }
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from autohhkek.domain.models import serialize, utc_now_iso
+from autohhkek.services.llm_rate_limit import LLM_RATE_LIMITER, LLMRateLimiter, estimate_prompt_tokens, priority_for
+
+
+# Approximate list prices in USD per 1M tokens (input, output). Models that are not
+# listed here are still counted, but reported as unpriced instead of guessing a cost.
+MODEL_PRICING_USD_PER_1M: dict[str, tuple[float, float]] = {
+    "gpt-5": (1.25, 10.0),
+    "gpt-5-mini": (0.25, 2.0),
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+FREE_BACKENDS = {"g4f", "local"}
+logger = logging.getLogger(__name__)
+DEFAULT_LEDGER_CAPACITY = 5000
+
+
+def _pricing_overrides() -> dict[str, tuple[float, float]]:
+    raw = os.getenv("AUTOHHKEK_LLM_PRICING_JSON", "").strip()
+    if not raw:
+        return {}
+    try:
+        payload = json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+    overrides: dict[str, tuple[float, float]] = {}
+    for model, prices in dict(payload or {}).items():
+        try:
+            overrides[str(model)] = (float(prices[0]), float(prices[1]))
+        except (TypeError, ValueError, IndexError):
+            continue
+    return overrides
+
+
+def model_pricing(model: str) -> tuple[float, float] | None:
+    value = str(model or "").strip()
+    pricing = {**MODEL_PRICING_USD_PER_1M, **_pricing_overrides()}
+    if value in pricing:
+        return pricing[value]
+    short = value.split("/", 1)[-1]
+    return pricing.get(short)
+
+
+def estimate_cost_usd(backend: str, model: str, prompt_tokens: int | None, completion_tokens: int | None) -> float | None:
+    if backend in FREE_BACKENDS:
+        return 0.0
+    if prompt_tokens is None and completion_tokens is None:
+        return None
+    pricing = model_pricing(model)
+    if pricing is None:
+        return None
+    input_price, output_price = pricing
+    return ((prompt_tokens or 0) * input_price + (completion_tokens or 0) * output_price) / 1_000_000
+
+
+def extract_token_usage(result: Any) -> tuple[int | None, int | None, int]:
+    usage = getattr(getattr(result, "context_wrapper", None), "usage", None)
+    if usage is None:
+        usage = getattr(result, "usage", None)
+    if usage is None:
+        return None, None, 1
+    prompt_tokens = getattr(usage, "input_tokens", None)
+    if prompt_tokens is None:
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "output_tokens", None)
+    if completion_tokens is None:
+        completion_tokens = getattr(usage, "completion_tokens", None)
+    requests = int(getattr(usage, "requests", 0) or 1)
+    return (
+        int(prompt_tokens) if prompt_tokens is not None else None,
+        int(completion_tokens) if completion_tokens is not None else None,
+        requests,
+    )
+
+
+def _error_class(error: BaseException | str | None) -> str:
+    if error is None:
+        return ""
+    if isinstance(error, BaseException):
+        return type(error).__name__
+    return str(error)
+
+
+@dataclass(slots=True)
+class LLMCallRecord:
+    component: str
+    backend: str
+    model: str = ""
+    status: str = "ok"
+    latency_ms: float = 0.0
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    requests: int = 1
+    retries: int = 0
+    error_class: str = ""
+    cache_hit: bool = False
+    vacancy_id: str = ""
+    scope: str = ""
+    estimated_cost_usd: float | None = None
+    rate_limit_wait_ms: float = 0.0
+    hedged: bool = False
+    hedge_won: bool = False
+    unhedged_latency_ms: float | None = None
+    prompt_compression_ratio: float | None = None
+    tier: str = ""
+    recorded_at: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return serialize(self)
+
+
+class LLMUsageLedger:
+    """Process-wide in-memory log of LLM calls, partitioned by per-thread scopes.
+
+    Records are indexed per scope. Past ``capacity`` the oldest record of the oldest scope
+    that is no longer open is evicted in O(1), so an analysis run keeps every record until
+    it ends; evictions are counted per scope and reported by ``dropped``.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LEDGER_CAPACITY) -> None:
+        self.capacity = max(1, capacity)
+        self._by_scope: dict[str, deque[tuple[int, LLMCallRecord]]] = {}
+        # Scopes with records that may be evicted, oldest first (a dict keeps insertion order).
+        self._evictable: dict[str, None] = {}
+        self._size = 0
+        self._seq = itertools.count()
+        self._open: Counter[str] = Counter()
+        self._dropped: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._listeners: list[Callable[[LLMCallRecord], None]] = []
+
+    def subscribe(self, listener: Callable[[LLMCallRecord], None]) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def current_scope(self) -> str:
+        return str(getattr(self._local, "scope", "") or "")
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[str]:
+        previous = self.current_scope()
+        name = str(name or "")
+        self._local.scope = name
+        # Unscoped records ("") never belong to a run, so that scope is never held open.
+        if name:
+            with self._lock:
+                self._open[name] += 1
+                self._evictable.pop(name, None)
+        try:
+            yield name
+        finally:
+            if name:
+                with self._lock:
+                    self._open[name] -= 1
+                    if self._open[name] <= 0:
+                        del self._open[name]
+                        if name in self._by_scope:
+                            self._evictable[name] = None
+            self._local.scope = previous
+
+    def add(self, record: LLMCallRecord) -> LLMCallRecord:
+        if not record.scope:
+            record.scope = self.current_scope()
+        if not record.recorded_at:
+            record.recorded_at = utc_now_iso()
+        if record.estimated_cost_usd is None:
+            record.estimated_cost_usd = estimate_cost_usd(record.backend, record.model, record.prompt_tokens, record.completion_tokens)
+        with self._lock:
+            self._by_scope.setdefault(record.scope, deque()).append((next(self._seq), record))
+            self._size += 1
+            if record.scope not in self._open:
+                self._evictable.setdefault(record.scope, None)
+            # Amortised O(1): every record is evicted at most once, and a closed run over capacity drains here.
+            while self._size > self.capacity and self._evictable:
+                self._evict_one()
+        for listener in list(self._listeners):
+            # A broken observer must not turn a finished LLM call into a failure.
+            try:
+                listener(record)
+            except Exception:  # noqa: BLE001
+                logger.exception("LLM usage listener %r failed", listener)
+        return record
+
+    def _evict_one(self) -> None:
+        scope = next(iter(self._evictable))
+        items = self._by_scope[scope]
+        items.popleft()
+        self._size -= 1
+        self._dropped[scope] += 1
+        if not items:
+            del self._by_scope[scope]
+            del self._evictable[scope]
+
+    def dropped(self, scope: str) -> int:
+        """Records of ``scope`` evicted so far; non-zero means ``records(scope=...)`` is incomplete."""
+        with self._lock:
+            return self._dropped.get(scope, 0)
+
+    def records(self, *, scope: str | None = None, component: str | None = None) -> list[LLMCallRecord]:
+        with self._lock:
+            if scope is not None:
+                items = [record for _, record in self._by_scope.get(scope, ())]
+            else:
+                items = [record for _, record in heapq.merge(*(list(queue) for queue in self._by_scope.values()), key=lambda entry: entry[0])]
+        if component is not None:
+            items = [item for item in items if item.component == component]
+        return items
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_scope.clear()
+            self._evictable.clear()
+            self._size = 0
+            self._dropped.clear()
+
+
+LLM_USAGE = LLMUsageLedger()
+
+
+class LLMCallMeter:
+    """Times one logical LLM call (including model fallbacks) and writes a single record."""
+
+    def __init__(
+        self,
+        component: str,
+        *,
+        backend: str,
+        model: str = "",
+        vacancy_id: str = "",
+        tier: str = "",
+        ledger: LLMUsageLedger | None = None,
+        limiter: LLMRateLimiter | None = None,
+    ) -> None:
+        self.component = component
+        self.backend = backend
+        self.model = model
+        self.vacancy_id = vacancy_id
+        self.tier = tier
+        self.ledger = ledger or LLM_USAGE
+        self.limiter = limiter or LLM_RATE_LIMITER
+        self.retries = 0
+        self.estimated_tokens = 0
+        self.rate_limit_wait_ms = 0.0
+        self.hedged = False
+        self.hedge_won = False
+        self.unhedged_latency_ms: float | None = None
+        self.prompt_compression_ratio: float | None = None
+        self.started = time.perf_counter()
+        self.record: LLMCallRecord | None = None
+
+    def throttle(self, prompt: Any = "", *, exclude_from_latency: bool = True) -> float:
+        """Wait for a rate-limit slot before each request; the wait is excluded from latency.
+
+        Parallel requests (hedges) pass ``exclude_from_latency=False`` because the caller
+        is already waiting on the primary request in the meantime.
+        """
+        self.estimated_tokens = estimate_prompt_tokens(prompt) if prompt else 0
+        waited_ms = self.limiter.acquire(self.backend, priority=priority_for(self.component), tokens=self.estimated_tokens)
+        self.rate_limit_wait_ms += waited_ms
+        if exclude_from_latency:
+            self.started += waited_ms / 1000
+        return waited_ms
+
+    def retry(self, model: str = "") -> None:
+        self.retries += 1
+        if model:
+            self.model = model
+
+    def succeed(self, result: Any = None, *, status: str = "") -> LLMCallRecord:
+        prompt_tokens, completion_tokens, requests = extract_token_usage(result)
+        if self.estimated_tokens and prompt_tokens is not None:
+            self.limiter.settle(
+                self.backend,
+                estimated_tokens=self.estimated_tokens,
+                actual_tokens=prompt_tokens + (completion_tokens or 0),
+            )
+        if not status:
+            status = "empty" if result is not None and getattr(result, "final_output", "") is None else "ok"
+        return self._emit(status, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, requests=requests)
+
+    def fail(self, error: BaseException | str | None) -> LLMCallRecord:
+        error_class = _error_class(error)
+        if error_class == "LLMCallCancelled":
+            return self._emit("cancelled", error_class=error_class)
+        status = "timeout" if "Timeout" in error_class else "error"
+        if error_class == "RateLimitError":
+            self.limiter.penalize(self.backend)
+        return self._emit(status, error_class=error_class)
+
+    def _emit(self, status: str, **fields: Any) -> LLMCallRecord:
+        self.record = self.ledger.add(
+            LLMCallRecord(
+                component=self.component,
+                backend=self.backend,
+                model=self.model,
+                status=status,
+                latency_ms=round((time.perf_counter() - self.started) * 1000, 1),
+                retries=self.retries,
+                vacancy_id=self.vacancy_id,
+                rate_limit_wait_ms=round(self.rate_limit_wait_ms, 1),
+                hedged=self.hedged,
+                hedge_won=self.hedge_won,
+                unhedged_latency_ms=self.unhedged_latency_ms,
+                prompt_compression_ratio=self.prompt_compression_ratio,
+                tier=self.tier,
+                **fields,
+            )
+        )
+        return self.record
+
+
+def record_cache_hit(component: str, *, backend: str, vacancy_id: str = "", ledger: LLMUsageLedger | None = None) -> LLMCallRecord:
+    return (ledger or LLM_USAGE).add(
+        LLMCallRecord(
+            component=component,
+            backend=backend,
+            status="cache",
+            cache_hit=True,
+            vacancy_id=vacancy_id,
+            estimated_cost_usd=0.0,
+        )
+    )
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return float(ordered[rank])
+
+
+def _summarize_group(records: list[LLMCallRecord]) -> dict[str, Any]:
+    latencies = [item.latency_ms for item in records]
+    prompt_tokens = sum(item.prompt_tokens or 0 for item in records)
+    completion_tokens = sum(item.completion_tokens or 0 for item in records)
+    priced = [item.estimated_cost_usd for item in records if item.estimated_cost_usd is not None]
+    waits = [item.rate_limit_wait_ms for item in records if item.rate_limit_wait_ms]
+    return {
+        "calls": len(records),
+        "errors": sum(1 for item in records if item.status in {"error", "timeout"}),
+        "timeouts": sum(1 for item in records if item.status == "timeout"),
+        "retries": sum(item.retries for item in records),
+        "latency_p50_ms": round(percentile(latencies, 0.50), 1),
+        "latency_p95_ms": round(percentile(latencies, 0.95), 1),
+        "latency_p99_ms": round(percentile(latencies, 0.99), 1),
+        "latency_max_ms": round(max(latencies), 1) if latencies else 0.0,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "estimated_cost_usd": round(sum(priced), 6),
+        "unpriced_calls": len(records) - len(priced),
+        "throttled_calls": len(waits),
+        "rate_limit_wait_ms_total": round(sum(waits), 1),
+        "rate_limit_wait_p95_ms": round(percentile(waits, 0.95), 1),
+    }
+
+
+def summarize_llm_calls(records: list[LLMCallRecord], *, vacancy_count: int = 0, dropped: int = 0) -> dict[str, Any]:
+    """Aggregate ``records``; ``dropped`` is how many records of the same scope the ledger evicted."""
+    live = [item for item in records if not item.cache_hit]
+    summary = _summarize_group(live)
+    summary["truncated"] = dropped > 0
+    summary["dropped_records"] = dropped
+    review_calls = [item for item in live if item.component == "vacancy_review"]
+    summary["cache_hits"] = len(records) - len(live)
+    summary["calls_per_vacancy"] = round(len(review_calls) / vacancy_count, 3) if vacancy_count else 0.0
+    summary["error_classes"] = dict(Counter(item.error_class for item in live if item.error_class))
+    summary["by_backend"] = {
+        backend: _summarize_group([item for item in live if item.backend == backend])
+        for backend in sorted({item.backend for item in live})
+    }
+    summary["by_component"] = dict(Counter(item.component for item in live))
+    ratios = [item.prompt_compression_ratio for item in live if item.prompt_compression_ratio is not None]
+    if ratios:
+        summary["compacted_calls"] = len(ratios)
+        summary["prompt_compression_ratio"] = round(sum(ratios) / len(ratios), 3)
+    tiers = sorted({item.tier for item in review_calls if item.tier})
+    if tiers:
+        summary["by_tier"] = {tier: _summarize_group([item for item in review_calls if item.tier == tier]) for tier in tiers}
+    hedged = [item for item in live if item.hedged]
+    if hedged:
+        unhedged = [item.latency_ms if item.unhedged_latency_ms is None else item.unhedged_latency_ms for item in live]
+        summary["hedged_calls"] = len(hedged)
+        summary["hedge_wins"] = sum(1 for item in hedged if item.hedge_won)
+        summary["hedge_rate"] = round(len(hedged) / len(review_calls), 3) if review_calls else 0.0
+        summary["latency_p99_unhedged_ms"] = round(percentile(unhedged, 0.99), 1)
+        summary["p99_improvement_ms"] = round(summary["latency_p99_unhedged_ms"] - summary["latency_p99_ms"], 1)
+    return summary
+
+
+def format_llm_usage_note(summary: dict[str, Any]) -> str:
+    if not summary.get("calls"):
+        return "LLM: вызовов не было."
+    cost = float(summary.get("estimated_cost_usd") or 0.0)
+    cost_suffix = f", ~${cost:.4f}" if cost else ""
+    wait_ms = float(summary.get("rate_limit_wait_ms_total") or 0.0)
+    wait_suffix = f", ожидание лимитов {wait_ms / 1000:.1f}s" if wait_ms else ""
+    if summary.get("compacted_calls"):
+        wait_suffix += f", сжатие описаний x{float(summary['prompt_compression_ratio']):.2f}"
+    if summary.get("hedged_calls"):
+        wait_suffix += (
+            f", хеджей {summary['hedged_calls']} (выиграли {summary.get('hedge_wins', 0)}, "
+            f"p99 быстрее на ~{float(summary.get('p99_improvement_ms') or 0.0) / 1000:.1f}s)"
+        )
+    escalation = dict(summary.get("by_tier") or {}).get("escalation")
+    if escalation:
+        escalation_cost = float(escalation.get("estimated_cost_usd") or 0.0)
+        wait_suffix += f", эскалаций {escalation['calls']} (p50 {escalation['latency_p50_ms'] / 1000:.1f}s"
+        wait_suffix += f", ~${escalation_cost:.4f})" if escalation_cost else ")"
+    if summary.get("truncated"):
+        wait_suffix += f"; журнал неполный, вытеснено записей {summary['dropped_records']}"
+    return (
+        f"LLM: вызовов {summary['calls']}, p50 {summary['latency_p50_ms'] / 1000:.1f}s, "
+        f"p95 {summary['latency_p95_ms'] / 1000:.1f}s, токенов {summary['total_tokens']}{cost_suffix}, "
+        f"ошибок {summary['errors']}, из кэша {summary.get('cache_hits', 0)}{wait_suffix}."
+    )
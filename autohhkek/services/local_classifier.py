@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import json
+import re
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Vacancy, VacancyAssessment, utc_now_iso
+
+
+CLASSES = (FitCategory.FIT, FitCategory.DOUBT, FitCategory.NO_FIT)
+LLM_LABEL_STRATEGIES = {"openai_agent", "openrouter_agent", "local_llm_agent", "openai_batch"}
+DEFAULT_DIM = 1 << 16
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_TARGET_ACCURACY = 0.9
+MIN_TRAINING_SAMPLES = 30
+# Below this many held-out examples the calibrated threshold is too noisy to trust.
+MIN_HOLDOUT_SAMPLES = 20
+HOLDOUT_BUCKETS = 5
+THRESHOLD_GRID = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.98)
+_TOKEN_RE = re.compile(r"[0-9a-zа-яё+#]+(?:[.\-][0-9a-zа-яё+#]+)*")
+
+
+def tokenize(vacancy: Vacancy) -> list[str]:
+    body = _TOKEN_RE.findall(vacancy.searchable_text().lower())
+    title = _TOKEN_RE.findall(vacancy.title.lower())
+    skills = [f"s:{item.strip().lower()}" for item in vacancy.skills if item.strip()]
+    bigrams = [f"{left} {right}" for left, right in zip(body, body[1:])]
+    return body + bigrams + [f"t:{item}" for item in title] + skills
+
+
+def _hash_token(token: str, dim: int) -> int:
+    return zlib.crc32(token.encode("utf-8")) % dim
+
+
+@dataclass(slots=True)
+class SparseRows:
+    """CSR-style row matrix with just the two products logistic regression needs."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    dim: int
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def take(self, rows: np.ndarray) -> "SparseRows":
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        picks = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)]) if len(rows) else np.zeros(0, dtype=np.int64)
+        return SparseRows(np.concatenate([[0], np.cumsum(lengths)]), self.indices[picks], self.data[picks], self.dim)
+
+    def dot(self, weights: np.ndarray) -> np.ndarray:
+        products = self.data[:, None] * weights[self.indices]
+        totals = np.vstack([np.zeros((1, weights.shape[1])), np.cumsum(products, axis=0)])
+        return totals[self.indptr[1:]] - totals[self.indptr[:-1]]
+
+    def rdot(self, values: np.ndarray) -> np.ndarray:
+        row_ids = np.repeat(np.arange(self.rows), np.diff(self.indptr))
+        return np.stack(
+            [np.bincount(self.indices, weights=self.data * values[row_ids, column], minlength=self.dim) for column in range(values.shape[1])],
+            axis=1,
+        )
+
+
+def _count_rows(vacancies: list[Vacancy], dim: int) -> SparseRows:
+    indptr = [0]
+    indices: list[np.ndarray] = []
+    counts: list[np.ndarray] = []
+    for vacancy in vacancies:
+        hashed = np.fromiter((_hash_token(token, dim) for token in tokenize(vacancy)), dtype=np.int64)
+        unique, count = np.unique(hashed, return_counts=True)
+        indices.append(unique)
+        counts.append(count.astype(np.float64))
+        indptr.append(indptr[-1] + len(unique))
+    return SparseRows(
+        np.asarray(indptr, dtype=np.int64),
+        np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64),
+        np.concatenate(counts) if counts else np.zeros(0),
+        dim,
+    )
+
+
+def tfidf_rows(vacancies: list[Vacancy], idf: np.ndarray) -> SparseRows:
+    rows = _count_rows(vacancies, len(idf))
+    data = (1.0 + np.log(rows.data)) * idf[rows.indices]
+    squares = np.concatenate([[0.0], np.cumsum(data * data)])
+    norms = np.sqrt(squares[rows.indptr[1:]] - squares[rows.indptr[:-1]])
+    norms[norms == 0] = 1.0
+    rows.data = data / np.repeat(norms, np.diff(rows.indptr))
+    return rows
+
+
+def fit_idf(vacancies: list[Vacancy], dim: int) -> np.ndarray:
+    rows = _count_rows(vacancies, dim)
+    document_frequency = np.bincount(rows.indices, minlength=dim)
+    return np.log((1.0 + rows.rows) / (1.0 + document_frequency)) + 1.0
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+def fit_softmax_regression(
+    rows: SparseRows,
+    labels: np.ndarray,
+    *,
+    l2: float = 1e-4,
+    epochs: int = 300,
+    learning_rate: float = 0.1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Full-batch multinomial logistic regression with Adam updates."""
+    classes = len(CLASSES)
+    weights = np.zeros((rows.dim, classes))
+    bias = np.zeros(classes)
+    targets = np.eye(classes)[labels]
+    moments = [np.zeros_like(weights), np.zeros_like(weights), np.zeros_like(bias), np.zeros_like(bias)]
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    for step in range(1, epochs + 1):
+        error = (_softmax(rows.dot(weights) + bias) - targets) / rows.rows
+        grads = (rows.rdot(error) + l2 * weights, error.sum(axis=0))
+        for index, (param, grad) in enumerate(zip((weights, bias), grads)):
+            first, second = moments[2 * index], moments[2 * index + 1]
+            first *= beta1
+            first += (1 - beta1) * grad
+            second *= beta2
+            second += (1 - beta2) * grad * grad
+            param -= learning_rate * (first / (1 - beta1**step)) / (np.sqrt(second / (1 - beta2**step)) + eps)
+    return weights, bias
+
+
+@dataclass(slots=True)
+class LocalReviewerModel:
+    weights: np.ndarray
+    bias: np.ndarray
+    idf: np.ndarray
+    class_scores: list[float]
+    threshold: float = DEFAULT_THRESHOLD
+    report: dict[str, Any] = field(default_factory=dict)
+    trained_at: str = ""
+
+    def predict_proba(self, vacancies: list[Vacancy]) -> np.ndarray:
+        if not vacancies:
+            return np.zeros((0, len(CLASSES)))
+        return _softmax(tfidf_rows(vacancies, self.idf).dot(self.weights) + self.bias)
+
+    def predict(self, vacancy: Vacancy) -> tuple[FitCategory, float, float]:
+        """Return category, confidence and an expected 0-100 score for one vacancy."""
+        probabilities = self.predict_proba([vacancy])[0]
+        best = int(np.argmax(probabilities))
+        score = float(probabilities @ np.asarray(self.class_scores))
+        return CLASSES[best], float(probabilities[best]), score
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"class_scores": self.class_scores, "threshold": self.threshold, "report": self.report, "trained_at": self.trained_at}
+        with path.open("wb") as handle:
+            np.savez_compressed(
+                handle,
+                weights=self.weights.astype(np.float32),
+                bias=self.bias,
+                idf=self.idf.astype(np.float32),
+                meta=np.asarray(json.dumps(meta, ensure_ascii=False)),
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "LocalReviewerModel | None":
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as payload:
+                meta = json.loads(str(payload["meta"]))
+                return cls(
+                    weights=payload["weights"].astype(np.float64),
+                    bias=payload["bias"],
+                    idf=payload["idf"].astype(np.float64),
+                    class_scores=[float(item) for item in meta["class_scores"]],
+                    threshold=float(meta.get("threshold", DEFAULT_THRESHOLD)),
+                    report=dict(meta.get("report") or {}),
+                    trained_at=str(meta.get("trained_at") or ""),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def collect_training_examples(
+    vacancies: list[Vacancy],
+    assessments: list[VacancyAssessment],
+) -> tuple[list[Vacancy], list[VacancyAssessment]]:
+    by_id = {item.vacancy_id: item for item in vacancies}
+    pairs = [
+        (by_id[item.vacancy_id], item)
+        for item in assessments
+        if item.review_strategy in LLM_LABEL_STRATEGIES and item.vacancy_id in by_id
+    ]
+    return [vacancy for vacancy, _ in pairs], [assessment for _, assessment in pairs]
+
+
+def _is_holdout(vacancy_id: str) -> bool:
+    return zlib.crc32(vacancy_id.encode("utf-8")) % HOLDOUT_BUCKETS == 0
+
+
+def calibration_report(probabilities: np.ndarray, labels: np.ndarray, *, target_accuracy: float) -> dict[str, Any]:
+    confidence = probabilities.max(axis=1)
+    correct = probabilities.argmax(axis=1) == labels
+    edges = np.linspace(0.3, 1.0, 8)
+    positions = np.clip(np.digitize(confidence, edges) - 1, 0, len(edges) - 2)
+    bins = []
+    calibration_error = 0.0
+    for index in range(len(edges) - 1):
+        mask = positions == index
+        if not mask.any():
+            continue
+        accuracy = float(correct[mask].mean())
+        average = float(confidence[mask].mean())
+        calibration_error += mask.mean() * abs(accuracy - average)
+        bins.append(
+            {
+                "confidence_from": round(float(edges[index]), 2),
+                "confidence_to": round(float(edges[index + 1]), 2),
+                "count": int(mask.sum()),
+                "accuracy": round(accuracy, 3),
+                "avg_confidence": round(average, 3),
+            }
+        )
+    coverage = []
+    for threshold in THRESHOLD_GRID:
+        mask = confidence >= threshold
+        coverage.append(
+            {
+                "threshold": threshold,
+                "coverage": round(float(mask.mean()), 3) if len(mask) else 0.0,
+                "accuracy": round(float(correct[mask].mean()), 3) if mask.any() else None,
+            }
+        )
+    eligible = [item["threshold"] for item in coverage if item["accuracy"] is not None and item["accuracy"] >= target_accuracy]
+    return {
+        "holdout_samples": int(len(labels)),
+        "holdout_accuracy": round(float(correct.mean()), 3) if len(labels) else None,
+        "expected_calibration_error": round(float(calibration_error), 4),
+        "reliability": bins,
+        "coverage": coverage,
+        "target_accuracy": target_accuracy,
+        "recommended_threshold": min(eligible) if eligible else None,
+    }
+
+
+def train_local_reviewer(
+    vacancies: list[Vacancy],
+    assessments: list[VacancyAssessment],
+    *,
+    dim: int = DEFAULT_DIM,
+    threshold: float | None = None,
+    target_accuracy: float = DEFAULT_TARGET_ACCURACY,
+    epochs: int = 300,
+) -> LocalReviewerModel:
+    """Distil stored LLM verdicts into a hashed TF-IDF + softmax regression model.
+
+    A deterministic fifth of the examples is held out for the calibration report and
+    threshold choice; the shipped model is then refitted on every example.
+    """
+    examples, labelled = collect_training_examples(vacancies, assessments)
+    if len(examples) < MIN_TRAINING_SAMPLES:
+        raise RuntimeError(f"Need at least {MIN_TRAINING_SAMPLES} LLM-reviewed vacancies to train, found {len(examples)}.")
+    labels = np.asarray([CLASSES.index(item.category) for item in labelled])
+    scores = np.asarray([item.score for item in labelled], dtype=np.float64)
+    class_scores = [float(scores[labels == index].mean()) if (labels == index).any() else 50.0 for index in range(len(CLASSES))]
+
+    holdout = np.asarray([_is_holdout(item.vacancy_id) for item in examples])
+    if holdout.all() or not holdout.any():
+        holdout = np.arange(len(examples)) % HOLDOUT_BUCKETS == 0
+    train_rows, test_rows = np.flatnonzero(~holdout), np.flatnonzero(holdout)
+    train_idf = fit_idf([examples[index] for index in train_rows], dim)
+    train_matrix = tfidf_rows(examples, train_idf)
+    weights, bias = fit_softmax_regression(train_matrix.take(train_rows), labels[train_rows], epochs=epochs)
+    probabilities = _softmax(train_matrix.take(test_rows).dot(weights) + bias)
+    report = calibration_report(probabilities, labels[test_rows], target_accuracy=target_accuracy)
+    report["train_samples"] = int(len(train_rows))
+    report["class_counts"] = {category.value: int((labels == index).sum()) for index, category in enumerate(CLASSES)}
+
+    idf = fit_idf(examples, dim)
+    weights, bias = fit_softmax_regression(tfidf_rows(examples, idf), labels, epochs=epochs)
+    recommended = report["recommended_threshold"] if len(test_rows) >= MIN_HOLDOUT_SAMPLES else None
+    chosen = threshold if threshold is not None else (recommended or DEFAULT_THRESHOLD)
+    report["threshold"] = chosen
+    return LocalReviewerModel(
+        weights=weights,
+        bias=bias,
+        idf=idf,
+        class_scores=class_scores,
+        threshold=float(chosen),
+        report=report,
+        trained_at=utc_now_iso(),
+    )
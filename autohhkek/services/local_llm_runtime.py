@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit, urlunsplit
+
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+
+DEFAULT_LOCAL_LLM_BASE_URL = "http://127.0.0.1:8080/v1"
+# CPU inference of a few hundred output tokens easily takes a minute on a laptop.
+DEFAULT_LOCAL_LLM_TIMEOUT_SEC = 180.0
+DEFAULT_LOCAL_LLM_MAX_TOKENS = 512
+LOCAL_LLM_PLACEHOLDER_KEY = "local"
+LOCAL_LLM_PROBE_TIMEOUT_SEC = 1.5
+LOCAL_LLM_PROBE_TTL_SEC = 30.0
+
+
+@dataclass(slots=True)
+class LocalServerInfo:
+    reachable: bool = False
+    models: list[str] = field(default_factory=list)
+    slots: int = 0
+    server: str = ""
+    error: str = ""
+    probed_at: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "reachable": self.reachable,
+            "models": list(self.models),
+            "slots": self.slots,
+            "server": self.server,
+            "error": self.error,
+        }
+
+
+_PROBE_CACHE: dict[str, LocalServerInfo] = {}
+_SLOT_GATES: dict[tuple[str, int], threading.BoundedSemaphore] = {}
+_LOCK = threading.Lock()
+
+
+def _server_root(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    path = parts.path.rstrip("/")
+    if path.endswith("/v1"):
+        path = path[: -len("/v1")]
+    return urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+
+
+def probe_local_server(base_url: str, api_key: str = "", *, timeout: float = LOCAL_LLM_PROBE_TIMEOUT_SEC) -> LocalServerInfo:
+    """Ask an OpenAI-compatible server for its models and, on llama.cpp, its parallel slot count."""
+    import httpx
+
+    headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+    info = LocalServerInfo(probed_at=time.monotonic())
+    try:
+        with httpx.Client(timeout=timeout, headers=headers) as client:
+            response = client.get(f"{base_url.rstrip('/')}/models")
+            response.raise_for_status()
+            payload = response.json()
+            info.models = [str(item.get("id")) for item in payload.get("data") or [] if item.get("id")]
+            info.reachable = True
+            owners = {str(item.get("owned_by") or "") for item in payload.get("data") or []}
+            info.server = "llama.cpp" if "llamacpp" in owners else "vllm" if "vllm" in owners else "ollama" if "library" in owners else ""
+            try:
+                props = client.get(f"{_server_root(base_url)}/props")
+                if props.status_code == 200:
+                    info.slots = int(props.json().get("total_slots") or 0)
+                    info.server = info.server or "llama.cpp"
+            except (httpx.HTTPError, ValueError, TypeError, AttributeError):
+                pass
+    except (httpx.HTTPError, ValueError, TypeError, AttributeError) as exc:
+        info.reachable = False
+        info.error = str(exc) or exc.__class__.__name__
+    return info
+
+
+def discover_local_server(base_url: str, api_key: str = "", *, refresh: bool = False) -> LocalServerInfo:
+    """Cached ``probe_local_server``: settings screens and every reviewer share one probe per TTL."""
+    with _LOCK:
+        cached = _PROBE_CACHE.get(base_url)
+        if cached is not None and not refresh and time.monotonic() - cached.probed_at < LOCAL_LLM_PROBE_TTL_SEC:
+            return cached
+    info = probe_local_server(base_url, api_key)
+    with _LOCK:
+        _PROBE_CACHE[base_url] = info
+    return info
+
+
+def slot_gate(base_url: str, slots: int) -> threading.BoundedSemaphore:
+    """Process-wide semaphore that keeps in-flight requests within the server's parallel slots.
+
+    Requests beyond the slot count only queue inside the server, where they still hold an
+    HTTP connection and eat into the client timeout while waiting for a free slot.
+    """
+    key = (base_url, max(1, int(slots)))
+    with _LOCK:
+        gate = _SLOT_GATES.get(key)
+        if gate is None:
+            gate = _SLOT_GATES[key] = threading.BoundedSemaphore(key[1])
+        return gate
+
+
+@dataclass(slots=True)
+class LocalLLMAppConfig:
+    """Self-hosted OpenAI-compatible server (llama.cpp ``llama-server``, Ollama, vLLM, LM Studio).
+
+    No key is required. An empty ``model`` and ``slots`` of 0 are filled in from the server.
+    Calls go through Chat Completions with a JSON-schema ``response_format``, which those
+    servers turn into constrained decoding.
+    """
+
+    base_url: str = DEFAULT_LOCAL_LLM_BASE_URL
+    api_key: str = ""
+    model: str = ""
+    slots: int = 0
+    timeout_sec: float = DEFAULT_LOCAL_LLM_TIMEOUT_SEC
+    max_tokens: int = DEFAULT_LOCAL_LLM_MAX_TOKENS
+
+    @classmethod
+    def from_env(cls) -> "LocalLLMAppConfig":
+        return cls(
+            base_url=os.getenv("AUTOHHKEK_LOCAL_LLM_BASE_URL", DEFAULT_LOCAL_LLM_BASE_URL).strip() or DEFAULT_LOCAL_LLM_BASE_URL,
+            api_key=os.getenv("AUTOHHKEK_LOCAL_LLM_API_KEY", "").strip(),
+            model=os.getenv("AUTOHHKEK_LOCAL_LLM_MODEL", "").strip(),
+            slots=int(os.getenv("AUTOHHKEK_LOCAL_LLM_SLOTS", "0") or 0),
+            timeout_sec=float(os.getenv("AUTOHHKEK_LOCAL_LLM_TIMEOUT_SEC", str(DEFAULT_LOCAL_LLM_TIMEOUT_SEC)) or DEFAULT_LOCAL_LLM_TIMEOUT_SEC),
+            max_tokens=int(os.getenv("AUTOHHKEK_LOCAL_LLM_MAX_TOKENS", str(DEFAULT_LOCAL_LLM_MAX_TOKENS)) or DEFAULT_LOCAL_LLM_MAX_TOKENS),
+        )
+
+    def server_info(self, *, refresh: bool = False) -> LocalServerInfo:
+        return discover_local_server(self.base_url, self.api_key, refresh=refresh)
+
+    def is_available(self) -> bool:
+        info = self.server_info()
+        return info.reachable and bool(self.model or info.models)
+
+    def resolved_model(self) -> str:
+        if self.model:
+            return self.model
+        models = self.server_info().models
+        return models[0] if models else ""
+
+    def resolved_slots(self) -> int:
+        return max(1, self.slots or self.server_info().slots or 1)
+
+    def slot_gate(self) -> threading.BoundedSemaphore:
+        return slot_gate(self.base_url, self.resolved_slots())
+
+    def client_kwargs(self) -> dict[str, Any]:
+        return {
+            "api_key": self.api_key or LOCAL_LLM_PLACEHOLDER_KEY,
+            "base_url": self.base_url,
+            "timeout": self.timeout_sec,
+        }
+
+    def build_provider(self):
+        return LLM_CLIENT_POOL.provider("local", use_responses=False, **self.client_kwargs())
+
+    def build_client(self):
+        return LLM_CLIENT_POOL.sync_client("local", **self.client_kwargs())
+
+    def build_model_settings(self):
+        from agents import ModelSettings
+
+        return ModelSettings(temperature=0.0, max_tokens=self.max_tokens)
+
+    def build_run_config(self, *, workflow_name: str = "AutoHHKek workflow"):
+        from agents import RunConfig
+
+        return RunConfig(
+            model=self.resolved_model(),
+            model_provider=self.build_provider(),
+            model_settings=self.build_model_settings(),
+            tracing_disabled=True,
+            workflow_name=workflow_name,
+        )
+
+    def to_safe_dict(self) -> dict[str, Any]:
+        info = self.server_info()
+        return {
+            "available": self.is_available(),
+            "model": self.resolved_model(),
+            "base_url": self.base_url,
+            "slots": self.resolved_slots(),
+            "timeout_sec": self.timeout_sec,
+            "max_tokens": self.max_tokens,
+            "server": info.to_dict(),
+        }
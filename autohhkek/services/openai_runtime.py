@@ -6,6 +6,8 @@ import shutil
 from dataclasses import dataclass, field
 from typing import Any
 
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+
 
 DEFAULT_PLAYWRIGHT_MCP_ARGS = ["-y", "@playwright/mcp@latest"]
 DEFAULT_OPENAI_TIMEOUT_SEC = 25.0
@@ -51,15 +53,13 @@ class OpenAIAppConfig:
         return bool(self.api_key)
 
     def build_provider(self):
-        from agents import OpenAIProvider
-
-        return OpenAIProvider(
-            api_key=self.api_key or None,
-            base_url=self.base_url or None,
-            organization=self.organization or None,
-            project=self.project or None,
+        return LLM_CLIENT_POOL.provider(
+            "openai",
+            api_key=self.api_key,
+            base_url=self.base_url,
+            organization=self.organization,
+            project=self.project,
             timeout=self.timeout_sec,
-            use_responses=True,
         )
 
     def build_model_settings(self):
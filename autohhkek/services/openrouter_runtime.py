@@ -4,9 +4,12 @@ import os
 from dataclasses import dataclass
 from typing import Any
 
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL
+
 DEFAULT_OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 DEFAULT_OPENROUTER_MODEL = "openai/gpt-5-nano"
 DEFAULT_OPENROUTER_TIMEOUT_SEC = 25.0
+DEFAULT_OPENROUTER_HEDGE_BUDGET = 0.1
 OPENROUTER_MODEL_ALIASES = {
     "gpt-5.4": "openai/gpt-5.4",
     "gpt-5.4-nano": "openai/gpt-5-nano",
@@ -30,6 +33,8 @@ class OpenRouterAppConfig:
     site_url: str = ""
     app_name: str = "AutoHHKek"
     timeout_sec: float = DEFAULT_OPENROUTER_TIMEOUT_SEC
+    hedge_enabled: bool = False
+    hedge_budget: float = DEFAULT_OPENROUTER_HEDGE_BUDGET
 
     @classmethod
     def from_env(cls) -> "OpenRouterAppConfig":
@@ -47,27 +52,34 @@ class OpenRouterAppConfig:
                 or "AutoHHKek"
             ),
             timeout_sec=float(os.getenv("AUTOHHKEK_OPENROUTER_TIMEOUT_SEC", str(DEFAULT_OPENROUTER_TIMEOUT_SEC)) or DEFAULT_OPENROUTER_TIMEOUT_SEC),
+            hedge_enabled=os.getenv("AUTOHHKEK_OPENROUTER_HEDGE", "").strip().lower() in {"1", "true", "yes", "on"},
+            hedge_budget=float(os.getenv("AUTOHHKEK_OPENROUTER_HEDGE_BUDGET", str(DEFAULT_OPENROUTER_HEDGE_BUDGET)) or DEFAULT_OPENROUTER_HEDGE_BUDGET),
         )
 
     def is_available(self) -> bool:
         return bool(self.api_key)
 
-    def build_provider(self):
-        from agents import OpenAIProvider
-        from openai import AsyncOpenAI
-
+    def build_headers(self) -> dict[str, str]:
         headers = {}
         if self.site_url:
             headers["HTTP-Referer"] = self.site_url
         if self.app_name:
             headers["X-OpenRouter-Title"] = self.app_name
-        client = AsyncOpenAI(
-            api_key=self.api_key or None,
-            base_url=self.base_url or DEFAULT_OPENROUTER_BASE_URL,
-            default_headers=headers or None,
-            timeout=self.timeout_sec,
-        )
-        return OpenAIProvider(openai_client=client, use_responses=True)
+        return headers
+
+    def client_kwargs(self) -> dict[str, Any]:
+        return {
+            "api_key": self.api_key,
+            "base_url": self.base_url or DEFAULT_OPENROUTER_BASE_URL,
+            "headers": self.build_headers(),
+            "timeout": self.timeout_sec,
+        }
+
+    def build_provider(self):
+        return LLM_CLIENT_POOL.provider("openrouter", **self.client_kwargs())
+
+    def build_client(self):
+        return LLM_CLIENT_POOL.sync_client("openrouter", **self.client_kwargs())
 
     def build_model_settings(self):
         from agents import ModelSettings
@@ -93,4 +105,6 @@ class OpenRouterAppConfig:
             "site_url": self.site_url,
             "app_name": self.app_name,
             "timeout_sec": self.timeout_sec,
+            "hedge_enabled": self.hedge_enabled,
+            "hedge_budget": self.hedge_budget,
         }
@@ -76,6 +76,14 @@ class WorkspacePaths:
     def incoming_hh_state_path(self) -> Path:
         return self.global_memory_dir / "incoming_hh_state.json"
 
+    @property
+    def llm_router_state_path(self) -> Path:
+        return self.global_memory_dir / "llm_router_state.json"
+
+    @property
+    def scrape_profile_stats_path(self) -> Path:
+        return self.global_memory_dir / "scrape_profile_stats.json"
+
     @property
     def preferences_path(self) -> Path:
         return self.memory_dir / "user_preferences.json"
@@ -92,6 +100,18 @@ class WorkspacePaths:
     def dashboard_state_path(self) -> Path:
         return self.memory_dir / "dashboard_state.json"
 
+    @property
+    def rule_weights_path(self) -> Path:
+        return self.memory_dir / "rule_weights.json"
+
+    @property
+    def local_reviewer_model_path(self) -> Path:
+        return self.memory_dir / "local_reviewer.npz"
+
+    @property
+    def vacancy_clusters_path(self) -> Path:
+        return self.memory_dir / "vacancy_clusters.npz"
+
     @property
     def hh_resumes_path(self) -> Path:
         return self.memory_dir / "hh_resumes.json"
@@ -112,6 +132,13 @@ class WorkspacePaths:
     def assessments_path(self) -> Path:
         return self.snapshots_dir / "assessments.json"
 
+    @property
+    def serp_cache_dir(self) -> Path:
+        return self.snapshots_dir / "serp_cache"
+
+    def serp_cache_path(self, query_key: str) -> Path:
+        return self.serp_cache_dir / f"{query_key}.json"
+
     @property
     def analysis_state_path(self) -> Path:
         return self.snapshots_dir / "analysis_state.json"
@@ -136,10 +163,25 @@ class WorkspacePaths:
     def vacancy_feedback_path(self) -> Path:
         return self.artifacts_dir / "vacancy_feedback.json"
 
+    @property
+    def local_reviewer_report_path(self) -> Path:
+        return self.artifacts_dir / "local_reviewer_report.json"
+
     @property
     def filter_plan_path(self) -> Path:
         return self.artifacts_dir / "filter_plan.json"
 
+    @property
+    def batch_reviews_dir(self) -> Path:
+        return self.artifacts_dir / "batch_reviews"
+
+    def batch_review_dir(self, job_id: str) -> Path:
+        return self.batch_reviews_dir / job_id
+
+    @property
+    def review_escalations_path(self) -> Path:
+        return self.artifacts_dir / "review_escalations.jsonl"
+
     @property
     def repair_tasks_path(self) -> Path:
         return self.artifacts_dir / "repair_tasks.json"
@@ -52,18 +52,16 @@ def get_browser_launch_probe_error() -> str | None:
         return _BROWSER_LAUNCH_PROBE
 
     try:
-        from playwright.async_api import async_playwright
+        import playwright.async_api  # noqa: F401
     except Exception as exc:  # noqa: BLE001
         _BROWSER_LAUNCH_PROBE = str(exc)
         return _BROWSER_LAUNCH_PROBE
 
-    async def _probe() -> None:
-        async with async_playwright() as playwright:
-            browser = await launch_chromium_resilient(playwright, headless=True)
-            await browser.close()
+    from autohhkek.services.browser_service import BROWSER_SERVICE
 
     try:
-        asyncio.run(_probe())
+        # The probe launch stays warm in the shared service for the first real task.
+        BROWSER_SERVICE.run(BROWSER_SERVICE.probe)
         _BROWSER_LAUNCH_PROBE = None
     except Exception as exc:  # noqa: BLE001
         _BROWSER_LAUNCH_PROBE = str(exc)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from autohhkek.domain.models import Vacancy
+
+
+DEFAULT_DESCRIPTION_TOKENS = 700
+MAX_CHUNK_CHARS = 400
+MAX_SKILLS = 30
+# Vacancy meta stored by the detail fetch that matters for the fit verdict; the rest is bookkeeping.
+PROMPT_META_FIELDS = ("experience", "schedule", "published_at")
+# Lower value wins when the budget runs out; sections are still emitted in their original order.
+SECTION_PRIORITY = {"salary": 0, "requirements": 1, "responsibilities": 2, "stack": 3, "conditions": 4, "overview": 5}
+SECTION_HEADERS: dict[str, tuple[str, ...]] = {
+    "responsibilities": (
+        "обязанности",
+        "основные задачи",
+        "задачи",
+        "что нужно делать",
+        "что предстоит делать",
+        "чем предстоит заниматься",
+        "чем ты будешь заниматься",
+        "чем вы будете заниматься",
+        "responsibilities",
+        "what you will do",
+    ),
+    "requirements": (
+        "требования",
+        "мы ожидаем",
+        "ожидания",
+        "наши ожидания",
+        "что мы ждем",
+        "что мы ждём",
+        "кого мы ищем",
+        "нам важно",
+        "будет плюсом",
+        "будет преимуществом",
+        "requirements",
+        "qualifications",
+        "nice to have",
+    ),
+    "stack": (
+        "технологический стек",
+        "наш стек",
+        "стек технологий",
+        "стек",
+        "технологии",
+        "ключевые навыки",
+        "tech stack",
+    ),
+    "conditions": (
+        "условия",
+        "что мы предлагаем",
+        "мы предлагаем",
+        "преимущества работы с нами",
+        "мы гарантируем",
+        "conditions",
+        "we offer",
+        "benefits",
+    ),
+    "drop": (
+        "о компании",
+        "о нас",
+        "кто мы",
+        "где предстоит работать",
+        "адрес",
+        "контактная информация",
+        "контакты",
+        "задайте вопрос работодателю",
+        "вакансия опубликована",
+        "похожие вакансии",
+        "вам подойдут эти вакансии",
+        "about us",
+        "about the company",
+    ),
+}
+_HEADER_RE = re.compile(
+    r"(?:^|(?<=[\s.;:!?•·]))(?P<header>"
+    + "|".join(re.escape(item) for item in sorted({h for items in SECTION_HEADERS.values() for h in items}, key=len, reverse=True))
+    + r")(?P<tail>\s*:\s*|\s+(?=[A-ZА-ЯЁ•·\-–—]))",
+    re.IGNORECASE,
+)
+_HEADER_KIND = {header: kind for kind, items in SECTION_HEADERS.items() for header in items}
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|\s+(?=[•·])|\s*\n+\s*")
+_SALARY_RE = re.compile(r"(₽|руб|\$|€|зарплат|заработн|оклад|доход|на руки|до вычета|salary)", re.IGNORECASE)
+
+
+def description_token_budget() -> int:
+    raw = os.getenv("AUTOHHKEK_PROMPT_DESCRIPTION_TOKENS", "").strip()
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_DESCRIPTION_TOKENS
+    except ValueError:
+        return DEFAULT_DESCRIPTION_TOKENS
+
+
+def estimate_text_tokens(value: Any) -> int:
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    return len(text or "") // 4
+
+
+@dataclass(slots=True)
+class _Section:
+    kind: str
+    header: str
+    sentences: list[str] = field(default_factory=list)
+    kept: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class CompactVacancy:
+    payload: dict[str, Any]
+    original_tokens: int
+    compact_tokens: int
+    sections: list[str] = field(default_factory=list)
+
+    @property
+    def compression_ratio(self) -> float:
+        if not self.original_tokens:
+            return 1.0
+        return round(self.compact_tokens / self.original_tokens, 3)
+
+
+def _sentence_key(value: str) -> str:
+    return re.sub(r"[\W_]+", " ", value.lower()).strip()
+
+
+def _split_sentences(text: str) -> list[str]:
+    sentences: list[str] = []
+    for part in _SENTENCE_SPLIT_RE.split(text or ""):
+        part = part.strip(" •·-–—\t")
+        while len(part) > MAX_CHUNK_CHARS:
+            cut = part.rfind(" ", 0, MAX_CHUNK_CHARS)
+            cut = cut if cut > MAX_CHUNK_CHARS // 2 else MAX_CHUNK_CHARS
+            sentences.append(part[:cut].strip())
+            part = part[cut:].strip()
+        if part:
+            sentences.append(part)
+    return sentences
+
+
+def split_sections(text: str) -> list[_Section]:
+    """Cut flattened hh.ru page text at known section headers ("Требования", "Условия", ...)."""
+    matches = [match for match in _HEADER_RE.finditer(text or "") if match.group("header")[0].isupper() or ":" in match.group("tail")]
+    sections = [_Section("overview", "", _split_sentences(text[: matches[0].start()] if matches else text))]
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        header = match.group("header")
+        sections.append(_Section(_HEADER_KIND[header.lower()], header, _split_sentences(text[match.end() : end])))
+    return sections
+
+
+def compact_description(text: str, *, budget_tokens: int | None = None, seen: set[str] | None = None) -> tuple[str, list[str]]:
+    """Extract requirements, duties, stack, conditions and salary lines within a token budget.
+
+    Boilerplate sections are dropped, repeated sentences are kept once, and when the
+    budget runs out sentences are taken round-robin by section priority so every
+    relevant section keeps its leading lines.
+    """
+    budget_chars = (description_token_budget() if budget_tokens is None else budget_tokens) * 4
+    seen = set() if seen is None else seen
+    sections = [section for section in split_sections(text) if section.kind != "drop"]
+    salary = _Section("salary", "")
+    for section in sections:
+        unique: list[str] = []
+        for sentence in section.sentences:
+            key = _sentence_key(sentence)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            if section.kind == "overview" and _SALARY_RE.search(sentence):
+                salary.sentences.append(sentence)
+                continue
+            unique.append(sentence)
+        section.sentences = unique
+    sections = [salary, *sections]
+
+    queues = sorted((section for section in sections if section.sentences), key=lambda item: SECTION_PRIORITY[item.kind])
+    used = 0
+    while queues and used < budget_chars:
+        for section in list(queues):
+            sentence = section.sentences[len(section.kept)]
+            cost = len(sentence) + 1 + (len(section.header) + 2 if section.header and not section.kept else 0)
+            if used + cost > budget_chars:
+                queues.remove(section)
+                continue
+            section.kept.append(sentence)
+            used += cost
+            if len(section.kept) == len(section.sentences):
+                queues.remove(section)
+
+    lines = []
+    for section in sections:
+        if not section.kept:
+            continue
+        body = " ".join(section.kept)
+        lines.append(f"{section.header}: {body}" if section.header else body)
+    return "\n".join(lines), [section.kind for section in sections if section.kept]
+
+
+def compact_vacancy(vacancy: Vacancy, *, budget_tokens: int | None = None) -> CompactVacancy:
+    """Prompt-ready vacancy payload; ``budget_tokens=0`` (or the env override) disables compaction."""
+    original = vacancy.to_dict()
+    original_tokens = estimate_text_tokens(original)
+    budget = description_token_budget() if budget_tokens is None else budget_tokens
+    if budget <= 0:
+        return CompactVacancy(payload=original, original_tokens=original_tokens, compact_tokens=original_tokens)
+
+    seen = {_sentence_key(item) for item in (vacancy.title, vacancy.company, vacancy.location, vacancy.salary_text) if item}
+    source = "\n".join(part for part in (vacancy.description, vacancy.summary) if part)
+    description, sections = compact_description(source, budget_tokens=budget, seen=seen)
+    payload = {
+        "vacancy_id": vacancy.vacancy_id,
+        "title": vacancy.title,
+        "company": vacancy.company,
+        "location": vacancy.location,
+        "employment": vacancy.employment,
+        "salary_text": vacancy.salary_text,
+        "salary_from": vacancy.salary_from,
+        "salary_to": vacancy.salary_to,
+        "is_remote": vacancy.is_remote,
+        "skills": vacancy.skills[:MAX_SKILLS],
+        **{key: str(vacancy.meta.get(key) or "") for key in PROMPT_META_FIELDS},
+        "description": description,
+    }
+    payload = {key: value for key, value in payload.items() if value not in ("", None, [])}
+    return CompactVacancy(
+        payload=payload,
+        original_tokens=original_tokens,
+        compact_tokens=estimate_text_tokens(payload),
+        sections=sections,
+    )
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from autohhkek.services.env_loader import env_int
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_REVIEW_WORKERS = 1
+MAX_REVIEW_WORKERS = 8
+
+StageFn = Callable[[Any], Awaitable[Iterable[Any] | None]]
+EmitFn = Callable[[Any], Awaitable[None]]
+_DONE = object()
+
+
+@dataclass(slots=True)
+class PipelineConfig:
+    enabled: bool = True
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    review_workers: int = DEFAULT_REVIEW_WORKERS
+
+    @classmethod
+    def from_env(cls) -> "PipelineConfig":
+        return cls(
+            enabled=os.getenv("AUTOHHKEK_STREAMING_ANALYSIS", "1").strip().lower() not in {"0", "false", "no", "off"},
+            queue_size=max(1, env_int("AUTOHHKEK_PIPELINE_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+            review_workers=min(MAX_REVIEW_WORKERS, max(1, env_int("AUTOHHKEK_PIPELINE_REVIEW_WORKERS", DEFAULT_REVIEW_WORKERS))),
+        )
+
+
+@dataclass(slots=True)
+class PipelineStage:
+    """One step of a ``StreamingPipeline``: ``handle`` maps an input to zero or more outputs."""
+
+    name: str
+    handle: StageFn
+    workers: int = 1
+
+
+@dataclass(slots=True)
+class StageStats:
+    name: str
+    workers: int = 1
+    capacity: int = 0
+    received: int = 0
+    emitted: int = 0
+    busy_sec: float = 0.0
+    queue_peak: int = 0
+    blocked_sec: float = 0.0
+    first_output_sec: float | None = None
+    elapsed_sec: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return self.received / self.elapsed_sec if self.elapsed_sec > 0 else 0.0
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "received": self.received,
+            "emitted": self.emitted,
+            "queue_peak": self.queue_peak,
+            "busy_sec": round(self.busy_sec, 2),
+            "blocked_sec": round(self.blocked_sec, 2),
+            "first_output_sec": round(self.first_output_sec, 2) if self.first_output_sec is not None else None,
+            "elapsed_sec": round(self.elapsed_sec, 2),
+            "per_second": round(self.per_second, 2),
+        }
+
+
+@dataclass(slots=True)
+class StreamingPipeline:
+    """Stages connected by bounded queues, each drained by its own workers on one event loop.
+
+    A full queue blocks the upstream ``put`` (time counted in the downstream stage's
+    ``blocked_sec``), so a slow stage throttles everything before it instead of letting
+    cards pile up in memory. Items reach the last stage as soon as they clear the ones
+    before it, not when the whole source is exhausted.
+    """
+
+    stages: list[PipelineStage]
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    clock: Callable[[], float] = time.perf_counter
+    stats: list[StageStats] = field(init=False)
+    _queues: list[asyncio.Queue] = field(init=False, default_factory=list)
+    _started: float = field(init=False, default=0.0)
+
+    def __post_init__(self) -> None:
+        self.stats = [StageStats(name=stage.name, workers=max(1, stage.workers), capacity=self.queue_size) for stage in self.stages]
+
+    async def _put(self, index: int, item: Any) -> None:
+        queue = self._queues[index]
+        stats = self.stats[index]
+        started = self.clock()
+        await queue.put(item)
+        stats.blocked_sec += self.clock() - started
+        stats.queue_peak = max(stats.queue_peak, queue.qsize())
+
+    async def _run_stage(self, index: int) -> None:
+        stage = self.stages[index]
+        stats = self.stats[index]
+        inbox = self._queues[index]
+        last = index == len(self.stages) - 1
+
+        async def _worker() -> None:
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                stats.received += 1
+                started = self.clock()
+                outputs = list(await stage.handle(item) or ())
+                finished = self.clock()
+                stats.busy_sec += finished - started
+                stats.elapsed_sec = finished - self._started
+                if stats.first_output_sec is None:
+                    stats.first_output_sec = finished - self._started
+                stats.emitted += len(outputs)
+                if not last:
+                    for output in outputs:
+                        await self._put(index + 1, output)
+
+        await asyncio.gather(*(_worker() for _ in range(stats.workers)))
+        if not last:
+            for _ in range(self.stats[index + 1].workers):
+                await self._queues[index + 1].put(_DONE)
+
+    async def run(self, produce: Callable[[EmitFn], Awaitable[Any]]) -> Any:
+        """Feed the first stage through ``produce(emit)`` and wait until every stage drains.
+
+        Returns what ``produce`` returned. If any stage fails, the others are cancelled and
+        the error is raised.
+        """
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        self._started = self.clock()
+
+        async def _produce() -> Any:
+            result = await produce(lambda item: self._put(0, item))
+            for _ in range(self.stats[0].workers):
+                await self._queues[0].put(_DONE)
+            return result
+
+        producer = asyncio.ensure_future(_produce())
+        tasks = [producer, *(asyncio.ensure_future(self._run_stage(index)) for index in range(len(self.stages)))]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        return producer.result()
+
+    def depths(self) -> dict[str, int]:
+        """Items waiting in front of each stage right now."""
+        return {stats.name: queue.qsize() for stats, queue in zip(self.stats, self._queues)}
+
+    def depth_line(self) -> str:
+        depths = self.depths()
+        return "Конвейер, очереди: " + ", ".join(
+            f"{stats.name} {depths.get(stats.name, 0)}/{stats.capacity} (обработано {stats.received})" for stats in self.stats
+        ) + "."
+
+    def to_dict(self) -> list[dict[str, object]]:
+        return [stats.to_dict() for stats in self.stats]
+
+    def summary_line(self) -> str:
+        parts = [
+            f"{stats.name}: {stats.received} за {stats.elapsed_sec:.1f}s ({stats.per_second:.1f}/с, пик очереди {stats.queue_peak}/{stats.capacity})"
+            for stats in self.stats
+        ]
+        first = self.stats[-1].first_output_sec if self.stats else None
+        return f"Конвейер: {'; '.join(parts)}." + (f" Первый результат через {first:.1f}s." if first is not None else "")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable
+
+from autohhkek.domain.models import Vacancy, VacancyAssessment
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL, LLMCancelScope
+from autohhkek.services.llm_usage import LLM_USAGE
+
+
+ENSEMBLE_QUORUM = 2
+ENSEMBLE_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="autohhkek-ensemble")
+
+MemberFn = Callable[[Vacancy], "VacancyAssessment | None"]
+
+
+@dataclass(slots=True)
+class EnsembleVote:
+    member: str
+    status: str = "pending"
+    assessment: VacancyAssessment | None = None
+    latency_ms: float = 0.0
+
+    def label(self) -> str:
+        if self.assessment is not None:
+            return f"{self.member}: {self.assessment.category.value} {self.assessment.score:.0f}"
+        return f"{self.member}: {ENSEMBLE_STATUS_LABELS.get(self.status, self.status)}"
+
+
+ENSEMBLE_STATUS_LABELS = {"failed": "ошибка", "cancelled": "отменён", "skipped": "пропущен", "pending": "нет ответа"}
+
+
+def agreed_category(votes: list[EnsembleVote], quorum: int = ENSEMBLE_QUORUM) -> str:
+    counts: dict[str, int] = {}
+    for vote in votes:
+        if vote.assessment is not None:
+            category = vote.assessment.category.value
+            counts[category] = counts.get(category, 0) + 1
+            if counts[category] >= quorum:
+                return category
+    return ""
+
+
+def run_ensemble(
+    vacancy: Vacancy,
+    members: list[tuple[str, MemberFn | None]],
+    *,
+    quorum: int = ENSEMBLE_QUORUM,
+    executor: ThreadPoolExecutor | None = None,
+) -> tuple[list[EnsembleVote], str]:
+    """Query every member concurrently and stop as soon as ``quorum`` of them agree on a category.
+
+    Members given as ``None`` are recorded as skipped. On early exit the agent runs still in
+    flight are cancelled through a shared ``LLMCancelScope`` and their votes marked cancelled.
+    Returns the votes in member order and the agreed category (``""`` on disagreement).
+    """
+    votes = [EnsembleVote(member=name, status="skipped" if fn is None else "pending") for name, fn in members]
+    scope = LLMCancelScope()
+    usage_scope = LLM_USAGE.current_scope()
+
+    def _call(fn: MemberFn) -> tuple[VacancyAssessment | None, float]:
+        started = time.perf_counter()
+        with LLM_USAGE.scope(usage_scope), LLM_CLIENT_POOL.cancel_scope(scope):
+            assessment = fn(vacancy)
+        return assessment, round((time.perf_counter() - started) * 1000, 1)
+
+    pool = executor or ENSEMBLE_EXECUTOR
+    futures: dict[Future, EnsembleVote] = {pool.submit(_call, fn): vote for vote, (_, fn) in zip(votes, members) if fn is not None}
+    pending = set(futures)
+    category = ""
+    while pending and not category:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            vote = futures[future]
+            try:
+                vote.assessment, vote.latency_ms = future.result()
+            except Exception:  # noqa: BLE001
+                vote.status = "failed"
+                continue
+            vote.status = "ok" if vote.assessment is not None else "failed"
+        category = agreed_category(votes, quorum)
+    if pending:
+        scope.cancel()
+        for future in pending:
+            future.cancel()
+            futures[future].status = "cancelled"
+    return votes, category
+
+
+def format_ensemble_note(votes: list[EnsembleVote], category: str, elapsed_ms: float) -> str:
+    answered = sum(1 for vote in votes if vote.assessment is not None)
+    details = "; ".join(vote.label() for vote in votes)
+    if category:
+        agreeing = sum(1 for vote in votes if vote.assessment is not None and vote.assessment.category.value == category)
+        return f"Ансамбль: {agreeing} из {len(votes)} согласны на {category} за {elapsed_ms / 1000:.1f}s ({details})."
+    return f"Ансамбль: согласия нет, ответили {answered} из {len(votes)} ({details})."
+
+
+def format_ensemble_stats_note(stats: dict[str, int]) -> str:
+    if not stats.get("reviews"):
+        return ""
+    return (
+        f"Ансамбль: {stats['reviews']} вакансий, согласие {stats.get('agreements', 0)} "
+        f"(досрочно {stats.get('early_exits', 0)}, отменено вызовов {stats.get('cancelled_calls', 0)}), "
+        f"разногласий {stats.get('disagreements', 0)}."
+    )
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from autohhkek.domain.models import VacancyAssessment, utc_now_iso
+from autohhkek.services.analysis import DEFAULT_DOUBT_THRESHOLD, DEFAULT_FIT_THRESHOLD, RuleWeights
+from autohhkek.services.runtime_settings import ESCALATION_OFF_VALUES
+
+
+ESCALATION_BACKENDS = ("openai", "openrouter")
+DEFAULT_ESCALATION_MIN_CONFIDENCE = 0.7
+DEFAULT_ESCALATION_SCORE_MARGIN = 5.0
+TRIAGE_TIER = "triage"
+ESCALATION_TIER = "escalation"
+
+
+def escalation_model_field(backend: str) -> str:
+    return f"{backend}_escalation_model"
+
+
+@dataclass(slots=True)
+class EscalationPolicy:
+    """When a cheap triage verdict is re-reviewed by the stronger model configured for its backend.
+
+    A verdict escalates when the triage model is unsure of it or its score lands within
+    ``score_margin`` of the fit/doubt thresholds, where a few points flip the column.
+    """
+
+    models: dict[str, str] = field(default_factory=dict)
+    min_confidence: float = DEFAULT_ESCALATION_MIN_CONFIDENCE
+    score_margin: float = DEFAULT_ESCALATION_SCORE_MARGIN
+    thresholds: tuple[float, ...] = (DEFAULT_DOUBT_THRESHOLD, DEFAULT_FIT_THRESHOLD)
+
+    @classmethod
+    def from_settings(cls, settings: dict[str, Any], weights: RuleWeights | None = None) -> "EscalationPolicy":
+        weights = weights or RuleWeights()
+        return cls(
+            models={backend: str(settings.get(escalation_model_field(backend)) or "").strip() for backend in ESCALATION_BACKENDS},
+            min_confidence=float(settings.get("escalation_min_confidence", DEFAULT_ESCALATION_MIN_CONFIDENCE)),
+            score_margin=float(settings.get("escalation_score_margin", DEFAULT_ESCALATION_SCORE_MARGIN)),
+            thresholds=(weights.doubt_threshold, weights.fit_threshold),
+        )
+
+    def model_for(self, backend: str, triage_model: str) -> str:
+        """The escalation model for ``backend``, or ``""`` when escalation is off or would repeat triage."""
+        model = self.models.get(backend, "")
+        return "" if not model or model.lower() in ESCALATION_OFF_VALUES or model == triage_model else model
+
+    def reason(self, assessment: VacancyAssessment, confidence: float) -> str:
+        if confidence < self.min_confidence:
+            return "low_confidence"
+        if any(abs(assessment.score - threshold) <= self.score_margin for threshold in self.thresholds):
+            return "near_threshold"
+        return ""
+
+
+def escalation_record(
+    vacancy_id: str,
+    *,
+    backend: str,
+    reason: str,
+    triage_model: str,
+    triage: VacancyAssessment,
+    triage_confidence: float,
+    escalation_model: str,
+    final: VacancyAssessment | None,
+    final_confidence: float | None,
+) -> dict[str, Any]:
+    return {
+        "vacancy_id": vacancy_id,
+        "backend": backend,
+        "reason": reason,
+        "triage_model": triage_model,
+        "triage_category": triage.category.value,
+        "triage_score": round(triage.score, 1),
+        "triage_confidence": round(triage_confidence, 3),
+        "escalation_model": escalation_model,
+        "status": "ok" if final is not None else "failed",
+        "final_category": final.category.value if final is not None else "",
+        "final_score": round(final.score, 1) if final is not None else None,
+        "final_confidence": round(final_confidence, 3) if final_confidence is not None else None,
+        "disagreement": final is not None and final.category != triage.category,
+        "recorded_at": utc_now_iso(),
+    }
+
+
+def summarize_escalations(records: list[dict[str, Any]], *, reviewed_count: int = 0) -> dict[str, Any]:
+    completed = [item for item in records if item.get("status") == "ok"]
+    moves = Counter(f"{item['triage_category']}->{item['final_category']}" for item in completed if item.get("disagreement"))
+    return {
+        "escalated": len(records),
+        "escalation_rate": round(len(records) / reviewed_count, 3) if reviewed_count else 0.0,
+        "failed": len(records) - len(completed),
+        "disagreements": sum(moves.values()),
+        "by_reason": dict(Counter(item["reason"] for item in records)),
+        "moves": dict(sorted(moves.items())),
+    }
+
+
+def format_escalation_note(summary: dict[str, Any]) -> str:
+    if not summary.get("escalated"):
+        return ""
+    return (
+        f"Эскалация на сильную модель: {summary['escalated']} вакансий ({summary['escalation_rate']:.0%} от проверенных LLM), "
+        f"разошлись с триажем {summary['disagreements']}."
+    )
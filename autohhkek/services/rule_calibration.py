@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy, utc_now_iso
+from autohhkek.services.analysis import BASE_SCORE, RULE_FEATURES, RuleWeights, VacancyRuleEngine
+
+
+DECISIONS = ("no_fit", "doubt", "fit")
+MIN_FEEDBACK_SAMPLES = 10
+MAX_FOLDS = 5
+# Logistic slope in score points: a vacancy 8 points past a threshold is ~73% on that side.
+SCORE_TEMPERATURE = 8.0
+
+
+def build_feedback_dataset(
+    engine: VacancyRuleEngine,
+    vacancies: list[Vacancy],
+    feedback: dict[str, dict[str, Any]],
+) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """Engine feature rows and ordinal labels (0 no_fit, 1 doubt, 2 fit) for manual decisions.
+
+    Hard-blocked vacancies are skipped: their category does not depend on the weights.
+    """
+    by_id = {item.vacancy_id: item for item in vacancies}
+    rows: list[list[float]] = []
+    labels: list[int] = []
+    ids: list[str] = []
+    for vacancy_id in sorted(feedback):
+        item = dict(feedback[vacancy_id] or {})
+        decision = str(item.get("decision") or "")
+        vacancy = by_id.get(vacancy_id)
+        if vacancy is None and item.get("vacancy"):
+            vacancy = Vacancy.from_dict(dict(item["vacancy"]))
+        if decision not in DECISIONS or vacancy is None:
+            continue
+        values, hard_blocked = engine.feature_vector(vacancy)
+        if hard_blocked:
+            continue
+        rows.append(values)
+        labels.append(DECISIONS.index(decision))
+        ids.append(vacancy_id)
+    return np.asarray(rows, dtype=np.float64).reshape(-1, len(RULE_FEATURES)), np.asarray(labels, dtype=np.int64), ids
+
+
+def predict_labels(features: np.ndarray, weights: RuleWeights) -> np.ndarray:
+    vector = np.asarray([weights.weight(name) for name in RULE_FEATURES])
+    scores = BASE_SCORE + features @ vector
+    return (scores >= weights.doubt_threshold).astype(np.int64) + (scores >= weights.fit_threshold).astype(np.int64)
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(values, -60, 60)))
+
+
+def fit_rule_weights(
+    features: np.ndarray,
+    labels: np.ndarray,
+    *,
+    prior: RuleWeights,
+    l2: float = 1e-3,
+    epochs: int = 1500,
+    learning_rate: float = 0.5,
+) -> RuleWeights:
+    """Cumulative-logit fit of weights and both thresholds, shrunk towards ``prior``.
+
+    The score keeps its 0-100 scale: each threshold gets its own logistic term
+    ``P(label >= k) = sigmoid((score - threshold_k) / SCORE_TEMPERATURE)``, and the L2
+    penalty pulls every parameter back to the prior, so features nobody gave feedback
+    on keep their hand-tuned weight.
+    """
+    prior_params = np.asarray([prior.weight(name) for name in RULE_FEATURES] + [prior.doubt_threshold, prior.fit_threshold])
+    params = prior_params.copy()
+    targets = np.stack([labels >= 1, labels >= 2], axis=1).astype(np.float64)
+    count = max(1, len(labels))
+    first = np.zeros_like(params)
+    second = np.zeros_like(params)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    width = len(RULE_FEATURES)
+    for step in range(1, epochs + 1):
+        scores = BASE_SCORE + features @ params[:width]
+        error = (_sigmoid((scores[:, None] - params[width:]) / SCORE_TEMPERATURE) - targets) / (SCORE_TEMPERATURE * count)
+        grad = np.concatenate([features.T @ error.sum(axis=1), -error.sum(axis=0)])
+        grad += 2 * l2 * (params - prior_params)
+        first = beta1 * first + (1 - beta1) * grad
+        second = beta2 * second + (1 - beta2) * grad * grad
+        params -= learning_rate * (first / (1 - beta1**step)) / (np.sqrt(second / (1 - beta2**step)) + eps)
+    doubt_threshold, fit_threshold = float(params[width]), float(params[width + 1])
+    fit_threshold = max(fit_threshold, doubt_threshold + 1.0)
+    return RuleWeights(
+        weights={name: round(float(value), 2) for name, value in zip(RULE_FEATURES, params[:width])},
+        fit_threshold=round(fit_threshold, 2),
+        doubt_threshold=round(doubt_threshold, 2),
+        version=prior.version,
+    )
+
+
+def cross_validate(features: np.ndarray, labels: np.ndarray, *, prior: RuleWeights, folds: int = MAX_FOLDS) -> dict[str, Any]:
+    folds = max(2, min(folds, len(labels)))
+    assignment = np.arange(len(labels)) % folds
+    learned: list[float] = []
+    baseline: list[float] = []
+    for fold in range(folds):
+        test = assignment == fold
+        weights = fit_rule_weights(features[~test], labels[~test], prior=prior)
+        learned.append(float((predict_labels(features[test], weights) == labels[test]).mean()))
+        baseline.append(float((predict_labels(features[test], prior) == labels[test]).mean()))
+    return {
+        "folds": folds,
+        "cv_accuracy": round(float(np.mean(learned)), 3),
+        "baseline_cv_accuracy": round(float(np.mean(baseline)), 3),
+        "fold_accuracies": [round(item, 3) for item in learned],
+    }
+
+
+def calibrate_rule_weights(
+    preferences: UserPreferences,
+    anamnesis: Anamnesis,
+    vacancies: list[Vacancy],
+    feedback: dict[str, dict[str, Any]],
+    *,
+    current: RuleWeights | None = None,
+) -> dict[str, Any]:
+    """Fit a new weight profile from manual decisions and report cross-validated accuracy.
+
+    The profile is marked ``activated`` only when it does not lose to the current
+    profile under the same folds.
+    """
+    current = current or RuleWeights()
+    features, labels, ids = build_feedback_dataset(VacancyRuleEngine(preferences, anamnesis, current), vacancies, feedback)
+    if len(labels) < MIN_FEEDBACK_SAMPLES:
+        raise RuntimeError(f"Need at least {MIN_FEEDBACK_SAMPLES} manual decisions to calibrate, found {len(labels)}.")
+    report = cross_validate(features, labels, prior=current)
+    fitted = fit_rule_weights(features, labels, prior=current)
+    return {
+        **fitted.to_dict(),
+        "trained_at": utc_now_iso(),
+        "samples": len(labels),
+        "class_counts": {name: int((labels == index).sum()) for index, name in enumerate(DECISIONS)},
+        "train_accuracy": round(float((predict_labels(features, fitted) == labels).mean()), 3),
+        **report,
+        "activated": report["cv_accuracy"] >= report["baseline_cv_accuracy"],
+        "based_on_version": current.version,
+    }
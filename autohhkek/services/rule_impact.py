@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.analysis import (
+    BASE_SCORE,
+    RULE_FEATURE_GROUPS,
+    RULE_FEATURES,
+    RULE_GROUP_INPUTS,
+    RULE_SIGNAL_GROUPS,
+    RuleWeights,
+    VacancyRuleEngine,
+    normalize_text,
+)
+from autohhkek.services.rule_calibration import DECISIONS
+from autohhkek.services.rule_loader import apply_rule_bundles, load_rule_bundle_from_text
+from autohhkek.services.storage import WorkspaceStore
+
+
+HARD_BLOCK_SCORE_CAP = 15.0
+MAX_IMPACT_ITEMS = 50
+MAX_CACHED_INDEXES = 4
+# Groups whose list inputs only match by substring: adding terms can only affect vacancies containing them.
+TERM_MATCH_GROUPS = ("hard_block", "title", "skills")
+
+
+def rule_inputs(preferences: UserPreferences, anamnesis: Anamnesis) -> dict[str, Any]:
+    """Every preference/anamnesis value the rule engine reads, keyed by field name."""
+    values: dict[str, Any] = {}
+    for names in RULE_GROUP_INPUTS.values():
+        for name in names:
+            source = preferences if hasattr(preferences, name) else anamnesis
+            value = getattr(source, name)
+            values[name] = list(value) if isinstance(value, list) else value
+    return values
+
+
+def _inputs_signature(inputs: dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(inputs, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def changed_rule_groups(before: dict[str, Any], after: dict[str, Any]) -> set[str]:
+    return {group for group, names in RULE_GROUP_INPUTS.items() if any(before.get(name) != after.get(name) for name in names)}
+
+
+def _added_terms(before: dict[str, Any], after: dict[str, Any], names: tuple[str, ...]) -> list[str] | None:
+    """Normalised terms added to the list inputs ``names``, or ``None`` when a term was removed."""
+    added: list[str] = []
+    for name in names:
+        old = {normalize_text(item) for item in before.get(name) or []}
+        new = {normalize_text(item) for item in after.get(name) or []}
+        if not old <= new:
+            return None
+        added.extend(sorted(term for term in new - old if term))
+    return added
+
+
+def _group_terms(group: str, before: dict[str, Any], after: dict[str, Any]) -> list[str] | None:
+    """Terms that bound which vacancies a change to ``group`` can affect; ``None`` means every vacancy.
+
+    Adding an excluded term, a target title (once there is at least one) or a non-required skill
+    only changes vacancies whose text contains it. Anything else may move every row.
+    """
+    if group not in TERM_MATCH_GROUPS:
+        return None
+    if group == "title" and not before.get("target_titles"):
+        return None
+    names = RULE_GROUP_INPUTS[group]
+    if group == "skills":
+        if [normalize_text(item) for item in before.get("required_skills") or []] != [
+            normalize_text(item) for item in after.get("required_skills") or []
+        ]:
+            return None
+        names = tuple(name for name in names if name != "required_skills")
+    return _added_terms(before, after, names)
+
+
+def score_rows(features: np.ndarray, hard_blocked: np.ndarray, weights: RuleWeights) -> tuple[np.ndarray, np.ndarray]:
+    """Scores and ordinal labels exactly as ``VacancyRuleEngine.assess`` would produce them."""
+    vector = np.asarray([weights.weight(name) for name in RULE_FEATURES], dtype=np.float64)
+    scores = BASE_SCORE + np.round(features * vector, 1).sum(axis=1)
+    scores = np.where(hard_blocked, np.minimum(scores, HARD_BLOCK_SCORE_CAP), scores)
+    labels = (scores >= weights.doubt_threshold).astype(np.int8) + (scores >= weights.fit_threshold).astype(np.int8)
+    labels[hard_blocked] = 0
+    return scores, labels
+
+
+@dataclass(slots=True)
+class RuleImpactIndex:
+    """Engine feature rows for a vacancy snapshot under one set of rule inputs."""
+
+    ids: list[str]
+    titles: list[str]
+    texts: list[str]
+    vacancies: list[Vacancy]
+    features: np.ndarray
+    hard_blocked: np.ndarray
+    inputs: dict[str, Any]
+
+    @classmethod
+    def build(cls, preferences: UserPreferences, anamnesis: Anamnesis, vacancies: list[Vacancy]) -> "RuleImpactIndex":
+        engine = VacancyRuleEngine(preferences, anamnesis)
+        texts = [normalize_text(item.searchable_text()) for item in vacancies]
+        rows: list[list[float]] = []
+        blocked: list[bool] = []
+        for vacancy, text in zip(vacancies, texts):
+            values, hard_blocked = engine.feature_vector(vacancy, text=text)
+            rows.append(values)
+            blocked.append(hard_blocked)
+        return cls(
+            ids=[item.vacancy_id for item in vacancies],
+            titles=[item.title for item in vacancies],
+            texts=texts,
+            vacancies=vacancies,
+            features=np.asarray(rows, dtype=np.float64).reshape(-1, len(RULE_FEATURES)),
+            hard_blocked=np.asarray(blocked, dtype=bool),
+            inputs=rule_inputs(preferences, anamnesis),
+        )
+
+    def rescore(self, preferences: UserPreferences, anamnesis: Anamnesis) -> tuple["RuleImpactIndex", set[str], np.ndarray]:
+        """A copy under new rule inputs, recomputing only the changed groups on the rows they can reach.
+
+        Returns the new index, the changed groups and the mask of rows that were re-evaluated.
+        """
+        inputs = rule_inputs(preferences, anamnesis)
+        groups = changed_rule_groups(self.inputs, inputs)
+        affected = np.zeros(len(self.ids), dtype=bool)
+        for group in groups:
+            terms = _group_terms(group, self.inputs, inputs)
+            if terms is None:
+                affected[:] = True
+                break
+            if terms:
+                affected |= np.fromiter((any(term in text for term in terms) for text in self.texts), dtype=bool, count=len(self.texts))
+        features = self.features.copy()
+        hard_blocked = self.hard_blocked.copy()
+        if groups and affected.any():
+            engine = VacancyRuleEngine(preferences, anamnesis)
+            columns = [RULE_FEATURES.index(name) for group in groups for name in RULE_FEATURE_GROUPS[group]]
+            recompute = frozenset(groups) & RULE_SIGNAL_GROUPS
+            for row in np.flatnonzero(affected):
+                values, blocked = engine.feature_vector(self.vacancies[row], text=self.texts[row], groups=recompute)
+                features[row, columns] = [values[column] for column in columns]
+                if "hard_block" in groups:
+                    hard_blocked[row] = blocked
+        return replace(self, features=features, hard_blocked=hard_blocked, inputs=inputs), groups, affected
+
+
+class RuleImpactCache:
+    """Feature indexes per vacancy snapshot and rule inputs, so a preview re-scores only what changed."""
+
+    def __init__(self, max_items: int = MAX_CACHED_INDEXES) -> None:
+        self.max_items = max_items
+        self._items: OrderedDict[tuple[Any, ...], RuleImpactIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _snapshot_key(store: WorkspaceStore) -> tuple[Any, ...]:
+        path = store.paths.vacancies_path
+        if not path.exists():
+            return (str(path), 0, 0)
+        stat = path.stat()
+        return (str(path), stat.st_mtime_ns, stat.st_size)
+
+    def index_for(self, store: WorkspaceStore, preferences: UserPreferences, anamnesis: Anamnesis) -> RuleImpactIndex:
+        key = (*self._snapshot_key(store), _inputs_signature(rule_inputs(preferences, anamnesis)))
+        with self._lock:
+            index = self._items.get(key)
+            if index is not None:
+                self._items.move_to_end(key)
+                return index
+        index = RuleImpactIndex.build(preferences, anamnesis, store.load_vacancies())
+        self.put(store, index)
+        return index
+
+    def put(self, store: WorkspaceStore, index: RuleImpactIndex) -> None:
+        key = (*self._snapshot_key(store), _inputs_signature(index.inputs))
+        with self._lock:
+            self._items[key] = index
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+RULE_IMPACT_CACHE = RuleImpactCache()
+
+
+def _category_counts(labels: np.ndarray) -> dict[str, int]:
+    return {name: int((labels == index).sum()) for index, name in enumerate(DECISIONS)}
+
+
+def format_rule_impact_note(impact: dict[str, Any]) -> str:
+    if not impact or not impact.get("vacancy_count"):
+        return "Предпросмотр влияния: в кэше нет вакансий."
+    moves = ", ".join(f"{name}: {count}" for name, count in dict(impact.get("moves") or {}).items())
+    return (
+        f"Предпросмотр влияния: {impact['changed_count']} из {impact['vacancy_count']} вакансий сменят колонку"
+        f"{f' ({moves})' if moves else ''}; пересчитано {impact['rescored_count']} за {impact['elapsed_ms']:.0f} мс."
+    )
+
+
+def preview_rule_impact(
+    store: WorkspaceStore,
+    preferences: UserPreferences,
+    anamnesis: Anamnesis,
+    next_preferences: UserPreferences,
+    next_anamnesis: Anamnesis,
+    *,
+    weights: RuleWeights | None = None,
+    cache: RuleImpactCache | None = None,
+) -> dict[str, Any]:
+    """Which cached vacancies change rule-engine category when the inputs move to ``next_*``."""
+    started = time.perf_counter()
+    cache = cache or RULE_IMPACT_CACHE
+    weights = weights or store.load_rule_weights()
+    current = cache.index_for(store, preferences, anamnesis)
+    proposed, groups, affected = current.rescore(next_preferences, next_anamnesis)
+    cache.put(store, proposed)
+
+    before_scores, before_labels = score_rows(current.features, current.hard_blocked, weights)
+    after_scores, after_labels = score_rows(proposed.features, proposed.hard_blocked, weights)
+    changed = np.flatnonzero(before_labels != after_labels)
+    order = changed[np.argsort(-np.abs(after_scores[changed] - before_scores[changed]), kind="stable")]
+    moves: dict[str, int] = {}
+    for row in changed:
+        move = f"{DECISIONS[before_labels[row]]}->{DECISIONS[after_labels[row]]}"
+        moves[move] = moves.get(move, 0) + 1
+    impact: dict[str, Any] = {
+        "vacancy_count": len(current.ids),
+        "rescored_count": int(affected.sum()),
+        "changed_groups": sorted(groups),
+        "changed_count": int(len(changed)),
+        "counts_before": _category_counts(before_labels),
+        "counts_after": _category_counts(after_labels),
+        "moves": dict(sorted(moves.items())),
+        "items": [
+            {
+                "vacancy_id": current.ids[row],
+                "title": current.titles[row],
+                "before_category": DECISIONS[before_labels[row]],
+                "after_category": DECISIONS[after_labels[row]],
+                "before_score": round(float(before_scores[row]), 1),
+                "after_score": round(float(after_scores[row]), 1),
+            }
+            for row in order[:MAX_IMPACT_ITEMS]
+        ],
+        "rule_weights_version": weights.version,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    impact["note"] = format_rule_impact_note(impact)
+    return impact
+
+
+def preview_rule_edit(store: WorkspaceStore, markdown: str, *, filename: str = "chat_rules.md") -> dict[str, Any]:
+    """Impact of importing ``markdown`` the way ``import_rules_text`` would, without saving anything."""
+    preferences = store.load_preferences()
+    anamnesis = store.load_anamnesis()
+    if not preferences or not anamnesis:
+        return {}
+    bundle = load_rule_bundle_from_text(filename, markdown)
+    next_preferences, next_anamnesis, _ = apply_rule_bundles(preferences, anamnesis, [bundle])
+    return preview_rule_impact(store, preferences, anamnesis, next_preferences, next_anamnesis)
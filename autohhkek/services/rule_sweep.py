@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from itertools import product
+from typing import Any
+
+import numpy as np
+
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.analysis import BASE_SCORE, RULE_FEATURES, RuleWeights, VacancyRuleEngine
+from autohhkek.services.rule_calibration import DECISIONS
+
+
+UNLABELED = -1
+
+
+def build_feature_matrix(engine: VacancyRuleEngine, vacancies: list[Vacancy]) -> tuple[np.ndarray, np.ndarray]:
+    """Engine feature rows for every vacancy and the hard-block mask, in ``vacancies`` order."""
+    rows: list[list[float]] = []
+    blocked: list[bool] = []
+    for vacancy in vacancies:
+        values, hard_blocked = engine.feature_vector(vacancy)
+        rows.append(values)
+        blocked.append(hard_blocked)
+    return np.asarray(rows, dtype=np.float64).reshape(-1, len(RULE_FEATURES)), np.asarray(blocked, dtype=bool)
+
+
+def label_vector(ids: list[str], labels: dict[str, str]) -> np.ndarray:
+    """Ordinal labels (0 no_fit, 1 doubt, 2 fit) aligned with ``ids``; ``UNLABELED`` where unknown."""
+    return np.asarray(
+        [DECISIONS.index(labels[item]) if labels.get(item) in DECISIONS else UNLABELED for item in ids],
+        dtype=np.int64,
+    )
+
+
+def build_weight_grid(
+    base: RuleWeights,
+    *,
+    fit_thresholds: list[float] | None = None,
+    doubt_thresholds: list[float] | None = None,
+    weights: dict[str, list[float]] | None = None,
+) -> list[RuleWeights]:
+    """Cartesian product of the given values around ``base``; omitted axes keep the base value.
+
+    Combinations where the doubt threshold is above the fit threshold are dropped.
+    """
+    for name in weights or {}:
+        if name not in RULE_FEATURES:
+            raise ValueError(f"Unknown rule feature: {name}")
+    weight_axes = [(name, list(values)) for name, values in dict(weights or {}).items()]
+    grid: list[RuleWeights] = []
+    for fit_threshold, doubt_threshold, *weight_values in product(
+        fit_thresholds or [base.fit_threshold],
+        doubt_thresholds or [base.doubt_threshold],
+        *[values for _, values in weight_axes],
+    ):
+        if doubt_threshold > fit_threshold:
+            continue
+        overrides = {name: float(value) for (name, _), value in zip(weight_axes, weight_values)}
+        grid.append(
+            replace(
+                base,
+                weights={**base.weights, **overrides},
+                fit_threshold=float(fit_threshold),
+                doubt_threshold=float(doubt_threshold),
+            )
+        )
+    return grid
+
+
+def sweep_rule_weights(
+    features: np.ndarray,
+    hard_blocked: np.ndarray,
+    settings: list[RuleWeights],
+    *,
+    current_labels: np.ndarray | None = None,
+    feedback_labels: np.ndarray | None = None,
+) -> list[dict[str, Any]]:
+    """Categorise every vacancy under every setting in one matrix product.
+
+    Scores are ``BASE_SCORE + W @ X.T`` with shape (settings, vacancies); hard-blocked rows
+    are always ``no_fit``, as in ``VacancyRuleEngine.assess``. ``churn`` counts vacancies
+    whose category differs from ``current_labels``; ``feedback_agreement`` is the share of
+    manual decisions the setting reproduces.
+    """
+    if not settings:
+        return []
+    matrix = np.asarray([[item.weight(name) for name in RULE_FEATURES] for item in settings], dtype=np.float64)
+    fit = np.asarray([item.fit_threshold for item in settings], dtype=np.float64)[:, None]
+    doubt = np.asarray([item.doubt_threshold for item in settings], dtype=np.float64)[:, None]
+    scores = BASE_SCORE + matrix @ features.T
+    labels = (scores >= doubt).astype(np.int8) + (scores >= fit).astype(np.int8)
+    labels[:, hard_blocked] = 0
+    counts = np.stack([(labels == index).sum(axis=1) for index in range(len(DECISIONS))], axis=1)
+
+    churn = moved = None
+    if current_labels is not None:
+        known = current_labels != UNLABELED
+        changed = labels[:, known] != current_labels[known]
+        churn = changed.sum(axis=1)
+        moved = {
+            (source, target): ((labels[:, known] == target) & (current_labels[known] == source)).sum(axis=1)
+            for source in range(len(DECISIONS))
+            for target in range(len(DECISIONS))
+            if source != target
+        }
+    agreement = None
+    feedback_count = 0
+    if feedback_labels is not None:
+        labeled = (feedback_labels != UNLABELED) & ~hard_blocked
+        feedback_count = int(labeled.sum())
+        if feedback_count:
+            agreement = (labels[:, labeled] == feedback_labels[labeled]).mean(axis=1)
+
+    results: list[dict[str, Any]] = []
+    for index, item in enumerate(settings):
+        result: dict[str, Any] = {
+            "fit_threshold": item.fit_threshold,
+            "doubt_threshold": item.doubt_threshold,
+            "weights": dict(item.weights),
+            "counts": {name: int(counts[index, position]) for position, name in enumerate(DECISIONS)},
+            "churn": int(churn[index]) if churn is not None else None,
+            "moves": {
+                f"{DECISIONS[source]}->{DECISIONS[target]}": int(values[index])
+                for (source, target), values in (moved or {}).items()
+                if values[index]
+            },
+            "feedback_samples": feedback_count,
+            "feedback_agreement": round(float(agreement[index]), 3) if agreement is not None else None,
+        }
+        results.append(result)
+    return results
+
+
+def run_rule_sweep(
+    preferences: UserPreferences,
+    anamnesis: Anamnesis,
+    vacancies: list[Vacancy],
+    assessments: list[VacancyAssessment],
+    feedback: dict[str, dict[str, Any]],
+    settings: list[RuleWeights],
+) -> list[dict[str, Any]]:
+    """Sweep ``settings`` over the cached queue against stored assessments and manual decisions."""
+    engine = VacancyRuleEngine(preferences, anamnesis)
+    features, hard_blocked = build_feature_matrix(engine, vacancies)
+    ids = [item.vacancy_id for item in vacancies]
+    current = label_vector(ids, {item.vacancy_id: item.category.value for item in assessments})
+    decisions = label_vector(ids, {key: str(dict(value or {}).get("decision") or "") for key, value in feedback.items()})
+    return sweep_rule_weights(features, hard_blocked, settings, current_labels=current, feedback_labels=decisions)
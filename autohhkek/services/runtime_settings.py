@@ -15,11 +15,20 @@ DEFAULT_RUNTIME_SETTINGS: dict[str, Any] = {
     "openrouter_model": "openai/gpt-5-nano",
     "g4f_model": "gpt-4o-mini",
     "g4f_provider": "",
+    "local_model": "",
     "selected_resume_id": "",
+    "openai_escalation_model": "",
+    "openrouter_escalation_model": "",
+    "escalation_min_confidence": 0.7,
+    "escalation_score_margin": 5.0,
+    "review_ensemble": [],
 }
 
-AVAILABLE_LLM_BACKENDS = ["openai", "openrouter", "g4f"]
+AVAILABLE_LLM_BACKENDS = ["openai", "openrouter", "g4f", "local"]
 AVAILABLE_DASHBOARD_MODES = ["analyze", "apply_plan", "repair", "full_pipeline"]
+ESCALATION_OFF_VALUES = {"off", "none", "-"}
+ENSEMBLE_RULES_MEMBER = "rules"
+MAX_ENSEMBLE_MEMBERS = 3
 LEGACY_DASHBOARD_MODE_ALIASES = {
     "plan_apply": "apply_plan",
 }
@@ -32,6 +41,9 @@ def _runtime_defaults_from_env() -> dict[str, Any]:
         "openrouter_model": normalize_openrouter_model(os.getenv("AUTOHHKEK_OPENROUTER_MODEL", DEFAULT_RUNTIME_SETTINGS["openrouter_model"])),
         "g4f_model": os.getenv("AUTOHHKEK_G4F_MODEL", DEFAULT_RUNTIME_SETTINGS["g4f_model"]).strip() or DEFAULT_RUNTIME_SETTINGS["g4f_model"],
         "g4f_provider": os.getenv("AUTOHHKEK_G4F_PROVIDER", DEFAULT_RUNTIME_SETTINGS["g4f_provider"]).strip(),
+        "local_model": os.getenv("AUTOHHKEK_LOCAL_LLM_MODEL", "").strip(),
+        "openai_escalation_model": os.getenv("AUTOHHKEK_OPENAI_ESCALATION_MODEL", "").strip(),
+        "openrouter_escalation_model": os.getenv("AUTOHHKEK_OPENROUTER_ESCALATION_MODEL", "").strip(),
     }
 
 
@@ -59,4 +71,41 @@ def normalize_runtime_settings(payload: dict[str, Any] | None = None) -> dict[st
             data[field] = value
     data["openrouter_model"] = normalize_openrouter_model(str(data.get("openrouter_model") or env_defaults["openrouter_model"]))
     data["g4f_provider"] = str(data.get("g4f_provider") or env_defaults["g4f_provider"] or "")
+    # An empty local model means "whatever the server serves", discovered through GET /models.
+    data["local_model"] = str(data.get("local_model") or "").strip() or str(env_defaults["local_model"])
+    # Escalation is off unless a model is set here or in the environment; "off" overrides the environment.
+    for field in ("openai_escalation_model", "openrouter_escalation_model"):
+        value = str(data.get(field) or "").strip() or str(env_defaults[field])
+        data[field] = "off" if value.lower() in ESCALATION_OFF_VALUES else value
+    if data["openrouter_escalation_model"] not in {"", "off"}:
+        data["openrouter_escalation_model"] = normalize_openrouter_model(data["openrouter_escalation_model"])
+    data["escalation_min_confidence"] = min(1.0, max(0.0, _as_float(data.get("escalation_min_confidence"), DEFAULT_RUNTIME_SETTINGS["escalation_min_confidence"])))
+    data["review_ensemble"] = normalize_review_ensemble(data.get("review_ensemble"))
+    data["escalation_score_margin"] = min(50.0, max(0.0, _as_float(data.get("escalation_score_margin"), DEFAULT_RUNTIME_SETTINGS["escalation_score_margin"])))
     return data
+
+
+def normalize_review_ensemble(value: Any) -> list[str]:
+    """Up to ``MAX_ENSEMBLE_MEMBERS`` distinct ``backend[:model]`` or ``rules`` members; fewer than two means off."""
+    raw = value if isinstance(value, list) else str(value or "").replace(";", ",").split(",")
+    members: list[str] = []
+    for item in raw:
+        backend, _, model = str(item or "").strip().partition(":")
+        backend = backend.strip().lower()
+        if backend not in AVAILABLE_LLM_BACKENDS and backend != ENSEMBLE_RULES_MEMBER:
+            continue
+        model = model.strip()
+        if backend == "openrouter" and model:
+            model = normalize_openrouter_model(model)
+        member = f"{backend}:{model}" if model and backend != ENSEMBLE_RULES_MEMBER else backend
+        if member not in members:
+            members.append(member)
+    members = members[:MAX_ENSEMBLE_MEMBERS]
+    return members if len(members) >= 2 else []
+
+
+def _as_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float(default)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+DEFAULT_SERP_CACHE_TTL_SEC = 6 * 3600
+# Middle pages re-checked per reuse on top of the last one; a fresh random draw every run.
+DEFAULT_SERP_CACHE_SAMPLE_PAGES = 2
+# Params that change between walks of the same search and must not split the cache.
+VOLATILE_QUERY_PARAMS = frozenset({"page", "searchSessionId", "hhtmFrom", "hhtmFromLabel"})
+PAGE_HASH_FIELDS = ("title", "company", "salary_text")
+
+
+def canonical_query_params(query_params: dict[str, object] | None) -> list[tuple[str, list[str]]]:
+    """Sorted, stringified params with multi-values sorted too; empty and volatile params dropped."""
+    canonical = []
+    for key, value in dict(query_params or {}).items():
+        if key in VOLATILE_QUERY_PARAMS or value in (None, "", [], ()):
+            continue
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        canonical.append((str(key), sorted(str(item) for item in values)))
+    return sorted(canonical)
+
+
+def serp_query_key(account_key: str, resume_id: str, query_params: dict[str, object] | None) -> str:
+    payload = json.dumps([str(account_key or "default"), str(resume_id or ""), canonical_query_params(query_params)], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def serp_page_hash(items: list[dict[str, Any]]) -> str:
+    """Content hash of one SERP page: card order, vacancy URLs without tracking params and card headers."""
+    digest = hashlib.sha1()
+    for item in items:
+        url = urlsplit(str(item.get("url") or ""))
+        digest.update(f"{url.netloc}{url.path}".encode("utf-8"))
+        for key in PAGE_HASH_FIELDS:
+            digest.update(b"\x1f" + " ".join(str(item.get(key) or "").split()).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()[:16]
+
+
+@dataclass(slots=True)
+class SerpPageCache:
+    """SERP pages of one (account, resume, query) with a per-page content hash.
+
+    ``search_vacancies`` checks page 0 with ``validate_page``; while the cache is fresh and the
+    first page and total count are unchanged, it also reloads the pages from ``pages_to_check``
+    (the last cached page plus ``sample_pages`` random middle ones) and checks them the same
+    way, and only then reuses the cached run instead of walking it again. The sample is drawn
+    anew on every run, so an edit confined to the middle pages is caught within a few runs
+    even before the TTL runs out.
+    """
+
+    path: Path
+    ttl_sec: float = DEFAULT_SERP_CACHE_TTL_SEC
+    total_count: int = 0
+    saved_at: float = 0.0
+    pages: dict[int, dict[str, Any]] = field(default_factory=dict)
+    clock: Callable[[], float] = time.time
+    sample_pages: int = DEFAULT_SERP_CACHE_SAMPLE_PAGES
+    rng: random.Random = field(default_factory=random.Random)
+    unchanged: int = 0
+    changed: int = 0
+    reused: int = 0
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        *,
+        ttl_sec: float = DEFAULT_SERP_CACHE_TTL_SEC,
+        clock: Callable[[], float] = time.time,
+        sample_pages: int = DEFAULT_SERP_CACHE_SAMPLE_PAGES,
+    ) -> "SerpPageCache":
+        cache = cls(path=Path(path), ttl_sec=ttl_sec, clock=clock, sample_pages=max(0, int(sample_pages)))
+        try:
+            payload = json.loads(cache.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if not isinstance(payload, dict):
+            return cache
+        cache.total_count = int(payload.get("total_count") or 0)
+        cache.saved_at = float(payload.get("saved_at") or 0.0)
+        for raw_page, entry in dict(payload.get("pages") or {}).items():
+            if isinstance(entry, dict) and str(raw_page).isdigit():
+                cache.pages[int(raw_page)] = {"hash": str(entry.get("hash") or ""), "items": list(entry.get("items") or [])}
+        return cache
+
+    def is_fresh(self) -> bool:
+        return self.saved_at > 0 and self.clock() - self.saved_at <= self.ttl_sec
+
+    def validate_page(self, page_num: int, items: list[dict[str, Any]]) -> bool:
+        """Whether a freshly loaded page equals the cached one: one hash comparison."""
+        entry = self.pages.get(page_num)
+        same = bool(entry) and self.is_fresh() and entry["hash"] == serp_page_hash(items)
+        if same:
+            self.unchanged += 1
+        elif entry:
+            self.changed += 1
+        return same
+
+    def last_cached_page(self, start: int) -> int | None:
+        """Number of the last page in the consecutive cached run from ``start``, or ``None``."""
+        page_num = start
+        while page_num in self.pages and self.pages[page_num]["items"]:
+            page_num += 1
+        return page_num - 1 if page_num > start else None
+
+    def pages_to_check(self, start: int) -> list[int]:
+        """Pages to reload before reusing the run from ``start``: a random middle sample, then the last page."""
+        last = self.last_cached_page(start)
+        if last is None:
+            return []
+        middle = list(range(start, last))
+        return sorted(self.rng.sample(middle, min(self.sample_pages, len(middle)))) + [last]
+
+    def cached_pages(self, start: int) -> list[list[dict[str, Any]]]:
+        """Consecutive cached pages from ``start``; counted as reused."""
+        pages = []
+        page_num = start
+        while page_num in self.pages and self.pages[page_num]["items"]:
+            pages.append(list(self.pages[page_num]["items"]))
+            page_num += 1
+        self.reused += len(pages)
+        return pages
+
+    def store_page(self, page_num: int, items: list[dict[str, Any]]) -> None:
+        self.pages[page_num] = {"hash": serp_page_hash(items), "items": list(items)}
+
+    def reset(self, total_count: int) -> None:
+        self.pages.clear()
+        self.total_count = int(total_count or 0)
+
+    def save(self) -> None:
+        # A run that reused cached pages did not re-check them, so the TTL keeps counting from the last full walk.
+        if not self.reused or not self.saved_at:
+            self.saved_at = self.clock()
+        payload = {
+            "total_count": self.total_count,
+            "saved_at": self.saved_at,
+            "pages": {str(page_num): entry for page_num, entry in sorted(self.pages.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def to_dict(self) -> dict[str, int]:
+        return {"pages": len(self.pages), "unchanged": self.unchanged, "changed": self.changed, "reused": self.reused}
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from autohhkek.domain.models import Vacancy
+from autohhkek.services.analysis import VacancyRuleEngine
+
+
+@dataclass(slots=True)
+class SerpPrescore:
+    """SERP cards split into those worth a detail fetch, best expected fit first, and hard-blocked ones."""
+
+    ranked: list[dict[str, Any]] = field(default_factory=list)
+    blocked: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ordered(self) -> list[dict[str, Any]]:
+        return self.ranked + self.blocked
+
+    def to_dict(self, fetched: int = 0) -> dict[str, object]:
+        scores = [float(item["prescore"]) for item in self.ranked]
+        cutoff = scores[min(fetched, len(scores)) - 1] if fetched and scores else None
+        return {
+            "scored": len(self.ranked) + len(self.blocked),
+            "blocked": len(self.blocked),
+            "top_score": scores[0] if scores else None,
+            "detail_cutoff_score": cutoff,
+        }
+
+    def summary_line(self, fetched: int) -> str:
+        payload = self.to_dict(fetched)
+        cutoff = payload["detail_cutoff_score"]
+        return (
+            f"Предоценка по карточкам: {payload['scored']}, жёстко исключено {payload['blocked']}; "
+            f"описания в порядке ожидаемого соответствия"
+            f"{f' (порог детализации {cutoff:.1f})' if cutoff is not None else ''}."
+        )
+
+
+def prescore_serp_cards(
+    items: list[dict[str, Any]],
+    engine: VacancyRuleEngine,
+    to_vacancy: Callable[[dict[str, Any]], Vacancy],
+) -> SerpPrescore:
+    """Run the rule engine on card-level fields only and rank ``items`` by the score.
+
+    The ranking is stable, so cards with equal scores keep the hh.ru relevance order.
+    Every card gets ``prescore``; hard-blocked ones also get ``prescore_blocked``.
+    """
+    result = SerpPrescore()
+    for item in items:
+        assessment = engine.assess(to_vacancy(item))
+        item["prescore"] = assessment.score
+        if any(reason.code == "hard_block" for reason in assessment.reasons):
+            item["prescore_blocked"] = True
+            result.blocked.append(item)
+        else:
+            result.ranked.append(item)
+    result.ranked.sort(key=lambda item: -float(item["prescore"]))
+    return result
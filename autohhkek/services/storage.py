@@ -10,6 +10,7 @@ from typing import Any
 from autohhkek.domain.models import Anamnesis, ResumeDraft, RunSummary, RuntimeSettings, UserPreferences, Vacancy, VacancyAssessment, utc_now_iso
 
 from .account_profiles import sanitize_account_key
+from .analysis import RuleWeights
 from .paths import WorkspacePaths
 from .runtime_settings import normalize_runtime_settings
 
@@ -390,6 +391,54 @@ class WorkspaceStore:
         items[vacancy_key] = merged
         _write_json(self.paths.vacancy_feedback_path, items)
 
+    def load_rule_weight_profiles(self) -> dict[str, Any]:
+        payload = _read_json(self.paths.rule_weights_path, {})
+        if not isinstance(payload, dict):
+            return {"active_version": 0, "versions": []}
+        return {"active_version": int(payload.get("active_version") or 0), "versions": list(payload.get("versions") or [])}
+
+    def save_rule_weight_profile(self, profile: dict[str, Any]) -> dict[str, Any]:
+        payload = self.load_rule_weight_profiles()
+        item = dict(profile)
+        item["version"] = max([int(entry.get("version") or 0) for entry in payload["versions"]] + [0]) + 1
+        payload["versions"].append(item)
+        if item.get("activated"):
+            payload["active_version"] = item["version"]
+        _write_json(self.paths.rule_weights_path, payload)
+        return item
+
+    def load_rule_weights(self) -> RuleWeights:
+        payload = self.load_rule_weight_profiles()
+        for item in payload["versions"]:
+            if int(item.get("version") or 0) == payload["active_version"]:
+                return RuleWeights.from_dict(item)
+        return RuleWeights()
+
+    def load_local_reviewer_report(self) -> dict[str, Any]:
+        payload = _read_json(self.paths.local_reviewer_report_path, {})
+        return dict(payload) if isinstance(payload, dict) else {}
+
+    def save_local_reviewer_report(self, payload: dict[str, Any]) -> None:
+        _write_json(self.paths.local_reviewer_report_path, dict(payload))
+
+    def save_batch_review_job(self, job: dict[str, Any]) -> None:
+        _write_json(self.paths.batch_review_dir(str(job["job_id"])) / "job.json", dict(job))
+
+    def load_batch_review_jobs(self) -> list[dict[str, Any]]:
+        if not self.paths.batch_reviews_dir.exists():
+            return []
+        jobs = [dict(_read_json(path, {})) for path in self.paths.batch_reviews_dir.glob("*/job.json")]
+        return sorted((item for item in jobs if item), key=lambda item: str(item.get("created_at") or ""), reverse=True)
+
+    def append_review_escalation(self, payload: dict[str, Any]) -> None:
+        _append_jsonl(self.paths.review_escalations_path, dict(payload))
+
+    def load_review_escalations(self, limit: int = 200) -> list[dict[str, Any]]:
+        if not self.paths.review_escalations_path.exists():
+            return []
+        lines = self.paths.review_escalations_path.read_text(encoding="utf-8").splitlines()
+        return [json.loads(line) for line in lines[-limit:] if line.strip()][::-1]
+
     def load_repair_tasks(self, limit: int | None = None) -> list[dict[str, Any]]:
         items = _read_json(self.paths.repair_tasks_path, [])
         if limit is not None:
@@ -435,6 +484,28 @@ class WorkspaceStore:
         run_path.mkdir(parents=True, exist_ok=True)
         _write_json(run_path / "summary.json", run.to_dict())
 
+    def load_llm_router_state(self) -> dict[str, Any]:
+        payload = _read_json(self.paths.llm_router_state_path, {})
+        return dict(payload) if isinstance(payload, dict) else {}
+
+    def save_llm_router_state(self, payload: dict[str, Any]) -> None:
+        _write_json(self.paths.llm_router_state_path, dict(payload))
+
+    def load_scrape_profile_stats(self) -> dict[str, Any]:
+        payload = _read_json(self.paths.scrape_profile_stats_path, {})
+        return dict(payload) if isinstance(payload, dict) else {}
+
+    def save_scrape_profile_stats(self, payload: dict[str, Any]) -> None:
+        _write_json(self.paths.scrape_profile_stats_path, dict(payload))
+
+    def save_run_llm_calls(self, run_id: str, records: list[dict[str, Any]]) -> None:
+        run_path = self.paths.run_path(run_id)
+        run_path.mkdir(parents=True, exist_ok=True)
+        _write_json(run_path / "llm_calls.json", list(records))
+
+    def load_run_llm_calls(self, run_id: str) -> list[dict[str, Any]]:
+        return list(_read_json(self.paths.run_path(run_id) / "llm_calls.json", []))
+
     def list_runs(self, limit: int = 12) -> list[RunSummary]:
         runs: list[RunSummary] = []
         for summary_path in sorted(self.paths.runs_dir.glob("*/summary.json"), reverse=True):
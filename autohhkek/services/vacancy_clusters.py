@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from autohhkek.domain.models import Vacancy, VacancyAssessment
+
+
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_WORDS = 3
+# Shorter texts (bare titles, empty SERP snippets) are too generic to call two postings the same job.
+MIN_SHINGLES = 8
+DEFAULT_SIMILARITY = 0.8
+MINHASH_SEED = 1
+MAX_HISTORY = 20000
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r"\w+")
+
+
+def _permutations(seed: int = MINHASH_SEED, num_perm: int = NUM_PERM) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64),
+        rng.integers(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64),
+    )
+
+
+_PERMUTATIONS = _permutations()
+
+
+def cluster_text(vacancy: Vacancy) -> str:
+    """Title and body as lower-case words; location is left out so multi-city copies collapse."""
+    return " ".join(_WORD_RE.findall(f"{vacancy.title} {vacancy.description or vacancy.summary}".lower()))
+
+
+def _normalize_company(value: str) -> str:
+    return " ".join(_WORD_RE.findall(str(value or "").lower()))
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_WORDS) -> np.ndarray:
+    words = text.split()
+    grams = {" ".join(words[index : index + size]) for index in range(max(1, len(words) - size + 1))}
+    return np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams if gram), dtype=np.uint64)
+
+
+def minhash_signature(hashes: np.ndarray) -> np.ndarray:
+    """MinHash over universal hashes ``(a * x + b) mod 2^61-1``, truncated to 32 bits."""
+    first, second = _PERMUTATIONS
+    with np.errstate(over="ignore"):
+        values = (np.outer(first, hashes) + second[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return values.min(axis=1).astype(np.uint32)
+
+
+def _band_keys(signature: np.ndarray) -> list[bytes]:
+    return [signature[band * LSH_ROWS : (band + 1) * LSH_ROWS].tobytes() for band in range(LSH_BANDS)]
+
+
+@dataclass(slots=True)
+class VacancyClusterIndex:
+    """MinHash signatures of every vacancy seen by an account, bucketed by LSH band.
+
+    Each row keeps the cluster representative it was assigned when first seen; ``verdicts``
+    holds the review of each representative so later copies can reuse it. ``signatures``
+    grows by doubling, so only its first ``len(ids)`` rows are meaningful.
+    """
+
+    similarity: float = DEFAULT_SIMILARITY
+    ids: list[str] = field(default_factory=list)
+    companies: list[str] = field(default_factory=list)
+    fingerprints: list[str] = field(default_factory=list)
+    representatives: list[str] = field(default_factory=list)
+    signatures: np.ndarray = field(default_factory=lambda: np.zeros((0, NUM_PERM), dtype=np.uint32))
+    verdicts: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _rows: dict[str, int] = field(default_factory=dict, repr=False)
+    _buckets: list[dict[bytes, list[int]]] = field(default_factory=list, repr=False)
+
+    def __post_init__(self) -> None:
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._rows = {vacancy_id: row for row, vacancy_id in enumerate(self.ids)}
+        self._buckets = [{} for _ in range(LSH_BANDS)]
+        for row, signature in enumerate(self.signatures[: len(self.ids)]):
+            if signature.any():
+                self._bucket(row, signature)
+
+    def _bucket(self, row: int, signature: np.ndarray) -> None:
+        for band, key in enumerate(_band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(row)
+
+    def _candidates(self, signature: np.ndarray) -> set[int]:
+        rows: set[int] = set()
+        for band, key in enumerate(_band_keys(signature)):
+            rows.update(self._buckets[band].get(key, ()))
+        return rows
+
+    def _upsert(self, vacancy_id: str, company: str, fingerprint: str, representative: str, signature: np.ndarray) -> None:
+        row = self._rows.get(vacancy_id)
+        if row is None:
+            row = len(self.ids)
+            self._rows[vacancy_id] = row
+            self.ids.append(vacancy_id)
+            self.companies.append(company)
+            self.fingerprints.append(fingerprint)
+            self.representatives.append(representative)
+            if row >= len(self.signatures):
+                grown = np.zeros((max(64, 2 * len(self.signatures)), NUM_PERM), dtype=np.uint32)
+                grown[:row] = self.signatures[:row]
+                self.signatures = grown
+        else:
+            self.companies[row] = company
+            self.fingerprints[row] = fingerprint
+            self.representatives[row] = representative
+        self.signatures[row] = signature
+        if signature.any():
+            self._bucket(row, signature)
+
+    def assign(self, vacancies: list[Vacancy]) -> dict[str, str]:
+        """Map each vacancy id to its cluster representative, indexing vacancies not seen before.
+
+        A vacancy joins the cluster of the most similar indexed posting from the same employer
+        whose estimated Jaccard similarity reaches ``similarity``; otherwise it represents itself.
+        """
+        result: dict[str, str] = {}
+        for vacancy in vacancies:
+            text = cluster_text(vacancy)
+            company = _normalize_company(vacancy.company)
+            fingerprint = hashlib.sha1(f"{company}|{text}".encode("utf-8")).hexdigest()
+            row = self._rows.get(vacancy.vacancy_id)
+            if row is not None and self.fingerprints[row] == fingerprint:
+                result[vacancy.vacancy_id] = self.representatives[row]
+                continue
+            hashes = shingle_hashes(text)
+            if len(hashes) < MIN_SHINGLES:
+                self._upsert(vacancy.vacancy_id, company, fingerprint, vacancy.vacancy_id, np.zeros(NUM_PERM, dtype=np.uint32))
+                result[vacancy.vacancy_id] = vacancy.vacancy_id
+                continue
+            signature = minhash_signature(hashes)
+            representative = vacancy.vacancy_id
+            best = 0.0
+            for candidate in self._candidates(signature):
+                if self.ids[candidate] == vacancy.vacancy_id:
+                    continue
+                if company and self.companies[candidate] and company != self.companies[candidate]:
+                    continue
+                similarity = float((self.signatures[candidate] == signature).mean())
+                if similarity >= self.similarity and similarity > best:
+                    best = similarity
+                    representative = self.representatives[candidate]
+            self._upsert(vacancy.vacancy_id, company, fingerprint, representative, signature)
+            result[vacancy.vacancy_id] = representative
+        return result
+
+    def verdict_for(self, representative: str, *, rules_hash: str) -> VacancyAssessment | None:
+        item = self.verdicts.get(representative)
+        if not item or item.get("rules_hash") != rules_hash:
+            return None
+        return VacancyAssessment.from_dict(dict(item["assessment"]))
+
+    def remember_verdict(self, representative: str, assessment: VacancyAssessment, *, rules_hash: str) -> None:
+        self.verdicts[representative] = {"rules_hash": rules_hash, "assessment": assessment.to_dict()}
+
+    def _trim(self) -> None:
+        if len(self.ids) <= MAX_HISTORY:
+            return
+        keep = slice(len(self.ids) - MAX_HISTORY, len(self.ids))
+        self.signatures = self.signatures[keep].copy()
+        self.ids = self.ids[keep]
+        self.companies = self.companies[keep]
+        self.fingerprints = self.fingerprints[keep]
+        self.representatives = self.representatives[keep]
+        live = set(self.representatives)
+        self.verdicts = {key: value for key, value in self.verdicts.items() if key in live}
+        self._reindex()
+
+    def save(self, path: Path) -> None:
+        self._trim()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "num_perm": NUM_PERM,
+            "seed": MINHASH_SEED,
+            "similarity": self.similarity,
+            "ids": self.ids,
+            "companies": self.companies,
+            "fingerprints": self.fingerprints,
+            "representatives": self.representatives,
+            "verdicts": self.verdicts,
+        }
+        with path.open("wb") as handle:
+            np.savez_compressed(handle, signatures=self.signatures[: len(self.ids)], meta=np.asarray(json.dumps(meta, ensure_ascii=False)))
+
+    @classmethod
+    def load(cls, path: Path) -> "VacancyClusterIndex | None":
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as payload:
+                meta = json.loads(str(payload["meta"]))
+                if meta.get("num_perm") != NUM_PERM or meta.get("seed") != MINHASH_SEED:
+                    return None
+                return cls(
+                    similarity=float(meta.get("similarity", DEFAULT_SIMILARITY)),
+                    ids=list(meta["ids"]),
+                    companies=list(meta["companies"]),
+                    fingerprints=list(meta["fingerprints"]),
+                    representatives=list(meta["representatives"]),
+                    signatures=payload["signatures"].astype(np.uint32).reshape(-1, NUM_PERM),
+                    verdicts=dict(meta.get("verdicts") or {}),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def propagate_verdict(source: VacancyAssessment, vacancy_id: str, representative: str) -> VacancyAssessment:
+    payload = source.to_dict()
+    payload["vacancy_id"] = vacancy_id
+    payload["review_notes"] = f"Оценка перенесена с почти-дубликата {representative}. {payload.get('review_notes') or ''}".strip()
+    return VacancyAssessment.from_dict(payload)
+
+
+def annotate_vacancy_clusters(vacancies: list[Vacancy], clusters: dict[str, str]) -> int:
+    """Store ``cluster_id``/``cluster_size`` in the meta of clustered vacancies.
+
+    Returns how many vacancies are copies beyond the first of their cluster.
+    """
+    sizes = Counter(clusters.get(item.vacancy_id, item.vacancy_id) for item in vacancies)
+    for vacancy in vacancies:
+        representative = clusters.get(vacancy.vacancy_id, vacancy.vacancy_id)
+        if sizes[representative] > 1 or representative != vacancy.vacancy_id:
+            vacancy.meta["cluster_id"] = representative
+            vacancy.meta["cluster_size"] = sizes[representative]
+        else:
+            vacancy.meta.pop("cluster_id", None)
+            vacancy.meta.pop("cluster_size", None)
+    return len(vacancies) - len(sizes)
@@ -1,14 +1,13 @@
 import asyncio
-import json
-import os
+import math
 import random
 import re
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 from urllib.parse import urlencode
 
 from playwright.async_api import Page
 
-CACHE_FILE = 'vacancies_cache.json'
+DEFAULT_SERP_INTERVAL_SEC = 1.0
 TRANSIENT_GOTO_ERRORS = ("ERR_NETWORK_CHANGED", "ERR_CONNECTION_RESET", "ERR_ABORTED", "ERR_HTTP2_PROTOCOL_ERROR")
 
 
@@ -39,28 +38,6 @@ def build_resume_search_url(resume_id: str, query_params: Dict[str, object] | No
         params.append(("page", str(page)))
     return f"https://hh.ru/search/vacancy?{urlencode(params, doseq=True)}"
 
-def load_cache() -> List[Dict[str, str]]:
-    """Загрузка кэша из JSON."""
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-                cache = json.load(f)
-                print(f"Загружен кэш с {len(cache)} вакансиями.")
-                return cache
-        except Exception as e:
-            print(f"Ошибка загрузки кэша: {e}")
-    return []
-
-def save_cache(vacancies: List[Dict[str, str]]):
-    """Сохранение кэша в JSON."""
-    try:
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
-            json.dump(vacancies, f, ensure_ascii=False, indent=2)
-        print(f"Кэш сохранён: {len(vacancies)} вакансий.")
-    except Exception as e:
-        print(f"Ошибка сохранения кэша: {e}")
-
-
 async def goto_with_retry(page: Page, url: str, *, wait_until: str = "domcontentloaded", timeout: int = 60000, attempts: int = 3):
     last_error = None
     for attempt in range(1, attempts + 1):
@@ -384,50 +361,110 @@ async def get_max_pages_from_pagination(page: Page, total_count: int = 0) -> int
         print(f"Ошибка при извлечении максимальной страницы: {e}")
         return 0
 
-def find_matching_sequence(cache: List[Dict[str, str]], current_page_vacancies: List[Dict[str, str]]) -> int:
-    """Находит индекс в кэше, где current_page_vacancies совпадает с последовательностью из 100 вакансий."""
-    if len(current_page_vacancies) != 100:
-        return -1  # Только если ровно 100
-    
-    # Улучшенная нормализация: только title (игнорируем URL, т.к. они динамические)
-    # Убираем пунктуацию, тире, слэши; лишние пробелы; lower
-    def norm_title(title):
-        # Удаляем пунктуацию и нормализуем
-        title_clean = re.sub(r'[.,!?;:\-/()]+', ' ', title.strip())  # Убираем ., !? ; : - / ( )
-        title_norm = re.sub(r'\s+', ' ', title_clean).lower().strip()
-        return title_norm
-    
-    current_norm = [norm_title(vac['title']) for vac in current_page_vacancies]
-    cache_norm = [norm_title(vac['title']) for vac in cache]
-    
-    # Debug: print первых 3 для сравнения
-    print("🔍 Debug: Первые 3 нормализованных title из current страницы:")
-    for i in range(min(3, len(current_norm))):
-        print(f"  {i+1}: {current_norm[i]}")
-    print("🔍 Первые 3 нормализованных title из кэша:")
-    for i in range(min(3, len(cache_norm))):
-        print(f"  {i+1}: {cache_norm[i]}")
-    
-    for i in range(len(cache_norm) - 99):
-        if cache_norm[i:i+100] == current_norm:
-            print(f"Найдено совпадение с кэшем начиная с индекса {i} (100 вакансий идентичны по порядку).")
-            return i
-    
-    # Опциональный fuzzy fallback: если >90% совпадают (раскомментируйте если нужно)
-    # from difflib import SequenceMatcher
-    # max_similarity = 0
-    # best_i = -1
-    # for i in range(len(cache_norm) - 99):
-    #     sim = SequenceMatcher(None, cache_norm[i:i+100], current_norm).ratio()
-    #     if sim > 0.9 and sim > max_similarity:
-    #         max_similarity = sim
-    #         best_i = i
-    # if best_i != -1:
-    #     print(f"Fuzzy совпадение (90%+) с индекса {best_i} (similarity: {max_similarity:.2f}).")
-    #     return best_i
-    
-    print("Совпадение не найдено даже после улучшенной нормализации.")
-    return -1
+async def load_serp_page(page: Page, url: str) -> List[Dict[str, str]]:
+    """Открыть страницу выдачи и вернуть её карточки; пустой список — конец пагинации."""
+    await goto_with_retry(page, url, wait_until="domcontentloaded", timeout=60000)
+    try:
+        await page.wait_for_selector("a[href*='/vacancy/']", timeout=30000)
+    except Exception:
+        return []
+    await expand_search_results(page)
+    return await extract_page_vacancies(page)
+
+
+async def reuse_cached_serp_pages(
+    page: Page,
+    serp_cache,
+    page_url: Callable[[int], str],
+    start: int = 1,
+) -> List[List[Dict[str, str]]]:
+    """Кэшированные страницы выдачи с ``start``, если выборочно проверенные из них не изменились.
+
+    Страницы из ``serp_cache.pages_to_check`` (последняя и случайная выборка промежуточных)
+    загружаются заново и сверяются по хэшу (``serp_cache.validate_page``); при первом же
+    расхождении возвращается пустой список и выдача проходится как обычно.
+    """
+    to_check = serp_cache.pages_to_check(start)
+    if not to_check:
+        return []
+    for page_num in to_check:
+        if not serp_cache.validate_page(page_num, await load_serp_page(page, page_url(page_num))):
+            print(f"Страница {page_num + 1} из кэша выдачи изменилась — кэш не используется.")
+            return []
+    return serp_cache.cached_pages(start)
+
+
+async def fetch_serp_pages_concurrently(
+    page: Page,
+    page_urls: List[str],
+    *,
+    tabs: int = 3,
+    min_interval_sec: float = DEFAULT_SERP_INTERVAL_SEC,
+    known_page: Callable[[List[Dict[str, str]]], bool] | None = None,
+    known_page_streak: int = 0,
+    known_streak_start: int = 0,
+) -> List[List[Dict[str, str]]]:
+    """Загрузить страницы выдачи пулом вкладок того же контекста, что и ``page``.
+
+    Старты загрузок разнесены минимум на ``min_interval_sec`` для всего пула. Результат идёт
+    в порядке ``page_urls`` и обрывается на первой пустой (или упавшей) странице, а с
+    ``known_page`` — и после ``known_page_streak`` подряд полностью известных страниц.
+    """
+    if not page_urls:
+        return []
+    loop = asyncio.get_running_loop()
+    results: Dict[int, List[Dict[str, str]]] = {}
+    stop_at = len(page_urls)
+    next_index = 0
+    next_start = 0.0
+    throttle = asyncio.Lock()
+    scanned = 0
+    streak = known_streak_start
+
+    def _scan_known() -> None:
+        nonlocal scanned, streak, stop_at
+        while known_page is not None and scanned < stop_at and scanned in results:
+            streak = streak + 1 if known_page(results[scanned]) else 0
+            scanned += 1
+            if streak >= known_page_streak:
+                stop_at = min(stop_at, scanned)
+
+    async def _wait_turn() -> None:
+        nonlocal next_start
+        async with throttle:
+            now = loop.time()
+            start = max(now, next_start)
+            next_start = start + max(0.0, min_interval_sec)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _worker() -> None:
+        nonlocal next_index, stop_at
+        tab = await page.context.new_page()
+        try:
+            while next_index < stop_at:
+                index = next_index
+                next_index += 1
+                await _wait_turn()
+                if index >= stop_at:
+                    return
+                try:
+                    vacancies = await load_serp_page(tab, page_urls[index])
+                except Exception as exc:
+                    print(f"Страница выдачи {page_urls[index]} не загрузилась: {exc}")
+                    vacancies = []
+                results[index] = vacancies
+                if not vacancies:
+                    stop_at = min(stop_at, index)
+                else:
+                    print(f"Страница выдачи {index + 1}/{len(page_urls)} (параллельно): {len(vacancies)} вакансий.")
+                _scan_known()
+        finally:
+            await tab.close()
+
+    await asyncio.gather(*(_worker() for _ in range(max(1, min(tabs, len(page_urls))))))
+    return [results[index] for index in range(stop_at)]
+
 
 async def search_vacancies(
     page: Page,
@@ -437,11 +474,22 @@ async def search_vacancies(
     *,
     persist_serp_cache: bool = True,
     max_pages_cap: int | None = None,
+    serp_cache=None,
+    serp_tabs: int = 1,
+    serp_interval_sec: float = DEFAULT_SERP_INTERVAL_SEC,
+    known_page: Callable[[List[Dict[str, str]]], bool] | None = None,
+    known_page_streak: int = 2,
 ) -> Tuple[List[Dict[str, str]], int, Dict[str, object]]:
     """Поиск вакансий по резюме с динамическим определением max_pages из пагинации и кэшированием.
 
-    persist_serp_cache: если False — не читать/не писать глобальный vacancies_cache.json (доп. раунды поиска).
+    persist_serp_cache: если False — не читать и не писать ``serp_cache``.
+    serp_cache: кэш страниц этой выдачи (``SerpPageCache``: аккаунт, резюме и параметры запроса).
+    Если первая страница и total_count совпали со свежим кэшем, следующие страницы берутся из него.
     max_pages_cap: верхняя граница числа страниц выдачи (включая уже открытую первую).
+    serp_tabs: больше 1 — остальные страницы грузятся параллельно этим числом вкладок
+    (см. ``fetch_serp_pages_concurrently``), иначе последовательно с паузой 2–4 с.
+    known_page: инкрементальный режим — пагинация останавливается, когда ``known_page_streak``
+    страниц подряд (считая первую) целиком известны по ``known_page``.
     """
     print("Поиск вакансий по резюме...")
     base_url = build_resume_search_url(resume_id, query_params)
@@ -457,8 +505,11 @@ async def search_vacancies(
     total_count = await get_total_vacancies(page)
     print(f"Всего найдено вакансий на hh.ru: {total_count}")
 
+    def _page_url(page_num: int) -> str:
+        page_url = build_resume_search_url(resume_id, query_params, page=page_num)
+        return f"{page_url}&searchSessionId={search_session_id}" if search_session_id else page_url
+
     # Первая страница уже открыта по base_url; повторный goto на page=0 может ломать контекст поиска hh.ru.
-    current_page_num = 0
     try:
         await page.wait_for_selector("a[href*='/vacancy/']", timeout=30000)
     except:
@@ -467,36 +518,28 @@ async def search_vacancies(
     await expand_search_results(page)
     first_page_vacancies = await extract_page_vacancies(page)
 
+    all_vacancies = list(first_page_vacancies)
+    start_page_num = 1
+    pages_reused = 0
     if not persist_serp_cache:
-        use_cache = False
-        all_vacancies = first_page_vacancies
-        start_page_num = 1
-    elif len(first_page_vacancies) != 100:
-        print(f"На первой странице найдено {len(first_page_vacancies)} вакансий, не 100 — обновляем кэш заново.")
-        use_cache = False
-        all_vacancies = first_page_vacancies
-        start_page_num = 1
-    else:
-        # Проверка кэша: скип если total_count сильно отличается
-        cache = load_cache()
-        if abs(total_count - len(cache)) / max(1, len(cache)) > 0.05:  # >5% разница — скип
-            print(f"Total_count ({total_count}) сильно отличается от кэша ({len(cache)}), обновляем заново.")
-            use_cache = False
-            all_vacancies = first_page_vacancies
-            start_page_num = 1
+        serp_cache = None
+    if serp_cache is not None:
+        cached_run: List[List[Dict[str, str]]] = []
+        if first_page_vacancies and serp_cache.total_count == total_count and serp_cache.validate_page(0, first_page_vacancies):
+            cached_run = await reuse_cached_serp_pages(page, serp_cache, _page_url)
+        if cached_run:
+            for cached_page in cached_run:
+                all_vacancies.extend(cached_page)
+                pages_reused += 1
+            start_page_num += pages_reused
+            print(f"Первая, последняя, выборочные промежуточные страницы и total_count совпали с кэшем выдачи: взято из кэша страниц {pages_reused}.")
         else:
-            matching_index = find_matching_sequence(cache, first_page_vacancies)
-            if matching_index != -1:
-                print(f"Кэш корректный. Начинаем обработку с индекса {matching_index} из кэша.")
-                all_vacancies = cache[matching_index:]
-                use_cache = True
-                # Продолжаем парсинг с следующей страницы после совпадения
-                start_page_num = current_page_num + 1
-            else:
-                print("Первая страница не совпадает с кэшем — обновляем кэш заново.")
-                use_cache = False
-                all_vacancies = first_page_vacancies
-                start_page_num = 1
+            serp_cache.reset(total_count)
+        serp_cache.store_page(0, first_page_vacancies)
+    known_streak = 1 if known_page is not None and first_page_vacancies and known_page(first_page_vacancies) else 0
+
+    def _incremental_done() -> bool:
+        return known_page is not None and known_streak >= max(1, known_page_streak)
     print(f"Страница 1: найдено {len(first_page_vacancies)} вакансий.")
     
     pages_parsed = 1 if first_page_vacancies else 0
@@ -506,54 +549,38 @@ async def search_vacancies(
             return raw
         return min(raw, max_pages_cap)
 
-    if not use_cache:
-        # Если не используем кэш, парсим все заново
-        current_page_num = start_page_num
-        max_pages = _clamp_max_pages(initial_max_pages)
-        while current_page_num < max_pages:
-            # Динамическое обновление max_pages из пагинации
-            dynamic_max = await get_max_pages_from_pagination(page, total_count)
-            if dynamic_max > 0:
-                max_pages = _clamp_max_pages(max(max_pages, dynamic_max))
-                print(f"Обновлён max_pages из пагинации: {max_pages}")
-            
-            page_url = build_resume_search_url(resume_id, query_params, page=current_page_num)
-            if search_session_id:
-                page_url = f"{page_url}&searchSessionId={search_session_id}"
-            await goto_with_retry(page, page_url, wait_until="domcontentloaded", timeout=60000)
-            print(f"Загружена страница {current_page_num + 1} (URL: page={current_page_num})")
-            
-            try:
-                await page.wait_for_selector("a[href*='/vacancy/']", timeout=30000)
-            except:
-                print(f"Контейнер вакансий не найден на странице {current_page_num + 1}. Возможно, конец пагинации.")
-                break
-            await expand_search_results(page)
-            page_vacancies = await extract_page_vacancies(page)
-            
-            if len(page_vacancies) == 0:
-                print(f"Нет вакансий на странице {current_page_num + 1}. Конец пагинации.")
-                break
-            
+    max_pages = _clamp_max_pages(initial_max_pages)
+    if serp_tabs > 1 and not _incremental_done():
+        dynamic_max = await get_max_pages_from_pagination(page, total_count)
+        if dynamic_max > 0:
+            max_pages = _clamp_max_pages(max(max_pages, dynamic_max))
+        remaining = max(0, total_count - len(all_vacancies))
+        per_page = len(first_page_vacancies) or 20
+        last_page = min(max_pages, start_page_num + math.ceil(remaining / per_page)) if total_count > 0 else max_pages
+        page_urls = []
+        for page_num in range(start_page_num, last_page):
+            page_urls.append(_page_url(page_num))
+        print(f"Параллельная пагинация: {len(page_urls)} страниц, вкладок {serp_tabs}, интервал {serp_interval_sec:.1f}s.")
+        loaded = await fetch_serp_pages_concurrently(
+            page,
+            page_urls,
+            tabs=serp_tabs,
+            min_interval_sec=serp_interval_sec,
+            known_page=known_page,
+            known_page_streak=max(1, known_page_streak),
+            known_streak_start=known_streak,
+        )
+        for offset, page_vacancies in enumerate(loaded):
             all_vacancies.extend(page_vacancies)
             pages_parsed += 1
-            print(f"Страница {current_page_num + 1}: найдено {len(page_vacancies)} вакансий. Всего собрано: {len(all_vacancies)} (общее на hh.ru: {total_count})")
-            
-            # Проверка: если число отпаршенных совпало с общим - прекращаем парсинг
-            if len(all_vacancies) >= total_count:
-                print(f"Число отпаршенных вакансий ({len(all_vacancies)}) достигло общего ({total_count}) - прекращаем парсинг.")
-                break
-            
-            current_page_num += 1
-            await asyncio.sleep(random.uniform(2, 4))  # Случайная пауза 2-4 сек
-
-        if persist_serp_cache:
-            save_cache(all_vacancies)
+            if serp_cache is not None:
+                serp_cache.validate_page(start_page_num + offset, page_vacancies)
+                serp_cache.store_page(start_page_num + offset, page_vacancies)
+            if known_page is not None:
+                known_streak = known_streak + 1 if known_page(page_vacancies) else 0
     else:
-        # Если используем кэш, продолжаем парсинг только новых страниц после совпадения
         current_page_num = start_page_num
-        max_pages = _clamp_max_pages(initial_max_pages)
-        while current_page_num < max_pages:
+        while not _incremental_done() and current_page_num < max_pages and (total_count <= 0 or len(all_vacancies) < total_count):
             # Динамическое обновление max_pages из пагинации
             dynamic_max = await get_max_pages_from_pagination(page, total_count)
             if dynamic_max > 0:
@@ -580,24 +607,37 @@ async def search_vacancies(
             
             all_vacancies.extend(page_vacancies)
             pages_parsed += 1
+            if serp_cache is not None:
+                serp_cache.validate_page(current_page_num, page_vacancies)
+                serp_cache.store_page(current_page_num, page_vacancies)
+            if known_page is not None:
+                known_streak = known_streak + 1 if known_page(page_vacancies) else 0
             print(f"Страница {current_page_num + 1}: найдено {len(page_vacancies)} вакансий. Всего собрано: {len(all_vacancies)} (общее на hh.ru: {total_count})")
             
             # Проверка: если число отпаршенных совпало с общим - прекращаем парсинг
             if len(all_vacancies) >= total_count:
                 print(f"Число отпаршенных вакансий ({len(all_vacancies)}) достигло общего ({total_count}) - прекращаем парсинг.")
                 break
+            if _incremental_done():
+                break
             
             current_page_num += 1
             await asyncio.sleep(random.uniform(2, 4))  # Случайная пауза 2-4 сек
-        
-        # Обновляем кэш новыми вакансиями
-        if persist_serp_cache:
-            cache = load_cache()  # Перезагружаем, чтобы добавить в конец
-            cache.extend(all_vacancies[len(first_page_vacancies):])  # Добавляем только новые (после первой страницы)
-            save_cache(cache)
-            all_vacancies = cache[matching_index:]  # Возвращаем с позиции совпадения
-    
+
+    if serp_cache is not None:
+        serp_cache.save()
+    if _incremental_done():
+        print(f"Инкрементальный режим: {known_streak} стр. подряд уже известны — пагинация остановлена.")
+
     print(f"Всего собрано {len(all_vacancies)} вакансий для обработки (из {total_count} на hh.ru).")
     if len(all_vacancies) == 0:
         print("Возможно, селекторы изменились или требуется логин.")
-    return all_vacancies, total_count, {"search_url": base_url, "pages_parsed": pages_parsed, "search_session_id": search_session_id}
+    return all_vacancies, total_count, {
+        "search_url": base_url,
+        "pages_parsed": pages_parsed,
+        "search_session_id": search_session_id,
+        "serp_tabs": max(1, serp_tabs),
+        "pages_reused": pages_reused,
+        "stopped_on_known_pages": _incremental_done(),
+        "serp_cache": serp_cache.to_dict() if serp_cache is not None else {},
+    }
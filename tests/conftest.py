@@ -0,0 +1,13 @@
+import pytest
+
+from autohhkek.services.llm_rate_limit import LLM_RATE_LIMITER
+from autohhkek.services.llm_router import LLM_ROUTER
+
+
+@pytest.fixture(autouse=True)
+def _reset_llm_runtime_state():
+    LLM_ROUTER.reset()
+    LLM_RATE_LIMITER.reset()
+    yield
+    LLM_ROUTER.reset()
+    LLM_RATE_LIMITER.reset()
@@ -0,0 +1,85 @@
+import pytest
+
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.batch_review import (
+    LocalBatchSubmitter,
+    build_batch_requests,
+    parse_batch_output_line,
+    run_deferred_review,
+)
+from autohhkek.services.storage import WorkspaceStore
+
+
+def _store(tmp_path) -> WorkspaceStore:
+    store = WorkspaceStore(tmp_path)
+    store.save_preferences(UserPreferences(target_titles=["Python Developer"]))
+    store.save_anamnesis(Anamnesis(headline="Python Developer"))
+    store.save_vacancies([Vacancy(vacancy_id=f"v-{index}", title="Python Developer", description="Python, Django") for index in range(3)])
+    return store
+
+
+def _responder(custom_id, body):
+    if custom_id == "v-2":
+        return {"score": 10}
+    return {"category": "fit", "score": 88, "confidence": 0.9, "explanation": f"batch verdict for {custom_id}"}
+
+
+def test_batch_requests_use_the_review_prompt_and_output_schema():
+    [request] = build_batch_requests(
+        [Vacancy(vacancy_id="v-1", title="Python Developer")],
+        UserPreferences(target_titles=["Python Developer"]),
+        Anamnesis(headline="Python Developer"),
+        model="gpt-5-mini",
+    )
+
+    assert request["custom_id"] == "v-1"
+    assert request["url"] == "/v1/chat/completions"
+    assert request["body"]["model"] == "gpt-5-mini"
+    assert "Оцени эту вакансию" in request["body"]["messages"][1]["content"]
+    assert "confidence" in request["body"]["response_format"]["json_schema"]["schema"]["properties"]
+
+    output, _, error = parse_batch_output_line({"custom_id": "v-1", "response": {"status_code": 429, "body": {"error": {"message": "slow down"}}}})
+    assert output is None and error == "HTTP 429: slow down"
+
+
+def test_deferred_review_resumes_after_restart_and_ingests_results(tmp_path):
+    submitter_root = tmp_path / "local-batches"
+    first = run_deferred_review(
+        _store(tmp_path),
+        LocalBatchSubmitter(submitter_root, _responder, polls_until_done=1),
+        model="gpt-5-mini",
+    )
+
+    assert first["status"] == "in_progress"
+
+    restarted = WorkspaceStore(tmp_path)
+    assert restarted.load_batch_review_jobs()[0]["batch_id"] == first["batch_id"]
+    second = run_deferred_review(restarted, LocalBatchSubmitter(submitter_root, _responder, polls_until_done=1), model="gpt-5-mini")
+
+    assert second["job_id"] == first["job_id"]
+    assert second["status"] == "ingested"
+    assert second["ingested_count"] == 2
+    assert list(second["errors"]) == ["v-2"]
+    by_id = {item.vacancy_id: item for item in restarted.load_assessments()}
+    assert set(by_id) == {"v-0", "v-1"}
+    assert by_id["v-0"].category == FitCategory.FIT
+    assert by_id["v-0"].review_strategy == "openai_batch"
+    assert first["job_id"] in by_id["v-0"].review_notes
+    assert restarted.load_analysis_state()["deferred_review"]["ingested_count"] == 2
+
+    third = run_deferred_review(restarted, LocalBatchSubmitter(submitter_root, _responder), model="gpt-5-mini")
+    assert third["job_id"] != first["job_id"]
+    assert third["status"] == "ingested"
+
+
+def test_deferred_review_refuses_to_resume_a_job_with_another_submitter(tmp_path):
+    store = _store(tmp_path)
+    first = run_deferred_review(store, LocalBatchSubmitter(tmp_path / "local-batches", _responder, polls_until_done=1), model="gpt-5-mini")
+
+    class _OtherSubmitter(LocalBatchSubmitter):
+        name = "openai"
+
+    with pytest.raises(RuntimeError, match="local"):
+        run_deferred_review(store, _OtherSubmitter(tmp_path / "other-batches", _responder), model="gpt-5-mini")
+    assert store.load_batch_review_jobs()[0]["status"] == first["status"] == "in_progress"
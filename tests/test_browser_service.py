@@ -0,0 +1,114 @@
+import threading
+
+from autohhkek.services.browser_service import BrowserService
+
+
+class _FakeContext:
+    def __init__(self, browser, kwargs):
+        self.browser = browser
+        self.kwargs = kwargs
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self, headless):
+        self.headless = headless
+        self.connected = True
+        self.contexts = []
+        self.thread = threading.current_thread()
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = _FakeContext(self, kwargs)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+def _service(launch_errors=()):
+    drivers = []
+    errors = list(launch_errors)
+
+    async def _start():
+        drivers.append(_FakePlaywright())
+        return drivers[-1]
+
+    async def _launch(playwright, *, headless):
+        if errors:
+            raise errors.pop(0)
+        return _FakeBrowser(headless)
+
+    return BrowserService(start_playwright=_start, launch=_launch), drivers
+
+
+def test_service_keeps_one_warm_browser_per_account_and_relaunches_dead_ones():
+    service, drivers = _service()
+
+    async def _use(account, **kwargs):
+        async with service.context(account, locale="ru-RU", **kwargs) as context:
+            return context
+
+    try:
+        first = service.run(lambda: _use("main"))
+        second = service.run(lambda: _use("main"))
+        headed = service.run(lambda: _use("main", headless=False))
+        other = service.run(lambda: _use("second"))
+
+        assert first.closed and second.closed
+        assert first.kwargs == {"locale": "ru-RU"}
+        assert first.browser is second.browser
+        assert first.browser.thread is not threading.current_thread()
+        assert headed.browser is not first.browser and headed.browser.headless is False
+        assert other.browser is not first.browser
+        assert len(drivers) == 1
+
+        first.browser.connected = False
+        relaunched = service.run(lambda: _use("main"))
+        assert relaunched.browser is not first.browser
+        stats = service.stats()
+        assert (stats["launches"], stats["relaunches"], stats["browser_reuses"], stats["contexts"]) == (4, 1, 1, 5)
+        assert stats["browsers"] == ["main:headed", "main:headless", "second:headless"]
+    finally:
+        service.shutdown()
+
+    assert drivers[0].stopped
+    assert not relaunched.browser.connected
+    assert service.stats()["loop_alive"] is False
+
+
+def test_service_restarts_a_dead_driver_once_but_surfaces_missing_browsers():
+    service, drivers = _service([RuntimeError("Connection closed while reading from the driver")])
+    try:
+        browser = service.run(service.browser)
+        assert browser.connected
+        assert len(drivers) == 2 and drivers[0].stopped
+        assert service.stats()["driver_restarts"] == 1
+    finally:
+        service.shutdown()
+
+    service, drivers = _service([RuntimeError("Executable doesn't exist at /ms-playwright/chromium")])
+    try:
+        try:
+            service.run(service.probe)
+        except RuntimeError as exc:
+            assert "Executable doesn't exist" in str(exc)
+        else:
+            raise AssertionError("missing browser must not be retried")
+        assert len(drivers) == 1
+    finally:
+        service.shutdown()
@@ -209,6 +209,14 @@ def test_dashboard_server_supports_plan_filters_action(tmp_path):
 
 
 def test_dashboard_server_chat_rules_editor_requires_confirmation(tmp_path):
+    from autohhkek.domain.models import Vacancy
+
+    WorkspaceStore(tmp_path).save_vacancies(
+        [
+            Vacancy(vacancy_id="vac-evil", title="LLM Engineer", company="Evil Corp", location="Remote", description="Python LLM"),
+            Vacancy(vacancy_id="vac-acme", title="LLM Engineer", company="Acme", location="Remote", description="Python LLM"),
+        ]
+    )
     handle = start_dashboard_server(tmp_path, host="127.0.0.1", port=0)
     try:
         _request_json(
@@ -233,6 +241,10 @@ def test_dashboard_server_chat_rules_editor_requires_confirmation(tmp_path):
         assert payload["result"]["action"] == "propose-rules"
         assert payload["snapshot"]["pending_rule_edit"]["markdown"] == "excluded_companies: Evil Corp"
         assert "Evil Corp" not in payload["snapshot"]["intake"]["rules_preview"]
+        impact = payload["snapshot"]["pending_rule_edit"]["impact"]
+        assert impact["vacancy_count"] == 2
+        assert impact["rescored_count"] == 1
+        assert [(item["vacancy_id"], item["after_category"]) for item in impact["items"]] == [("vac-evil", "no_fit")]
 
         status, payload = _request_json("POST", handle.url + "/api/chat", {"message": "подтверди правила"})
 
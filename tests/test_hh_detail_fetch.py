@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from autohhkek.services.hh_detail_fetch import DetailFetchConfig, HostPoliteness, fetch_vacancy_details
+
+
+class _FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.url = ""
+
+    async def goto(self, url, wait_until="domcontentloaded", timeout=60000):
+        self.context.starts.append((url, time.monotonic()))
+        self.context.in_flight += 1
+        self.context.peak = max(self.context.peak, self.context.in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            if self.context.failures.get(url, 0) > 0:
+                self.context.failures[url] -= 1
+                raise RuntimeError("Timeout 60000ms exceeded")
+            self.url = url
+        finally:
+            self.context.in_flight -= 1
+
+    async def close(self):
+        self.context.closed += 1
+
+
+class _FakeContext:
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.starts = []
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = 0
+
+    async def new_page(self):
+        return _FakePage(self)
+
+
+async def _extract(page):
+    return {"description": f"Полное описание {page.url}", "skills": ["Python", " "]}
+
+
+def test_pool_fetches_in_parallel_keeps_order_and_retries_failed_urls(monkeypatch):
+    monkeypatch.setattr("autohhkek.services.hh_detail_fetch.RETRY_BACKOFF_SEC", 0.0)
+    items = [{"title": f"Вакансия {index}", "url": f"https://hh.ru/vacancy/{index}"} for index in range(8)]
+    items.insert(3, {"title": "Без ссылки", "url": ""})
+    context = _FakeContext(failures={"https://hh.ru/vacancy/5": 1, "https://hh.ru/vacancy/6": 5})
+    lines = []
+
+    stats = asyncio.run(
+        fetch_vacancy_details(context, items, _extract, config=DetailFetchConfig(pages=4, host_delay_sec=0.0), log=lines.append)
+    )
+
+    assert context.peak == 4
+    assert context.closed == 4
+    assert [item["title"] for item in items][:4] == ["Вакансия 0", "Вакансия 1", "Вакансия 2", "Без ссылки"]
+    assert items[0]["description"] == "Полное описание https://hh.ru/vacancy/0"
+    assert items[0]["skills"] == ["Python"]
+    assert "description" not in items[3]
+    assert items[6]["description"] == "Полное описание https://hh.ru/vacancy/5"
+    assert "description" not in items[7]
+    assert (stats.requested, stats.fetched, stats.failed, stats.retries) == (8, 7, 1, 2)
+    assert stats.speedup > 2
+    assert "ускорение x" in stats.summary_line()
+    assert lines[-1].startswith("Страницы вакансий: 8/8")
+
+
+def test_politeness_spaces_starts_per_host_across_workers():
+    async def _run():
+        politeness = HostPoliteness(0.05)
+        starts = {}
+
+        async def _hit(key, url):
+            await politeness.wait(url)
+            starts.setdefault(key, []).append(time.monotonic())
+
+        await asyncio.gather(*(_hit("hh", "https://hh.ru/vacancy/1") for _ in range(3)), _hit("other", "https://api.hh.ru/x"))
+        return starts
+
+    starts = asyncio.run(_run())
+
+    gaps = [later - earlier for earlier, later in zip(starts["hh"], starts["hh"][1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+    assert starts["other"][0] - starts["hh"][0] < 0.04
@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+
+from autohhkek.services.hh_detail_fetch import DEFAULT_DETAIL_PAGES, DetailFetchConfig
+from autohhkek.services.hh_detail_http import (
+    DEFAULT_HTTP_CONCURRENCY,
+    DEFAULT_HTTP_HOST_DELAY_SEC,
+    HttpDetailConfig,
+    cookies_from_state,
+    fallback_reason,
+    fetch_vacancy_details_http,
+    parse_vacancy_detail_html,
+)
+from autohhkek.services.hh_refresh import SerpPaginationConfig
+from autohhkek.services.refresh_pipeline import DEFAULT_QUEUE_SIZE, PipelineConfig
+
+
+VACANCY_HTML = """
+<html><body><main>
+  <h1 data-qa="vacancy-title"><span>Senior Python&nbsp;Developer</span></h1>
+  <p><span data-qa="vacancy-experience">3–6 лет</span></p>
+  <p data-qa="common-employment-text">Полная занятость</p>
+  <p data-qa="work-formats-text">Формат работы: удалённо</p>
+  <div class="g-user-content" data-qa="vacancy-description">
+    <p><strong>Задачи:</strong></p>
+    <ul><li>Разработка сервисов на FastAPI</li><li>Код-ревью</li></ul>
+    <p>Опыт с PostgreSQL<br>и Kafka</p>
+  </div>
+  <ul>
+    <li data-qa="skills-element"><div>Python</div></li>
+    <li data-qa="skills-element"><div>PostgreSQL</div></li>
+    <li data-qa="skills-element"><div>Python</div></li>
+  </ul>
+  <p class="vacancy-creation-time-redesigned" data-qa="vacancy-creation-time-redesigned">Вакансия опубликована 14 октября 2026 в Москве</p>
+</main></body></html>
+"""
+
+
+def test_parser_extracts_detail_fields_from_vacancy_html():
+    detail = parse_vacancy_detail_html(VACANCY_HTML)
+
+    assert detail["title"] == "Senior Python Developer"
+    assert detail["description"] == "Задачи:\nРазработка сервисов на FastAPI\nКод-ревью\nОпыт с PostgreSQL\nи Kafka"
+    assert detail["skills"] == ["Python", "PostgreSQL"]
+    assert detail["experience"] == "3–6 лет"
+    assert detail["schedule"] == "Полная занятость; Формат работы: удалённо"
+    assert detail["published_at"] == "14 октября 2026"
+
+
+def test_fallback_reason_flags_pages_that_need_a_browser():
+    good = parse_vacancy_detail_html(VACANCY_HTML)
+    shell = parse_vacancy_detail_html('<html><body><div id="HH-React-Root"></div></body></html>')
+
+    assert fallback_reason(200, "https://hh.ru/vacancy/1", VACANCY_HTML, good) == ""
+    assert fallback_reason(200, "https://hh.ru/account/login?backurl=/vacancy/1", "", shell) == "login_redirect"
+    assert fallback_reason(200, "https://hh.ru/vacancy/1", "<title>Подтвердите, что вы не робот</title>", shell) == "captcha"
+    assert fallback_reason(429, "https://hh.ru/vacancy/1", "", shell) == "captcha"
+    assert fallback_reason(200, "https://hh.ru/vacancy/1", "<html></html>", shell) == "js_shell"
+
+
+def test_http_fast_path_merges_details_and_returns_the_rest_for_the_browser():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["cookie"] == "hhtoken=secret"
+        vacancy_id = request.url.path.rsplit("/", 1)[-1]
+        if vacancy_id == "2":
+            return httpx.Response(302, headers={"Location": "https://hh.ru/account/login"})
+        if vacancy_id == "3":
+            return httpx.Response(200, text="<html><body><div id='root'></div></body></html>")
+        if request.url.path == "/account/login":
+            return httpx.Response(200, text="<form>login</form>")
+        return httpx.Response(200, text=VACANCY_HTML)
+
+    state = {"cookies": [{"name": "hhtoken", "value": "secret", "domain": ".hh.ru", "path": "/"}]}
+    items = [{"title": f"v{index}", "url": f"https://hh.ru/vacancy/{index}"} for index in range(1, 6)]
+
+    async def _run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler), cookies=cookies_from_state(state), follow_redirects=True)
+        async with client:
+            return await fetch_vacancy_details_http(items, state, config=HttpDetailConfig(host_delay_sec=0.0), client=client)
+
+    stats, fallback = asyncio.run(_run())
+
+    assert [item["title"] for item in fallback] == ["v2", "v3"]
+    assert stats.fetched == 3
+    assert stats.fallbacks == {"js_shell": 1, "login_redirect": 1}
+    assert items[0]["skills"] == ["Python", "PostgreSQL"]
+    assert items[0]["detail_source"] == "http"
+    assert "description" not in items[1]
+
+
+def test_malformed_env_values_fall_back_to_defaults(monkeypatch):
+    monkeypatch.setenv("AUTOHHKEK_HH_HTTP_CONCURRENCY", "fast")
+    monkeypatch.setenv("AUTOHHKEK_HH_HTTP_HOST_DELAY_SEC", "0,1")
+    monkeypatch.setenv("AUTOHHKEK_HH_DETAIL_PAGES", "many")
+    monkeypatch.setenv("AUTOHHKEK_HH_SERP_TABS", "two")
+    monkeypatch.setenv("AUTOHHKEK_PIPELINE_QUEUE_SIZE", "")
+
+    http = HttpDetailConfig.from_env()
+
+    assert (http.concurrency, http.host_delay_sec) == (DEFAULT_HTTP_CONCURRENCY, DEFAULT_HTTP_HOST_DELAY_SEC)
+    assert DetailFetchConfig.from_env().pages == DEFAULT_DETAIL_PAGES
+    assert SerpPaginationConfig.from_env().tabs == 1
+    assert PipelineConfig.from_env().queue_size == DEFAULT_QUEUE_SIZE
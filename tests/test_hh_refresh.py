@@ -1,7 +1,7 @@
 import asyncio
 
 from autohhkek.domain.models import Vacancy
-from autohhkek.services.hh_refresh import HHVacancyRefresher
+from autohhkek.services.hh_refresh import HHVacancyRefresher, serp_card_hash
 from autohhkek.services.storage import WorkspaceStore
 from logic.vacancy_parser import extract_page_vacancies, get_search_session_id, get_total_vacancies, goto_with_retry, search_vacancies
 
@@ -238,3 +238,143 @@ def test_get_search_session_id_accepts_non_hex_values():
         url = "https://hh.ru/search/vacancy?resume=1&searchSessionId=abcDEF_123-xyz&hhtmFrom=resumelist"
 
     assert asyncio.run(get_search_session_id(FakePage())) == "abcDEF_123-xyz"
+
+
+def test_cached_details_are_reused_when_the_serp_card_is_unchanged(tmp_path):
+    store = WorkspaceStore(tmp_path)
+    refresher = HHVacancyRefresher(store)
+    card = {
+        "title": "Python Developer",
+        "url": "https://hh.ru/vacancy/101?query=python",
+        "company": "Acme",
+        "salary_text": "от 200 000 ₽",
+        "summary": "Пишем сервисы на Python. Сейчас смотрят 3 человека",
+    }
+    fetched = {**card, "description": "Полное описание", "skills": ["Python"], "experience": "1–3 года", "detail_source": "http"}
+    fetched["card_hash"] = serp_card_hash(fetched)
+    store.save_vacancies([refresher._to_vacancy(fetched, "resume-1")])
+
+    same = {**card, "summary": "Пишем сервисы на Python. Сейчас смотрят 7 человек"}
+    edited = {**card, "url": "https://hh.ru/vacancy/101", "salary_text": "от 250 000 ₽"}
+    new = {**card, "url": "https://hh.ru/vacancy/202"}
+
+    pending, counts = refresher._reuse_cached_details([same])
+    assert pending == []
+    assert same["description"] == "Полное описание"
+    assert same["skills"] == ["Python"]
+    assert same["detail_source"] == "http"
+    assert refresher._to_vacancy(same, "resume-1").meta["experience"] == "1–3 года"
+
+    pending, counts = refresher._reuse_cached_details([edited, new])
+    assert pending == [edited, new]
+    assert counts == {"reused": 0, "changed": 1}
+    assert "description" not in edited
+
+
+def test_concurrent_serp_pagination_keeps_page_order_and_stops_at_the_first_empty_page(monkeypatch):
+    import time
+
+    import logic.vacancy_parser as vacancy_parser
+
+    state = {"in_flight": 0, "peak": 0, "starts": [], "tabs": 0, "closed": 0}
+    sizes = {0: 20, 1: 20, 2: 20, 3: 0, 4: 20, 5: 20}
+
+    async def fake_load(tab, url):
+        index = int(url.rsplit("page=", 1)[1])
+        state["starts"].append(time.monotonic())
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.05 if index != 1 else 0.12)
+        state["in_flight"] -= 1
+        return [{"url": f"https://hh.ru/vacancy/{index}{card}"} for card in range(sizes[index])]
+
+    class _Tab:
+        async def close(self):
+            state["closed"] += 1
+
+    class _Context:
+        async def new_page(self):
+            state["tabs"] += 1
+            return _Tab()
+
+    class _Page:
+        context = _Context()
+
+    monkeypatch.setattr(vacancy_parser, "load_serp_page", fake_load)
+    urls = [f"https://hh.ru/search/vacancy?page={index}" for index in range(6)]
+
+    pages = asyncio.run(vacancy_parser.fetch_serp_pages_concurrently(_Page(), urls, tabs=3, min_interval_sec=0.01))
+
+    assert [page[0]["url"] for page in pages] == ["https://hh.ru/vacancy/00", "https://hh.ru/vacancy/10", "https://hh.ru/vacancy/20"]
+    assert state["peak"] == 3
+    assert state["tabs"] == state["closed"] == 3
+    assert len(state["starts"]) < len(urls)
+    assert all(later - earlier >= 0.009 for earlier, later in zip(state["starts"], state["starts"][1:]))
+
+
+def test_concurrent_serp_pagination_stops_after_a_streak_of_known_pages(monkeypatch):
+    import logic.vacancy_parser as vacancy_parser
+
+    known = {"https://hh.ru/vacancy/2", "https://hh.ru/vacancy/4", "https://hh.ru/vacancy/5", "https://hh.ru/vacancy/6"}
+
+    async def fake_load(tab, url):
+        index = int(url.rsplit("page=", 1)[1])
+        await asyncio.sleep(0.01)
+        return [{"url": f"https://hh.ru/vacancy/{index}"}]
+
+    class _Tab:
+        async def close(self):
+            return None
+
+    class _Context:
+        async def new_page(self):
+            return _Tab()
+
+    class _Page:
+        context = _Context()
+
+    monkeypatch.setattr(vacancy_parser, "load_serp_page", fake_load)
+    urls = [f"https://hh.ru/search/vacancy?page={index}" for index in range(1, 8)]
+
+    pages = asyncio.run(
+        vacancy_parser.fetch_serp_pages_concurrently(
+            _Page(),
+            urls,
+            tabs=1,
+            min_interval_sec=0.0,
+            known_page=lambda items: all(item["url"] in known for item in items),
+            known_page_streak=2,
+        )
+    )
+
+    assert [page[0]["url"] for page in pages] == [f"https://hh.ru/vacancy/{index}" for index in range(1, 6)]
+
+
+def test_incremental_refresh_keeps_stored_vacancies_past_the_stop_point(tmp_path):
+    store = WorkspaceStore(tmp_path)
+    state_path = tmp_path / "hh_state.json"
+    state_path.write_text('{"cookies": []}', encoding="utf-8")
+    store.save_vacancies(
+        [
+            Vacancy(vacancy_id="old-1", title="Old LLM Engineer", url="https://hh.ru/vacancy/old-1"),
+            Vacancy(vacancy_id="vac-1", title="LLM Engineer", url="https://hh.ru/vacancy/1"),
+        ]
+    )
+
+    result = HHVacancyRefresher(
+        store,
+        resume_id="resume-123",
+        state_path=state_path,
+        search_runner=lambda resume_id, limit: (
+            [
+                Vacancy(vacancy_id="vac-new", title="AI Engineer", url="https://hh.ru/vacancy/new"),
+                Vacancy(vacancy_id="vac-1", title="LLM Engineer", url="https://hh.ru/vacancy/1"),
+            ],
+            {"sweep": "incremental"},
+        ),
+    ).refresh()
+
+    assert result["count"] == 3
+    assert result["new_count"] == 1
+    assert [item.vacancy_id for item in store.load_vacancies()] == ["vac-new", "vac-1", "old-1"]
+    assert "last_full_serp_sweep_at" not in store.load_dashboard_state()
@@ -0,0 +1,102 @@
+import asyncio
+
+from autohhkek.services.lean_scraping import (
+    LeanScrapingConfig,
+    LeanScrapingStats,
+    apply_scraping_profile,
+    block_reason,
+    update_profile_timings,
+)
+
+
+def test_block_reason_keeps_documents_scripts_and_xhr_but_drops_assets_and_trackers():
+    lean = LeanScrapingConfig()
+    no_css = LeanScrapingConfig(block_css=True)
+
+    assert block_reason("document", "https://hh.ru/search/vacancy?resume=1", lean) == ""
+    assert block_reason("xhr", "https://hh.ru/shards/vacancy/search", lean) == ""
+    assert block_reason("script", "https://i.hh.ru/build/main.js", lean) == ""
+    assert block_reason("stylesheet", "https://i.hh.ru/build/main.css", lean) == ""
+    assert block_reason("stylesheet", "https://i.hh.ru/build/main.css", no_css) == "stylesheet"
+    assert block_reason("image", "https://img.hhcdn.ru/employer-logo/1.png", lean) == "image"
+    assert block_reason("font", "https://i.hh.ru/fonts/hh.woff2", lean) == "font"
+    assert block_reason("script", "https://mc.yandex.ru/metrika/tag.js", lean) == "tracker"
+    assert block_reason("image", "https://img.hhcdn.ru/1.png", LeanScrapingConfig(enabled=False)) == ""
+
+
+class _Request:
+    def __init__(self, resource_type, url, size=0):
+        self.resource_type = resource_type
+        self.url = url
+        self.size = size
+
+    async def sizes(self):
+        return {"responseBodySize": self.size, "responseHeadersSize": 0}
+
+
+class _Route:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = ""
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class _Context:
+    def __init__(self):
+        self.handler = None
+        self.listeners = {}
+
+    async def route(self, pattern, handler):
+        assert pattern == "**/*"
+        self.handler = handler
+
+    def on(self, event, callback):
+        self.listeners[event] = callback
+
+
+def test_profile_routes_requests_and_counts_bytes_per_type():
+    context = _Context()
+    requests = [
+        _Request("document", "https://hh.ru/vacancy/1", 120_000),
+        _Request("image", "https://img.hhcdn.ru/logo.png"),
+        _Request("image", "https://img.hhcdn.ru/banner.png"),
+        _Request("script", "https://www.googletagmanager.com/gtm.js"),
+    ]
+
+    async def _run():
+        stats = await apply_scraping_profile(context, LeanScrapingConfig())
+        routes = [_Route(request) for request in requests]
+        for route in routes:
+            await context.handler(route)
+        await context.listeners["requestfinished"](requests[0])
+        return stats, routes
+
+    stats, routes = asyncio.run(_run())
+
+    assert [route.outcome for route in routes] == ["continued", "aborted", "aborted", "aborted"]
+    payload = stats.to_dict()
+    assert payload["profile"] == "lean"
+    assert payload["blocked"] == {"image": 2, "tracker": 1}
+    assert payload["bytes_loaded"] == 120_000
+    assert payload["bytes_saved_by_type"] == {"image": 50_000, "tracker": 30_000}
+
+
+def test_profile_timings_report_speedup_against_the_full_profile():
+    full = LeanScrapingStats(profile="full")
+    full.time_pages("serp", 12.0, 4)
+    full.time_pages("detail", 20.0, 10)
+    history, speedups = update_profile_timings({}, full)
+
+    lean = LeanScrapingStats(profile="lean")
+    lean.time_pages("serp", 6.0, 4)
+    lean.time_pages("detail", 8.0, 10)
+    history, speedups = update_profile_timings(history, lean)
+
+    assert history["full"] == {"serp": 3000.0, "detail": 2000.0}
+    assert speedups == {"serp": 2.0, "detail": 2.5}
+    assert "быстрее полного профиля: detail x2.5, serp x2.0" in lean.summary_line(speedups)
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+
+import pytest
+
+from autohhkek.agents.openrouter_review_agent import OpenRouterVacancyReviewer
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL, LLMClientPool
+from autohhkek.services.openai_runtime import OpenAIAppConfig
+from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
+
+
+def test_providers_and_clients_are_reused_per_backend_url_and_key():
+    first = OpenRouterAppConfig(api_key="or-pool-a").build_run_config(model="openai/gpt-4o-mini")
+    second = OpenRouterAppConfig(api_key="or-pool-a").build_run_config(model="openai/gpt-5-nano")
+    other = OpenRouterAppConfig(api_key="or-pool-b").build_run_config()
+
+    assert first.model_provider is second.model_provider
+    assert first.model_provider is not other.model_provider
+    assert OpenRouterAppConfig(api_key="or-pool-a").build_client() is OpenRouterAppConfig(api_key="or-pool-a").build_client()
+    assert OpenAIAppConfig(api_key="sk-pool").build_run_config().model_provider is OpenAIAppConfig(api_key="sk-pool").build_provider()
+    assert LLM_CLIENT_POOL.stats()["provider_hits"] >= 2
+
+
+def test_clients_are_split_by_timeout_and_default_headers():
+    pool = LLMClientPool()
+    base = pool.sync_client("openrouter", api_key="or-key", timeout=30.0, headers={"X-Title": "AutoHHKek"})
+
+    assert pool.sync_client("openrouter", api_key="or-key", timeout=30.0, headers={"X-Title": "AutoHHKek"}) is base
+    assert pool.sync_client("openrouter", api_key="or-key", timeout=5.0, headers={"X-Title": "AutoHHKek"}) is not base
+    assert pool.sync_client("openrouter", api_key="or-key", timeout=30.0, headers={"X-Title": "Other"}) is not base
+    assert pool.sync_client("openrouter", api_key="or-key", timeout=5.0).timeout == 5.0
+
+
+def test_agents_are_cached_per_model_and_output_type():
+    reviewer = OpenRouterVacancyReviewer(config=OpenRouterAppConfig(api_key="or-test"))
+
+    assert reviewer._build_agent("openai/gpt-5-nano") is reviewer._build_agent("openai/gpt-5-nano")
+    assert reviewer._build_agent("openai/gpt-5-nano") is not reviewer._build_agent("openai/gpt-4o-mini")
+
+
+def test_runs_share_one_long_lived_loop_and_time_out():
+    pool = LLMClientPool()
+
+    async def _thread_id():
+        return threading.get_ident(), id(asyncio.get_running_loop())
+
+    assert pool.run_coroutine(_thread_id) == pool.run_coroutine(_thread_id)
+
+    async def _slow():
+        await asyncio.sleep(5)
+
+    with pytest.raises(TimeoutError):
+        pool.run_coroutine(_slow, timeout=0.05)
+    assert pool.stats()["runs"] == 3
+    assert pool.stats()["run_timeouts"] == 1
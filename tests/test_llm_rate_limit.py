@@ -0,0 +1,99 @@
+import threading
+import time
+
+from autohhkek.services.llm_rate_limit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMRateLimiter,
+    RateLimit,
+)
+from autohhkek.services.llm_usage import LLMCallMeter, LLMUsageLedger, summarize_llm_calls
+
+
+def test_drained_bucket_makes_callers_wait_and_reports_it():
+    limiter = LLMRateLimiter(limits=lambda backend: RateLimit(requests_per_minute=1200))
+    assert limiter.acquire("openrouter") < 1.0
+
+    limiter.penalize("openrouter")
+    waited_ms = limiter.acquire("openrouter")
+
+    assert waited_ms >= 30
+    stats = limiter.stats()["openrouter"]
+    assert stats["acquired"] == 2
+    assert stats["waited"] == 1
+    assert stats["penalties"] == 1
+
+
+def test_interactive_callers_are_served_before_background_ones():
+    limiter = LLMRateLimiter(limits=lambda backend: RateLimit(requests_per_minute=600))
+    limiter.penalize("openrouter")
+    served: list[str] = []
+
+    def _call(name: str, priority: int) -> None:
+        limiter.acquire("openrouter", priority=priority)
+        served.append(name)
+
+    background = threading.Thread(target=_call, args=("background", PRIORITY_BACKGROUND))
+    interactive = threading.Thread(target=_call, args=("interactive", PRIORITY_INTERACTIVE))
+    background.start()
+    time.sleep(0.02)
+    interactive.start()
+    background.join()
+    interactive.join()
+
+    assert served == ["interactive", "background"]
+    assert set(limiter.stats()["openrouter"]["wait_ms_by_priority"]) == {"interactive", "background"}
+
+
+def test_token_budget_is_settled_against_reported_usage():
+    limiter = LLMRateLimiter(limits=lambda backend: RateLimit(tokens_per_minute=6000))
+    limiter.acquire("openai", tokens=6000)
+    limiter.settle("openai", estimated_tokens=6000, actual_tokens=1000)
+
+    assert limiter.acquire("openai", tokens=4000) < 1.0
+
+
+def test_lock_file_shares_buckets_between_limiters(tmp_path):
+    lock_path = tmp_path / "llm_rate.lock"
+    first = LLMRateLimiter(limits=lambda backend: RateLimit(requests_per_minute=1200), lock_path=lock_path)
+    second = LLMRateLimiter(limits=lambda backend: RateLimit(requests_per_minute=1200), lock_path=lock_path)
+
+    first.penalize("openrouter")
+
+    assert second.acquire("openrouter") >= 30
+    assert not lock_path.exists()
+
+
+def test_busy_lock_file_does_not_block_other_threads(tmp_path):
+    lock_path = tmp_path / "llm_rate.lock"
+    limiter = LLMRateLimiter(limits=lambda backend: RateLimit(requests_per_minute=1200), lock_path=lock_path)
+    lock_path.write_text("", encoding="utf-8")  # held by another process
+    waiter = threading.Thread(target=limiter.acquire, args=("openrouter",))
+    waiter.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    assert limiter.stats() == {}
+    assert time.monotonic() - started < 0.05
+    assert waiter.is_alive()
+
+    lock_path.unlink()
+    waiter.join(timeout=2)
+    assert not waiter.is_alive()
+    assert limiter.stats()["openrouter"]["waited"] == 1
+
+
+def test_meter_records_rate_limit_wait_outside_latency():
+    limiter = LLMRateLimiter(limits=lambda backend: RateLimit(requests_per_minute=600))
+    limiter.penalize("openrouter")
+    ledger = LLMUsageLedger()
+    meter = LLMCallMeter("vacancy_review", backend="openrouter", ledger=ledger, limiter=limiter)
+
+    meter.throttle("prompt")
+    record = meter.succeed()
+
+    assert record.rate_limit_wait_ms >= 50
+    assert record.latency_ms < record.rate_limit_wait_ms
+    summary = summarize_llm_calls(ledger.records(), vacancy_count=1)
+    assert summary["throttled_calls"] == 1
+    assert summary["rate_limit_wait_ms_total"] == record.rate_limit_wait_ms
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+from autohhkek.agents.openrouter_review_agent import OpenRouterVacancyReviewer
+from autohhkek.agents.vacancy_review_agent import VacancyReviewAgent
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.llm_router import LLM_ROUTER, LLMBackendRouter
+from autohhkek.services.llm_usage import LLMCallRecord
+from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _HealthyReviewer:
+    config = SimpleNamespace(model="gpt-5.4")
+
+    def review(self, vacancy, preferences, anamnesis):
+        return VacancyAssessment(
+            vacancy_id=vacancy.vacancy_id,
+            category=FitCategory.FIT,
+            subcategory="llm_review",
+            score=80,
+            explanation="ok",
+            review_strategy="openai_agent",
+        )
+
+
+def test_circuit_opens_after_consecutive_failures_and_half_opens_with_single_probe():
+    clock = _Clock()
+    router = LLMBackendRouter(failure_threshold=3, cooldown_sec=60, clock=clock)
+    for _ in range(3):
+        router.record_failure("openrouter", "m", error_class="TimeoutError")
+
+    assert router.choose([("openrouter", "m")]) is None
+    assert router.choose([("openrouter", "m"), ("g4f", "x")]) == ("g4f", "x")
+
+    clock.now += 61
+    assert router.choose([("openrouter", "m")]) == ("openrouter", "m")
+    assert router.choose([("openrouter", "m")]) is None
+
+    router.record_failure("openrouter", "m")
+    clock.now += 61
+    assert router.choose([("openrouter", "m")]) is None
+    clock.now += 60
+    assert router.choose([("openrouter", "m")]) == ("openrouter", "m")
+
+    router.record_success("openrouter", "m", latency_ms=900)
+    assert router.snapshot()[0]["state"] == "closed"
+    assert router.choose([("openrouter", "m")]) == ("openrouter", "m")
+
+
+def test_router_prefers_healthier_backend_when_primary_is_degraded():
+    router = LLMBackendRouter(failure_threshold=10)
+    for index in range(10):
+        if index % 3:
+            router.record_failure("openrouter", "m")
+        else:
+            router.record_success("openrouter", "m")
+    router.record_success("g4f", "x")
+
+    assert router.choose([("openrouter", "m"), ("g4f", "x")]) == ("g4f", "x")
+
+
+def test_router_observes_ledger_records_and_restores_persisted_state():
+    clock = _Clock()
+    router = LLMBackendRouter(failure_threshold=2, clock=clock)
+    for _ in range(2):
+        router.observe(LLMCallRecord(component="vacancy_review", backend="openai", model="gpt", status="timeout", latency_ms=30000))
+    router.observe(LLMCallRecord(component="vacancy_review", backend="openai", model="gpt", status="cache", cache_hit=True))
+
+    restored = LLMBackendRouter(clock=clock)
+    assert restored.restore(router.to_dict()) == 1
+    item = restored.snapshot()[0]
+    assert item["state"] == "open"
+    assert item["ewma_latency_ms"] == 30000.0
+    assert restored.is_available("openai", "gpt") is False
+
+
+def test_review_agent_shifts_to_next_healthy_backend_mid_run():
+    openrouter_calls = []
+
+    def failing_runner(agent, prompt, run_config=None):
+        openrouter_calls.append(run_config.model)
+        raise TimeoutError("slow provider")
+
+    agent = VacancyReviewAgent(
+        UserPreferences(target_titles=["LLM Engineer"]),
+        Anamnesis(headline="LLM Engineer"),
+        llm_backend="openrouter",
+        openrouter_reviewer=OpenRouterVacancyReviewer(
+            config=OpenRouterAppConfig(api_key="or-test", model="openai/gpt-4o-mini"),
+            runner=failing_runner,
+        ),
+        openai_reviewer=_HealthyReviewer(),
+        llm_runtime=SimpleNamespace(backend_order=lambda: ["openrouter", "openai"]),
+    )
+    strategies = [agent.review(Vacancy(vacancy_id=f"v-{index}", title="LLM Engineer")).review_strategy for index in range(5)]
+
+    assert strategies == ["rule_based_fallback"] * 3 + ["openai_agent"] * 2
+    assert len(openrouter_calls) == 3
+    assert LLM_ROUTER.is_available("openrouter", "openai/gpt-4o-mini") is False
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+
+from autohhkek.agents.openai_review_agent import VacancyReviewOutput
+from autohhkek.agents.openrouter_review_agent import OpenRouterVacancyReviewer
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.llm_usage import (
+    LLM_USAGE,
+    LLMCallMeter,
+    LLMCallRecord,
+    LLMUsageLedger,
+    estimate_cost_usd,
+    format_llm_usage_note,
+    percentile,
+    summarize_llm_calls,
+)
+from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
+
+
+class _FakeResult:
+    def __init__(self, output, *, input_tokens=0, output_tokens=0):
+        self.final_output = output
+        self.context_wrapper = SimpleNamespace(
+            usage=SimpleNamespace(requests=1, input_tokens=input_tokens, output_tokens=output_tokens)
+        )
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(item) for item in range(1, 101)]
+
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile([], 0.95) == 0.0
+
+
+def test_estimate_cost_handles_prefixed_models_and_free_backends():
+    assert estimate_cost_usd("openrouter", "openai/gpt-4o-mini", 1_000_000, 0) == 0.15
+    assert estimate_cost_usd("g4f", "gpt-4o-mini", 1000, 1000) == 0.0
+    assert estimate_cost_usd("openrouter", "unknown/model", 1000, 1000) is None
+
+
+def test_summarize_llm_calls_aggregates_latency_tokens_and_cache_hits():
+    records = [
+        LLMCallRecord(component="vacancy_review", backend="openrouter", model="openai/gpt-5-nano", latency_ms=1000, prompt_tokens=1000, completion_tokens=100),
+        LLMCallRecord(component="vacancy_review", backend="openrouter", model="openai/gpt-5-nano", latency_ms=3000, prompt_tokens=1200, completion_tokens=80),
+        LLMCallRecord(component="vacancy_review", backend="openrouter", status="timeout", latency_ms=30000, error_class="TimeoutError", retries=1),
+        LLMCallRecord(component="vacancy_review", backend="openrouter", status="cache", cache_hit=True),
+        LLMCallRecord(component="filter_planning", backend="openrouter", latency_ms=2000),
+    ]
+
+    summary = summarize_llm_calls(records, vacancy_count=4)
+
+    assert summary["calls"] == 4
+    assert summary["cache_hits"] == 1
+    assert summary["errors"] == 1
+    assert summary["timeouts"] == 1
+    assert summary["retries"] == 1
+    assert summary["latency_p50_ms"] == 2000.0
+    assert summary["latency_p95_ms"] == 30000.0
+    assert summary["total_tokens"] == 2380
+    assert summary["calls_per_vacancy"] == 0.75
+    assert summary["error_classes"] == {"TimeoutError": 1}
+    assert summary["by_component"] == {"vacancy_review": 3, "filter_planning": 1}
+
+
+def test_ledger_scopes_are_isolated_per_thread_scope():
+    ledger = LLMUsageLedger()
+    with ledger.scope("run-a"):
+        LLMCallMeter("vacancy_review", backend="openai", ledger=ledger).succeed()
+    LLMCallMeter("chat", backend="openrouter", ledger=ledger).fail(TimeoutError("slow"))
+
+    assert [item.component for item in ledger.records(scope="run-a")] == ["vacancy_review"]
+    unscoped = ledger.records(scope="")
+    assert unscoped[0].status == "timeout"
+    assert unscoped[0].error_class == "TimeoutError"
+
+
+def test_ledger_keeps_the_open_scope_in_full_and_flags_evicted_runs():
+    ledger = LLMUsageLedger(capacity=3)
+    with ledger.scope("old-run"):
+        for _ in range(2):
+            LLMCallMeter("vacancy_review", backend="openai", ledger=ledger).succeed()
+    with ledger.scope("big-run"):
+        for _ in range(5):
+            LLMCallMeter("vacancy_review", backend="openai", ledger=ledger).succeed()
+        assert len(ledger.records(scope="big-run")) == 5
+    LLMCallMeter("chat", backend="openai", ledger=ledger).succeed()
+
+    assert ledger.records(scope="old-run") == []
+    assert ledger.dropped("old-run") == 2
+    assert ledger.dropped("big-run") == 3
+    assert len(ledger.records(scope="big-run")) == 2
+    summary = summarize_llm_calls(ledger.records(scope="big-run"), dropped=ledger.dropped("big-run"))
+    assert summary["truncated"] is True
+    assert "журнал неполный" in format_llm_usage_note(summary)
+
+
+def test_failing_listener_does_not_fail_the_call():
+    ledger = LLMUsageLedger()
+    seen = []
+
+    def broken(record):
+        raise RuntimeError("observer bug")
+
+    ledger.subscribe(broken)
+    ledger.subscribe(seen.append)
+
+    record = LLMCallMeter("vacancy_review", backend="openai", ledger=ledger).succeed()
+
+    assert record.status == "ok"
+    assert seen == [record]
+
+
+def test_openrouter_reviewer_records_one_call_with_retry_and_tokens():
+    def runner(agent, prompt, run_config=None):
+        if run_config.model == "openai/gpt-5-nano":
+            raise RuntimeError("provider failed")
+        return _FakeResult(VacancyReviewOutput(category="fit", score=80), input_tokens=900, output_tokens=60)
+
+    reviewer = OpenRouterVacancyReviewer(
+        config=OpenRouterAppConfig(api_key="or-test", model="openai/gpt-5-nano"),
+        runner=runner,
+    )
+
+    with LLM_USAGE.scope("test-openrouter-usage"):
+        reviewer.review(
+            Vacancy(vacancy_id="v-usage", title="LLM Engineer"),
+            UserPreferences(target_titles=["LLM Engineer"]),
+            Anamnesis(headline="LLM Engineer"),
+        )
+
+    records = LLM_USAGE.records(scope="test-openrouter-usage")
+    assert len(records) == 1
+    assert records[0].model == "openai/gpt-4o-mini"
+    assert records[0].retries == 1
+    assert records[0].prompt_tokens == 900
+    assert records[0].completion_tokens == 60
+    assert records[0].vacancy_id == "v-usage"
+    assert records[0].estimated_cost_usd is not None
@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from autohhkek.agents.local_llm_review_agent import LocalLLMVacancyReviewer
+from autohhkek.agents.openai_review_agent import VacancyReviewOutput
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services import local_llm_runtime
+from autohhkek.services.llm_runtime import LLMRuntime
+from autohhkek.services.llm_usage import LLM_USAGE, summarize_llm_calls
+from autohhkek.services.local_llm_runtime import LocalLLMAppConfig, LocalServerInfo
+
+
+class _LlamaServerHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        payloads = {
+            "/v1/models": {"object": "list", "data": [{"id": "qwen2.5-3b-instruct-q4_k_m", "owned_by": "llamacpp"}]},
+            "/props": {"total_slots": 3},
+        }
+        payload = payloads.get(self.path)
+        self.send_response(200 if payload else 404)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(payload or {}).encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _fresh_probe_cache():
+    local_llm_runtime._PROBE_CACHE.clear()
+    yield
+    local_llm_runtime._PROBE_CACHE.clear()
+
+
+@pytest.fixture
+def llama_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LlamaServerHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_config_discovers_model_and_slots_without_a_key(llama_server):
+    config = LocalLLMAppConfig(base_url=llama_server)
+    offline = LocalLLMAppConfig(base_url="http://127.0.0.1:9/v1")
+
+    assert config.is_available()
+    assert config.resolved_model() == "qwen2.5-3b-instruct-q4_k_m"
+    assert config.resolved_slots() == 3
+    assert config.server_info().server == "llama.cpp"
+    assert config.client_kwargs()["api_key"] == "local"
+    assert LocalLLMAppConfig(base_url=llama_server, model="phi-4-mini", slots=1).resolved_model() == "phi-4-mini"
+    assert not offline.is_available()
+    assert offline.server_info().error
+
+
+def test_runtime_routes_local_backend_first_and_reports_capabilities(llama_server, monkeypatch):
+    monkeypatch.setenv("AUTOHHKEK_LOCAL_LLM_BASE_URL", llama_server)
+
+    runtime = LLMRuntime({"llm_backend": "local"})
+    local = runtime.capabilities()["backends"]["local"]
+
+    assert runtime.backend_order()[0] == "local"
+    assert runtime.backend_model("local") == "qwen2.5-3b-instruct-q4_k_m"
+    assert local["ready"] is True
+    assert local["slots"] == 3
+    assert local["supports_mcp_repair"] is False
+
+
+def test_local_reviewer_is_free_and_never_exceeds_server_slots(monkeypatch):
+    monkeypatch.setattr(
+        local_llm_runtime,
+        "probe_local_server",
+        lambda base_url, api_key="": LocalServerInfo(reachable=True, models=["llama-3.2-3b"], slots=2, probed_at=time.monotonic()),
+    )
+    in_flight = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+    configs = []
+
+    def runner(agent, prompt, run_config=None):
+        configs.append(run_config)
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.05)
+        with lock:
+            in_flight["now"] -= 1
+        return SimpleNamespace(
+            final_output=VacancyReviewOutput(category="fit", score=82, confidence=0.9),
+            context_wrapper=SimpleNamespace(usage=SimpleNamespace(requests=1, input_tokens=900, output_tokens=120)),
+        )
+
+    reviewer = LocalLLMVacancyReviewer(LocalLLMAppConfig(base_url="http://127.0.0.1:8080/v1"), runner=runner)
+    results = []
+
+    def review(index: int):
+        with LLM_USAGE.scope("test-local-llm"):
+            results.append(reviewer.review(Vacancy(vacancy_id=f"v-{index}", title="ML Engineer"), UserPreferences(), Anamnesis()))
+
+    threads = [threading.Thread(target=review, args=(index,)) for index in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert in_flight["peak"] == 2
+    assert {item.review_strategy for item in results} == {"local_llm_agent"}
+    assert configs[0].model == "llama-3.2-3b"
+    assert configs[0].model_settings.temperature == 0.0
+    usage = summarize_llm_calls(LLM_USAGE.records(scope="test-local-llm"))
+    assert usage["calls"] == 5
+    assert usage["estimated_cost_usd"] == 0.0
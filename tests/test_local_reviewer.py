@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from autohhkek.agents.local_review_agent import LocalVacancyReviewer
+from autohhkek.agents.vacancy_review_agent import VacancyReviewAgent
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.local_classifier import LocalReviewerModel, train_local_reviewer
+
+
+VOCABULARY = {
+    FitCategory.FIT: ["LLM", "RAG", "Python", "NLP", "агенты", "удалённо"],
+    FitCategory.DOUBT: ["Python", "SQL", "офис", "тестовое", "аналитика", "гибрид"],
+    FitCategory.NO_FIT: ["Java", "продажи", "холодные", "звонки", "1С", "склад"],
+}
+SCORES = {FitCategory.FIT: 82.0, FitCategory.DOUBT: 55.0, FitCategory.NO_FIT: 18.0}
+
+
+def _dataset(size: int = 150, *, strategy: str = "openrouter_agent") -> tuple[list[Vacancy], list[VacancyAssessment]]:
+    rng = random.Random(7)
+    vacancies: list[Vacancy] = []
+    assessments: list[VacancyAssessment] = []
+    for index in range(size):
+        category = list(VOCABULARY)[index % 3]
+        words = rng.sample(VOCABULARY[category], 4) + rng.sample(["команда", "проект", "опыт", "задачи", "развитие"], 2)
+        vacancies.append(Vacancy(vacancy_id=f"v-{index}", title=f"{words[0]} специалист", description=" ".join(words)))
+        assessments.append(
+            VacancyAssessment(
+                vacancy_id=f"v-{index}",
+                category=category,
+                subcategory="llm_review",
+                score=SCORES[category],
+                explanation="",
+                review_strategy=strategy,
+            )
+        )
+    return vacancies, assessments
+
+
+class _CountingReviewer:
+    def __init__(self):
+        self.config = type("Config", (), {"model": "openai/gpt-5-nano"})()
+        self.calls = 0
+
+    def review(self, vacancy, preferences, anamnesis):
+        self.calls += 1
+        return VacancyAssessment(vacancy_id=vacancy.vacancy_id, category=FitCategory.DOUBT, subcategory="llm", score=50, explanation="", review_strategy="openrouter_agent")
+
+
+def test_training_learns_llm_labels_and_reports_calibration():
+    vacancies, assessments = _dataset()
+
+    model = train_local_reviewer(vacancies, assessments, dim=1 << 12, epochs=150)
+
+    report = model.report
+    assert report["train_samples"] + report["holdout_samples"] == 150
+    assert report["holdout_accuracy"] >= 0.9
+    assert report["class_counts"] == {"fit": 50, "doubt": 50, "no_fit": 50}
+    assert {"threshold", "coverage", "accuracy"} <= set(report["coverage"][0])
+    assert 0.0 <= report["expected_calibration_error"] <= 1.0
+    category, confidence, score = model.predict(Vacancy(vacancy_id="new", title="LLM инженер", description="RAG NLP агенты удалённо"))
+    assert category == FitCategory.FIT
+    assert confidence > 0.5
+    assert score > 55
+
+
+def test_training_ignores_non_llm_labels():
+    vacancies, assessments = _dataset(size=60, strategy="rule_based_fallback")
+
+    with pytest.raises(RuntimeError):
+        train_local_reviewer(vacancies, assessments, dim=1 << 10)
+
+
+def test_model_round_trips_through_disk(tmp_path):
+    vacancies, assessments = _dataset(size=60)
+    model = train_local_reviewer(vacancies, assessments, dim=1 << 10, epochs=50, threshold=0.7)
+    path = tmp_path / "local_reviewer.npz"
+
+    model.save(path)
+    loaded = LocalReviewerModel.load(path)
+
+    assert loaded is not None
+    assert loaded.threshold == 0.7
+    assert loaded.report == model.report
+    assert loaded.predict(vacancies[0])[0] == model.predict(vacancies[0])[0]
+    assert LocalReviewerModel.load(tmp_path / "missing.npz") is None
+
+
+def test_review_agent_uses_local_model_and_defers_low_confidence_to_llm():
+    vacancies, assessments = _dataset()
+    model = train_local_reviewer(vacancies, assessments, dim=1 << 12, epochs=150)
+    llm = _CountingReviewer()
+    prefs, anamnesis = UserPreferences(), Anamnesis()
+
+    confident = VacancyReviewAgent(prefs, anamnesis, llm_backend="openrouter", openrouter_reviewer=llm, local_reviewer=LocalVacancyReviewer(model, threshold=0.5))
+    assessment = confident.review(Vacancy(vacancy_id="x", title="Java разработчик", description="Java склад продажи 1С"))
+    assert assessment.review_strategy == "local_classifier"
+    assert assessment.category == FitCategory.NO_FIT
+    assert llm.calls == 0
+
+    strict = VacancyReviewAgent(prefs, anamnesis, llm_backend="openrouter", openrouter_reviewer=llm, local_reviewer=LocalVacancyReviewer(model, threshold=1.01))
+    assert strict.review(vacancies[0]).review_strategy == "openrouter_agent"
+    assert llm.calls == 1
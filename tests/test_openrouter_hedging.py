@@ -0,0 +1,115 @@
+import threading
+from types import SimpleNamespace
+
+from autohhkek.agents import openrouter_review_agent
+from autohhkek.agents.openai_review_agent import VacancyReviewOutput
+from autohhkek.agents.openrouter_review_agent import OpenRouterVacancyReviewer
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.llm_usage import LLM_USAGE, LLMCallRecord, summarize_llm_calls
+from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
+
+
+PRIMARY = "openai/gpt-5-nano"
+SECONDARY = "openai/gpt-4o-mini"
+
+
+def _slow_primary_runner(release: threading.Event, calls: list[str]):
+    def runner(agent, prompt, run_config=None):
+        calls.append(run_config.model)
+        if run_config.model == PRIMARY:
+            release.wait(timeout=5)
+        return SimpleNamespace(final_output=VacancyReviewOutput(category="fit", score=81))
+
+    return runner
+
+
+def _review(reviewer, vacancy_id="v-hedge"):
+    return reviewer.review(
+        Vacancy(vacancy_id=vacancy_id, title="LLM Engineer"),
+        UserPreferences(target_titles=["LLM Engineer"]),
+        Anamnesis(headline="LLM Engineer"),
+    )
+
+
+def test_hedge_fires_after_observed_p90_and_secondary_wins(monkeypatch):
+    monkeypatch.setattr(openrouter_review_agent, "HEDGE_MIN_DELAY_SEC", 0.05)
+    with LLM_USAGE.scope("hedge-history"):
+        for _ in range(10):
+            LLM_USAGE.add(LLMCallRecord(component="vacancy_review", backend="openrouter", model=PRIMARY, latency_ms=40))
+    release = threading.Event()
+    calls: list[str] = []
+    reviewer = OpenRouterVacancyReviewer(
+        config=OpenRouterAppConfig(api_key="or-test", model=PRIMARY, hedge_enabled=True, hedge_budget=1.0),
+        runner=_slow_primary_runner(release, calls),
+    )
+
+    with LLM_USAGE.scope("hedge-run"):
+        assessment = _review(reviewer)
+    release.set()
+
+    assert assessment.review_strategy == "openrouter_agent"
+    assert calls == [PRIMARY, SECONDARY]
+    record = LLM_USAGE.records(scope="hedge-run")[0]
+    assert record.hedged and record.hedge_won
+    assert record.model == SECONDARY
+    assert record.unhedged_latency_ms >= record.latency_ms
+    assert reviewer.hedge_stats == {"reviews": 1, "hedged": 1, "hedge_wins": 1, "budget_skips": 0}
+
+
+def test_single_candidate_is_never_hedged_against_itself(monkeypatch):
+    monkeypatch.setattr(openrouter_review_agent, "HEDGE_MIN_DELAY_SEC", 0.05)
+    monkeypatch.setattr(openrouter_review_agent, "HEDGE_MIN_SAMPLES", 1000)
+    release = threading.Event()
+    calls: list[str] = []
+    reviewer = OpenRouterVacancyReviewer(
+        config=OpenRouterAppConfig(api_key="or-test", model=PRIMARY, timeout_sec=0.1, hedge_enabled=True, hedge_budget=1.0),
+        runner=_slow_primary_runner(release, calls),
+    )
+    monkeypatch.setattr(reviewer, "_candidate_models", lambda: [PRIMARY])
+    reviewer._build_agent(PRIMARY)  # the first agent build is slow enough to outlast the hedge delay
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+
+    assert _review(reviewer) is not None
+    timer.cancel()
+    release.set()
+
+    assert calls == [PRIMARY]
+    assert reviewer.hedge_stats["hedged"] == 0
+
+
+def test_hedge_budget_caps_hedge_rate(monkeypatch):
+    monkeypatch.setattr(openrouter_review_agent, "HEDGE_MIN_DELAY_SEC", 0.05)
+    monkeypatch.setattr(openrouter_review_agent, "HEDGE_MIN_SAMPLES", 1000)
+    release = threading.Event()
+    calls: list[str] = []
+    reviewer = OpenRouterVacancyReviewer(
+        config=OpenRouterAppConfig(api_key="or-test", model=PRIMARY, timeout_sec=0.1, hedge_enabled=True, hedge_budget=0.5),
+        runner=_slow_primary_runner(release, calls),
+    )
+
+    for index in range(4):
+        release.clear()
+        timer = threading.Timer(0.3, release.set)
+        timer.start()
+        assert _review(reviewer, vacancy_id=f"v-{index}") is not None
+        timer.cancel()
+    release.set()
+
+    assert reviewer.hedge_stats["hedged"] == 2
+    assert reviewer.hedge_stats["budget_skips"] == 2
+
+
+def test_summary_reports_p99_improvement_for_hedged_calls():
+    records = [LLMCallRecord(component="vacancy_review", backend="openrouter", latency_ms=1000) for _ in range(48)]
+    records.append(LLMCallRecord(component="vacancy_review", backend="openrouter", latency_ms=3000, hedged=True, hedge_won=True, unhedged_latency_ms=25000))
+    records.append(LLMCallRecord(component="vacancy_review", backend="openrouter", latency_ms=2000, hedged=True))
+
+    summary = summarize_llm_calls(records, vacancy_count=50)
+
+    assert summary["hedged_calls"] == 2
+    assert summary["hedge_wins"] == 1
+    assert summary["hedge_rate"] == 0.04
+    assert summary["latency_p99_ms"] == 3000.0
+    assert summary["latency_p99_unhedged_ms"] == 25000.0
+    assert summary["p99_improvement_ms"] == 22000.0
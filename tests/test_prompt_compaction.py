@@ -0,0 +1,202 @@
+import json
+from types import SimpleNamespace
+
+from autohhkek.agents.openai_review_agent import VacancyReviewOutput
+from autohhkek.agents.openrouter_review_agent import OpenRouterVacancyReviewer
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.analysis import VacancyRuleEngine
+from autohhkek.services.llm_usage import LLM_USAGE, summarize_llm_calls
+from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
+from autohhkek.services.prompt_compaction import compact_description, compact_vacancy
+
+
+BOILERPLATE = (
+    " О компании Мы — одна из крупнейших технологических компаний страны. Более 20 лет мы создаём сервисы, "
+    "которыми пользуются миллионы людей. У нас открытая культура, горизонтальная структура и сильное комьюнити. "
+    "Наши офисы находятся в пяти городах, а команда насчитывает более десяти тысяч сотрудников. "
+    "Мы регулярно проводим митапы, хакатоны и внутренние конференции. "
+    "Где предстоит работать Москва, Ленинградский проспект, 39, строение 79. Показать на карте. "
+    "Задайте вопрос работодателю Он получит его с откликом на вакансию. Вакансия опубликована 12 октября в Москве"
+)
+
+FIXTURES = [
+    Vacancy(
+        vacancy_id="fx-1",
+        title="LLM Engineer",
+        company="AI Lab",
+        location="Москва",
+        salary_text="от 300 000 ₽ на руки",
+        description=(
+            "LLM Engineer от 300 000 ₽ на руки Опыт работы: 3–6 лет Полная занятость, удалённо "
+            "Обязанности: Разработка RAG-пайплайнов на Python. Обучение и оценка LLM. Интеграция агентов в продукт. "
+            "Требования: Python от 3 лет. Опыт с LLM и NLP. Знание PostgreSQL. "
+            "Условия: Удалённая работа. ДМС. Бюджет на обучение."
+            + BOILERPLATE
+        ),
+        skills=["Python", "LLM", "RAG"],
+    ),
+    Vacancy(
+        vacancy_id="fx-2",
+        title="Senior Java Developer",
+        company="Bank",
+        location="Санкт-Петербург",
+        description=(
+            "Senior Java Developer Опыт работы: более 6 лет Полная занятость, офис "
+            "Чем предстоит заниматься: Развитие платёжного ядра на Java и Spring. Оптимизация SQL. "
+            "Требования: Java 17, Spring Boot, Kafka. Опыт в банковской сфере. "
+            "Мы предлагаем: Офис у метро. Годовая премия."
+            + BOILERPLATE
+        ),
+        skills=["Java", "Spring"],
+    ),
+    Vacancy(
+        vacancy_id="fx-3",
+        title="ML Engineer",
+        company="Retail Tech",
+        location="Москва",
+        salary_text="250 000 – 320 000 ₽",
+        description=(
+            "ML Engineer 250 000 – 320 000 ₽ Опыт работы: 1–3 года "
+            "Задачи: Построение моделей рекомендаций на Python. Работа с SQL и Spark. "
+            "Требования: Python, SQL, классический ML. Будет плюсом: опыт с LLM. "
+            "Условия: Гибридный формат. Обучение за счёт компании."
+            + BOILERPLATE
+        ),
+    ),
+    Vacancy(
+        vacancy_id="fx-4",
+        title="Менеджер по продажам",
+        company="Торговый дом",
+        location="Казань",
+        description=(
+            "Менеджер по продажам Опыт работы: не требуется "
+            "Обязанности: Холодные звонки. Ведение клиентской базы. "
+            "Требования: Грамотная речь. Желание зарабатывать. "
+            "Условия: Оклад плюс процент. Офис в центре города."
+            + BOILERPLATE
+        ),
+    ),
+    Vacancy(
+        vacancy_id="fx-5",
+        title="Python Backend Developer",
+        company="Outsource Studio",
+        location="Москва",
+        is_remote=True,
+        description=(
+            "Python Backend Developer до 280 000 ₽ Опыт работы: 3–6 лет удалённо "
+            "Что нужно делать: Писать сервисы на FastAPI. Проектировать API для LLM-агентов. "
+            "Наш стек: Python, FastAPI, PostgreSQL, Redis, Docker. "
+            "Мы ожидаем: Опыт коммерческой разработки на Python. Понимание NLP будет плюсом. "
+            "Условия: Полностью удалённая работа. Гибкий график. Требуется пройти тестовое задание."
+            + BOILERPLATE
+        ),
+    ),
+    Vacancy(
+        vacancy_id="fx-6",
+        title="Data Scientist",
+        company="Университет",
+        location="Иннополис",
+        description=(
+            "Data Scientist Опыт работы: 1–3 года "
+            "Обязанности: Исследования в области NLP и LLM. Подготовка публикаций. "
+            "Требования: Python, PyTorch, статистика. "
+            "Условия: Кампус, общежитие, гибкий график."
+            + BOILERPLATE
+        ),
+    ),
+]
+
+
+def _profile() -> tuple[UserPreferences, Anamnesis]:
+    preferences = UserPreferences(
+        target_titles=["LLM Engineer", "ML Engineer", "Python Developer"],
+        excluded_companies=["Университет"],
+        required_skills=["Python", "LLM"],
+        preferred_skills=["NLP", "RAG", "SQL"],
+        preferred_locations=["Москва"],
+        salary_min=250000,
+    )
+    anamnesis = Anamnesis(headline="LLM Engineer", primary_skills=["Python", "LLM", "NLP", "RAG"], experience_years=4)
+    return preferences, anamnesis
+
+
+def test_compaction_keeps_relevant_sections_and_drops_boilerplate():
+    description, sections = compact_description(FIXTURES[0].description, budget_tokens=700)
+
+    assert "Обязанности: Разработка RAG-пайплайнов на Python." in description
+    assert "Требования: Python от 3 лет." in description
+    assert "Условия: Удалённая работа." in description
+    assert "Где предстоит работать" not in description
+    assert "митапы" not in description
+    assert sections[0] == "salary"
+
+
+def test_compaction_dedupes_repeated_text_and_respects_budget():
+    vacancy = Vacancy(
+        vacancy_id="dup",
+        title="Python Developer",
+        summary="Требования: Python от 3 лет. Знание SQL.",
+        description="Требования: Python от 3 лет. Знание SQL. Python от 3 лет. " + "Обязанности: " + "Писать код на Python. " * 3 + " ".join(f"Задача номер {index}." for index in range(200)),
+    )
+
+    compact = compact_vacancy(vacancy, budget_tokens=60)
+
+    assert compact.payload["description"].count("Python от 3 лет") == 1
+    assert compact.payload["description"].count("Писать код на Python") == 1
+    assert len(compact.payload["description"]) <= 60 * 4
+    assert "summary" not in compact.payload
+
+
+def test_compaction_keeps_detail_meta_and_drops_bookkeeping():
+    vacancy = Vacancy(
+        vacancy_id="meta",
+        title="Python Developer",
+        description="Требования: Python от 3 лет.",
+        meta={"experience": "3–6 лет", "schedule": "Удалённая работа", "published_at": "2026-10-01", "card_hash": "abc", "prescore": 42},
+    )
+
+    payload = compact_vacancy(vacancy, budget_tokens=200).payload
+
+    assert payload["experience"] == "3–6 лет"
+    assert payload["schedule"] == "Удалённая работа"
+    assert payload["published_at"] == "2026-10-01"
+    assert "card_hash" not in payload and "prescore" not in payload
+
+
+def test_compaction_reduces_tokens_and_keeps_rule_agreement_on_fixtures():
+    preferences, anamnesis = _profile()
+    engine = VacancyRuleEngine(preferences, anamnesis)
+    agreed = 0
+    original_tokens = compact_tokens = 0
+    for vacancy in FIXTURES:
+        compact = compact_vacancy(vacancy)
+        compacted = Vacancy.from_dict({**vacancy.to_dict(), "description": compact.payload["description"], "summary": ""})
+        full_assessment = engine.assess(vacancy)
+        compact_assessment = engine.assess(compacted)
+        agreed += int(full_assessment.category == compact_assessment.category)
+        assert abs(full_assessment.score - compact_assessment.score) <= 15
+        original_tokens += compact.original_tokens
+        compact_tokens += compact.compact_tokens
+
+    assert agreed / len(FIXTURES) >= 5 / 6
+    assert compact_tokens / original_tokens <= 0.6
+
+
+def test_openrouter_prompt_sends_compact_vacancy_once_and_records_ratio():
+    prompts: list[str] = []
+
+    def runner(agent, prompt, run_config=None):
+        prompts.append(prompt)
+        return SimpleNamespace(final_output=VacancyReviewOutput(category="fit", score=80))
+
+    preferences, anamnesis = _profile()
+    reviewer = OpenRouterVacancyReviewer(config=OpenRouterAppConfig(api_key="or-test"), runner=runner)
+    with LLM_USAGE.scope("compaction"):
+        assert reviewer.review(FIXTURES[0], preferences, anamnesis) is not None
+
+    assert "vacancy_searchable_text" not in prompts[0]
+    payload = json.loads(prompts[0][prompts[0].index("{") :])
+    assert "Где предстоит работать" not in payload["vacancy"]["description"]
+    record = LLM_USAGE.records(scope="compaction")[0]
+    assert 0 < record.prompt_compression_ratio < 1
+    assert summarize_llm_calls([record])["prompt_compression_ratio"] == record.prompt_compression_ratio
@@ -0,0 +1,177 @@
+import asyncio
+import time
+
+from autohhkek.agents import vacancy_analysis_agent
+from autohhkek.agents.vacancy_analysis_agent import VacancyAnalysisAgent
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.refresh_pipeline import PipelineConfig, PipelineStage, StreamingPipeline
+from autohhkek.services.storage import WorkspaceStore
+
+
+def test_pipeline_streams_items_through_bounded_queues():
+    events = []
+
+    async def produce(emit):
+        for page in range(6):
+            events.append(("page", page))
+            await emit([f"{page}-a", f"{page}-b"])
+        return "walked"
+
+    async def split(batch):
+        return batch
+
+    async def slow_review(item):
+        await asyncio.sleep(0.01)
+        events.append(("review", item))
+        return [item]
+
+    pipeline = StreamingPipeline(
+        [PipelineStage("split", split), PipelineStage("review", slow_review), PipelineStage("persist", _discard)],
+        queue_size=2,
+    )
+
+    assert asyncio.run(pipeline.run(produce)) == "walked"
+
+    stats = {item["name"]: item for item in pipeline.to_dict()}
+    assert stats["split"]["received"] == 6
+    assert stats["review"]["received"] == stats["persist"]["received"] == 12
+    assert all(item["queue_peak"] <= 2 for item in stats.values())
+    # The slow review holds the producer back, and its first verdict lands before the last page is read.
+    assert stats["review"]["blocked_sec"] > 0
+    assert events.index(("review", "0-a")) < events.index(("page", 5))
+    assert stats["persist"]["first_output_sec"] < stats["persist"]["elapsed_sec"]
+
+
+def test_pipeline_surfaces_a_stage_failure_without_hanging():
+    async def produce(emit):
+        for index in range(50):
+            await emit(index)
+
+    async def explode(item):
+        if item == 3:
+            raise ValueError("boom")
+        return [item]
+
+    pipeline = StreamingPipeline([PipelineStage("explode", explode), PipelineStage("persist", _discard)], queue_size=1)
+
+    try:
+        asyncio.run(asyncio.wait_for(pipeline.run(produce), timeout=5))
+    except ValueError as exc:
+        assert str(exc) == "boom"
+    else:
+        raise AssertionError("stage error was swallowed")
+
+
+async def _discard(item):
+    return None
+
+
+class _RuleEngine:
+    weights = type("Weights", (), {"version": "test"})()
+
+    def assess(self, vacancy):
+        return VacancyAssessment(
+            vacancy_id=vacancy.vacancy_id,
+            category=FitCategory.NO_FIT,
+            subcategory="hard_block",
+            score=0,
+            explanation="rules",
+        )
+
+
+class _Reviewer:
+    calls: list[str] = []
+    instances: list["_Reviewer"] = []
+
+    def __init__(self, *args, **kwargs):
+        self.rule_engine = _RuleEngine()
+        self.busy = False
+        self.instances.append(self)
+
+    def review(self, vacancy):
+        # One reviewer instance must never serve two workers at once.
+        assert not self.busy
+        self.busy = True
+        time.sleep(0.01)
+        self.busy = False
+        self.calls.append(vacancy.vacancy_id)
+        return VacancyAssessment(
+            vacancy_id=vacancy.vacancy_id,
+            category=FitCategory.FIT,
+            subcategory="llm_review",
+            score=70,
+            explanation="LLM verdict",
+            review_strategy="openrouter_agent",
+        )
+
+
+class _StreamingRefresher:
+    can_stream = True
+
+    def __init__(self, store, vacancies):
+        self.store = store
+        self.vacancies = vacancies
+        self.saved_mid_run = []
+
+    def refresh(self, limit=0, downstream=None):
+        async def produce(emit):
+            for vacancy in self.vacancies:
+                await emit(vacancy)
+            self.saved_mid_run = [item.vacancy_id for item in self.store.load_assessments()]
+
+        pipeline = StreamingPipeline(list(downstream), queue_size=2)
+        asyncio.run(pipeline.run(produce))
+        self.store.save_vacancies(self.vacancies)
+        return {"status": "updated", "reason": "live_refresh", "message": "ok", "pipeline": pipeline.to_dict()}
+
+
+def _streaming_run(tmp_path, monkeypatch, *, limit):
+    store = WorkspaceStore(tmp_path)
+    store.save_preferences(UserPreferences(target_titles=["Python разработчик"]))
+    store.save_anamnesis(Anamnesis(headline="Python разработчик"))
+    vacancies = [
+        Vacancy(vacancy_id=str(index), title=f"Python разработчик {index}", company=f"Company {index}", description=f"Вакансия номер {index}")
+        for index in range(8)
+    ]
+    vacancies[2].meta["prescore_blocked"] = True
+    store.save_assessments(
+        [VacancyAssessment(vacancy_id="old", category=FitCategory.DOUBT, subcategory="earlier", score=50, explanation="earlier run")]
+    )
+    refresher = _StreamingRefresher(store, vacancies)
+    progress = []
+    _Reviewer.calls = []
+    _Reviewer.instances = []
+    monkeypatch.setattr(vacancy_analysis_agent, "VacancyReviewAgent", _Reviewer)
+
+    _, assessments = VacancyAnalysisAgent(store, vacancy_refresher=refresher, pipeline_config=PipelineConfig(review_workers=3)).analyze(
+        limit=limit,
+        progress_callback=lambda **kwargs: progress.append(kwargs),
+    )
+    return store, refresher, progress, assessments
+
+
+def test_streaming_analysis_reviews_each_vacancy_once_as_it_arrives(tmp_path, monkeypatch):
+    store, refresher, progress, assessments = _streaming_run(tmp_path, monkeypatch, limit=6)
+
+    # The hard-blocked card neither costs an LLM call nor takes one of the six slots.
+    assert sorted(_Reviewer.calls) == ["0", "1", "3", "4", "5", "6"]
+    assert [item.vacancy_id for item in assessments] == ["0", "1", "3", "4", "5", "6"]
+    assert sorted(item.vacancy_id for item in store.load_assessments()) == ["0", "1", "3", "4", "5", "6"]
+    # Checkpoints keep verdicts from earlier runs next to the streamed ones.
+    assert "old" in refresher.saved_mid_run
+    assert progress[0]["done"] == 1
+    state = store.load_analysis_state()
+    assert state["streamed_assessment_count"] == 6
+    assert state["llm_reviewed_count"] == 6
+    assert [stage["name"] for stage in state["pipeline"]] == ["review", "persist"]
+
+
+def test_streaming_analysis_gives_blocked_cards_in_the_slice_a_rule_verdict(tmp_path, monkeypatch):
+    store, _, _, assessments = _streaming_run(tmp_path, monkeypatch, limit=8)
+
+    assert "2" not in _Reviewer.calls
+    assert {item.vacancy_id: item.review_strategy for item in assessments}["2"] == "rule_hard_block"
+    state = store.load_analysis_state()
+    assert state["llm_reviewed_count"] == 7
+    assert state["review_strategy_counts"]["rule_hard_block"] == 1
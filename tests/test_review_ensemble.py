@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from autohhkek.agents.vacancy_review_agent import VacancyReviewAgent
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, RuntimeSettings, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.llm_pool import LLM_CLIENT_POOL, LLMCallCancelled
+from autohhkek.services.runtime_settings import normalize_runtime_settings
+
+
+class _Reviewer:
+    def __init__(self, model: str, category: FitCategory, score: float, *, delay: float = 0.0):
+        self.config = type("Config", (), {"model": model})()
+        self.category = category
+        self.score = score
+        self.delay = delay
+        self.cancelled = False
+        self.last_status = "idle"
+        self.last_error = ""
+
+    def review(self, vacancy, preferences, anamnesis):
+        try:
+            LLM_CLIENT_POOL.run_coroutine(lambda: asyncio.sleep(self.delay))
+        except LLMCallCancelled:
+            self.cancelled = True
+            return None
+        return VacancyAssessment(
+            vacancy_id=vacancy.vacancy_id,
+            category=self.category,
+            subcategory="llm_review",
+            score=self.score,
+            explanation=f"{self.config.model} verdict",
+            review_strategy="openrouter_agent",
+        )
+
+
+def _agent(ensemble, **reviewers) -> VacancyReviewAgent:
+    return VacancyReviewAgent(
+        UserPreferences(target_titles=["Python Developer"]),
+        Anamnesis(headline="Python Developer"),
+        runtime_settings=RuntimeSettings(llm_backend="openrouter", review_ensemble=ensemble),
+        **reviewers,
+    )
+
+
+def test_ensemble_returns_once_two_members_agree_and_cancels_the_straggler():
+    slow = _Reviewer("gpt-5.4", FitCategory.NO_FIT, 10, delay=5.0)
+    agent = _agent(
+        ["openrouter", "openai", "g4f"],
+        openrouter_reviewer=_Reviewer("openai/gpt-5-nano", FitCategory.FIT, 82, delay=0.05),
+        openai_reviewer=slow,
+        g4f_reviewer=_Reviewer("gpt-4o-mini", FitCategory.FIT, 78, delay=0.1),
+    )
+
+    started = time.perf_counter()
+    assessment = agent.review(Vacancy(vacancy_id="v-1", title="Python Developer"))
+    elapsed = time.perf_counter() - started
+    for _ in range(50):
+        if slow.cancelled:
+            break
+        time.sleep(0.02)
+
+    assert elapsed < 2.0
+    assert slow.cancelled
+    assert assessment.category == FitCategory.FIT
+    assert assessment.review_strategy == "ensemble"
+    assert assessment.explanation == "openai/gpt-5-nano verdict"
+    assert assessment.review_notes.startswith("Ансамбль: 2 из 3 согласны на fit")
+    assert "openai: отменён" in assessment.review_notes
+    assert agent.ensemble_stats == {"reviews": 1, "agreements": 1, "early_exits": 1, "cancelled_calls": 1}
+
+
+def test_ensemble_disagreement_waits_for_every_member_and_asks_for_manual_review():
+    agent = _agent(
+        ["openrouter", "rules"],
+        openrouter_reviewer=_Reviewer("openai/gpt-5-nano", FitCategory.NO_FIT, 20),
+    )
+
+    assessment = agent.review(Vacancy(vacancy_id="v-2", title="Python Developer", description="Python Django"))
+
+    assert assessment.category == FitCategory.DOUBT
+    assert assessment.subcategory == "ensemble_disagreement"
+    assert assessment.ready_for_apply is False
+    assert "согласия нет, ответили 2 из 2" in assessment.review_notes
+    assert agent.ensemble_stats["disagreements"] == 1
+
+
+def test_review_ensemble_setting_needs_two_known_members():
+    assert normalize_runtime_settings({"review_ensemble": "openrouter:gpt-5.4, rules, bogus"})["review_ensemble"] == [
+        "openrouter:openai/gpt-5.4",
+        "rules",
+    ]
+    assert normalize_runtime_settings({"review_ensemble": ["openai"]})["review_ensemble"] == []
+    assert normalize_runtime_settings({"review_ensemble": "openai,g4f,rules,openrouter"})["review_ensemble"] == ["openai", "g4f", "rules"]
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+
+from autohhkek.agents.openai_review_agent import VacancyReviewOutput
+from autohhkek.agents.openrouter_review_agent import OpenRouterVacancyReviewer
+from autohhkek.agents.vacancy_review_agent import VacancyReviewAgent
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, RuntimeSettings, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.llm_usage import LLM_USAGE, summarize_llm_calls
+from autohhkek.services.openrouter_runtime import OpenRouterAppConfig
+from autohhkek.services.review_escalation import EscalationPolicy, summarize_escalations
+from autohhkek.services.runtime_settings import normalize_runtime_settings
+
+
+def _result(output):
+    return SimpleNamespace(
+        final_output=output,
+        context_wrapper=SimpleNamespace(usage=SimpleNamespace(requests=1, input_tokens=1000, output_tokens=100)),
+    )
+
+
+def _agent(outputs: dict[str, VacancyReviewOutput], calls: list[str], **settings) -> VacancyReviewAgent:
+    def runner(agent, prompt, run_config=None):
+        calls.append(run_config.model)
+        return _result(outputs[run_config.model])
+
+    reviewer = OpenRouterVacancyReviewer(config=OpenRouterAppConfig(api_key="or-test", model="openai/gpt-5-nano"), runner=runner)
+    return VacancyReviewAgent(
+        UserPreferences(target_titles=["LLM Engineer"]),
+        Anamnesis(headline="LLM Engineer"),
+        runtime_settings=RuntimeSettings(llm_backend="openrouter", **settings),
+        openrouter_reviewer=reviewer,
+    )
+
+
+def test_low_confidence_triage_is_re_reviewed_by_the_strong_model_and_logged():
+    calls: list[str] = []
+    agent = _agent(
+        {
+            "openai/gpt-5-nano": VacancyReviewOutput(category="doubt", score=60, confidence=0.4),
+            "openai/gpt-5": VacancyReviewOutput(category="fit", score=86, confidence=0.9),
+        },
+        calls,
+        openrouter_escalation_model="openai/gpt-5",
+    )
+
+    with LLM_USAGE.scope("test-escalation"):
+        assessment = agent.review(Vacancy(vacancy_id="v-1", title="LLM Engineer"))
+
+    assert calls == ["openai/gpt-5-nano", "openai/gpt-5"]
+    assert assessment.category == FitCategory.FIT
+    assert "после триажа openai/gpt-5-nano" in assessment.review_notes
+    [record] = agent.escalations
+    assert record["reason"] == "low_confidence"
+    assert record["disagreement"] is True
+    assert summarize_escalations(agent.escalations, reviewed_count=1)["moves"] == {"doubt->fit": 1}
+    usage = summarize_llm_calls(LLM_USAGE.records(scope="test-escalation"))
+    assert usage["by_tier"]["triage"]["calls"] == 1
+    assert usage["by_tier"]["escalation"]["calls"] == 1
+    assert usage["by_tier"]["escalation"]["estimated_cost_usd"] > usage["by_tier"]["triage"]["estimated_cost_usd"]
+
+
+def test_confident_triage_far_from_thresholds_is_kept_and_escalation_is_off_by_default():
+    calls: list[str] = []
+    outputs = {"openai/gpt-5-nano": VacancyReviewOutput(category="fit", score=90, confidence=0.95)}
+
+    confident = _agent(outputs, calls, openrouter_escalation_model="openai/gpt-5").review(Vacancy(vacancy_id="v-2", title="LLM Engineer"))
+    default = _agent({"openai/gpt-5-nano": VacancyReviewOutput(category="doubt", score=50, confidence=0.1)}, calls)
+    default.review(Vacancy(vacancy_id="v-3", title="LLM Engineer"))
+
+    assert confident.score == 90
+    assert calls == ["openai/gpt-5-nano", "openai/gpt-5-nano"]
+    assert default.escalations == []
+
+
+def test_policy_escalates_scores_near_the_thresholds():
+    policy = EscalationPolicy(models={"openrouter": "openai/gpt-5"}, min_confidence=0.7, score_margin=5.0)
+
+    def assessment(score: float) -> VacancyAssessment:
+        return VacancyAssessment(vacancy_id="v", category=FitCategory.DOUBT, subcategory="", score=score, explanation="")
+
+    assert policy.reason(assessment(70), 0.9) == "near_threshold"
+    assert policy.reason(assessment(47), 0.9) == "near_threshold"
+    assert policy.reason(assessment(60), 0.9) == ""
+    assert policy.reason(assessment(60), 0.5) == "low_confidence"
+    assert policy.model_for("openrouter", "openai/gpt-5") == ""
+    assert policy.model_for("g4f", "gpt-4o-mini") == ""
+
+
+def test_runtime_settings_normalize_escalation_fields(monkeypatch):
+    monkeypatch.setenv("AUTOHHKEK_OPENROUTER_ESCALATION_MODEL", "gpt-5.4")
+
+    inherited = normalize_runtime_settings({"escalation_min_confidence": "2", "escalation_score_margin": "bad"})
+    disabled = normalize_runtime_settings({"openrouter_escalation_model": "off"})
+
+    assert inherited["openrouter_escalation_model"] == "openai/gpt-5.4"
+    assert inherited["escalation_min_confidence"] == 1.0
+    assert inherited["escalation_score_margin"] == 5.0
+    assert disabled["openrouter_escalation_model"] == "off"
+    assert EscalationPolicy.from_settings(disabled).model_for("openrouter", "openai/gpt-5-nano") == ""
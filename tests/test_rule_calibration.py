@@ -0,0 +1,80 @@
+import pytest
+
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.analysis import RuleWeights, VacancyRuleEngine
+from autohhkek.services.rule_calibration import build_feedback_dataset, calibrate_rule_weights
+from autohhkek.services.storage import WorkspaceStore
+
+
+def _profile():
+    preferences = UserPreferences(target_titles=["Python Developer"], required_skills=["Python"], preferred_locations=["Москва"])
+    anamnesis = Anamnesis(headline="Python Developer", primary_skills=["Python", "Django"])
+    return preferences, anamnesis
+
+
+def _feedback_fixture():
+    """The user rejects every vacancy with a test task, which the default weights barely penalise."""
+    vacancies = []
+    feedback = {}
+    for index in range(30):
+        screening = index % 2 == 0
+        description = "Python, Django. " + ("Обязательное тестовое задание." if screening else "Сразу собеседование с командой.")
+        vacancy = Vacancy(vacancy_id=f"v-{index:02d}", title="Python Developer", location="Москва", description=description)
+        vacancies.append(vacancy)
+        feedback[vacancy.vacancy_id] = {"decision": "no_fit" if screening else "fit"}
+    return vacancies, feedback
+
+
+def test_default_weights_reproduce_hand_tuned_scores():
+    preferences, anamnesis = _profile()
+    vacancy = Vacancy(vacancy_id="1", title="Python Developer", location="Москва", description="Python, Django")
+
+    assessment = VacancyRuleEngine(preferences, anamnesis, RuleWeights()).assess(vacancy)
+
+    assert assessment.score == 50 + 18 + 6 + 4 + 6
+    assert assessment.category == FitCategory.FIT
+
+
+def test_calibration_learns_feedback_and_reports_cross_validated_accuracy():
+    preferences, anamnesis = _profile()
+    vacancies, feedback = _feedback_fixture()
+
+    profile = calibrate_rule_weights(preferences, anamnesis, vacancies, feedback)
+
+    assert profile["samples"] == 30
+    assert profile["class_counts"] == {"no_fit": 15, "doubt": 0, "fit": 15}
+    assert profile["baseline_cv_accuracy"] == 0.5
+    assert profile["cv_accuracy"] == 1.0
+    assert profile["activated"] is True
+    assert profile["weights"]["screening_required"] < -3
+    assert profile["weights"]["salary_low"] == -18.0
+
+    learned = VacancyRuleEngine(preferences, anamnesis, RuleWeights.from_dict(profile))
+    assert learned.assess(vacancies[0]).category == FitCategory.NO_FIT
+    assert learned.assess(vacancies[1]).category == FitCategory.FIT
+
+
+def test_calibration_needs_enough_feedback_and_skips_hard_blocks():
+    preferences, anamnesis = _profile()
+    preferences.excluded_companies = ["Рога и копыта"]
+    vacancies, feedback = _feedback_fixture()
+    vacancies[0].company = "Рога и копыта"
+
+    features, labels, ids = build_feedback_dataset(VacancyRuleEngine(preferences, anamnesis), vacancies, feedback)
+
+    assert "v-00" not in ids
+    assert features.shape == (29, len(RuleWeights().weights))
+    with pytest.raises(RuntimeError):
+        calibrate_rule_weights(preferences, anamnesis, vacancies, dict(list(feedback.items())[:5]))
+
+
+def test_store_keeps_versioned_profiles_and_loads_the_active_one(tmp_path):
+    store = WorkspaceStore(tmp_path)
+    first = store.save_rule_weight_profile({**RuleWeights(fit_threshold=70).to_dict(), "activated": True})
+    second = store.save_rule_weight_profile({**RuleWeights(fit_threshold=90).to_dict(), "activated": False})
+
+    assert (first["version"], second["version"]) == (1, 2)
+    assert store.load_rule_weights().fit_threshold == 70
+    assert store.load_rule_weights().version == 1
+    assert len(store.load_rule_weight_profiles()["versions"]) == 2
@@ -0,0 +1,131 @@
+import random
+
+import numpy as np
+
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.analysis import RuleWeights, VacancyRuleEngine
+from autohhkek.services.rule_impact import RuleImpactCache, RuleImpactIndex, preview_rule_edit, preview_rule_impact, score_rows
+from autohhkek.services.rule_loader import apply_rule_bundles, load_rule_bundle_from_text
+from autohhkek.services.storage import WorkspaceStore
+
+
+WORDS = ["Python", "Django", "LLM", "финтех", "банк", "удалённо", "офис", "Москва", "Казань", "тестовое", "SQL", "Go"]
+
+
+def _profile():
+    preferences = UserPreferences(
+        target_titles=["Python Developer"],
+        required_skills=["Python"],
+        preferred_skills=["Django"],
+        preferred_locations=["Москва"],
+        salary_min=250000,
+    )
+    anamnesis = Anamnesis(headline="Python Developer", primary_skills=["Python"])
+    return preferences, anamnesis
+
+
+def _vacancies(count: int) -> list[Vacancy]:
+    rng = random.Random(11)
+    items = []
+    for index in range(count):
+        title = rng.choice(["Python Developer", "LLM Engineer", "Go Developer", "Data Analyst"])
+        salary = rng.choice([None, 150000, 300000])
+        items.append(
+            Vacancy(
+                vacancy_id=f"v-{index}",
+                title=title,
+                company=rng.choice(["Acme", "Банк Ромашка", "Evil Corp"]),
+                location=rng.choice(["Москва", "Казань"]),
+                salary_from=salary,
+                description=" ".join(rng.sample(WORDS, 5)),
+            )
+        )
+    return items
+
+
+def _full_labels(preferences, anamnesis, vacancies, weights):
+    engine = VacancyRuleEngine(preferences, anamnesis, weights)
+    return [engine.assess(item) for item in vacancies]
+
+
+def _apply(preferences, anamnesis, markdown):
+    bundle = load_rule_bundle_from_text("chat_rules.md", markdown)
+    next_preferences, next_anamnesis, _ = apply_rule_bundles(preferences, anamnesis, [bundle])
+    return next_preferences, next_anamnesis
+
+
+def test_incremental_rescore_matches_full_reassessment():
+    preferences, anamnesis = _profile()
+    vacancies = _vacancies(300)
+    weights = RuleWeights()
+    index = RuleImpactIndex.build(preferences, anamnesis, vacancies)
+
+    for markdown in (
+        "excluded_companies: Evil Corp",
+        "forbidden_keywords: финтех",
+        "target_titles: LLM Engineer",
+        "preferred_skills: SQL",
+        "required_skills: LLM",
+        "remote_only: true",
+        "salary_min: 200000",
+    ):
+        next_preferences, next_anamnesis = _apply(preferences, anamnesis, markdown)
+        proposed, groups, _ = index.rescore(next_preferences, next_anamnesis)
+        scores, labels = score_rows(proposed.features, proposed.hard_blocked, weights)
+        expected = _full_labels(next_preferences, next_anamnesis, vacancies, weights)
+
+        assert groups, markdown
+        assert [item.category.value for item in expected] == [("no_fit", "doubt", "fit")[label] for label in labels], markdown
+        assert np.allclose(scores, [item.score for item in expected]), markdown
+
+
+def test_additive_term_edits_only_rescore_matching_vacancies():
+    preferences, anamnesis = _profile()
+    vacancies = _vacancies(300)
+    index = RuleImpactIndex.build(preferences, anamnesis, vacancies)
+
+    _, groups, affected = index.rescore(*_apply(preferences, anamnesis, "excluded_companies: Evil Corp"))
+    assert groups == {"hard_block"}
+    assert affected.sum() == sum(1 for item in vacancies if item.company == "Evil Corp")
+
+    _, groups, affected = index.rescore(*_apply(preferences, anamnesis, "salary_min: 200000"))
+    assert groups == {"salary"}
+    assert affected.all()
+
+    _, groups, affected = index.rescore(*_apply(preferences, anamnesis, "notes: просто заметка"))
+    assert groups == set()
+    assert not affected.any()
+
+
+def test_preview_lists_moved_vacancies_and_reuses_the_cached_index(tmp_path, monkeypatch):
+    preferences, anamnesis = _profile()
+    store = WorkspaceStore(tmp_path)
+    store.save_preferences(preferences)
+    store.save_anamnesis(anamnesis)
+    vacancies = _vacancies(200)
+    store.save_vacancies(vacancies)
+    cache = RuleImpactCache()
+    builds = []
+    original_build = RuleImpactIndex.build.__func__
+    monkeypatch.setattr(RuleImpactIndex, "build", classmethod(lambda cls, *args: builds.append(1) or original_build(cls, *args)))
+
+    next_preferences, next_anamnesis = _apply(preferences, anamnesis, "excluded_companies: Evil Corp")
+    impact = preview_rule_impact(store, preferences, anamnesis, next_preferences, next_anamnesis, cache=cache)
+    again = preview_rule_impact(store, preferences, anamnesis, next_preferences, next_anamnesis, cache=cache)
+    applied = preview_rule_impact(store, next_preferences, next_anamnesis, next_preferences, next_anamnesis, cache=cache)
+
+    before = _full_labels(preferences, anamnesis, vacancies, RuleWeights())
+    moved = {item.vacancy_id for item, vacancy in zip(before, vacancies) if vacancy.company == "Evil Corp" and item.category.value != "no_fit"}
+    assert builds == [1]
+    assert impact["changed_groups"] == ["hard_block"]
+    assert impact["changed_count"] == len(moved) > 0
+    assert {item["vacancy_id"] for item in impact["items"]} <= moved
+    assert all(item["after_category"] == "no_fit" and item["after_score"] <= 15 for item in impact["items"])
+    assert sum(impact["counts_after"].values()) == 200
+    assert impact["note"].startswith("Предпросмотр влияния")
+    assert again["changed_count"] == impact["changed_count"]
+    assert applied["changed_count"] == 0
+
+
+def test_preview_rule_edit_needs_intake(tmp_path):
+    assert preview_rule_edit(WorkspaceStore(tmp_path), "salary_min: 100000") == {}
@@ -0,0 +1,99 @@
+import time
+
+import numpy as np
+import pytest
+
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy
+from autohhkek.services.analysis import RULE_FEATURES, RuleWeights, VacancyRuleEngine
+from autohhkek.services.rule_sweep import build_weight_grid, run_rule_sweep, sweep_rule_weights
+
+
+def _profile():
+    preferences = UserPreferences(
+        target_titles=["Python Developer"],
+        required_skills=["Python"],
+        preferred_locations=["Москва"],
+        salary_min=250000,
+        excluded_companies=["Рога и копыта"],
+    )
+    anamnesis = Anamnesis(headline="Python Developer", primary_skills=["Python", "Django"])
+    return preferences, anamnesis
+
+
+def _vacancies():
+    return [
+        Vacancy(vacancy_id="fit", title="Python Developer", location="Москва", salary_from=300000, description="Python, Django"),
+        Vacancy(vacancy_id="no-salary", title="Python Developer", location="Москва", description="Python, Django"),
+        Vacancy(vacancy_id="test-task", title="Python Developer", location="Москва", description="Python. Тестовое задание."),
+        Vacancy(vacancy_id="java", title="Java Developer", location="Казань", salary_from=100000, description="Java, Spring"),
+        Vacancy(vacancy_id="blocked", title="Python Developer", company="Рога и копыта", location="Москва", description="Python"),
+    ]
+
+
+def test_sweep_at_current_weights_matches_the_engine():
+    preferences, anamnesis = _profile()
+    vacancies = _vacancies()
+    engine = VacancyRuleEngine(preferences, anamnesis)
+    assessments = [engine.assess(item) for item in vacancies]
+
+    [result] = run_rule_sweep(preferences, anamnesis, vacancies, assessments, {}, [RuleWeights()])
+
+    expected = {name.value: sum(1 for item in assessments if item.category == name) for name in FitCategory}
+    assert result["counts"] == expected
+    assert result["churn"] == 0
+    assert result["moves"] == {}
+    assert result["feedback_agreement"] is None
+
+
+def test_sweep_reports_churn_and_feedback_agreement_per_setting():
+    preferences, anamnesis = _profile()
+    vacancies = _vacancies()
+    engine = VacancyRuleEngine(preferences, anamnesis)
+    assessments = [engine.assess(item) for item in vacancies]
+    feedback = {"no-salary": {"decision": "fit"}, "test-task": {"decision": "no_fit"}, "blocked": {"decision": "fit"}}
+    grid = build_weight_grid(RuleWeights(), fit_thresholds=[72, 85], weights={"screening_required": [-3, -40]})
+
+    results = run_rule_sweep(preferences, anamnesis, vacancies, assessments, feedback, grid)
+
+    assert len(results) == 4
+    assert all(item["feedback_samples"] == 2 for item in results)
+    by_setting = {(item["fit_threshold"], item["weights"]["screening_required"]): item for item in results}
+    assert by_setting[(72, -3)]["churn"] == 0
+    assert by_setting[(72, -3)]["feedback_agreement"] == 0.5
+    assert by_setting[(72, -40)]["churn"] == 1
+    assert by_setting[(72, -40)]["moves"] == {"fit->no_fit": 1}
+    assert by_setting[(72, -40)]["feedback_agreement"] == 1.0
+    assert by_setting[(85, -40)]["counts"] == {"no_fit": 3, "doubt": 1, "fit": 1}
+
+
+def test_grid_rejects_unknown_features_and_inverted_thresholds():
+    with pytest.raises(ValueError):
+        build_weight_grid(RuleWeights(), weights={"nope": [1.0]})
+
+    grid = build_weight_grid(RuleWeights(), fit_thresholds=[40, 80], doubt_thresholds=[45])
+
+    assert [item.fit_threshold for item in grid] == [80.0]
+
+
+def test_sweep_over_10k_vacancies_is_a_single_fast_pass():
+    rng = np.random.default_rng(3)
+    features = rng.integers(0, 2, size=(10_000, len(RULE_FEATURES))).astype(np.float64)
+    hard_blocked = rng.random(10_000) < 0.05
+    current = rng.integers(0, 3, size=10_000)
+    feedback = np.where(rng.random(10_000) < 0.1, current, -1)
+    grid = build_weight_grid(
+        RuleWeights(),
+        fit_thresholds=[60, 65, 70, 72, 75, 80],
+        doubt_thresholds=[35, 40, 45, 50],
+        weights={"salary_unknown": [-12, -8, -4, 0], "screening_required": [-10, -6, -3, 0]},
+    )
+
+    started = time.perf_counter()
+    results = sweep_rule_weights(features, hard_blocked, grid, current_labels=current, feedback_labels=feedback)
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 384
+    assert all(sum(item["counts"].values()) == 10_000 for item in results)
+    assert all(item["counts"]["no_fit"] >= int(hard_blocked.sum()) for item in results)
+    assert elapsed < 1.0
@@ -0,0 +1,112 @@
+import asyncio
+import random
+
+from autohhkek.services.serp_cache import SerpPageCache, serp_page_hash, serp_query_key
+from logic import vacancy_parser
+
+
+def _page(start, count=3, salary=""):
+    return [
+        {"title": f"Python {index}", "url": f"https://hh.ru/vacancy/{index}?query=python&hhtmFrom=serp", "company": "Acme", "salary_text": salary}
+        for index in range(start, start + count)
+    ]
+
+
+def test_query_key_is_canonical_per_account_resume_and_query():
+    params = {"text": "python", "area": ["2", "1"], "remote_work": "1", "page": "3", "searchSessionId": "abc"}
+    reordered = {"remote_work": "1", "area": ["1", "2"], "text": "python"}
+
+    assert serp_query_key("main", "r1", params) == serp_query_key("main", "r1", reordered)
+    assert serp_query_key("main", "r1", params) != serp_query_key("second", "r1", params)
+    assert serp_query_key("main", "r1", params) != serp_query_key("main", "r2", params)
+    assert serp_query_key("main", "r1", params) != serp_query_key("main", "r1", {**reordered, "text": "golang"})
+
+
+def test_page_hash_ignores_tracking_params_but_not_card_edits():
+    page = _page(1)
+    retracked = [{**item, "url": item["url"].split("?")[0] + "?hhtmFrom=resume"} for item in page]
+
+    assert serp_page_hash(page) == serp_page_hash(retracked)
+    assert serp_page_hash(page) != serp_page_hash(_page(1, salary="от 200 000 ₽"))
+    assert serp_page_hash(page) != serp_page_hash(list(reversed(page)))
+
+
+def test_cache_roundtrip_validates_pages_and_expires_after_ttl(tmp_path):
+    now = [1000.0]
+    path = tmp_path / "serp_cache" / "key.json"
+    cache = SerpPageCache.load(path, ttl_sec=60, clock=lambda: now[0])
+    cache.reset(total_count=9)
+    for page_num in range(3):
+        cache.store_page(page_num, _page(page_num * 3))
+    cache.save()
+
+    now[0] += 30
+    loaded = SerpPageCache.load(path, ttl_sec=60, clock=lambda: now[0])
+    assert loaded.total_count == 9
+    assert loaded.validate_page(0, _page(0))
+    assert not loaded.validate_page(1, _page(100))
+    assert [page[0]["title"] for page in loaded.cached_pages(1)] == ["Python 3", "Python 6"]
+    loaded.save()
+    assert loaded.to_dict() == {"pages": 3, "unchanged": 1, "changed": 1, "reused": 2}
+
+    now[0] += 40
+    reloaded = SerpPageCache.load(path, ttl_sec=60, clock=lambda: now[0])
+    assert reloaded.saved_at == 1000.0
+    assert not reloaded.validate_page(0, _page(0))
+
+
+def test_cached_pages_are_reused_only_when_the_last_one_is_unchanged(tmp_path, monkeypatch):
+    cache = SerpPageCache.load(tmp_path / "key.json", ttl_sec=60, sample_pages=0)
+    cache.reset(total_count=9)
+    for page_num in range(3):
+        cache.store_page(page_num, _page(page_num * 3))
+    cache.save()
+    live = {2: _page(6)}
+    loaded = []
+
+    async def fake_load(page, url):
+        loaded.append(url)
+        return live[int(url.rsplit("=", 1)[1])]
+
+    monkeypatch.setattr(vacancy_parser, "load_serp_page", fake_load)
+    page_url = lambda page_num: f"https://hh.ru/search/vacancy?page={page_num}"
+
+    reused = asyncio.run(vacancy_parser.reuse_cached_serp_pages(None, cache, page_url))
+    assert [page[0]["title"] for page in reused] == ["Python 3", "Python 6"]
+    assert loaded == ["https://hh.ru/search/vacancy?page=2"]
+
+    live[2] = _page(6, salary="от 200 000 ₽")
+    assert asyncio.run(vacancy_parser.reuse_cached_serp_pages(None, cache, page_url)) == []
+    assert cache.to_dict() == {"pages": 3, "unchanged": 1, "changed": 1, "reused": 2}
+
+
+def test_reuse_samples_middle_pages_and_drops_the_cache_on_a_middle_edit(tmp_path, monkeypatch):
+    cache = SerpPageCache.load(tmp_path / "key.json", ttl_sec=60, sample_pages=2)
+    cache.rng = random.Random(7)
+    cache.reset(total_count=18)
+    for page_num in range(6):
+        cache.store_page(page_num, _page(page_num * 3))
+    cache.save()
+    live = {page_num: _page(page_num * 3) for page_num in range(6)}
+    loaded = []
+
+    async def fake_load(page, url):
+        loaded.append(int(url.rsplit("=", 1)[1]))
+        return live[loaded[-1]]
+
+    monkeypatch.setattr(vacancy_parser, "load_serp_page", fake_load)
+    page_url = lambda page_num: f"https://hh.ru/search/vacancy?page={page_num}"
+
+    assert len(asyncio.run(vacancy_parser.reuse_cached_serp_pages(None, cache, page_url))) == 5
+    assert len(loaded) == 3 and loaded[-1] == 5 and set(loaded[:2]) <= {1, 2, 3, 4}
+
+    live[3] = _page(9, salary="от 200 000 ₽")
+    seen_middle = set()
+    for _ in range(20):
+        loaded.clear()
+        if not asyncio.run(vacancy_parser.reuse_cached_serp_pages(None, cache, page_url)):
+            break
+        seen_middle.update(loaded[:-1])
+    else:
+        raise AssertionError(f"middle edit never caught, sampled {seen_middle}")
+    assert 3 in loaded
@@ -0,0 +1,53 @@
+from autohhkek.domain.models import Anamnesis, UserPreferences
+from autohhkek.services.analysis import VacancyRuleEngine
+from autohhkek.services.hh_refresh import HHVacancyRefresher
+from autohhkek.services.serp_prescore import prescore_serp_cards
+from autohhkek.services.storage import WorkspaceStore
+
+
+def _card(vacancy_id, title, company="Acme", salary_text="", summary=""):
+    return {
+        "title": title,
+        "url": f"https://hh.ru/vacancy/{vacancy_id}",
+        "company": company,
+        "salary_text": salary_text,
+        "summary": summary,
+        "location": "Москва",
+    }
+
+
+def test_prescore_ranks_cards_by_fit_and_sets_hard_blocked_employers_aside(tmp_path):
+    prefs = UserPreferences(
+        target_titles=["Python Developer"],
+        excluded_companies=["Рога и копыта"],
+        required_skills=["Python"],
+        salary_min=200_000,
+    )
+    anamnesis = Anamnesis(headline="Python Developer", primary_skills=["Python", "FastAPI"])
+    cards = [
+        _card(1, "Оператор call-центра", salary_text="от 60 000 ₽"),
+        _card(2, "Python Developer", company="Рога и копыта", salary_text="от 300 000 ₽"),
+        _card(3, "Python Developer", salary_text="от 250 000 ₽", summary="FastAPI, PostgreSQL"),
+        _card(4, "Python Developer"),
+    ]
+    refresher = HHVacancyRefresher(WorkspaceStore(tmp_path))
+
+    result = prescore_serp_cards(cards, VacancyRuleEngine(prefs, anamnesis), lambda item: refresher._to_vacancy(item, "r"))
+
+    assert [item["url"][-1] for item in result.ranked] == ["3", "4", "1"]
+    assert [item["url"][-1] for item in result.blocked] == ["2"]
+    assert result.ordered[-1]["prescore_blocked"] is True
+    assert result.ranked[0]["prescore"] > result.ranked[1]["prescore"] > result.ranked[2]["prescore"]
+    assert result.to_dict(fetched=2) == {
+        "scored": 4,
+        "blocked": 1,
+        "top_score": result.ranked[0]["prescore"],
+        "detail_cutoff_score": result.ranked[1]["prescore"],
+    }
+    assert refresher._to_vacancy(result.blocked[0], "r").meta["prescore_blocked"] is True
+
+
+def test_refresher_skips_prescoring_until_intake_is_done(tmp_path):
+    store = WorkspaceStore(tmp_path)
+
+    assert HHVacancyRefresher(store)._prescore([_card(1, "Python Developer")], "r") is None
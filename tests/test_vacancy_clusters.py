@@ -0,0 +1,103 @@
+from autohhkek.agents import vacancy_analysis_agent
+from autohhkek.agents.vacancy_analysis_agent import VacancyAnalysisAgent
+from autohhkek.domain.enums import FitCategory
+from autohhkek.domain.models import Anamnesis, UserPreferences, Vacancy, VacancyAssessment
+from autohhkek.services.storage import WorkspaceStore
+from autohhkek.services.vacancy_clusters import VacancyClusterIndex, annotate_vacancy_clusters
+
+
+BODY = (
+    "Ищем Python разработчика в команду платформы данных. Задачи: разработка сервисов на FastAPI, "
+    "проектирование схем PostgreSQL, код-ревью и наставничество. Требования: опыт от трёх лет, "
+    "уверенное знание asyncio, Docker и Kubernetes. Условия: ДМС, гибкий график, обучение за счёт компании."
+)
+
+
+def _vacancy(vacancy_id: str, *, company: str = "Acme", location: str = "Москва", body: str = BODY) -> Vacancy:
+    return Vacancy(vacancy_id=vacancy_id, title="Python разработчик", company=company, location=location, description=body)
+
+
+def _batch() -> list[Vacancy]:
+    return [
+        _vacancy("1"),
+        _vacancy("2", location="Казань", body=BODY.replace("Москва", "Казань") + " Офис в Казани."),
+        _vacancy("3", body=BODY.replace("обучение за счёт компании", "оплачиваемое обучение")),
+        _vacancy("4", company="Другая компания"),
+        _vacancy("5", body="Продавец-консультант в салон связи. Работа с клиентами, выкладка товара, касса, график два через два."),
+    ]
+
+
+def test_near_duplicates_from_the_same_employer_share_a_representative():
+    clusters = VacancyClusterIndex().assign(_batch())
+
+    assert clusters["2"] == clusters["3"] == clusters["1"] == "1"
+    assert clusters["4"] == "4"
+    assert clusters["5"] == "5"
+
+
+def test_index_persists_and_clusters_reposts_across_history(tmp_path):
+    path = tmp_path / "vacancy_clusters.npz"
+    first = VacancyClusterIndex()
+    first.assign(_batch()[:1])
+    first.save(path)
+
+    reloaded = VacancyClusterIndex.load(path)
+    clusters = reloaded.assign([_vacancy("99", location="Санкт-Петербург")])
+    batch = [_vacancy("99", location="Санкт-Петербург"), _vacancy("100")]
+    duplicates = annotate_vacancy_clusters(batch, reloaded.assign(batch))
+
+    assert clusters == {"99": "1"}
+    assert duplicates == 1
+    assert batch[0].meta == {"cluster_id": "1", "cluster_size": 2}
+    assert VacancyClusterIndex.load(tmp_path / "missing.npz") is None
+
+
+class _CountingReviewAgent:
+    calls: list[str] = []
+
+    def __init__(self, *args, **kwargs):
+        self.rule_engine = type("Engine", (), {"weights": type("Weights", (), {"version": 0})()})()
+
+    def review(self, vacancy):
+        self.calls.append(vacancy.vacancy_id)
+        return VacancyAssessment(
+            vacancy_id=vacancy.vacancy_id,
+            category=FitCategory.FIT,
+            subcategory="llm_review",
+            score=80,
+            explanation="LLM verdict",
+            review_strategy="openrouter_agent",
+        )
+
+
+class _SkippedRefresher:
+    def refresh(self, limit=0):
+        return {"status": "skipped", "reason": "refresh_disabled", "message": "Live refresh disabled."}
+
+
+def test_analysis_reviews_one_vacancy_per_cluster_and_propagates_the_verdict(tmp_path, monkeypatch):
+    store = WorkspaceStore(tmp_path)
+    store.save_preferences(UserPreferences(target_titles=["Python разработчик"]))
+    store.save_anamnesis(Anamnesis(headline="Python разработчик"))
+    store.save_vacancies(_batch())
+    _CountingReviewAgent.calls = []
+    monkeypatch.setattr(vacancy_analysis_agent, "VacancyReviewAgent", _CountingReviewAgent)
+
+    run, assessments = VacancyAnalysisAgent(store, vacancy_refresher=_SkippedRefresher()).analyze(limit=10)
+
+    assert _CountingReviewAgent.calls == ["1", "4", "5"]
+    by_id = {item.vacancy_id: item for item in assessments}
+    assert by_id["2"].category == FitCategory.FIT
+    assert "почти-дубликата 1" in by_id["2"].review_notes
+    state = store.load_analysis_state()
+    assert state["near_duplicate_count"] == 2
+    assert state["cluster_propagated_count"] == 2
+    assert {item.vacancy_id: item.meta.get("cluster_id") for item in store.load_vacancies()}["3"] == "1"
+
+    store.save_vacancies([_vacancy("7", location="Новосибирск")])
+    _CountingReviewAgent.calls = []
+    _, assessments = VacancyAnalysisAgent(store, vacancy_refresher=_SkippedRefresher()).analyze(limit=10)
+
+    assert _CountingReviewAgent.calls == []
+    assert assessments[0].vacancy_id == "7"
+    assert "почти-дубликата 1" in assessments[0].review_notes